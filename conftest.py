@@ -1,4 +1,5 @@
 import datetime
+import json
 import os
 import uuid
 from typing import Any, AsyncGenerator, Callable, Generator, cast
@@ -22,9 +23,10 @@ from apps.shared.test.client import TestClient
 from broker import broker
 from config import settings
 from infrastructure.app import create_app
+from infrastructure.cache import LocalCache
 from infrastructure.database.core import build_engine
 from infrastructure.database.deps import get_session
-from infrastructure.utility import FCMNotificationTest, RedisCacheTest
+from infrastructure.utility import CDNClient, FCMNotificationTest, RedisCacheTest
 
 pytest_plugins = [
     "apps.activities.tests.fixtures.configs",
@@ -238,9 +240,21 @@ async def mock_report_server_response(mocker) -> AsyncGenerator[Any, Any]:
             ),
         )
 
+    async def iter_chunked(size: int) -> AsyncGenerator[bytes, None]:
+        body = json.dumps(json_()).encode()
+        for i in range(0, len(body), 8):
+            yield body[i : i + 8]
+
     mock = mocker.patch("aiohttp.ClientSession.post")
     mock.return_value.__aenter__.return_value.status = 200
     mock.return_value.__aenter__.return_value.json.side_effect = json_
+    mock.return_value.__aenter__.return_value.content.iter_chunked.side_effect = iter_chunked
+    yield mock
+
+
+@pytest.fixture
+async def mock_kiq_answer_events(mocker) -> AsyncGenerator[Any, Any]:
+    mock = mocker.patch("apps.answers.api.process_answer_events.kiq")
     yield mock
 
 
@@ -288,9 +302,19 @@ def mock_get_session(
 def fcm_client() -> FCMNotificationTest:
     client = FCMNotificationTest()
     client.notifications.clear()
+    client.unregistered.clear()
     return client
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Database changes are rolled back after each test, so cached data must be dropped as well."""
+    LocalCache.clear_all()
+    RedisCacheTest._storage.clear()
+    # storage clients may be mocked by tests
+    CDNClient._clients.clear()
+
+
 @pytest.fixture
 def redis() -> RedisCacheTest:
     redis = RedisCacheTest()
@@ -20,7 +20,25 @@ class ActivityHistoriesCRUD(BaseCRUD[ActivityHistorySchema]):
         self,
         activities: list[ActivityHistorySchema],
     ) -> None:
-        await self._create_many(activities)
+        await self._insert_many(activities)
+
+    async def get_last_items_versions(self, activity_ids: list[uuid.UUID]) -> dict[uuid.UUID, tuple[str, str]]:
+        """Items hash and id_version of the items owner of the last hashed
+        version of every activity.
+        """
+        query: Query = select(
+            ActivityHistorySchema.id,
+            ActivityHistorySchema.items_hash,
+            ActivityHistorySchema.items_id_version,
+        )
+        query = query.where(
+            ActivityHistorySchema.id.in_(activity_ids),
+            ActivityHistorySchema.items_hash.isnot(None),
+        )
+        query = query.distinct(ActivityHistorySchema.id)
+        query = query.order_by(ActivityHistorySchema.id, ActivityHistorySchema.created_at.desc())
+        result = await self._execute(query)
+        return {row.id: (row.items_hash, row.items_id_version) for row in result.all()}
 
     async def retrieve_by_applet_version(self, id_version) -> list[ActivityHistorySchema]:
         query: Query = select(ActivityHistorySchema)
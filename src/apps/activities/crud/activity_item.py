@@ -1,6 +1,7 @@
 import uuid
 
 from sqlalchemy import delete, select
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Query
 
 from apps.activities.db.schemas import ActivityItemSchema, ActivitySchema
@@ -15,9 +16,8 @@ class ActivityItemsCRUD(BaseCRUD[ActivityItemSchema]):
     async def create_many(
         self,
         activity_item_schemas: list[ActivityItemSchema],
-    ) -> list[ActivityItemSchema]:
-        instances = await self._create_many(activity_item_schemas)
-        return instances
+    ) -> list[Row]:
+        return await self._insert_many(activity_item_schemas)
 
     async def delete_by_applet_id(self, applet_id: uuid.UUID):
         activity_id_query: Query = select(ActivitySchema.id).where(ActivitySchema.applet_id == applet_id)
@@ -1,51 +1,79 @@
 import uuid
 
 from sqlalchemy import select
+from sqlalchemy.engine import Result
 from sqlalchemy.orm import Query
 
 from apps.activities.db.schemas import ActivityHistorySchema, ActivityItemHistorySchema, ActivitySchema
 from apps.applets.db.schemas import AppletHistorySchema
 from infrastructure.database import BaseCRUD
 
-__all__ = ["ActivityItemHistoriesCRUD"]
+__all__ = ["ActivityItemHistoriesCRUD", "as_activity_version_item"]
+
+
+def as_activity_version_item(item: ActivityItemHistorySchema, activity_id_version: str) -> ActivityItemHistorySchema:
+    """Item history row as a part of the given activity version.
+
+    Versions of an activity with unchanged items share the item history rows
+    of the version which wrote them, the shared rows are returned as
+    transient copies with the id_version and activity_id of the requested
+    version.
+    """
+    if item.activity_id == activity_id_version:
+        return item
+    version = activity_id_version.split("_", 1)[1]
+    values = dict(item, id_version=f"{item.id}_{version}", activity_id=activity_id_version)
+    return ActivityItemHistorySchema(**values)
 
 
 class ActivityItemHistoriesCRUD(BaseCRUD[ActivityItemHistorySchema]):
     schema_class = ActivityItemHistorySchema
 
+    @staticmethod
+    def _select_versions_items() -> Query:
+        """Items of activity versions, the id_version of the activity version
+        is selected next to the item history row.
+        """
+        query: Query = select(ActivityItemHistorySchema, ActivityHistorySchema.id_version)
+        query = query.join(
+            ActivityHistorySchema,
+            ActivityHistorySchema.items_id_version == ActivityItemHistorySchema.activity_id,
+        )
+        return query
+
+    @staticmethod
+    def _versions_items(result: Result) -> list[ActivityItemHistorySchema]:
+        return [as_activity_version_item(item, activity_id_version) for item, activity_id_version in result.all()]
+
     async def create_many(
         self,
         items: list[ActivityItemHistorySchema],
     ):
-        await self._create_many(items)
+        await self._insert_many(items)
 
     async def retrieve_by_applet_version(self, id_version: str) -> list[ActivityItemHistorySchema]:
-        query: Query = select(ActivityItemHistorySchema)
-        query = query.join(
-            ActivityHistorySchema,
-            ActivityHistorySchema.id_version == ActivityItemHistorySchema.activity_id,
-        )
+        query = self._select_versions_items()
         query = query.filter(ActivityHistorySchema.applet_id == id_version)
         query = query.order_by(
             ActivityItemHistorySchema.order.asc(),
         )
 
         result = await self._execute(query)
-        return result.scalars().all()
+        return self._versions_items(result)
 
     async def get_by_activity_id_version(self, activity_id: str) -> list[ActivityItemHistorySchema]:
-        query: Query = select(ActivityItemHistorySchema)
-        query = query.where(ActivityItemHistorySchema.activity_id == activity_id)
+        query = self._select_versions_items()
+        query = query.where(ActivityHistorySchema.id_version == activity_id)
         query = query.order_by(ActivityItemHistorySchema.order.asc())
         db_result = await self._execute(query)
-        return db_result.scalars().all()
+        return self._versions_items(db_result)
 
     async def get_by_activity_id_versions(self, id_versions: list[str]) -> list[ActivityItemHistorySchema]:
-        query: Query = select(ActivityItemHistorySchema)
-        query = query.where(ActivityItemHistorySchema.activity_id.in_(id_versions))
+        query = self._select_versions_items()
+        query = query.where(ActivityHistorySchema.id_version.in_(id_versions))
         query = query.order_by(ActivityItemHistorySchema.order.asc())
         db_result = await self._execute(query)
-        return db_result.scalars().all()
+        return self._versions_items(db_result)
 
     async def get_applets_assessments(
         self,
@@ -63,11 +91,7 @@ class ActivityItemHistoriesCRUD(BaseCRUD[ActivityItemHistorySchema]):
             .subquery()
         )
 
-        query: Query = select(ActivityItemHistorySchema)
-        query = query.join(
-            ActivityHistorySchema,
-            ActivityHistorySchema.id_version == ActivityItemHistorySchema.activity_id,
-        )
+        query = self._select_versions_items()
         query = query.join(ActivitySchema, ActivitySchema.id == ActivityHistorySchema.id)
         query = query.where(ActivitySchema.applet_id == applet_id)
         query = query.where(
@@ -77,34 +101,24 @@ class ActivityItemHistoriesCRUD(BaseCRUD[ActivityItemHistorySchema]):
         query = query.order_by(ActivityItemHistorySchema.order.asc())
         db_result = await self._execute(query)
 
-        res = db_result.scalars().all()
-        return res
+        return self._versions_items(db_result)
 
     async def get_assessment_activity_items(self, id_version: str | None) -> list[ActivityItemHistorySchema | None]:
         if not id_version:
             return []  # pragma: no cover
-        query: Query = select(ActivityItemHistorySchema)
-        query = query.join(
-            ActivityHistorySchema,
-            ActivityHistorySchema.id_version == ActivityItemHistorySchema.activity_id,
-        )
+        query = self._select_versions_items()
         query = query.join(ActivitySchema, ActivitySchema.id == ActivityHistorySchema.id)
         query = query.where(
             ActivityHistorySchema.is_reviewable == True,  # noqa: E712
             ActivityHistorySchema.id_version == id_version,
         )
         db_result = await self._execute(query)
-        res = db_result.scalars().all()
-        return res
+        return self._versions_items(db_result)
 
     async def get_activity_items(
         self, activity_id: uuid.UUID, versions: list[str] | None
     ) -> list[ActivityItemHistorySchema]:
-        query: Query = select(ActivityItemHistorySchema)
-        query = query.join(
-            ActivityHistorySchema,
-            ActivityHistorySchema.id_version == ActivityItemHistorySchema.activity_id,
-        )
+        query = self._select_versions_items()
         query = query.where(ActivityHistorySchema.id == activity_id)
         if versions:
             query = query.join(
@@ -118,4 +132,4 @@ class ActivityItemHistoriesCRUD(BaseCRUD[ActivityItemHistorySchema]):
         query = query.order_by(ActivityItemHistorySchema.order.asc())
         db_result = await self._execute(query)
 
-        return db_result.scalars().all()
+        return self._versions_items(db_result)
@@ -45,15 +45,21 @@ class ActivitySchema(Base, _BaseActivitySchema):
 class ActivityHistorySchema(Base, _BaseActivitySchema):
     __tablename__ = "activity_histories"
 
-    id = Column(UUID(as_uuid=True))
+    id = Column(UUID(as_uuid=True), index=True)
     id_version = Column(String(), primary_key=True)
     applet_id = Column(
         ForeignKey("applet_histories.id_version", ondelete="RESTRICT"),
         nullable=False,
     )
+    # structural hash of the items, versions with equal hashes share item history rows
+    items_hash = Column(String(64), nullable=True)
+    # id_version of the activity version which owns the item history rows of this version
+    items_id_version = Column(String(), nullable=False)
 
     items = relationship(
         "ActivityItemHistorySchema",
+        primaryjoin="ActivityHistorySchema.items_id_version == foreign(ActivityItemHistorySchema.activity_id)",
         order_by="asc(ActivityItemHistorySchema.order)",
         lazy="noload",
+        viewonly=True,
     )
@@ -5,13 +5,7 @@ from pydantic import Field, root_validator
 
 from apps.activities.domain.activity_base import ActivityBase
 from apps.activities.domain.activity_item_base import BaseActivityItem
-from apps.activities.domain.custom_validation import (
-    validate_item_flow,
-    validate_performance_task_type,
-    validate_phrasal_templates,
-    validate_score_and_sections,
-    validate_subscales,
-)
+from apps.activities.domain.custom_validation import validate_activity_structure, validate_performance_task_type
 from apps.activities.errors import DuplicateActivityItemNameNameError
 from apps.shared.domain import InternalModel
 
@@ -42,21 +36,9 @@ class ActivityCreate(ActivityBase, InternalModel):
         return values
 
     @root_validator()
-    def validate_item_flow_conditional_logic(cls, values):
-        return validate_item_flow(values)
-
-    @root_validator()
-    def validate_scores_and_reports_conditional_logic(cls, values):
-        return validate_score_and_sections(values)
-
-    @root_validator()
-    def validate_subscales(cls, values):
-        return validate_subscales(values)
+    def validate_structure(cls, values):
+        return validate_activity_structure(values)
 
     @root_validator()
     def validate_performance_task_type(cls, values):
         return validate_performance_task_type(values)
-
-    @root_validator()
-    def validate_phrasal_templates(cls, values):
-        return validate_phrasal_templates(values)
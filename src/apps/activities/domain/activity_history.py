@@ -59,6 +59,20 @@ class PublicActivityHistoryChange(PublicModel):
 class ActivityHistoryFull(ActivityHistory):
     items: list[ActivityItemHistoryFull] = Field(default_factory=list)
 
+    @validator("items")
+    def items_of_version(cls, value: list[ActivityItemHistoryFull], values: dict) -> list[ActivityItemHistoryFull]:
+        # items shared with a previous version of the activity are presented as items of this version
+        id_version = values.get("id_version")
+        if not id_version:
+            return value
+        version = id_version.split("_", 1)[1]
+        return [
+            item
+            if item.activity_id == id_version
+            else item.copy(update=dict(id_version=f"{item.id}_{version}", activity_id=id_version))
+            for item in value
+        ]
+
 
 class ActivityHistoryExport(PublicActivityFull):
     id_version: str
@@ -28,49 +28,122 @@ from apps.activities.errors import (
     SubscaleNameDoesNotExist,
     SubscaleSettingDoesNotExist,
 )
+from apps.shared.exception import BaseError
+
+SCORE_ITEM_TYPES = frozenset(
+    (
+        ResponseType.SINGLESELECT,
+        ResponseType.MULTISELECT,
+        ResponseType.SLIDER,
+    )
+)
+SCORE_PRINT_ITEM_TYPES = frozenset(
+    (
+        ResponseType.SINGLESELECT,
+        ResponseType.MULTISELECT,
+        ResponseType.SLIDER,
+        ResponseType.TEXT,
+        ResponseType.PARAGRAPHTEXT,
+        ResponseType.NUMBERSELECT,
+    )
+)
+SECTION_PRINT_ITEM_TYPES = frozenset(
+    (
+        ResponseType.SINGLESELECT,
+        ResponseType.MULTISELECT,
+        ResponseType.SLIDER,
+        ResponseType.TEXT,
+        ResponseType.PARAGRAPHTEXT,
+    )
+)
+PHRASAL_TEMPLATE_ITEM_TYPES = frozenset(
+    (
+        ResponseType.DATE,
+        ResponseType.MULTISELECT,
+        ResponseType.MULTISELECTROWS,
+        ResponseType.NUMBERSELECT,
+        ResponseType.SINGLESELECT,
+        ResponseType.SINGLESELECTROWS,
+        ResponseType.SLIDER,
+        ResponseType.SLIDERROWS,
+        ResponseType.TEXT,
+        ResponseType.TIME,
+        ResponseType.TIMERANGE,
+        ResponseType.PARAGRAPHTEXT,
+    )
+)
 
 
-def validate_item_flow(values: dict):
-    items = values.get("items", [])
-    item_names = [item.name for item in items]
+class ActivityValidationContext:
+    """Indexes of an activity built once and shared by the structure validators:
+    items by name and option values by item.
+
+    Errors are collected, so all of them are found in one pass.
+    `raise_errors` raises the first one, the same as a validator raising on
+    the first error would, with the rest in its `related_errors`.
+    """
+
+    def __init__(self, values: dict):
+        self.values = values
+        self.items = values.get("items", [])
+        self.item_indexes: dict[str, int] = {}
+        for index, item in enumerate(self.items):
+            self.item_indexes.setdefault(item.name, index)
+        self._option_values: dict[int, set[str]] = {}
+        self.errors: list[BaseError] = []
+
+    def option_values(self, index: int) -> set[str]:
+        """Values (ids or values, depending on the item type) of the options of the item."""
+        if index not in self._option_values:
+            self._option_values[index] = self._collect_option_values(self.items[index])
+        return self._option_values[index]
+
+    @staticmethod
+    def _collect_option_values(item) -> set[str]:
+        attr = "value" if item.config.type in ResponseType.options_mapped_on_value() else "id"
+        return {str(getattr(option, attr)) for option in item.response_values.options}
+
+    def add_error(self, error: BaseError) -> None:
+        self.errors.append(error)
+
+    def raise_errors(self) -> None:
+        if not self.errors:
+            return
+        first, *related = self.errors
+        first.related_errors = related
+        raise first
 
-    # conditional logic for item flow
-    for index in range(len(items)):
-        if items[index].conditional_logic is not None:
-            for condition in items[index].conditional_logic.conditions:
-                # check if condition item name is in item names
-                if condition.item_name not in item_names:
-                    raise IncorrectConditionItemError()
-                else:
-                    # check if condition item order is less than current item order  # noqa: E501
-                    condition_item_index = item_names.index(condition.item_name)
-                    condition_source_item = items[condition_item_index]
-                    item_type = condition_source_item.config.type
-                    if condition_item_index > index:
-                        raise IncorrectConditionItemIndexError()
-
-                    # check if condition item type is correct
-                    if condition_source_item.response_type not in ResponseType.conditional_logic_types():
-                        raise IncorrectConditionLogicItemTypeError()
-
-                    # check if condition option ids are correct
-                    if item_type in ResponseType.option_based():
-                        if item_type in ResponseType.options_mapped_on_value():
-                            option_value_attr = "value"
-                            selected_option = str(condition.payload.option_value)
-                        else:
-                            option_value_attr = "id"
-                            selected_option = str(condition.payload.option_value)
-
-                        option_values = []
-                        for option in condition_source_item.response_values.options:
-                            option_value = getattr(option, option_value_attr)
-                            option_values.append(str(option_value))
-
-                        if selected_option not in option_values:
-                            raise IncorrectConditionOptionError()
 
-    return values
+def check_item_flow(context: ActivityValidationContext) -> None:
+    items = context.items
+
+    # conditional logic for item flow
+    for index, item in enumerate(items):
+        if item.conditional_logic is None:
+            continue
+        for condition in item.conditional_logic.conditions:
+            # check if condition item name is in item names
+            condition_item_index = context.item_indexes.get(condition.item_name)
+            if condition_item_index is None:
+                context.add_error(IncorrectConditionItemError())
+                continue
+
+            # check if condition item order is less than current item order
+            condition_source_item = items[condition_item_index]
+            item_type = condition_source_item.config.type
+            if condition_item_index > index:
+                context.add_error(IncorrectConditionItemIndexError())
+                continue
+
+            # check if condition item type is correct
+            if condition_source_item.response_type not in ResponseType.conditional_logic_types():
+                context.add_error(IncorrectConditionLogicItemTypeError())
+                continue
+
+            # check if condition option ids are correct
+            if item_type in ResponseType.option_based():
+                if str(condition.payload.option_value) not in context.option_values(condition_item_index):
+                    context.add_error(IncorrectConditionOptionError())
 
 
 def validate_subscale_setting_match_reports(report: Score, subscale_setting: SubscaleSetting):
@@ -90,134 +163,171 @@ def validate_subscale_setting_match_reports(report: Score, subscale_setting: Sub
             raise SubscaleItemTypeItemDoesNotExist()
 
 
-def validate_score_and_sections(values: dict):  # noqa: C901
-    items = values.get("items", [])
-    item_names = [item.name for item in items]
-    scores_and_reports = values.get("scores_and_reports")
-    if scores_and_reports:
-        score_item_ids = []
-        score_condition_item_ids = []
-        if not hasattr(scores_and_reports, "reports"):
-            return
+def _check_print_items(
+    context: ActivityValidationContext,
+    item_names: list[str],
+    item_types: frozenset[ResponseType],
+    item_error: type[BaseError],
+    type_error: type[BaseError],
+) -> None:
+    for item_name in item_names:
+        index = context.item_indexes.get(item_name)
+        if index is None:
+            context.add_error(item_error())
+        elif context.items[index].response_type not in item_types:
+            context.add_error(type_error())
+
+
+def check_score_and_sections(context: ActivityValidationContext) -> None:  # noqa: C901
+    scores_and_reports = context.values.get("scores_and_reports")
+    if not scores_and_reports or not hasattr(scores_and_reports, "reports"):
+        return
+
+    reports = scores_and_reports.reports or []
+    scores = [report for report in reports if report.type == ReportType.score]
+    sections = [report for report in reports if report.type == ReportType.section]
+    # reports by id which sections can depend on
+    score_item_ids = {report.id for report in scores}
+    score_condition_item_ids = {
+        conditional_logic.id for report in scores for conditional_logic in report.conditional_logic or []
+    }
+
+    for report in scores:
+        if report.scoring_type == "score":
+            subscale_setting = context.values.get("subscale_setting")
+            if not subscale_setting:  # report of type score exist then we need a subscale setting
+                context.add_error(SubscaleSettingDoesNotExist())
+            else:
+                try:
+                    validate_subscale_setting_match_reports(report, subscale_setting)
+                except BaseError as error:
+                    context.add_error(error)
+
+        # check if all item names are same as values.name
+        for item_name in report.items_score:
+            index = context.item_indexes.get(item_name)
+            if index is None:
+                context.add_error(IncorrectScoreItemError())
+            elif context.items[index].response_type not in SCORE_ITEM_TYPES:
+                context.add_error(IncorrectScoreItemTypeError())
+            elif not context.items[index].config.add_scores:
+                context.add_error(IncorrectScoreItemConfigError())
+
+        _check_print_items(
+            context,
+            report.items_print,
+            SCORE_PRINT_ITEM_TYPES,
+            IncorrectScorePrintItemError,
+            IncorrectScorePrintItemTypeError,
+        )
+        for conditional_logic in report.conditional_logic or []:
+            _check_print_items(
+                context,
+                conditional_logic.items_print,
+                SCORE_PRINT_ITEM_TYPES,
+                IncorrectScorePrintItemError,
+                IncorrectScorePrintItemTypeError,
+            )
+
+    for report in sections:
+        _check_print_items(
+            context,
+            report.items_print,
+            SECTION_PRINT_ITEM_TYPES,
+            IncorrectSectionPrintItemError,
+            IncorrectSectionPrintItemTypeError,
+        )
+        if report.conditional_logic and hasattr(report.conditional_logic, "conditions"):
+            for condition in report.conditional_logic.conditions:
+                dependency_conditions = (
+                    condition.item_name in context.item_indexes,
+                    condition.item_name in score_item_ids,
+                    condition.item_name in score_condition_item_ids,
+                )
+                if not any(dependency_conditions):
+                    context.add_error(IncorrectSectionConditionItemError())
+
+
+def check_subscales(context: ActivityValidationContext) -> None:
+    # validate items inside subscale exist
+    # and scores for them are set
+    subscale_setting = context.values.get("subscale_setting")
+    if not subscale_setting:
+        return
+
+    subscales = subscale_setting.subscales
+    subscale_names = {subscale.name for subscale in subscales}
+    for subscale in subscales:
+        for subscale_item in subscale.items:
+            if subscale_item.type == SubscaleItemType.ITEM:
+                index = context.item_indexes.get(subscale_item.name)
+                if index is None:
+                    context.add_error(IncorrectSubscaleItemError())
+                elif context.items[index].response_type not in SCORE_ITEM_TYPES:
+                    context.add_error(SubscaleItemTypeError())
+                elif not context.items[index].config.add_scores:
+                    context.add_error(SubscaleItemScoreError())
+            elif subscale_item.type == SubscaleItemType.SUBSCALE:
+                if subscale_item.name not in subscale_names:
+                    context.add_error(IncorrectSubscaleInsideSubscaleError())
+                elif subscale_item.name == subscale.name:
+                    context.add_error(SubscaleInsideSubscaleError())
+
+
+def check_phrasal_templates(context: ActivityValidationContext) -> None:
+    for item in context.items:
+        if item.response_type != ResponseType.PHRASAL_TEMPLATE:
+            continue
+        for phrase in item.response_values.phrases or []:
+            for field in phrase.fields or []:
+                if field.type != PhrasalTemplateFieldType.ITEM_RESPONSE:
+                    continue
+                index = context.item_indexes.get(field.item_name)
+                if index is None:
+                    context.add_error(IncorrectPhrasalTemplateItemError())
+                    continue
+
+                referenced_item = context.items[index]
+                if referenced_item.response_type not in PHRASAL_TEMPLATE_ITEM_TYPES:
+                    context.add_error(IncorrectPhrasalTemplateItemTypeError())
+                elif referenced_item.response_type == ResponseType.SLIDERROWS and field.item_index is None:
+                    context.add_error(IncorrectPhrasalTemplateItemIndexError())
+
+
+def validate_activity_structure(values: dict):
+    """Runs all the structure validators of an activity over one context
+    and reports all the errors at once.
+    """
+    context = ActivityValidationContext(values)
+    check_item_flow(context)
+    check_score_and_sections(context)
+    check_subscales(context)
+    check_phrasal_templates(context)
+    context.raise_errors()
+    return values
 
-        scores = filter(lambda r: r.type == ReportType.score, scores_and_reports.reports)
-        sections = filter(lambda r: r.type == ReportType.section, scores_and_reports.reports)
 
-        for report in list(scores):
-            score_item_ids.append(report.id)
-            if report.scoring_type == "score":
-                subscale_setting = values.get("subscale_setting")
-                if not subscale_setting:  # report of type score exist then we need a subscale setting
-                    raise SubscaleSettingDoesNotExist()
-                else:
-                    validate_subscale_setting_match_reports(report, subscale_setting)
+def validate_item_flow(values: dict):
+    context = ActivityValidationContext(values)
+    check_item_flow(context)
+    context.raise_errors()
+    return values
 
-            # check if all item names are same as values.name
-            for item in report.items_score:
-                if item not in item_names:
-                    raise IncorrectScoreItemError()
-                else:
-                    score_item_index = item_names.index(item)
-                    if items[score_item_index].response_type not in [
-                        ResponseType.SINGLESELECT,
-                        ResponseType.MULTISELECT,
-                        ResponseType.SLIDER,
-                    ]:
-                        raise IncorrectScoreItemTypeError()
-                    if not items[score_item_index].config.add_scores:
-                        raise IncorrectScoreItemConfigError()
-
-            print_item_types = [
-                ResponseType.SINGLESELECT,
-                ResponseType.MULTISELECT,
-                ResponseType.SLIDER,
-                ResponseType.TEXT,
-                ResponseType.PARAGRAPHTEXT,
-                ResponseType.NUMBERSELECT,
-            ]
-
-            for item in report.items_print:
-                if item not in item_names:
-                    raise IncorrectScorePrintItemError()
-                else:
-                    if items[item_names.index(item)].response_type not in print_item_types:
-                        raise IncorrectScorePrintItemTypeError()
-
-            if report.conditional_logic:
-                for conditional_logic in report.conditional_logic:
-                    score_condition_item_ids.append(conditional_logic.id)
-                    for item in conditional_logic.items_print:
-                        if item not in item_names:
-                            raise IncorrectScorePrintItemError()
-                        else:
-                            if items[item_names.index(item)].response_type not in print_item_types:
-                                raise IncorrectScorePrintItemTypeError()
-
-        for report in list(sections):
-            for item in report.items_print:
-                if item not in item_names:
-                    raise IncorrectSectionPrintItemError()
-                else:
-                    if items[item_names.index(item)].response_type not in [
-                        ResponseType.SINGLESELECT,
-                        ResponseType.MULTISELECT,
-                        ResponseType.SLIDER,
-                        ResponseType.TEXT,
-                        ResponseType.PARAGRAPHTEXT,
-                    ]:
-                        raise IncorrectSectionPrintItemTypeError()
-
-            if report.conditional_logic:
-                if hasattr(report.conditional_logic, "conditions"):
-                    for item in report.conditional_logic.conditions:
-                        dependency_conditions = (
-                            item.item_name in item_names,
-                            item.item_name in score_item_ids,
-                            item.item_name in score_condition_item_ids,
-                        )
-
-                        if not any(dependency_conditions):
-                            raise IncorrectSectionConditionItemError()
 
+def validate_score_and_sections(values: dict):
+    scores_and_reports = values.get("scores_and_reports")
+    if scores_and_reports and not hasattr(scores_and_reports, "reports"):
+        return
+    context = ActivityValidationContext(values)
+    check_score_and_sections(context)
+    context.raise_errors()
     return values
 
 
 def validate_subscales(values: dict):
-    # validate items inside subscale exist
-    # and scores for them are set
-    subscale_setting = values.get("subscale_setting")
-    if subscale_setting:
-        subscales = subscale_setting.subscales
-        items = values.get("items", [])
-        item_names = [item.name for item in items]
-        subscale_names = [subscale.name for subscale in subscales]
-        for subscale in subscales:
-            for subscale_item_name in subscale.items:
-                if subscale_item_name.type in [
-                    SubscaleItemType.ITEM,
-                ]:
-                    if subscale_item_name.name not in item_names:
-                        raise IncorrectSubscaleItemError()
-                    subscale_item_index = item_names.index(subscale_item_name.name)
-
-                    if items[subscale_item_index].response_type not in [
-                        ResponseType.SINGLESELECT,
-                        ResponseType.MULTISELECT,
-                        ResponseType.SLIDER,
-                    ]:
-                        raise SubscaleItemTypeError()
-
-                    if not items[subscale_item_index].config.add_scores:
-                        raise SubscaleItemScoreError()
-                elif subscale_item_name.type in [
-                    SubscaleItemType.SUBSCALE,
-                ]:
-                    if subscale_item_name.name not in subscale_names:
-                        raise IncorrectSubscaleInsideSubscaleError()
-                    else:
-                        if subscale_item_name.name == subscale.name:
-                            raise SubscaleInsideSubscaleError()
-
+    context = ActivityValidationContext(values)
+    check_subscales(context)
+    context.raise_errors()
     return values
 
 
@@ -241,36 +351,7 @@ def validate_performance_task_type(values: dict):
 
 
 def validate_phrasal_templates(values: dict):
-    items = values.get("items", [])
-    for item in items:
-        if item.response_type == ResponseType.PHRASAL_TEMPLATE:
-            phrases = item.response_values.phrases or []
-            for phrase in phrases:
-                fields = phrase.fields or []
-                for field in fields:
-                    if field.type == PhrasalTemplateFieldType.ITEM_RESPONSE:
-                        referenced_item = next((item for item in items if item.name == field.item_name), None)
-                        if referenced_item is None:
-                            raise IncorrectPhrasalTemplateItemError()
-
-                        if referenced_item.response_type not in [
-                            ResponseType.DATE,
-                            ResponseType.MULTISELECT,
-                            ResponseType.MULTISELECTROWS,
-                            ResponseType.NUMBERSELECT,
-                            ResponseType.SINGLESELECT,
-                            ResponseType.SINGLESELECTROWS,
-                            ResponseType.SLIDER,
-                            ResponseType.SLIDERROWS,
-                            ResponseType.TEXT,
-                            ResponseType.TIME,
-                            ResponseType.TIMERANGE,
-                            ResponseType.PARAGRAPHTEXT,
-                            ResponseType.MULTISELECTROWS,
-                        ]:
-                            raise IncorrectPhrasalTemplateItemTypeError()
-
-                        if referenced_item.response_type in [ResponseType.SLIDERROWS] and field.item_index is None:
-                            raise IncorrectPhrasalTemplateItemIndexError()
-
+    context = ActivityValidationContext(values)
+    check_phrasal_templates(context)
+    context.raise_errors()
     return values
@@ -18,15 +18,31 @@ class ActivityHistoryService:
         self.session = session
 
     async def add(self, activities: list[ActivityFull]):
+        """Writes the activities of the new version to the history.
+
+        Item history rows are written only for activities whose items have
+        changed since their last saved version, the versions with unchanged
+        items share the rows of that version.
+        """
+        last_items_versions = await ActivityHistoriesCRUD(self.session).get_last_items_versions(
+            [activity.id for activity in activities]
+        )
         activity_items = []
         schemas = []
 
         for activity in activities:
-            activity_items += activity.items
+            id_version = f"{activity.id}_{self._version}"
+            items_hash = ActivityItemHistoryService.get_items_hash(activity.items)
+            last_items_hash, items_id_version = last_items_versions.get(activity.id, (None, id_version))
+            if items_hash != last_items_hash:
+                items_id_version = id_version
+                activity_items += activity.items
             schemas.append(
                 ActivityHistorySchema(
                     id=activity.id,
-                    id_version=f"{activity.id}_{self._version}",
+                    id_version=id_version,
+                    items_hash=items_hash,
+                    items_id_version=items_id_version,
                     applet_id=self._applet_id_version,
                     name=activity.name,
                     description=activity.description,
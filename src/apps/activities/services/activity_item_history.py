@@ -1,4 +1,7 @@
+import hashlib
+import json
 import uuid
+from typing import Any
 
 from apps.activities.crud import ActivityItemHistoriesCRUD
 from apps.activities.db.schemas import ActivityItemHistorySchema
@@ -11,24 +14,37 @@ class ActivityItemHistoryService:
         self.version = version
         self.session = session
 
+    @staticmethod
+    def _history_values(item: ActivityItemFull) -> dict[str, Any]:
+        return dict(
+            id=item.id,
+            question=item.question,
+            response_type=item.response_type,
+            response_values=item.response_values.dict() if item.response_values else None,
+            config=item.config.dict(),
+            order=item.order,
+            name=item.name,
+            conditional_logic=item.conditional_logic.dict() if item.conditional_logic else None,
+            allow_edit=item.allow_edit,
+            is_hidden=item.is_hidden,
+        )
+
+    @classmethod
+    def get_items_hash(cls, activity_items: list[ActivityItemFull]) -> str:
+        """Structural hash of the items of an activity as they are written to the history."""
+        values = [cls._history_values(item) for item in activity_items]
+        dump = json.dumps(values, sort_keys=True, default=str)
+        return hashlib.sha256(dump.encode()).hexdigest()
+
     async def add(self, activity_items: list[ActivityItemFull]):
         schemas = []
 
         for item in activity_items:
             schemas.append(
                 ActivityItemHistorySchema(
-                    id=item.id,
                     id_version=f"{item.id}_{self.version}",
                     activity_id=f"{item.activity_id}_{self.version}",
-                    question=item.question,
-                    response_type=item.response_type,
-                    response_values=item.response_values.dict() if item.response_values else None,
-                    config=item.config.dict(),
-                    order=item.order,
-                    name=item.name,
-                    conditional_logic=item.conditional_logic.dict() if item.conditional_logic else None,
-                    allow_edit=item.allow_edit,
-                    is_hidden=item.is_hidden,
+                    **self._history_values(item),
                 )
             )
         await ActivityItemHistoriesCRUD(self.session).create_many(schemas)
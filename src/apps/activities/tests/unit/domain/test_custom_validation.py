@@ -1,7 +1,9 @@
+import uuid
 from typing import cast
 
 import pytest
 from pydantic import ValidationError
+from pytest_mock import MockerFixture
 
 from apps.activities.domain.activity_create import ActivityItemCreate
 from apps.activities.domain.conditional_logic import ConditionalLogic
@@ -23,6 +25,8 @@ from apps.activities.domain.conditions import (
     ValuePayload,
 )
 from apps.activities.domain.custom_validation import (
+    ActivityValidationContext,
+    validate_activity_structure,
     validate_item_flow,
     validate_score_and_sections,
     validate_subscales,
@@ -542,3 +546,41 @@ class TestValidateSubscales:
         values = {"items": items, "subscale_setting": subscale_setting}
         with pytest.raises(SubscaleInsideSubscaleError):
             validate_subscales(values)
+
+
+class TestValidateActivityStructure:
+    def test_all_errors_are_reported(
+        self,
+        items: list[ActivityItemCreate],
+        scores_and_reports: ScoresAndReports,
+        score: Score,
+    ):
+        items[0].conditional_logic = ConditionalLogic(
+            conditions=[
+                EqualCondition(
+                    item_name="non-existent name",
+                    type=ConditionType.EQUAL,
+                    payload=ValuePayload(value=1),
+                )
+            ]
+        )
+        score.items_score = ["incorrect_item_name"]
+        score.items_print = ["incorrect_item_name"]
+        scores_and_reports.reports = [score]
+        values = {"items": items, "scores_and_reports": scores_and_reports}
+        with pytest.raises(IncorrectConditionItemError) as exc_info:
+            validate_activity_structure(values)
+        related_errors = [type(error) for error in exc_info.value.related_errors]
+        assert related_errors == [IncorrectScoreItemError, IncorrectScorePrintItemError]
+
+    def test_large_activity_is_validated_in_linear_time(self, mocker: MockerFixture):
+        items = TestDataService(None, uuid.uuid4()).generate_activity_items(count=500, conditions_per_item=20)
+        values = {"items": items}
+        conditions = sum(len(item.conditional_logic.conditions) for item in items if item.conditional_logic)
+        option_values = mocker.spy(ActivityValidationContext, "option_values")
+        options = mocker.spy(ActivityValidationContext, "_collect_option_values")
+
+        assert validate_activity_structure(values) == values
+        # one lookup per condition, options of an item are collected once
+        assert option_values.call_count == conditions
+        assert options.call_count <= len(items)
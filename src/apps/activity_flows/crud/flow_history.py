@@ -21,7 +21,7 @@ class FlowsHistoryCRUD(BaseCRUD[ActivityFlowHistoriesSchema]):
         self,
         flows: list[ActivityFlowHistoriesSchema],
     ):
-        await self._create_many(flows)
+        await self._insert_many(flows)
 
     async def retrieve_by_applet_version(self, id_version: str) -> list[ActivityFlowHistoriesSchema]:
         query: Query = select(ActivityFlowHistoriesSchema)
@@ -17,7 +17,7 @@ class FlowItemHistoriesCRUD(BaseCRUD[ActivityFlowItemHistorySchema]):
         self,
         items: list[ActivityFlowItemHistorySchema],
     ):
-        await self._create_many(items)
+        await self._insert_many(items)
 
     async def retrieve_by_applet_version(self, id_version: str) -> list[ActivityFlowItemHistorySchema]:
         query: Query = select(ActivityFlowItemHistorySchema)
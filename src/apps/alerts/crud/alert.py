@@ -1,6 +1,7 @@
 import uuid
 
 from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Query
 
 from apps.alerts.db.schemas import AlertSchema
@@ -33,8 +34,17 @@ class _AlertOrdering(Ordering):
 class AlertCRUD(BaseCRUD[AlertSchema]):
     schema_class = AlertSchema
 
-    async def create_many(self, schemas: list[AlertSchema]) -> list[AlertSchema]:
-        return await self._create_many(schemas)
+    async def create_many(self, schemas: list[AlertSchema]) -> list[Row]:
+        return await self._insert_many(schemas)
+
+    async def get_by_answer_ids(self, answer_ids: list[uuid.UUID]) -> list[Row]:
+        """Plain rows of the alerts of the answers, as returned by `create_many`."""
+        if not answer_ids:
+            return []
+        query: Query = select(AlertSchema.__table__)
+        query = query.where(AlertSchema.answer_id.in_(answer_ids))
+        result = await self._execute(query)
+        return result.all()
 
     async def get_all_for_user(
         self, user_id: uuid.UUID, page: int, limit: int
@@ -0,0 +1,197 @@
+import asyncio
+import json
+import uuid
+from collections import defaultdict
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.alerts.domain import AlertHandlerResult, AlertMessage
+from apps.applets.crud import AppletHistoriesCRUD, AppletsCRUD
+from apps.subjects.services import SubjectsService
+from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
+from apps.workspaces.crud.workspaces import UserWorkspaceCRUD
+from apps.workspaces.domain.constants import Role
+from config import settings
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.database import session_manager
+from infrastructure.logger import logger
+from infrastructure.utility import RedisCache
+
+__all__ = ["AlertDispatcher", "alert_dispatcher"]
+
+CHANNEL_PREFIX = "channel_"
+
+
+@dataclass(frozen=True)
+class _AlertContext:
+    applet_name: str
+    image: str
+    encryption: dict
+    workspace: str
+    secret_id: str
+
+
+_ContextKey = tuple[uuid.UUID, str, uuid.UUID, uuid.UUID | None]
+
+
+class AlertDispatcher:
+    """Delivers alerts published to `channel_<user_id>` to the websockets
+    connected to this process.
+
+    One pattern subscription is shared by all the websockets. Every socket
+    has a bounded queue: if a client does not read its alerts, the oldest
+    ones are dropped instead of growing the memory of the process.
+    """
+
+    def __init__(self):
+        self._queues: dict[uuid.UUID, set[asyncio.Queue[dict]]] = defaultdict(set)
+        self._contexts: LocalCache[_AlertContext] = LocalCache(
+            maxsize=settings.alerts.context_cache_size, ttl=settings.alerts.context_cache_ttl
+        )
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    @property
+    def connections(self) -> int:
+        return sum(len(queues) for queues in self._queues.values())
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: uuid.UUID) -> AsyncIterator[asyncio.Queue[dict]]:
+        queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=settings.alerts.ws_queue_size)
+        self._queues[user_id].add(queue)
+        self.start()
+        try:
+            yield queue
+        finally:
+            self._queues[user_id].discard(queue)
+            if not self._queues[user_id]:
+                del self._queues[user_id]
+
+    def _put(self, queue: asyncio.Queue[dict], message: dict) -> None:
+        if queue.full():
+            queue.get_nowait()
+            self.dropped += 1
+        queue.put_nowait(message)
+
+    async def dispatch(self, channel: str | bytes, data: str | bytes, session: AsyncSession | None = None) -> int:
+        """Sends the alert to the local websockets of the channel's user.
+        Returns the number of the websockets. The alert details are loaded
+        with a short-lived session if they are not cached.
+        """
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        try:
+            user_id = uuid.UUID(channel.removeprefix(CHANNEL_PREFIX))
+        except ValueError:
+            return 0
+        queues = self._queues.get(user_id)
+        if not queues:
+            return 0
+        try:
+            alert_message = AlertMessage(**json.loads(data))
+        except (ValidationError, TypeError, ValueError):
+            return 0
+        try:
+            if session is not None:
+                context = await self._get_context(alert_message, session)
+            else:
+                async with session_manager.get_session()() as session:
+                    context = await self._get_context(alert_message, session)
+        except Exception as e:
+            logger.exception(f"Alert {alert_message.id} context is not loaded: {e}")
+            return 0
+        if context is None:
+            logger.warning(
+                f"Alert {alert_message.id} is skipped: respondent {alert_message.respondent_id} "
+                f"has no access to applet {alert_message.applet_id}"
+            )
+            return 0
+        result = AlertHandlerResult(
+            id=str(alert_message.id),
+            applet_id=str(alert_message.applet_id),
+            applet_name=context.applet_name,
+            version=alert_message.version,
+            secret_id=context.secret_id,
+            activity_id=str(alert_message.activity_id),
+            activity_item_id=str(alert_message.activity_item_id),
+            message=alert_message.message,
+            created_at=alert_message.created_at.isoformat(),
+            answer_id=str(alert_message.answer_id),
+            encryption=context.encryption,
+            image=context.image,
+            workspace=context.workspace,
+            respondent_id=str(alert_message.respondent_id),
+            subject_id=str(alert_message.subject_id),
+        ).dict()
+        for queue in list(queues):
+            self._put(queue, result)
+        return len(queues)
+
+    async def _get_context(self, alert_message: AlertMessage, session: AsyncSession) -> _AlertContext | None:
+        """Returns None if the respondent has no access to the applet (e.g. it is revoked)."""
+        key: _ContextKey = (
+            alert_message.applet_id,
+            alert_message.version,
+            alert_message.respondent_id,
+            alert_message.subject_id,
+        )
+        try:
+            return self._contexts.get(key)
+        except CacheNotFound:
+            pass
+        respondent_access = await UserAppletAccessCRUD(session).get_applet_role_by_user_id(
+            alert_message.applet_id, alert_message.respondent_id, Role.RESPONDENT
+        )
+        if not respondent_access:
+            return None
+        applet_history = await AppletHistoriesCRUD(session).retrieve_by_applet_version(
+            f"{alert_message.applet_id}_{alert_message.version}"
+        )
+        applet = await AppletsCRUD(session).get_by_id(alert_message.applet_id)
+        workspace = await UserWorkspaceCRUD(session).get_by_user_id(respondent_access.owner_id)
+        subject = (
+            await SubjectsService(session, respondent_access.owner_id).get(alert_message.subject_id)
+            if alert_message.subject_id
+            else None
+        )
+        context = _AlertContext(
+            applet_name=applet_history.display_name,
+            image=applet_history.image,
+            encryption=applet.encryption,
+            workspace=workspace.workspace_name,
+            secret_id=subject.secret_user_id if subject else "Anonymous",
+        )
+        self._contexts.set(key, context)
+        return context
+
+    async def _listen(self) -> None:
+        cache = RedisCache()
+        while True:
+            try:
+                async for message in cache.pmessages(f"{CHANNEL_PREFIX}*"):
+                    if message.get("type") == "pmessage":
+                        await self.dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"Alerts subscription failed: {e}")
+            # the subscription is over or failed, restore it
+            await asyncio.sleep(1)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+alert_dispatcher = AlertDispatcher()
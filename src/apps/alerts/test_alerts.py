@@ -1,13 +1,17 @@
 import http
+import json
 import uuid
 
 import pytest
+from pytest_mock import MockerFixture
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.alerts.crud.alert import AlertCRUD
 from apps.alerts.db.schemas import AlertSchema
+from apps.alerts.dispatcher import AlertDispatcher
 from apps.answers.crud.answers import AnswersCRUD
 from apps.answers.db.schemas import AnswerSchema
+from apps.applets.crud import AppletsCRUD
 from apps.applets.domain.applet_full import AppletFull
 from apps.shared.test import BaseTest
 from apps.subjects.domain import Subject
@@ -96,3 +100,84 @@ class TestAlert(BaseTest):
         assert response.status_code == http.HTTPStatus.OK
         assert payload["count"] == 2
         assert payload["result"][0]["secretId"] == lucy_subject.secret_user_id
+
+    async def test_dispatch_alert_to_local_websockets(
+        self,
+        session: AsyncSession,
+        mocker: MockerFixture,
+        lucy: User,
+        lucy_alert_for_applet_three: list[AlertSchema],
+        lucy_subject: Subject,
+    ):
+        dispatcher = AlertDispatcher()
+        mocker.patch.object(dispatcher, "start")
+        alert = lucy_alert_for_applet_three[0]
+        data = json.dumps(
+            dict(
+                id=str(uuid.uuid4()),
+                respondent_id=str(alert.respondent_id),
+                subject_id=str(alert.subject_id),
+                applet_id=str(alert.applet_id),
+                version=alert.version,
+                message=alert.alert_message,
+                created_at="2024-01-01T00:00:00",
+                activity_id=str(alert.activity_id),
+                activity_item_id=str(alert.activity_item_id),
+                answer_id=str(alert.answer_id),
+            )
+        )
+        # nobody is connected
+        assert await dispatcher.dispatch(f"channel_{lucy.id}", data, session) == 0
+
+        spy = mocker.spy(AppletsCRUD, "get_by_id")
+        async with dispatcher.subscribe(lucy.id) as first, dispatcher.subscribe(lucy.id) as second:
+            assert await dispatcher.dispatch(f"channel_{lucy.id}".encode(), data, session) == 2
+            assert await dispatcher.dispatch(f"channel_{uuid.uuid4()}", data, session) == 0
+            assert await dispatcher.dispatch(f"channel_{lucy.id}", data, session) == 2
+            message = first.get_nowait()
+            assert message == second.get_nowait()
+            assert message["secret_id"] == lucy_subject.secret_user_id
+            assert message["applet_id"] == str(alert.applet_id)
+        # details are loaded once for the same applet version and subject
+        assert spy.await_count == 1
+        assert dispatcher.connections == 0
+
+    async def test_dispatch_skips_alert_of_respondent_without_access(
+        self,
+        session: AsyncSession,
+        mocker: MockerFixture,
+        lucy: User,
+        lucy_alert_for_applet_three: list[AlertSchema],
+    ):
+        dispatcher = AlertDispatcher()
+        mocker.patch.object(dispatcher, "start")
+        alert = lucy_alert_for_applet_three[0]
+        data = json.dumps(
+            dict(
+                id=str(uuid.uuid4()),
+                respondent_id=str(uuid.uuid4()),
+                subject_id=str(alert.subject_id),
+                applet_id=str(alert.applet_id),
+                version=alert.version,
+                message=alert.alert_message,
+                created_at="2024-01-01T00:00:00",
+                activity_id=str(alert.activity_id),
+                activity_item_id=str(alert.activity_item_id),
+                answer_id=str(alert.answer_id),
+            )
+        )
+        async with dispatcher.subscribe(lucy.id) as queue:
+            assert await dispatcher.dispatch(f"channel_{lucy.id}", data, session) == 0
+            assert queue.empty()
+
+    async def test_dispatch_drops_oldest_alerts_for_slow_websocket(
+        self, session: AsyncSession, mocker: MockerFixture, lucy: User
+    ):
+        dispatcher = AlertDispatcher()
+        mocker.patch.object(dispatcher, "start")
+        mocker.patch("config.settings.alerts.ws_queue_size", 2)
+        async with dispatcher.subscribe(lucy.id) as queue:
+            for i in range(3):
+                dispatcher._put(queue, {"id": i})
+            assert [queue.get_nowait(), queue.get_nowait()] == [{"id": 1}, {"id": 2}]
+        assert dispatcher.dropped == 1
@@ -1,10 +1,12 @@
 import asyncio
-import base64
 import datetime
 import uuid
+from contextlib import aclosing
+from typing import AsyncIterator, Iterator, Sequence
 
 from fastapi import Body, Depends, Query
 from fastapi.responses import Response as FastApiResponse
+from fastapi.responses import StreamingResponse
 from pydantic import parse_obj_as
 
 from apps.activities.services import ActivityHistoryService
@@ -33,26 +35,29 @@ from apps.answers.domain import (
     PublicReviewFlow,
     PublicSummaryActivity,
     PublicSummaryActivityFlow,
+    ReportServerResponse,
     ReviewsCount,
 )
 from apps.answers.domain.answers import MultiinformantAssessmentValidationResponse, PublicSubmissionsResponse
 from apps.answers.filters import (
     AnswerExportFilters,
+    AnswerExportStreamFilters,
     AppletMultiinformantAssessmentParams,
     AppletSubmissionsFilter,
     AppletSubmitDateFilter,
+    FlowSubmissionsFilter,
     ReviewAppletItemFilter,
     SummaryActivityFilter,
 )
 from apps.answers.service import AnswerService
+from apps.answers.tasks import process_answer_events
 from apps.applets.crud import AppletsCRUD
 from apps.applets.db.schemas import AppletSchema
 from apps.applets.domain.applet_history import VersionPublic
-from apps.applets.errors import InvalidVersionError, NotValidAppletHistory
-from apps.applets.service import AppletHistoryService, AppletService
+from apps.applets.service import AppletService
 from apps.authentication.deps import get_current_user
 from apps.shared.deps import get_client_ip, get_i18n
-from apps.shared.domain import Response, ResponseMulti
+from apps.shared.domain import PublicModel, Response, ResponseMulti
 from apps.shared.exception import AccessDeniedError, NotFoundError, ValidationError
 from apps.shared.locale import I18N
 from apps.shared.query_params import BaseQueryParams, QueryParams, parse_query_params
@@ -62,6 +67,7 @@ from apps.users.domain import User
 from apps.workspaces.domain.constants import Role
 from apps.workspaces.service.check_access import CheckAccessService
 from apps.workspaces.service.workspace import WorkspaceService
+from config import settings
 from infrastructure.database import atomic, session_manager
 from infrastructure.database.deps import get_session
 from infrastructure.http import get_tz_utc_offset
@@ -76,17 +82,13 @@ async def create_answer(
     answer_session=Depends(get_answer_session),
 ) -> None:
     async with atomic(session):
-        await CheckAccessService(session, user.id).check_answer_create_access(schema.applet_id)
-        try:
-            await AppletHistoryService(session, schema.applet_id, schema.version).get()
-        except NotValidAppletHistory:
-            raise InvalidVersionError()
+        # access and applet version are checked by the service with the rest of the submission
         service = AnswerService(session, user.id, answer_session)
         if tz_offset is not None and schema.answer.tz_offset is None:
             schema.answer.tz_offset = tz_offset // 60  # value in minutes
         async with atomic(answer_session):
-            answer = await service.create_answer(schema)
-        await service.create_report_from_answer(answer)
+            await service.create_answer(schema)
+    await process_answer_events.kiq(schema.applet_id)
 
 
 async def create_anonymous_answer(
@@ -103,8 +105,8 @@ async def create_anonymous_answer(
         if tz_offset is not None and schema.answer.tz_offset is None:
             schema.answer.tz_offset = tz_offset // 60  # value in minutes
         async with atomic(answer_session):
-            answer = await service.create_answer(schema)
-        await service.create_report_from_answer(answer)
+            await service.create_answer(schema)
+    await process_answer_events.kiq(schema.applet_id)
     return
 
 
@@ -214,7 +216,7 @@ async def applet_flow_submissions_list(
     applet_id: uuid.UUID,
     flow_id: uuid.UUID,
     user: User = Depends(get_current_user),
-    query_params: QueryParams = Depends(parse_query_params(AppletSubmissionsFilter)),
+    query_params: QueryParams = Depends(parse_query_params(FlowSubmissionsFilter)),
     session=Depends(get_session),
     answer_session=Depends(get_answer_session),
 ) -> PublicFlowSubmissionsResponse:
@@ -230,7 +232,15 @@ async def applet_flow_submissions_list(
     for submission in submissions.submissions:
         review_count = submission_reviews.get(submission.submit_id, ReviewsCount())
         submission.review_count = review_count
-    return PublicFlowSubmissionsResponse(result=submissions, count=total)
+    return PublicFlowSubmissionsResponse(
+        result=submissions, count=total.count, total_mode=total.mode, has_more=total.has_more
+    )
+
+
+def _iter_report_pdf(report: ReportServerResponse) -> Iterator[bytes]:
+    with report.pdf:
+        while chunk := report.pdf.read(settings.report_server.read_chunk_size):
+            yield chunk
 
 
 async def summary_activity_latest_report_retrieve(
@@ -251,8 +261,8 @@ async def summary_activity_latest_report_retrieve(
         applet_id, activity_id, subject_id
     )
     if report:
-        return FastApiResponse(
-            base64.b64decode(report.pdf.encode()),
+        return StreamingResponse(
+            _iter_report_pdf(report),
             headers={
                 "Content-Disposition": f'attachment; filename="{report.email.attachment}.pdf"'  # noqa
             },
@@ -278,8 +288,8 @@ async def summary_flow_latest_report_retrieve(
         applet_id, flow_id, subject_id
     )
     if report:
-        return FastApiResponse(
-            base64.b64decode(report.pdf.encode()),
+        return StreamingResponse(
+            _iter_report_pdf(report),
             headers={
                 "Content-Disposition": f'attachment; filename="{report.email.attachment}.pdf"'  # noqa
             },
@@ -689,7 +699,6 @@ async def applet_answers_export(
     data: AnswerExport = await AnswerService(session, user.id, answer_session).get_export_data(
         applet_id, query_params, activities_last_version
     )
-    total_answers = data.total_answers
     for answer in data.answers:
         if answer.is_manager:
             answer.respondent_secret_id = f"[admin account] ({answer.respondent_secret_id})"
@@ -700,10 +709,65 @@ async def applet_answers_export(
         data.activities = activities
     return PublicAnswerExportResponse(
         result=PublicAnswerExport.from_orm(data).translate(i18n),
-        count=total_answers,
+        count=data.total.count,
+        total_mode=data.total.mode,
+        has_more=data.total.has_more,
     )
 
 
+def _ndjson_lines(type_: str, items: Sequence[PublicModel]) -> str:
+    return "".join(f'{{"type": "{type_}", "data": {item.json(by_alias=True)}}}\n' for item in items)
+
+
+async def applet_answers_export_stream(
+    applet_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    query_params: QueryParams = Depends(parse_query_params(AnswerExportStreamFilters)),
+    activities_last_version: bool = Query(False, alias="activitiesLastVersion"),
+    session=Depends(get_session),
+    answer_session=Depends(get_answer_session),
+    i18n: I18N = Depends(get_i18n),
+) -> StreamingResponse:
+    """Exports all the applet answers as NDJSON, one answer or activity
+    per line: {"type": "answer" | "activity", "data": {...}}.
+
+    All the matching answers are exported, they are read with keyset
+    pagination in constant memory.
+    """
+    await AppletService(session, user.id).exist_by_id(applet_id)
+    await CheckAccessService(session, user.id).check_answers_export_access(applet_id)
+    last_version_activities = None
+    if activities_last_version:
+        applet = await AppletService(session, user.id).get(applet_id)
+        last_version_activities = await ActivityHistoryService(session, applet.id, applet.version).get_full()
+
+    async def export_lines() -> AsyncIterator[str]:
+        # dependencies are closed before the response body is sent,
+        # sessions are re-opened by the export and released here
+        try:
+            chunks = AnswerService(session, user.id, answer_session).stream_export_data(
+                applet_id, query_params, skip_activities=activities_last_version
+            )
+            # the stream cursor is released when the client disconnects as well
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    for answer in chunk.answers:
+                        if answer.is_manager:
+                            answer.respondent_secret_id = f"[admin account] ({answer.respondent_secret_id})"
+                    translated = PublicAnswerExport.from_orm(chunk).translate(i18n)
+                    yield _ndjson_lines("answer", translated.answers)
+                    yield _ndjson_lines("activity", translated.activities)
+            if last_version_activities is not None:
+                translated = PublicAnswerExport(activities=last_version_activities).translate(i18n)
+                yield _ndjson_lines("activity", translated.activities)
+        finally:
+            await session.close()
+            if answer_session is not None:
+                await answer_session.close()
+
+    return StreamingResponse(export_lines(), media_type="application/x-ndjson")
+
+
 async def applet_completed_entities(
     applet_id: uuid.UUID,
     version: str,
@@ -871,12 +935,16 @@ async def applet_submissions_list(
 ) -> PublicSubmissionsResponse:
     await AppletService(session, user.id).exist_by_id(applet_id)
     await CheckAccessService(session, user.id).check_answer_access(applet_id)
-    submissions, submissions_count = await AnswerService(session, user.id, answer_session).get_applet_submissions(
+    submissions, total = await AnswerService(session, user.id, answer_session).get_applet_submissions(
         applet_id, query_params
     )
 
     participants_count = await WorkspaceService(session, user.id).get_workspace_applet_respondents_total(applet_id)
 
     return PublicSubmissionsResponse(
-        submissions=submissions, submissions_count=submissions_count, participants_count=participants_count
+        submissions=submissions,
+        submissions_count=total.count,
+        participants_count=participants_count,
+        total_mode=total.mode,
+        has_more=total.has_more,
     )
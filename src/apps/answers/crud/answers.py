@@ -1,15 +1,16 @@
-import asyncio
 import datetime
 import uuid
-from typing import Collection
+from typing import AsyncIterator, Collection
 
 from pydantic import parse_obj_as
-from sqlalchemy import Text, and_, case, column, delete, func, null, or_, select, text, update
+from sqlalchemy import Text, and_, case, column, delete, func, null, or_, select, text, tuple_, update
 from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute, Query, aliased, contains_eager
 from sqlalchemy.sql import Values
 from sqlalchemy.sql.elements import BooleanClauseList
 
+from apps.activities.crud.activity_item_history import as_activity_version_item
 from apps.activities.db.schemas import ActivityHistorySchema, ActivityItemHistorySchema
 from apps.activities.domain.activity_full import ActivityItemHistoryFull
 from apps.activity_flows.db.schemas import ActivityFlowHistoriesSchema
@@ -31,7 +32,7 @@ from apps.answers.filters import AppletSubmitDateFilter
 from apps.applets.db.schemas import AppletHistorySchema
 from apps.applets.domain.applet_history import Version
 from apps.shared.filtering import Comparisons, FilterField, Filtering
-from apps.shared.paging import paging
+from apps.shared.paging import PageTotal, TotalMode, paginate
 from infrastructure.database.crud import BaseCRUD
 
 
@@ -150,8 +151,15 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
         return parse_obj_as(list[FlowSubmissionInfo], data)
 
     async def get_flow_submissions(
-        self, applet_id: uuid.UUID, flow_id: uuid.UUID, *, page=None, limit=None, **filters
-    ) -> tuple[list[FlowSubmission], int]:
+        self,
+        applet_id: uuid.UUID,
+        flow_id: uuid.UUID,
+        *,
+        page=None,
+        limit=None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        **filters,
+    ) -> tuple[list[FlowSubmission], PageTotal]:
         created_at = func.max(AnswerItemSchema.created_at)
         query = (
             select(
@@ -214,18 +222,10 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
             query = query.having(and_(*_filters))
 
         query_data = query.order_by(created_at)
-        query_data = paging(query_data, page, limit)
-
         query_count = select(func.count()).select_from(query.with_only_columns(AnswerSchema.submit_id).subquery())
+        data, total = await paginate(self.session, query_data, query_count, page, limit, total_mode)
 
-        coro_data = self._execute(query_data)
-        coro_count = self._execute(query_count)
-        result_data, result_count = await asyncio.gather(coro_data, coro_count)
-
-        data = result_data.all()
-        count = result_count.scalar()
-
-        return parse_obj_as(list[FlowSubmission], data), count
+        return parse_obj_as(list[FlowSubmission], data), total
 
     async def get_respondents_submit_dates(
         self, applet_id: uuid.UUID, filters: AppletSubmitDateFilter
@@ -279,15 +279,7 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
             else_=col,
         )
 
-    async def get_applet_answers(
-        self,
-        applet_id: uuid.UUID,
-        *,
-        include_assessments: bool = True,
-        page=None,
-        limit=None,
-        **filters,
-    ) -> tuple[list[RespondentAnswerData], int]:
+    def _applet_answers_query(self, applet_id: uuid.UUID, include_assessments: bool, **filters) -> Query:
         reviewed_answer_id = case(
             (AnswerItemSchema.is_assessment.is_(True), AnswerSchema.id),
             else_=null(),
@@ -354,33 +346,77 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
         if not include_assessments:
             query = query.where(AnswerItemSchema.is_assessment.isnot(True))
 
+        return query
+
+    async def get_applet_answers(
+        self,
+        applet_id: uuid.UUID,
+        *,
+        include_assessments: bool = True,
+        page=None,
+        limit=None,
+        total_mode: TotalMode = TotalMode.EXACT,
+        **filters,
+    ) -> tuple[list[RespondentAnswerData], PageTotal]:
+        query = self._applet_answers_query(applet_id, include_assessments, **filters)
         query_count = query.with_only_columns(func.count())
 
         query = query.order_by(AnswerItemSchema.created_at.desc())
-        query = paging(query, page, limit)
-        coro_data, coro_count = (
-            self._execute(query),
-            self._execute(query_count),
-        )
-
-        res, res_count = await asyncio.gather(coro_data, coro_count)
-        answers = res.all()
-
-        total = res_count.scalars().one()
+        answers, total = await paginate(self.session, query, query_count, page, limit, total_mode)
 
         return parse_obj_as(list[RespondentAnswerData], answers), total
 
+    async def stream_applet_answers(
+        self,
+        applet_id: uuid.UUID,
+        *,
+        include_assessments: bool = True,
+        page_size: int = 10000,
+        batch_size: int = 500,
+        **filters,
+    ) -> AsyncIterator[list[RespondentAnswerData]]:
+        """Yields batches of the applet answers, newest first.
+
+        Pages are selected by the (created_at, id) keyset instead of OFFSET,
+        rows of a page are fetched with a server side cursor, so neither
+        the database nor the process keep more than a page at once.
+        The cursor stays open while the caller handles a batch, so the rows
+        are read by a session of their own and the caller can use this one.
+        """
+        query = self._applet_answers_query(applet_id, include_assessments, **filters)
+        query = query.add_columns(AnswerItemSchema.id.label("item_id"))
+        query = query.order_by(AnswerItemSchema.created_at.desc(), AnswerItemSchema.id.desc())
+
+        last_key: tuple[datetime.datetime, uuid.UUID] | None = None
+        async with AsyncSession(self.session.bind) as stream_session:
+            while True:
+                page_query = query.limit(page_size)
+                if last_key:
+                    page_query = page_query.where(tuple_(AnswerItemSchema.created_at, AnswerItemSchema.id) < last_key)
+                result = await stream_session.stream(page_query)
+                fetched = 0
+                async for rows in result.partitions(batch_size):
+                    fetched += len(rows)
+                    last_key = rows[-1].created_at, rows[-1].item_id
+                    yield [RespondentAnswerData.from_orm(row) for row in rows]
+                if fetched < page_size:
+                    break
+
     async def get_item_history_by_activity_history(self, activity_hist_ids: list[str]) -> list[ActivityItemHistoryFull]:
         query: Query = (
-            select(ActivityItemHistorySchema)
-            .where(ActivityItemHistorySchema.activity_id.in_(activity_hist_ids))
+            select(ActivityItemHistorySchema, ActivityHistorySchema.id_version)
+            .join(
+                ActivityHistorySchema,
+                ActivityHistorySchema.items_id_version == ActivityItemHistorySchema.activity_id,
+            )
+            .where(ActivityHistorySchema.id_version.in_(activity_hist_ids))
             .order_by(
-                ActivityItemHistorySchema.activity_id,
+                ActivityHistorySchema.id_version,
                 ActivityItemHistorySchema.order,
             )
         )
         res = await self._execute(query)
-        items: list[ActivityItemHistorySchema] = res.scalars().all()
+        items = [as_activity_version_item(item, id_version) for item, id_version in res.all()]
 
         return parse_obj_as(list[ActivityItemHistoryFull], items)
 
@@ -714,8 +750,9 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
         return res[0] if res else None
 
     async def get_applet_user_answer_items(
-        self, applet_id: uuid.UUID, user_id: uuid.UUID, page=None, limit=None
+        self, applet_id: uuid.UUID, user_id: uuid.UUID, after_id: uuid.UUID | None = None, limit: int | None = None
     ) -> list[UserAnswerItemData]:
+        """Answer items of the user ordered by id, keyset paginated: the items after `after_id`"""
         query: Query = (
             select(
                 AnswerItemSchema.id,
@@ -733,7 +770,10 @@ class AnswersCRUD(BaseCRUD[AnswerSchema]):
             )
             .order_by(AnswerItemSchema.id)
         )
-        query = paging(query, page, limit)
+        if after_id:
+            query = query.where(AnswerItemSchema.id > after_id)
+        if limit:
+            query = query.limit(limit)
 
         db_result = await self._execute(query)
 
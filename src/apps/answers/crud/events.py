@@ -0,0 +1,74 @@
+import datetime
+import uuid
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Query
+
+from apps.answers.db.schemas import AnswerEventSchema
+from infrastructure.database.crud import BaseCRUD
+
+__all__ = ["AnswerEventsCRUD"]
+
+
+class AnswerEventsCRUD(BaseCRUD[AnswerEventSchema]):
+    schema_class = AnswerEventSchema
+
+    async def create(self, schema: AnswerEventSchema) -> None:
+        """Adds the event without reloading it, nothing is read back on the submission path"""
+        self.session.add(schema)
+        await self.session.flush()
+
+    async def claim_pending(self, limit: int, lease: int, max_attempts: int) -> list[AnswerEventSchema]:
+        """Oldest events which are not claimed by another consumer, or whose claim has expired.
+
+        The events are claimed for `lease` seconds, the claim outlives the transaction.
+        """
+        now = datetime.datetime.utcnow()
+        query: Query = select(AnswerEventSchema)
+        query = query.where(
+            or_(AnswerEventSchema.locked_until.is_(None), AnswerEventSchema.locked_until < now),
+            AnswerEventSchema.attempts < max_attempts,
+        )
+        query = query.order_by(AnswerEventSchema.created_at.asc())
+        query = query.limit(limit)
+        query = query.with_for_update(skip_locked=True)
+        result = await self._execute(query)
+        events = result.scalars().all()
+        if events:
+            claim: Query = update(AnswerEventSchema)
+            claim = claim.where(AnswerEventSchema.id.in_([event.id for event in events]))
+            claim = claim.values(
+                locked_until=now + datetime.timedelta(seconds=lease),
+                attempts=AnswerEventSchema.attempts + 1,
+            )
+            await self._execute(claim)
+        return events
+
+    async def delete_exhausted(self, max_attempts: int) -> list[tuple[uuid.UUID, uuid.UUID, bool]]:
+        """Deletes the events which failed `max_attempts` times and are not processed now.
+
+        Returns (answer id, applet id, is report processed) of the deleted events.
+        """
+        query: Query = delete(AnswerEventSchema)
+        query = query.where(
+            or_(AnswerEventSchema.locked_until.is_(None), AnswerEventSchema.locked_until < datetime.datetime.utcnow()),
+            AnswerEventSchema.attempts >= max_attempts,
+        )
+        query = query.returning(
+            AnswerEventSchema.answer_id, AnswerEventSchema.applet_id, AnswerEventSchema.is_report_processed
+        )
+        result = await self._execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def mark_report_processed(self, id_: uuid.UUID) -> None:
+        query: Query = update(AnswerEventSchema)
+        query = query.where(AnswerEventSchema.id == id_)
+        query = query.values(is_report_processed=True)
+        await self._execute(query)
+
+    async def delete_by_ids(self, ids: list[uuid.UUID]) -> None:
+        if not ids:
+            return
+        query: Query = delete(AnswerEventSchema)
+        query = query.where(AnswerEventSchema.id.in_(ids))
+        await self._execute(query)
@@ -0,0 +1,161 @@
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import and_, distinct, exists, false, func, literal, null, or_, select, true, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import aliased
+
+from apps.activities.db.schemas import ActivityHistorySchema
+from apps.activity_assignments.db.schemas import ActivityAssigmentSchema
+from apps.activity_flows.db.schemas import ActivityFlowItemHistorySchema
+from apps.applets.db.schemas import AppletHistorySchema, AppletSchema
+from apps.subjects.db.schemas import SubjectRelationSchema, SubjectSchema
+from apps.subjects.domain import SubjectRelation
+from apps.workspaces.db.schemas import UserAppletAccessSchema
+from apps.workspaces.domain.constants import Role
+from infrastructure.database.crud import BaseCRUD
+
+__all__ = ["SubmissionContext", "SubmissionContextCRUD"]
+
+
+@dataclass
+class SubmissionContext:
+    """Everything the answer submission is validated against."""
+
+    applet_history_exists: bool
+    applet_link: uuid.UUID | None
+    # applet id_version of the activity history, None - activity history not found
+    activity_applet_history_id: str | None
+    # activity id_versions of the flow items in order, None - flow history not found
+    flow_activity_ids: list[str] | None
+    roles: list[Role]
+    respondent_subject: SubjectSchema | None
+    subjects: dict[uuid.UUID, SubjectSchema]
+    assignment_exists: bool = False
+    relations: dict[tuple[uuid.UUID, uuid.UUID], SubjectRelation] = field(default_factory=dict)
+
+    def get_relation(self, source_subject_id: uuid.UUID, target_subject_id: uuid.UUID) -> SubjectRelation | None:
+        return self.relations.get((source_subject_id, target_subject_id))
+
+
+class SubmissionContextCRUD(BaseCRUD[SubjectSchema]):
+    schema_class = SubjectSchema
+
+    async def load(
+        self,
+        *,
+        user_id: uuid.UUID,
+        applet_id: uuid.UUID,
+        applet_history_id: str,
+        activity_history_id: str,
+        flow_history_id: str | None,
+        subject_ids: list[uuid.UUID],
+    ) -> SubmissionContext:
+        """Loads the applet version, activity, flow, user roles and subjects
+        of the submission with one statement: a row per subject joined to
+        the single row of the scalar lookups.
+        """
+        flow_activity_ids = (
+            select(
+                func.array_agg(
+                    aggregate_order_by(ActivityFlowItemHistorySchema.activity_id, ActivityFlowItemHistorySchema.order)
+                )
+            )
+            .where(ActivityFlowItemHistorySchema.activity_flow_id == flow_history_id)
+            .scalar_subquery()
+            if flow_history_id
+            else null()
+        )
+        lookups = select(
+            exists().where(AppletHistorySchema.id_version == applet_history_id).label("applet_history_exists"),
+            select(AppletSchema.link).where(AppletSchema.id == applet_id).scalar_subquery().label("applet_link"),
+            select(ActivityHistorySchema.applet_id)
+            .where(ActivityHistorySchema.id_version == activity_history_id)
+            .scalar_subquery()
+            .label("activity_applet_history_id"),
+            flow_activity_ids.label("flow_activity_ids"),
+            select(func.array_agg(distinct(UserAppletAccessSchema.role)))
+            .where(
+                UserAppletAccessSchema.soft_exists(),
+                UserAppletAccessSchema.applet_id == applet_id,
+                UserAppletAccessSchema.user_id == user_id,
+            )
+            .scalar_subquery()
+            .label("roles"),
+        ).subquery()
+        subject = aliased(SubjectSchema)
+        query = select(lookups, subject).outerjoin(
+            subject,
+            or_(
+                and_(subject.user_id == user_id, subject.applet_id == applet_id, subject.soft_exists()),
+                subject.id.in_(subject_ids) if subject_ids else false(),
+            ),
+        )
+        rows = (await self._execute(query)).all()
+        first = rows[0]
+        respondent_subject = None
+        subjects = {}
+        for row in rows:
+            schema = row[-1]
+            if schema is None:
+                continue
+            subjects[schema.id] = schema
+            if schema.user_id == user_id and schema.applet_id == applet_id and schema.soft_exists():
+                respondent_subject = schema
+        return SubmissionContext(
+            applet_history_exists=first.applet_history_exists,
+            applet_link=first.applet_link,
+            activity_applet_history_id=first.activity_applet_history_id,
+            flow_activity_ids=first.flow_activity_ids,
+            roles=[Role(role) for role in first.roles or []],
+            respondent_subject=respondent_subject,
+            subjects=subjects,
+        )
+
+    async def load_relations(
+        self,
+        context: SubmissionContext,
+        *,
+        pairs: set[tuple[uuid.UUID, uuid.UUID]],
+        activity_id: uuid.UUID | None,
+        flow_id: uuid.UUID | None,
+        respondent_subject_id: uuid.UUID,
+        target_subject_id: uuid.UUID,
+    ) -> None:
+        """Loads the subject relations of the pairs and whether the activity
+        or flow is assigned, with one statement.
+        """
+        assignment_exists = exists().where(
+            ActivityAssigmentSchema.activity_id == activity_id,
+            ActivityAssigmentSchema.activity_flow_id == flow_id,
+            ActivityAssigmentSchema.respondent_subject_id == respondent_subject_id,
+            ActivityAssigmentSchema.target_subject_id == target_subject_id,
+            ActivityAssigmentSchema.soft_exists(),
+        )
+        relations = (
+            select(SubjectRelationSchema)
+            .where(
+                tuple_(SubjectRelationSchema.source_subject_id, SubjectRelationSchema.target_subject_id).in_(
+                    list(pairs)
+                )
+            )
+            .subquery()
+        )
+        anchor = select(literal(1).label("one")).subquery()
+        query = (
+            select(assignment_exists.label("assignment_exists"), relations)
+            .select_from(anchor)
+            .outerjoin(relations, true())
+        )
+        rows = (await self._execute(query)).all()
+        context.assignment_exists = rows[0].assignment_exists
+        context.relations = {
+            (row.source_subject_id, row.target_subject_id): SubjectRelation(
+                source_subject_id=row.source_subject_id,
+                target_subject_id=row.target_subject_id,
+                relation=row.relation,
+                meta=row.meta,
+            )
+            for row in rows
+            if row.source_subject_id is not None
+        }
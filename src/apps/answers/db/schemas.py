@@ -4,6 +4,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -95,3 +96,30 @@ class AnswerItemSchema(Base):
     @is_identifier_encrypted.expression  # type: ignore[no-redef]
     def is_identifier_encrypted(cls):
         return cls.migrated_data[text("'is_identifier_encrypted'")].astext.cast(Boolean()).isnot(false())
+
+
+class AnswerEventSchema(Base):
+    """Outbox of submitted answers.
+
+    Written in the submission transaction of the answer, so the events of the
+    answers stored on an arbitrary server are in the arbitrary database.
+    Reportability and alerts of the answer are processed by the
+    `process_answer_events` task, the event is deleted once it is done.
+    """
+
+    __tablename__ = "answer_events"
+    __table_args__ = (Index(None, "created_at", "locked_until"),)
+
+    answer_id = Column(UUID(as_uuid=True), nullable=False, unique=True)
+    submit_id = Column(UUID(as_uuid=True), nullable=False)
+    applet_id = Column(UUID(as_uuid=True), nullable=False)
+    version = Column(Text(), nullable=False)
+    activity_id = Column(UUID(as_uuid=True), nullable=False)
+    respondent_id = Column(UUID(as_uuid=True), nullable=False)
+    subject_id = Column(UUID(as_uuid=True), nullable=False)
+    # json list of the raised alerts, alert messages are encrypted as in the alerts table
+    alerts = Column(StringEncryptedType(Unicode, get_key), nullable=True)
+    # claimed by a consumer until this time
+    locked_until = Column(DateTime(), nullable=True)
+    attempts = Column(Integer(), nullable=False, server_default=text("0"))
+    is_report_processed = Column(Boolean(), nullable=False, server_default=false())
@@ -6,7 +6,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.answers.domain import ArbitraryPreprocessor
 from apps.subjects.services import SubjectsService
+from apps.workspaces.service.arbitrary_cache import ArbitraryServerCache
 from apps.workspaces.service.workspace import WorkspaceService
+from infrastructure.cache import CacheNotFound
 from infrastructure.database.core import session_manager
 from infrastructure.database.deps import get_session
 
@@ -68,12 +70,18 @@ async def get_answer_session_by_owner_id(
 
 
 async def get_answer_session_by_subject(subject_id: uuid.UUID, session: AsyncSession = Depends(get_session)):
-    subject = await SubjectsService(session, uuid.uuid4()).get(subject_id)
-    if not subject:
-        yield None
-    service = WorkspaceService(session, uuid.uuid4())
-    assert subject
-    server_info = await service.get_arbitrary_info_if_use_arbitrary(subject.applet_id)
+    cache = ArbitraryServerCache()
+    try:
+        server_info = await cache.get("subject", subject_id)
+    except CacheNotFound:
+        subject = await SubjectsService(session, uuid.uuid4()).get(subject_id)
+        if not subject:
+            yield None
+            return
+        server_info = await WorkspaceService(session, uuid.uuid4()).get_arbitrary_info_if_use_arbitrary(
+            subject.applet_id
+        )
+        await cache.set("subject", subject_id, server_info)
     if server_info and server_info.use_arbitrary:
         url = server_info.database_uri
         if not url:
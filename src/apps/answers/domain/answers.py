@@ -1,6 +1,7 @@
 import datetime
 import uuid
 from copy import deepcopy
+from tempfile import SpooledTemporaryFile
 from typing import Any, Generic
 
 from pydantic import BaseModel, Field, root_validator, validator
@@ -21,6 +22,7 @@ from apps.shared.domain import InternalModel, PublicModel, Response
 from apps.shared.domain.custom_validations import datetime_from_ms
 from apps.shared.domain.types import _BaseModel
 from apps.shared.locale import I18N
+from apps.shared.paging import PageTotal, TotalMode
 from apps.subjects.domain import SubjectReadResponse
 
 
@@ -359,7 +361,9 @@ class FlowSubmissionsResponse(PublicModel):
 
 
 class PublicFlowSubmissionsResponse(Response[FlowSubmissionsResponse]):
-    count: int = 0
+    count: int | None = 0
+    total_mode: TotalMode = TotalMode.EXACT
+    has_more: bool = False
 
 
 class FlowSubmissionDetails(PublicModel):
@@ -588,7 +592,7 @@ class RespondentAnswerDataPublic(UserAnswerDataBase, PublicModel):
 class AnswerExport(InternalModel):
     answers: list[RespondentAnswerData] = Field(default_factory=list)
     activities: list[ActivityHistoryFull] = Field(default_factory=list)
-    total_answers: int = 0
+    total: PageTotal = Field(default_factory=PageTotal)
 
 
 class PublicAnswerExportTranslated(PublicModel):
@@ -608,7 +612,9 @@ class PublicAnswerExport(PublicModel):
 
 
 class PublicAnswerExportResponse(Response[PublicAnswerExportTranslated]):
-    count: int = 0
+    count: int | None = 0
+    total_mode: TotalMode = TotalMode.EXACT
+    has_more: bool = False
 
 
 class SafeApplet(AppletBaseInfo, InternalModel):
@@ -629,7 +635,8 @@ class ReportServerEmail(InternalModel):
 
 
 class ReportServerResponse(InternalModel):
-    pdf: str
+    # decoded PDF, closed by the consumer
+    pdf: SpooledTemporaryFile
     email: ReportServerEmail
 
 
@@ -690,8 +697,10 @@ class MultiinformantAssessmentValidationResponse(PublicModel):
 
 class PublicSubmissionsResponse(PublicModel):
     submissions: list[AppletSubmission] = Field(default_factory=list)
-    submissions_count: int = 0
+    submissions_count: int | None = 0
     participants_count: int = 0
+    total_mode: TotalMode = TotalMode.EXACT
+    has_more: bool = False
 
 
 class AnswersCopyCheckResult(InternalModel):
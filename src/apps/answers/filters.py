@@ -6,6 +6,7 @@ from pydantic import Field, root_validator, validator
 
 from apps.shared.domain.base import InternalModel
 from apps.shared.domain.custom_validations import array_from_string
+from apps.shared.paging import TotalMode
 from apps.shared.query_params import BaseQueryParams
 
 
@@ -31,6 +32,10 @@ class AppletSubmissionsFilter(BaseQueryParams):
     _parse_array = validator("versions", "identifiers", allow_reuse=True)(array_from_string(True))
 
 
+class FlowSubmissionsFilter(AppletSubmissionsFilter):
+    total: TotalMode = TotalMode.EXACT
+
+
 class AppletSubmitDateFilter(BaseQueryParams):
     respondent_id: uuid.UUID | None
     target_subject_id: uuid.UUID | None
@@ -53,6 +58,16 @@ class AnswerExportFilters(BaseQueryParams):
     from_date: datetime.datetime | None = None
     to_date: datetime.datetime | None = None
     limit: int = 10000
+    total: TotalMode = TotalMode.EXACT
+
+
+class AnswerExportStreamFilters(InternalModel):
+    """Filters of the streamed export, all matching answers are exported."""
+
+    respondent_ids: list[uuid.UUID] | None = Field(Query(None))
+    target_subject_ids: list[uuid.UUID] | None = Field(Query(None))
+    from_date: datetime.datetime | None = None
+    to_date: datetime.datetime | None = None
 
 
 class AnswerIdentifierVersionFilter(BaseQueryParams):
@@ -1,3 +1,4 @@
+from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
 from starlette import status
 
@@ -16,6 +17,7 @@ from apps.answers.api import (
     applet_answer_assessment_delete,
     applet_answer_reviews_retrieve,
     applet_answers_export,
+    applet_answers_export_stream,
     applet_completed_entities,
     applet_flow_answer_retrieve,
     applet_flow_assessment_create,
@@ -399,6 +401,17 @@ router.get(
     },
 )(applet_answers_export)
 
+router.get(
+    "/applet/{applet_id}/data/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"application/x-ndjson": {}}},
+        **DEFAULT_OPENAPI_RESPONSE,
+        **AUTHENTICATION_ERROR_RESPONSES,
+    },
+)(applet_answers_export_stream)
+
 router.get(
     "/applet/{applet_id}/completions",
     status_code=status.HTTP_200_OK,
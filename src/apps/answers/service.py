@@ -4,35 +4,37 @@ import datetime
 import itertools
 import json
 import os
-import time
 import uuid
 from collections import defaultdict
+from contextlib import aclosing
+from concurrent.futures import Executor
 from json import JSONDecodeError
-from typing import Callable, List
+from typing import AsyncIterator, Callable, Collection, List, Mapping
 
-import aiohttp
 import pydantic
 import sentry_sdk
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.serialization import load_pem_public_key
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.activities.crud import ActivitiesCRUD, ActivityHistoriesCRUD, ActivityItemHistoriesCRUD
 from apps.activities.db.schemas import ActivityItemHistorySchema
 from apps.activities.domain.activity_history import ActivityHistoryFull
 from apps.activities.errors import ActivityDoeNotExist, ActivityHistoryDoeNotExist, FlowDoesNotExist
-from apps.activity_assignments.domain.assignments import ActivityAssignmentCreate
-from apps.activity_assignments.service import ActivityAssignmentService
 from apps.activity_flows.crud import FlowsCRUD, FlowsHistoryCRUD
+from apps.activity_flows.db.schemas import ActivityFlowHistoriesSchema
 from apps.alerts.crud.alert import AlertCRUD
 from apps.alerts.db.schemas import AlertSchema
 from apps.alerts.domain import AlertMessage
 from apps.answers.crud import AnswerItemsCRUD
 from apps.answers.crud.answers import AnswersCRUD
+from apps.answers.crud.events import AnswerEventsCRUD
 from apps.answers.crud.notes import AnswerNotesCRUD
-from apps.answers.db.schemas import AnswerItemSchema, AnswerNoteSchema, AnswerSchema
+from apps.answers.crud.submission import SubmissionContext, SubmissionContextCRUD
+from apps.answers.db.schemas import AnswerEventSchema, AnswerItemSchema, AnswerNoteSchema, AnswerSchema
 from apps.answers.domain import (
     ActivityAnswer,
     ActivitySubmission,
@@ -60,6 +62,7 @@ from apps.answers.domain import (
     SubmissionDate,
     SummaryActivity,
     SummaryActivityFlow,
+    UserAnswerItemData,
 )
 from apps.answers.domain.answers import (
     Answer,
@@ -80,7 +83,6 @@ from apps.answers.errors import (
     NonPublicAppletError,
     ReportServerError,
     ReportServerIsNotConfigured,
-    UserDoesNotHavePermissionError,
     WrongAnswerGroupAppletId,
     WrongAnswerGroupVersion,
     WrongRespondentForAnswerGroup,
@@ -90,12 +92,15 @@ from apps.answers.tasks import create_report
 from apps.applets.crud import AppletsCRUD
 from apps.applets.domain.applet_history import Version
 from apps.applets.domain.base import Encryption
+from apps.applets.errors import InvalidVersionError, NotValidAppletHistory
 from apps.applets.service import AppletHistoryService
+from apps.applets.service.applet_version_cache import AppletVersionCache
 from apps.file.enums import FileScopeEnum
 from apps.mailing.domain import MessageSchema
 from apps.mailing.services import MailingService
 from apps.shared.encryption import decrypt_cbc, encrypt_cbc
 from apps.shared.exception import EncryptionError, ValidationError
+from apps.shared.paging import PageTotal
 from apps.shared.query_params import QueryParams
 from apps.shared.subjects import is_take_now_relation, is_valid_take_now_relation
 from apps.subjects.constants import Relation
@@ -106,12 +111,18 @@ from apps.users import User, UserSchema, UsersCRUD
 from apps.workspaces.crud.applet_access import AppletAccessCRUD
 from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
 from apps.workspaces.domain.constants import Role
+from apps.workspaces.domain.user_applet_access import RespondentExportData, SubjectExportData
 from apps.workspaces.domain.workspace import WorkspaceRespondent
+from apps.workspaces.errors import AnswerCreateAccessDenied
+from apps.workspaces.service.check_access import CheckAccessService
 from apps.workspaces.service.user_applet_access import UserAppletAccessService
+from config import settings
+from infrastructure.cache import CacheNotFound, LocalCache
 from infrastructure.database import atomic
 from infrastructure.database.mixins import HistoryAware
 from infrastructure.logger import logger
 from infrastructure.utility import CDNClient, RedisCache
+from infrastructure.utility.report_client import report_client
 
 
 class AnswerService:
@@ -138,22 +149,47 @@ class AnswerService:
             return await self._create_anonymous_answer(activity_answer)
 
     async def _create_respondent_answer(self, activity_answer: AppletAnswerCreate) -> AnswerSchema:
-        await self._validate_respondent_answer(activity_answer)
-        return await self._create_answer(activity_answer)
+        context = await self._load_submission_context(activity_answer)
+        if Role.RESPONDENT not in context.roles:
+            raise AnswerCreateAccessDenied()
+        if not context.applet_history_exists:
+            raise InvalidVersionError()
+        await self._validate_answer(activity_answer, context)
+        return await self._create_answer(activity_answer, context)
 
     async def _create_anonymous_answer(self, activity_answer: AppletAnswerCreate) -> AnswerSchema:
-        await self._validate_anonymous_answer(activity_answer)
-        return await self._create_answer(activity_answer)
-
-    async def _validate_respondent_answer(self, activity_answer: AppletAnswerCreate) -> None:
-        await self._validate_answer(activity_answer)
-        await self._validate_applet_for_user_response(activity_answer.applet_id)
+        context = await self._load_submission_context(activity_answer)
+        if not context.applet_history_exists:
+            raise NotValidAppletHistory()
+        if not context.applet_link:
+            raise NonPublicAppletError()
+        await self._validate_answer(activity_answer, context)
+        return await self._create_answer(activity_answer, context)
 
-    async def _validate_anonymous_answer(self, activity_answer: AppletAnswerCreate) -> None:
-        await self._validate_applet_for_anonymous_response(activity_answer.applet_id, activity_answer.version)
-        await self._validate_answer(activity_answer)
+    async def _load_submission_context(self, applet_answer: AppletAnswerCreate) -> SubmissionContext:
+        assert self.user_id
+        pk = self._generate_history_id(applet_answer.version)
+        subject_ids = [
+            subject_id
+            for subject_id in (
+                applet_answer.input_subject_id,
+                applet_answer.target_subject_id,
+                applet_answer.source_subject_id,
+            )
+            if subject_id
+        ]
+        return await SubmissionContextCRUD(self.session).load(
+            user_id=self.user_id,
+            applet_id=applet_answer.applet_id,
+            applet_history_id=pk(applet_answer.applet_id),
+            activity_history_id=pk(applet_answer.activity_id),
+            flow_history_id=pk(applet_answer.flow_id) if applet_answer.flow_id else None,
+            subject_ids=subject_ids,
+        )
 
-    async def _validate_answer(self, applet_answer: AppletAnswerCreate) -> None:  # noqa: C901
+    async def _validate_answer(  # noqa: C901
+        self, applet_answer: AppletAnswerCreate, context: SubmissionContext
+    ) -> None:
         pk = self._generate_history_id(applet_answer.version)
         existed_answers = await AnswersCRUD(self.answer_session).get_by_submit_id(applet_answer.submit_id)
 
@@ -163,18 +199,14 @@ class AnswerService:
         activity_indexes = set()  # same activity is allowed multiple times in flow
         latest_activity_index = None
         if flow_history_id:
-            flow_histories = await FlowsHistoryCRUD(self.session).load_full(
-                [pk(applet_answer.flow_id)], load_activities=False
-            )
-            if not flow_histories:
+            if not context.flow_activity_ids:
                 raise ValidationError("Flow not found")
-            flow_history = next(iter(flow_histories))
 
             # check activity in the flow
-            for i, item in enumerate(flow_history.items):
-                if item.activity_id == activity_history_id:
+            for i, activity_id in enumerate(context.flow_activity_ids):
+                if activity_id == activity_history_id:
                     activity_indexes.add(i)
-            latest_activity_index = len(flow_history.items) - 1
+            latest_activity_index = len(context.flow_activity_ids) - 1
             if not activity_indexes:
                 raise ValidationError("Activity not found in the flow")
 
@@ -213,55 +245,32 @@ class AnswerService:
             # check first flow answer
             raise ValidationError("Wrong activity order in the flow")
 
-        activity_history = await ActivityHistoriesCRUD(self.session).get_by_id(activity_history_id)
-
-        if not activity_history.applet_id.startswith(f"{applet_answer.applet_id}"):
+        if context.activity_applet_history_id is None or not context.activity_applet_history_id.startswith(
+            f"{applet_answer.applet_id}"
+        ):
             raise ActivityHistoryDoeNotExist()
 
-    async def _validate_applet_for_anonymous_response(self, applet_id: uuid.UUID, version: str) -> None:
-        await AppletHistoryService(self.session, applet_id, version).get()
-        # Validate applet for anonymous answer
-        schema = await AppletsCRUD(self.session).get_by_id(applet_id)
-        if not schema.link:
-            raise NonPublicAppletError()
-
-    async def _validate_applet_for_user_response(self, applet_id: uuid.UUID) -> None:
-        assert self.user_id
-
-        roles = await UserAppletAccessService(self.session, self.user_id, applet_id).get_roles()
-        if not roles:
-            raise UserDoesNotHavePermissionError()
-
-    async def _validate_temp_take_now_relation_between_subjects(
-        self, respondent_subject_id: uuid.UUID, source_subject_id: uuid.UUID, target_subject_id: uuid.UUID
+    @staticmethod
+    def _validate_temp_take_now_relation_between_subjects(
+        context: SubmissionContext,
+        respondent_subject_id: uuid.UUID,
+        source_subject_id: uuid.UUID,
+        target_subject_id: uuid.UUID,
     ) -> None:
-        relation_respondent_source = await SubjectsCrud(self.session).get_relation(
-            respondent_subject_id, source_subject_id
-        )
-
-        if is_take_now_relation(relation_respondent_source) and not is_valid_take_now_relation(
-            relation_respondent_source
-        ):
-            raise ValidationError("Invalid temp take now relation between subjects")
-
-        relation_respondent_target = await SubjectsCrud(self.session).get_relation(
-            respondent_subject_id, target_subject_id
-        )
-
-        if is_take_now_relation(relation_respondent_target) and not is_valid_take_now_relation(
-            relation_respondent_target
-        ):
-            raise ValidationError("Invalid temp take now relation between subjects")
+        for subject_id in (source_subject_id, target_subject_id):
+            relation = context.get_relation(respondent_subject_id, subject_id)
+            if is_take_now_relation(relation) and not is_valid_take_now_relation(relation):
+                raise ValidationError("Invalid temp take now relation between subjects")
 
     async def _delete_temp_take_now_relation_if_exists(
-        self, respondent_subject: SubjectSchema, target_subject: SubjectSchema, source_subject: SubjectSchema
+        self,
+        context: SubmissionContext,
+        respondent_subject: SubjectSchema,
+        target_subject: SubjectSchema,
+        source_subject: SubjectSchema,
     ):
-        relation_respondent_target = await SubjectsCrud(self.session).get_relation(
-            source_subject_id=respondent_subject.id, target_subject_id=target_subject.id
-        )
-        relation_respondent_source = await SubjectsCrud(self.session).get_relation(
-            source_subject_id=respondent_subject.id, target_subject_id=source_subject.id
-        )
+        relation_respondent_target = context.get_relation(respondent_subject.id, target_subject.id)
+        relation_respondent_source = context.get_relation(respondent_subject.id, source_subject.id)
 
         if relation_respondent_target and (
             is_take_now_relation(relation_respondent_target) and is_valid_take_now_relation(relation_respondent_target)
@@ -273,8 +282,9 @@ class AnswerService:
         ):
             await SubjectsCrud(self.session).delete_relation(source_subject.id, respondent_subject.id)
 
-    async def _get_answer_relation(
-        self,
+    @staticmethod
+    def _get_answer_relation(
+        context: SubmissionContext,
         respondent_subject: SubjectSchema,
         source_subject: SubjectSchema,
         target_subject: SubjectSchema,
@@ -282,17 +292,13 @@ class AnswerService:
         if respondent_subject.id == target_subject.id:
             return None
 
-        is_admin = await AppletAccessCRUD(self.session).has_any_roles_for_applet(
-            respondent_subject.applet_id,
-            respondent_subject.user_id,
-            Role.managers(),
-        )
         if source_subject.id == target_subject.id:
             return Relation.self
 
-        relation = await SubjectsCrud(self.session).get_relation(source_subject.id, target_subject.id)
+        relation = context.get_relation(source_subject.id, target_subject.id)
         if not relation:
-            if is_admin:
+            # the respondent subject belongs to the submitting user
+            if any(role in Role.managers() for role in context.roles):
                 return Relation.admin
 
             return Relation.other
@@ -302,66 +308,51 @@ class AnswerService:
 
         return relation.relation
 
-    async def _create_answer(self, applet_answer: AppletAnswerCreate) -> AnswerSchema:
+    @staticmethod
+    def _get_submission_subject(
+        context: SubmissionContext, applet_answer: AppletAnswerCreate, subject_id: uuid.UUID | None
+    ) -> SubjectSchema | None:
+        if not subject_id:
+            return context.respondent_subject
+        subject = context.subjects.get(subject_id)
+        if not subject or not subject.soft_exists() or subject.applet_id != applet_answer.applet_id:
+            raise ValidationError(f"Subject {subject_id} not found")
+        return subject
+
+    async def _create_answer(self, applet_answer: AppletAnswerCreate, context: SubmissionContext) -> AnswerSchema:
         assert self.user_id
         pk = self._generate_history_id(applet_answer.version)
         created_at = applet_answer.created_at or datetime.datetime.utcnow()
-        subject_crud = SubjectsCrud(self.session)
 
-        respondent_subject = await subject_crud.get_user_subject(
-            user_id=self.user_id, applet_id=applet_answer.applet_id
-        )
-        if not respondent_subject or not respondent_subject.soft_exists():
+        respondent_subject = context.respondent_subject
+        if not respondent_subject:
             raise ValidationError("Respondent subject not found")
 
-        if applet_answer.input_subject_id:
-            input_subject = await subject_crud.get_by_id(applet_answer.input_subject_id)
-            if (
-                not input_subject
-                or not input_subject.soft_exists()
-                or input_subject.applet_id != applet_answer.applet_id
-            ):
-                raise ValidationError(f"Subject {applet_answer.input_subject_id} not found")
-        else:
-            input_subject = respondent_subject
-
-        if applet_answer.target_subject_id:
-            target_subject = await subject_crud.get_by_id(applet_answer.target_subject_id)
-            if (
-                not target_subject
-                or not target_subject.soft_exists()
-                or target_subject.applet_id != applet_answer.applet_id
-            ):
-                raise ValidationError(f"Subject {applet_answer.target_subject_id} not found")
-        else:
-            target_subject = respondent_subject
-
-        if applet_answer.source_subject_id:
-            source_subject = await subject_crud.get_by_id(applet_answer.source_subject_id)
-            if (
-                not source_subject
-                or not source_subject.soft_exists()
-                or source_subject.applet_id != applet_answer.applet_id
-            ):
-                raise ValidationError(f"Subject {applet_answer.source_subject_id} not found")
-        else:
-            source_subject = respondent_subject
-
-        # Check if source subject is manually assigned to target subject.
-        assignment = ActivityAssignmentCreate(
+        input_subject = self._get_submission_subject(context, applet_answer, applet_answer.input_subject_id)
+        target_subject = self._get_submission_subject(context, applet_answer, applet_answer.target_subject_id)
+        source_subject = self._get_submission_subject(context, applet_answer, applet_answer.source_subject_id)
+        assert input_subject and target_subject and source_subject
+
+        # Check if source subject is manually assigned to target subject and load the relations between subjects.
+        await SubmissionContextCRUD(self.session).load_relations(
+            context,
+            pairs={
+                (respondent_subject.id, source_subject.id),
+                (respondent_subject.id, target_subject.id),
+                (source_subject.id, target_subject.id),
+            },
             activity_id=applet_answer.activity_id if applet_answer.flow_id is None else None,
-            activity_flow_id=applet_answer.flow_id,
+            flow_id=applet_answer.flow_id,
             respondent_subject_id=source_subject.id,
             target_subject_id=target_subject.id,
         )
-        assignment_exists = await ActivityAssignmentService(self.session).exist(assignment)
         # If no assignment exists, ensure valid temp take now relation between the subjects.
-        if not assignment_exists:
-            await self._validate_temp_take_now_relation_between_subjects(
-                respondent_subject.id, source_subject.id, target_subject.id
+        if not context.assignment_exists:
+            self._validate_temp_take_now_relation_between_subjects(
+                context, respondent_subject.id, source_subject.id, target_subject.id
             )
 
-        relation = await self._get_answer_relation(respondent_subject, source_subject, target_subject)
+        relation = self._get_answer_relation(context, respondent_subject, source_subject, target_subject)
         answer = await AnswersCRUD(self.answer_session).create(
             AnswerSchema(
                 submit_id=applet_answer.submit_id,
@@ -401,16 +392,23 @@ class AnswerService:
         )
 
         await AnswerItemsCRUD(self.answer_session).create(item_answer)
-        await self._create_alerts(
-            target_subject.id,
-            answer.id,
-            answer.applet_id,
-            applet_answer.activity_id,
-            answer.version,
-            applet_answer.alerts,
+        # reportability and alerts are processed after the commit, see `process_answer_events`
+        await AnswerEventsCRUD(self.answer_session).create(
+            AnswerEventSchema(
+                answer_id=answer.id,
+                submit_id=answer.submit_id,
+                applet_id=answer.applet_id,
+                version=answer.version,
+                activity_id=applet_answer.activity_id,
+                respondent_id=self.user_id,
+                subject_id=target_subject.id,
+                alerts=json.dumps([alert.dict() for alert in applet_answer.alerts], default=str)
+                if applet_answer.alerts
+                else None,
+            )
         )
 
-        await self._delete_temp_take_now_relation_if_exists(respondent_subject, target_subject, source_subject)
+        await self._delete_temp_take_now_relation_if_exists(context, respondent_subject, target_subject, source_subject)
 
         return answer
 
@@ -1070,26 +1068,23 @@ class AnswerService:
         if not schema.is_reviewable:
             raise ActivityIsNotAssessment()
 
-    async def _get_exported_data(
-        self, applet_id: uuid.UUID, query_params: QueryParams
-    ) -> tuple[list[RespondentAnswerData], int]:
+    async def _get_export_filters(self, applet_id: uuid.UUID, query_params: QueryParams) -> tuple[dict, bool]:
+        """Returns answer filters narrowed to the data the user has access to
+        and whether assessments are exported as well."""
         assert self.user_id is not None
 
-        access = await UserAppletAccessCRUD(self.session).get_by_roles(
-            self.user_id,
-            applet_id,
-            [Role.OWNER, Role.MANAGER, Role.REVIEWER],
-        )
+        permissions = await CheckAccessService(self.session, self.user_id).get_applet_permissions(applet_id)
+        role = permissions.priority_role([Role.OWNER, Role.MANAGER, Role.REVIEWER])
         user_subject = await SubjectsCrud(self.session).get_user_subject(self.user_id, applet_id)
         assessments_allowed = False
         allowed_respondents = None
         allowed_subjects = None
-        if not access:
+        if not role:
             allowed_respondents = [self.user_id]
             allowed_subjects = [user_subject.id] if user_subject else []
-        elif access.role == Role.REVIEWER:
-            if isinstance(access.reviewer_subjects, list) and len(access.reviewer_subjects) > 0:
-                allowed_subjects = access.reviewer_subjects  # noqa: E501
+        elif role == Role.REVIEWER:
+            if len(permissions.reviewer_subjects) > 0:
+                allowed_subjects = permissions.reviewer_subjects
             else:
                 allowed_respondents = [self.user_id]
                 allowed_subjects = [user_subject.id] if user_subject else []
@@ -1108,11 +1103,18 @@ class AnswerService:
             else:
                 filters["target_subject_ids"] = allowed_subjects
 
+        return filters, assessments_allowed
+
+    async def _get_exported_data(
+        self, applet_id: uuid.UUID, query_params: QueryParams
+    ) -> tuple[list[RespondentAnswerData], PageTotal]:
+        filters, assessments_allowed = await self._get_export_filters(applet_id, query_params)
         repository = AnswersCRUD(self.answer_session)
         answers, total = await repository.get_applet_answers(
             applet_id,
             page=query_params.page,
             limit=query_params.limit,
+            total_mode=query_params.total_mode,
             include_assessments=assessments_allowed,
             **filters,
         )
@@ -1121,7 +1123,7 @@ class AnswerService:
 
     async def get_applet_submissions(
         self, applet_id: uuid.UUID, query_params: QueryParams
-    ) -> tuple[list[AppletSubmission], int]:
+    ) -> tuple[list[AppletSubmission], PageTotal]:
         answers, total = await self._get_exported_data(applet_id, query_params)
 
         if not answers:
@@ -1205,7 +1207,7 @@ class AnswerService:
     ) -> AnswerExport:
         answers, total = await self._get_exported_data(applet_id, query_params)
         if not answers:
-            return AnswerExport()
+            return AnswerExport(total=total)
 
         respondent_ids: set[uuid.UUID] = set()
         subject_ids: set[uuid.UUID] = set()
@@ -1245,6 +1247,25 @@ class AnswerService:
         flows, user_map, subject_map = coros_result
         flow_map = {flow.id_version: flow for flow in flows}  # type: ignore
 
+        self._fill_export_data(answers, user_map, subject_map, flow_map)  # type: ignore[arg-type]
+
+        activities_result = []
+        if not skip_activities:
+            activities_result = await self._get_export_activities(applet_id, activity_hist_ids)
+
+        return AnswerExport(
+            answers=answers,
+            activities=activities_result,
+            total=total,
+        )
+
+    @staticmethod
+    def _fill_export_data(
+        answers: list[RespondentAnswerData],
+        user_map: Mapping[uuid.UUID, RespondentExportData],
+        subject_map: Mapping[uuid.UUID, SubjectExportData],
+        flow_map: Mapping[str, ActivityFlowHistoriesSchema],
+    ) -> None:
         for answer in answers:
             # respondent data
             if answer.reviewed_answer_id:
@@ -1268,26 +1289,105 @@ class AnswerService:
                 if flow := flow_map.get(flow_id):
                     answer.flow_name = flow.name
 
-        repo_local = AnswersCRUD(self.session)
-        activities_result = []
-        if not skip_activities:
-            activities, items = await asyncio.gather(
-                ActivityHistoriesCRUD(self.session).get_by_history_ids(list(activity_hist_ids)),
-                repo_local.get_item_history_by_activity_history(list(activity_hist_ids)),
-            )
+    async def _get_export_activities(
+        self, applet_id: uuid.UUID, activity_hist_ids: Collection[str]
+    ) -> list[ActivityHistoryFull]:
+        """Answered activity versions with the items, cached by AppletVersionCache."""
+        cache = AppletVersionCache("export_activity", ActivityHistoryFull)
+        activity_map: dict[str, ActivityHistoryFull] = {}
+        missed = []
+        for id_version in activity_hist_ids:
+            try:
+                activity_map[id_version] = await cache.get(applet_id, id_version)
+            except CacheNotFound:
+                missed.append(id_version)
+        if not missed:
+            return list(activity_map.values())
+
+        activities, items = await asyncio.gather(
+            ActivityHistoriesCRUD(self.session).get_by_history_ids(missed),
+            AnswersCRUD(self.session).get_item_history_by_activity_history(missed),
+        )
 
-            activity_map = {activity.id_version: ActivityHistoryFull.from_orm(activity) for activity in activities}
-            for item in items:
-                activity = activity_map.get(item.activity_id)
-                if activity:
-                    activity.items.append(item)
-            activities_result = list(activity_map.values())
+        fetched = {activity.id_version: ActivityHistoryFull.from_orm(activity) for activity in activities}
+        for item in items:
+            activity = fetched.get(item.activity_id)
+            if activity:
+                activity.items.append(item)
+        for id_version, activity in fetched.items():
+            await cache.set(applet_id, id_version, activity)
+        activity_map.update(fetched)
+        return list(activity_map.values())
 
-        return AnswerExport(
-            answers=answers,
-            activities=activities_result,
-            total_answers=total,
+    async def stream_export_data(
+        self,
+        applet_id: uuid.UUID,
+        query_params: QueryParams,
+        skip_activities: bool = False,
+    ) -> AsyncIterator[AnswerExport]:
+        """Streaming version of `get_export_data`.
+
+        Yields chunks with batches of answers with resolved respondent, subject
+        and flow data and then, unless skipped, a chunk of answered activities.
+        Resolved respondents, subjects and flows are kept in bounded caches,
+        so the memory does not grow with the number of exported answers.
+        """
+        filters, assessments_allowed = await self._get_export_filters(applet_id, query_params)
+        maxsize = settings.cache.export_local_maxsize
+        user_cache: LocalCache[RespondentExportData] = LocalCache(maxsize=maxsize)
+        subject_cache: LocalCache[SubjectExportData] = LocalCache(maxsize=maxsize)
+        flow_cache: LocalCache[ActivityFlowHistoriesSchema | None] = LocalCache(maxsize=maxsize)
+        activity_hist_ids: set[str] = set()
+
+        batches = AnswersCRUD(self.answer_session).stream_applet_answers(
+            applet_id, include_assessments=assessments_allowed, **filters
         )
+        async with aclosing(batches):
+            async for answers in batches:
+                respondent_ids: set[uuid.UUID] = set()
+                subject_ids: set[uuid.UUID] = set()
+                flow_hist_ids: set[str] = set()
+                for answer in answers:
+                    if answer.reviewed_answer_id:
+                        respondent_ids.add(answer.respondent_id)  # type: ignore[arg-type]
+                    subject_ids.update(
+                        filter(None, (answer.target_subject_id, answer.source_subject_id))  # type: ignore[arg-type]
+                    )
+                    if answer.flow_history_id:
+                        flow_hist_ids.add(answer.flow_history_id)
+                    if answer.activity_history_id:
+                        activity_hist_ids.add(answer.activity_history_id)
+
+                user_map = user_cache.get_many(respondent_ids)
+                if missed_respondents := respondent_ids - user_map.keys():
+                    fetched_users = await AppletAccessCRUD(self.session).get_respondent_export_data(
+                        applet_id, list(missed_respondents)
+                    )
+                    user_cache.set_many(fetched_users)
+                    user_map.update(fetched_users)
+
+                subject_map = subject_cache.get_many(subject_ids)
+                if missed_subjects := subject_ids - subject_map.keys():
+                    fetched_subjects = await AppletAccessCRUD(self.session).get_subject_export_data(
+                        applet_id, list(missed_subjects)
+                    )
+                    subject_cache.set_many(fetched_subjects)
+                    subject_map.update(fetched_subjects)
+
+                flow_map = flow_cache.get_many(flow_hist_ids)
+                if missed_flows := flow_hist_ids - flow_map.keys():
+                    flows = await FlowsHistoryCRUD(self.session).get_by_id_versions(list(missed_flows))
+                    fetched_flows = {flow_id: None for flow_id in missed_flows} | {
+                        flow.id_version: flow for flow in flows
+                    }
+                    flow_cache.set_many(fetched_flows)
+                    flow_map.update(fetched_flows)
+
+                self._fill_export_data(answers, user_map, subject_map, flow_map)  # type: ignore[arg-type]
+                yield AnswerExport(answers=answers)
+
+        if not skip_activities and activity_hist_ids:
+            yield AnswerExport(activities=await self._get_export_activities(applet_id, activity_hist_ids))
 
     async def get_activity_identifiers(
         self, activity_id: uuid.UUID, filters: IdentifiersQueryParams
@@ -1373,9 +1473,15 @@ class AnswerService:
         applet_id: uuid.UUID,
         flow_id: uuid.UUID,
         filters: QueryParams,
-    ) -> tuple[FlowSubmissionsDetails, int]:
+    ) -> tuple[FlowSubmissionsDetails, PageTotal]:
         submissions, total = await AnswersCRUD(self.answer_session).get_flow_submissions(
-            applet_id, flow_id, page=filters.page, limit=filters.limit, is_completed=True, **filters.filters
+            applet_id,
+            flow_id,
+            page=filters.page,
+            limit=filters.limit,
+            total_mode=filters.total_mode,
+            is_completed=True,
+            **filters.filters,
         )
         flow_history_ids = {s.flow_history_id for s in submissions}
         flows = []
@@ -1569,61 +1675,77 @@ class AnswerService:
             )
         return results
 
-    async def _create_alerts(
-        self,
-        subject_id: uuid.UUID,
-        answer_id: uuid.UUID,
-        applet_id: uuid.UUID,
-        activity_id: uuid.UUID,
-        version: str,
-        raw_alerts: list[AnswerAlert],
-    ):
-        if len(raw_alerts) == 0:
-            return
-        cache = RedisCache()
-        persons = await UserAppletAccessCRUD(self.session).get_responsible_persons(applet_id, subject_id)
-        alert_schemas = []
+    async def create_alerts_from_events(
+        self, events: list[AnswerEventSchema]
+    ) -> tuple[list[Row], dict[uuid.UUID, list[UserSchema]]]:
+        """Creates the alerts raised by the submitted answers for the persons
+        responsible for the target subjects.
 
-        for person in persons:
-            for raw_alert in raw_alerts:
-                alert_schemas.append(
-                    AlertSchema(
-                        user_id=person.id,
-                        respondent_id=self.user_id,
-                        subject_id=subject_id,
-                        is_watched=False,
-                        applet_id=applet_id,
-                        version=version,
-                        activity_id=activity_id,
-                        activity_item_id=raw_alert.activity_item_id,
-                        alert_message=raw_alert.message,
-                        answer_id=answer_id,
+        Alerts of the answers which have alerts already (the events are processed
+        again) are not created twice, they are returned with the created ones.
+        Returns the alerts and the notified persons by applet.
+        """
+        answer_ids = [event.answer_id for event in events if event.alerts]
+        created = await AlertCRUD(self.session).get_by_answer_ids(answer_ids)
+        created_answer_ids = {alert.answer_id for alert in created}
+        persons_cache: dict[tuple[uuid.UUID, uuid.UUID], list[UserSchema]] = {}
+        recipients: dict[uuid.UUID, dict[uuid.UUID, UserSchema]] = defaultdict(dict)
+        alert_schemas = []
+        for event in events:
+            if not event.alerts:
+                continue
+            key = (event.applet_id, event.subject_id)
+            if key not in persons_cache:
+                persons_cache[key] = await UserAppletAccessCRUD(self.session).get_responsible_persons(*key)
+            raw_alerts = pydantic.parse_raw_as(list[AnswerAlert], event.alerts)
+            for person in persons_cache[key]:
+                recipients[event.applet_id][person.id] = person
+                if event.answer_id in created_answer_ids:
+                    continue
+                for raw_alert in raw_alerts:
+                    alert_schemas.append(
+                        AlertSchema(
+                            user_id=person.id,
+                            respondent_id=event.respondent_id,
+                            subject_id=event.subject_id,
+                            is_watched=False,
+                            applet_id=event.applet_id,
+                            version=event.version,
+                            activity_id=event.activity_id,
+                            activity_item_id=raw_alert.activity_item_id,
+                            alert_message=raw_alert.message,
+                            answer_id=event.answer_id,
+                        )
                     )
-                )
-        alerts = await AlertCRUD(self.session).create_many(alert_schemas)
+        alerts = await AlertCRUD(self.session).create_many(alert_schemas) if alert_schemas else []
+        return [*created, *alerts], {applet_id: list(persons.values()) for applet_id, persons in recipients.items()}
 
-        for alert in alerts:
-            channel_id = f"channel_{alert.user_id}"
-            try:
-                await cache.publish(
-                    channel_id,
-                    AlertMessage(
-                        id=alert.id,
-                        respondent_id=self.user_id,
-                        subject_id=subject_id,
-                        applet_id=applet_id,
-                        version=version,
-                        message=alert.alert_message,
-                        created_at=alert.created_at,
-                        activity_id=alert.activity_id,
-                        activity_item_id=alert.activity_item_id,
-                        answer_id=answer_id,
-                    ).dict(),
-                )
-            except Exception as e:
-                sentry_sdk.capture_exception(e)
-                break
-        await self.send_alert_mail(persons)
+    @staticmethod
+    async def publish_alerts(alerts: list[Row]) -> None:
+        if not alerts:
+            return
+        messages = [
+            (
+                f"channel_{alert.user_id}",
+                AlertMessage(
+                    id=alert.id,
+                    respondent_id=alert.respondent_id,
+                    subject_id=alert.subject_id,
+                    applet_id=alert.applet_id,
+                    version=alert.version,
+                    message=alert.alert_message,
+                    created_at=alert.created_at,
+                    activity_id=alert.activity_id,
+                    activity_item_id=alert.activity_item_id,
+                    answer_id=alert.answer_id,
+                ).dict(),
+            )
+            for alert in alerts
+        ]
+        try:
+            await RedisCache().publish_many(messages)
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
 
     async def get_completed_answers_data(
         self, applet_id: uuid.UUID, version: str, from_date: datetime.date
@@ -1705,56 +1827,34 @@ class AnswerService:
         self,
         applet_id: uuid.UUID,
         user_id: uuid.UUID,
-        page=1,
+        after_id: uuid.UUID | None = None,
         limit=1000,
         *,
         old_public_key: list,
         new_public_key: list,
         decryptor: "AnswerEncryptor",
         encryptor: "AnswerEncryptor",
-    ) -> int:
+        executor: Executor | None = None,
+    ) -> tuple[int, uuid.UUID | None]:
+        """Reencrypts the next `limit` answer items of the user after the `after_id` item.
+
+        Decryption and encryption run in the `executor`, the items are updated
+        with one statement. Returns the number of read items and the id of the last one.
+        """
         logger.debug(f'Reencryption: Start reencrypt_user_answers for "{applet_id}"')
         repository = AnswersCRUD(self.answer_session)
-        answers = await repository.get_applet_user_answer_items(applet_id, user_id, page, limit)
+        answers = await repository.get_applet_user_answer_items(applet_id, user_id, after_id, limit)
         count = len(answers)
         if not count:
-            return 0
-
-        data_to_update: list[AnswerItemDataEncrypted] = []
-        for answer in answers:
-            if not self._is_public_key_match(answer.id, answer.user_public_key, old_public_key):
-                continue
-
-            try:
-                encrypted_answer = encryptor.encrypt(decryptor.decrypt(answer.answer))
-                encrypted_events, encrypted_identifier = None, None
-                if answer.events:
-                    encrypted_events = encryptor.encrypt(decryptor.decrypt(answer.events))
-                if answer.identifier:
-                    if answer.migrated_data and answer.migrated_data.get("is_identifier_encrypted") is False:
-                        encrypted_identifier = encrypted_identifier
-                    else:
-                        encrypted_identifier = encryptor.encrypt(decryptor.decrypt(answer.identifier))
-
-                data_to_update.append(
-                    AnswerItemDataEncrypted(
-                        id=answer.id,
-                        answer=encrypted_answer,
-                        events=encrypted_events,
-                        identifier=encrypted_identifier,
-                    )
-                )
-            except EncryptionError as e:
-                logger.error(
-                    f'Reencryption: Skip answer item "{answer.id}": cannot decrypt answer'  # noqa: E501
-                )
-                logger.exception(str(e))
-                continue
+            return 0, None
 
+        data_to_update = await asyncio.get_running_loop().run_in_executor(
+            executor, reencrypt_answer_items, answers, old_public_key, decryptor, encryptor
+        )
         if data_to_update:
             await repository.update_encrypted_fields(json.dumps(new_public_key), data_to_update)
 
-        return count
+        return count, answers[-1].id
 
     async def fill_last_activity_workspace_respondent(
         self,
@@ -2054,22 +2154,12 @@ class ReportServerService:
             applet.report_server_ip.rstrip("/"), activity_id, flow_id
         )
 
-        async with aiohttp.ClientSession() as session:
-            logger.info(f"Sending request to the report server {url}.")
-            start = time.time()
-            async with session.post(
-                url,
-                json=dict(payload=encrypted_data),
-            ) as resp:
-                duration = time.time() - start
-                if resp.status == 200:
-                    logger.info(f"Successful request in {duration:.1f} seconds.")
-                    response_data = await resp.json()
-                    return ReportServerResponse(**response_data)
-                else:
-                    logger.error(f"Failed request in {duration:.1f} seconds.")
-                    error_message = await resp.text()
-                    raise ReportServerError(message=error_message)
+        payload = await report_client.post_report(url, dict(payload=encrypted_data))
+        email = payload.data.get("email")
+        if not email:
+            payload.pdf.close()
+            raise ReportServerError(message="response has no email")
+        return ReportServerResponse(pdf=payload.pdf, email=email)
 
     def _is_activity_last_in_flow(self, applet_full: dict, activity_id: str | None, flow_id: str | None) -> bool:
         if "activityFlows" not in applet_full or "activities" not in applet_full or not activity_id or not flow_id:
@@ -2090,8 +2180,8 @@ class ReportServerService:
         non_performance: bool = False,
     ):
         applet_full = await AppletHistoryService(self.session, applet_id, version).get_full(non_performance)
-        applet_full.encryption = Encryption(**encryption)
-        return applet_full.dict(by_alias=True)
+        # the applet version is shared by reports, so it is copied
+        return applet_full.copy(update=dict(encryption=Encryption(**encryption))).dict(by_alias=True)
 
     async def _get_user_info(self, subject_id: uuid.UUID):
         subject = await SubjectsCrud(self.session).get_by_id(subject_id)
@@ -2176,6 +2266,50 @@ class AnswerEncryptor:
             raise EncryptionError("Cannot decrypt answer data") from e
 
 
+def reencrypt_answer_items(
+    answers: list[UserAnswerItemData],
+    old_public_key: list,
+    decryptor: AnswerEncryptor,
+    encryptor: AnswerEncryptor,
+) -> list[AnswerItemDataEncrypted]:
+    """Reencrypts the answer items encrypted with the old public key, other items are skipped.
+
+    Has no IO, so it can run in a process pool.
+    """
+    data_to_update: list[AnswerItemDataEncrypted] = []
+    for answer in answers:
+        if not AnswerService._is_public_key_match(answer.id, answer.user_public_key, old_public_key):
+            continue
+
+        try:
+            encrypted_answer = encryptor.encrypt(decryptor.decrypt(answer.answer))
+            encrypted_events, encrypted_identifier = None, None
+            if answer.events:
+                encrypted_events = encryptor.encrypt(decryptor.decrypt(answer.events))
+            if answer.identifier:
+                if answer.migrated_data and answer.migrated_data.get("is_identifier_encrypted") is False:
+                    encrypted_identifier = answer.identifier
+                else:
+                    encrypted_identifier = encryptor.encrypt(decryptor.decrypt(answer.identifier))
+
+            data_to_update.append(
+                AnswerItemDataEncrypted(
+                    id=answer.id,
+                    answer=encrypted_answer,
+                    events=encrypted_events,
+                    identifier=encrypted_identifier,
+                )
+            )
+        except EncryptionError as e:
+            logger.error(
+                f'Reencryption: Skip answer item "{answer.id}": cannot decrypt answer'  # noqa: E501
+            )
+            logger.exception(str(e))
+            continue
+
+    return data_to_update
+
+
 class AnswerTransferService:
     def __init__(
         self,
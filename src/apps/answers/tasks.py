@@ -1,5 +1,3 @@
-import base64
-import io
 import traceback
 import uuid
 
@@ -7,12 +5,18 @@ import sentry_sdk
 from fastapi import UploadFile
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.answers.crud.answers import AnswersCRUD
+from apps.answers.crud.events import AnswerEventsCRUD
+from apps.answers.db.schemas import AnswerEventSchema
 from apps.answers.deps.preprocess_arbitrary import get_arbitrary_info
 from apps.answers.domain import ReportServerResponse
 from apps.mailing.domain import MessageSchema
 from apps.mailing.services import MailingService
+from apps.workspaces.service.workspace import WorkspaceService
 from broker import broker
-from infrastructure.database import session_manager
+from config import settings
+from infrastructure.database import atomic, session_manager
+from infrastructure.logger import logger
 
 # moved from previous implementation
 
@@ -49,20 +53,137 @@ async def create_report(
 
             if not response:
                 return
-            file = UploadFile(
-                io.BytesIO(base64.b64decode(response.pdf.encode())),
-                filename=response.email.attachment,
-            )
-
-            mail_service = MailingService()
-            await mail_service.send(
-                MessageSchema(
-                    recipients=response.email.email_recipients,
-                    subject=response.email.subject,
-                    body=response.email.body,
-                    attachments=[file],
+            with response.pdf:
+                file = UploadFile(response.pdf, filename=response.email.attachment)
+                mail_service = MailingService()
+                await mail_service.send(
+                    MessageSchema(
+                        recipients=response.email.email_recipients,
+                        subject=response.email.subject,
+                        body=response.email.body,
+                        attachments=[file],
+                    )
                 )
-            )
     except Exception as e:
         traceback.print_exception(e)
         sentry_sdk.capture_exception(e)
+
+
+async def _create_reports(
+    events: list[AnswerEventSchema], session: AsyncSession, answer_session: AsyncSession
+) -> set[uuid.UUID]:
+    """Creates the reports of the answers, returns ids of the processed events.
+
+    Every processed event is marked right away, so the report of an answer is
+    not created again when the event is processed again.
+    """
+    from apps.answers.service import AnswerService
+
+    service = AnswerService(session, arbitrary_session=answer_session)
+    processed = {event.id for event in events if event.is_report_processed}
+    for event in events:
+        if event.id in processed:
+            continue
+        try:
+            answer = await AnswersCRUD(answer_session).get_by_id(event.answer_id)
+            await service.create_report_from_answer(answer)
+            async with atomic(answer_session):
+                await AnswerEventsCRUD(answer_session).mark_report_processed(event.id)
+        except Exception as e:
+            logger.error(f"Answer events: cannot create report of answer {event.answer_id}")
+            sentry_sdk.capture_exception(e)
+        else:
+            processed.add(event.id)
+    return processed
+
+
+async def process_answer_events_batch(
+    session: AsyncSession, limit: int, answer_session: AsyncSession | None = None
+) -> int:
+    """Processes up to `limit` pending answer events of the answers database
+    (the main one by default), returns the number of claimed events.
+
+    Events are processed at least once: an event is deleted only after its
+    alerts, alert emails and report are done, events of a failed or crashed
+    consumer are claimed again when their lease expires. Alerts and reports
+    of an answer are not created twice, alert messages and emails of the
+    events processed again can be repeated. Events failed `max_attempts`
+    times are logged and deleted.
+    """
+    from apps.answers.service import AnswerService
+
+    answer_session = answer_session or session
+    config = settings.task_answer_events
+    async with atomic(answer_session):
+        crud = AnswerEventsCRUD(answer_session)
+        exhausted = await crud.delete_exhausted(config.max_attempts)
+        events = await crud.claim_pending(limit, config.lease, config.max_attempts)
+    for answer_id, applet_id, is_report_processed in exhausted:
+        logger.error(
+            f"Answer events: event of answer {answer_id} of applet {applet_id} failed {config.max_attempts} times "
+            f"and is dropped, report processed: {is_report_processed}"
+        )
+    if not events:
+        return 0
+
+    service = AnswerService(session)
+    async with atomic(session):
+        alerts, recipients = await service.create_alerts_from_events(events)
+
+    await service.publish_alerts(alerts)
+    failed_applets: set[uuid.UUID] = set()
+    for applet_id, persons in recipients.items():
+        try:
+            await service.send_alert_mail(persons)
+        except Exception as e:
+            failed_applets.add(applet_id)
+            sentry_sdk.capture_exception(e)
+    reported = await _create_reports(events, session, answer_session)
+
+    done = [event.id for event in events if event.id in reported and event.applet_id not in failed_applets]
+    async with atomic(answer_session):
+        await AnswerEventsCRUD(answer_session).delete_by_ids(done)
+    return len(events)
+
+
+async def _drain_answer_events(arbitrary_uri: str | None) -> None:
+    batch_limit = settings.task_answer_events.batch_limit
+    session_maker = session_manager.get_session()
+    while True:
+        async with session_maker() as session:
+            if arbitrary_uri:
+                async with session_manager.get_session(arbitrary_uri)() as answer_session:
+                    processed = await process_answer_events_batch(session, batch_limit, answer_session)
+            else:
+                processed = await process_answer_events_batch(session, batch_limit)
+        if processed < batch_limit:
+            break
+
+
+@broker.task(schedule=[{"cron": "* * * * *"}])
+async def process_answer_events(applet_id: uuid.UUID | None = None):
+    """Drains the answer events outbox of the answers database of the applet,
+    kicked after every submission. Runs by schedule without an applet to drain
+    the outboxes of all the databases and to pick up events left by failed
+    kicks and failed consumers.
+    """
+    arbitrary_uris: list[str | None]
+    session_maker = session_manager.get_session()
+    try:
+        async with session_maker() as session:
+            if applet_id:
+                arbitrary_uris = [await get_arbitrary_info(applet_id, session)]
+            else:
+                workspaces = await WorkspaceService(session, uuid.uuid4()).get_arbitrary_list()
+                arbitrary_uris = [None, *dict.fromkeys(workspace.database_uri for workspace in workspaces)]
+    except Exception as e:
+        traceback.print_exception(e)
+        sentry_sdk.capture_exception(e)
+        return
+
+    for arbitrary_uri in arbitrary_uris:
+        try:
+            await _drain_answer_events(arbitrary_uri)
+        except Exception as e:
+            traceback.print_exception(e)
+            sentry_sdk.capture_exception(e)
@@ -1,5 +1,6 @@
 import datetime
 import http
+import json
 import re
 import uuid
 from collections import defaultdict
@@ -9,17 +10,21 @@ from unittest.mock import AsyncMock
 import pytest
 from pydantic import EmailStr
 from pytest import Config, FixtureRequest
-from sqlalchemy import select
+from pytest_mock import MockerFixture
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.activities.domain.activity_update import ActivityUpdate
 from apps.activity_assignments.domain.assignments import ActivityAssignmentCreate
 from apps.activity_assignments.service import ActivityAssignmentService
+from apps.alerts.db.schemas import AlertSchema
 from apps.answers.crud import AnswerItemsCRUD
 from apps.answers.crud.answers import AnswersCRUD
-from apps.answers.db.schemas import AnswerItemSchema, AnswerNoteSchema, AnswerSchema
+from apps.answers.db.schemas import AnswerEventSchema, AnswerItemSchema, AnswerNoteSchema, AnswerSchema
 from apps.answers.domain import AnswerNote, AppletAnswerCreate, AssessmentAnswerCreate, ClientMeta, ItemAnswerCreate
 from apps.answers.service import AnswerService
+from apps.answers.tasks import process_answer_events_batch
 from apps.applets.domain.applet_create_update import AppletUpdate
 from apps.applets.domain.applet_full import AppletFull
 from apps.applets.errors import InvalidVersionError
@@ -39,6 +44,7 @@ from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
 from apps.workspaces.db.schemas import UserAppletAccessSchema
 from apps.workspaces.domain.constants import Role
 from apps.workspaces.service.user_applet_access import UserAppletAccessService
+from config import settings
 from infrastructure.utility import RedisCacheTest
 
 
@@ -689,6 +695,7 @@ class TestAnswerActivityItems(BaseTest):
     flow_submissions_url = "/answers/applet/{applet_id}/flows/{flow_id}/submissions"
     applet_submissions_list_url = "/answers/applet/{applet_id}/submissions"
     applet_answers_export_url = "/answers/applet/{applet_id}/data"
+    applet_answers_export_stream_url = "/answers/applet/{applet_id}/data/stream"
     applet_answers_completions_url = "/answers/applet/{applet_id}/completions"
     applets_answers_completions_url = "/answers/applet/completions"
     applet_submit_dates_url = "/answers/applet/{applet_id}/dates"
@@ -722,26 +729,90 @@ class TestAnswerActivityItems(BaseTest):
     async def test_answer_activity_items_create_alert_for_respondent(
         self,
         mock_kiq_report: AsyncMock,
+        mock_kiq_answer_events: AsyncMock,
         tom: User,
         answer_with_alert_create: AppletAnswerCreate,
         tom_applet_subject: Subject,
         redis: RedisCacheTest,
         mailbox: TestMail,
         client: TestClient,
+        session: AsyncSession,
     ) -> None:
         client.login(tom)
         response = await client.post(self.answer_url, data=answer_with_alert_create)
         assert response.status_code == http.HTTPStatus.CREATED, response.json()
 
+        # reportability and alerts are processed after the submission
+        mock_kiq_answer_events.assert_awaited_once()
+        mock_kiq_report.assert_not_awaited()
+        assert not mailbox.mails
+        assert await process_answer_events_batch(session, 100) == 1
+        # events are deleted once processed
+        assert await process_answer_events_batch(session, 100) == 0
+
         mock_kiq_report.assert_awaited_once()
 
         published_values = await redis.get(f"channel_{tom.id}")
         published_values = published_values or []
         assert len(published_values) == 1
-        assert len(redis._storage) == 1
+        assert len(await redis.keys("channel_.*")) == 1
         assert len(mailbox.mails) == 1
         assert mailbox.mails[0].subject == "Response alert"
 
+    async def test_answer_events_are_processed_again_after_failure(
+        self,
+        mock_kiq_report: AsyncMock,
+        mock_kiq_answer_events: AsyncMock,
+        tom: User,
+        answer_with_alert_create: AppletAnswerCreate,
+        tom_applet_subject: Subject,
+        client: TestClient,
+        session: AsyncSession,
+        mocker: MockerFixture,
+    ) -> None:
+        client.login(tom)
+        response = await client.post(self.answer_url, data=answer_with_alert_create)
+        assert response.status_code == http.HTTPStatus.CREATED, response.json()
+
+        mocker.patch.object(settings.task_answer_events, "lease", 0)
+        send_mail = mocker.patch.object(AnswerService, "send_alert_mail", side_effect=RuntimeError)
+        assert await process_answer_events_batch(session, 100) == 1
+        mock_kiq_report.assert_awaited_once()
+
+        # the event is kept until the email is sent, the alert and the report are not created again
+        send_mail.side_effect = None
+        assert await process_answer_events_batch(session, 100) == 1
+        assert await process_answer_events_batch(session, 100) == 0
+        assert send_mail.await_count == 2
+        mock_kiq_report.assert_awaited_once()
+        alerts = await session.execute(
+            select(AlertSchema.id).where(AlertSchema.applet_id == answer_with_alert_create.applet_id)
+        )
+        assert len(alerts.all()) == 1
+
+    async def test_exhausted_answer_events_are_dropped(
+        self,
+        mock_kiq_report: AsyncMock,
+        mock_kiq_answer_events: AsyncMock,
+        tom: User,
+        answer_with_alert_create: AppletAnswerCreate,
+        tom_applet_subject: Subject,
+        client: TestClient,
+        session: AsyncSession,
+        mocker: MockerFixture,
+    ) -> None:
+        client.login(tom)
+        response = await client.post(self.answer_url, data=answer_with_alert_create)
+        assert response.status_code == http.HTTPStatus.CREATED, response.json()
+
+        mocker.patch.object(settings.task_answer_events, "lease", 0)
+        mocker.patch.object(settings.task_answer_events, "max_attempts", 1)
+        mocker.patch.object(AnswerService, "send_alert_mail", side_effect=RuntimeError)
+        assert await process_answer_events_batch(session, 100) == 1
+        assert await process_answer_events_batch(session, 100) == 0
+        events = await session.execute(select(AnswerEventSchema.id))
+        assert not events.all()
+
     async def test_answer_activity_answer_dates_for_respondent(
         self,
         client: TestClient,
@@ -1858,6 +1929,73 @@ class TestAnswerActivityItems(BaseTest):
             answer_for_review["respondentSecretId"],
         )
 
+    @pytest.mark.usefixtures("assessment")
+    async def test_answers_export_stream(
+        self,
+        client: TestClient,
+        tom: User,
+        answer_reviewable_activity_with_ts_offset: AnswerSchema,
+    ):
+        client.login(tom)
+        applet_id = str(answer_reviewable_activity_with_ts_offset.applet_id)
+        response = await client.get(self.applet_answers_export_url.format(applet_id=applet_id))
+        expected = response.json()["result"]
+
+        response = await client.get(self.applet_answers_export_stream_url.format(applet_id=applet_id))
+        assert response.status_code == http.HTTPStatus.OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        answers = [line["data"] for line in lines if line["type"] == "answer"]
+        activities = [line["data"] for line in lines if line["type"] == "activity"]
+        assert sorted(answers, key=lambda a: a["id"]) == sorted(expected["answers"], key=lambda a: a["id"])
+        assert sorted(activities, key=lambda a: a["idVersion"]) == sorted(
+            expected["activities"], key=lambda a: a["idVersion"]
+        )
+
+    @pytest.mark.usefixtures("assessment")
+    async def test_answers_export_total_modes(
+        self, client: TestClient, tom: User, answer_reviewable_activity_with_ts_offset: AnswerSchema
+    ):
+        client.login(tom)
+        url = self.applet_answers_export_url.format(applet_id=str(answer_reviewable_activity_with_ts_offset.applet_id))
+
+        response = await client.get(url, dict(limit=2, total="none"))
+        assert response.status_code == http.HTTPStatus.OK
+        data = response.json()
+        assert len(data["result"]["answers"]) == 2
+        assert data["count"] is None
+        assert data["totalMode"] == "none"
+        assert data["hasMore"] is True
+
+        response = await client.get(url, dict(limit=2, total="estimated"))
+        # the planner estimation is never less than the records seen
+        assert response.json()["count"] >= 3
+
+        response = await client.get(url, dict(limit=2))
+        assert response.json()["count"] == 3
+        assert response.json()["hasMore"] is True
+
+        # the exact total is cached for the estimated mode
+        response = await client.get(url, dict(limit=2, total="estimated"))
+        assert response.json()["count"] == 3
+
+        # the last page total is known without counting
+        response = await client.get(url, dict(limit=2, page=2, total="estimated"))
+        assert response.json()["count"] == 3
+        assert response.json()["hasMore"] is False
+
+    @pytest.mark.usefixtures("assessment")
+    async def test_stream_applet_answers_keyset_pages(
+        self, session: AsyncSession, answer_reviewable_activity_with_ts_offset: AnswerSchema
+    ):
+        crud = AnswersCRUD(session)
+        applet_id = answer_reviewable_activity_with_ts_offset.applet_id
+        answers, _ = await crud.get_applet_answers(applet_id, page=1, limit=100)
+        batches = [batch async for batch in crud.stream_applet_answers(applet_id, page_size=2, batch_size=1)]
+        assert [len(batch) for batch in batches] == [1] * len(answers)
+        streamed = [answer for batch in batches for answer in batch]
+        assert sorted(streamed, key=lambda a: a.id) == sorted(answers, key=lambda a: a.id)
+
     async def test_get_applet_answers_without_assessment(
         self, client: TestClient, tom: User, applet: AppletFull, answer_shell_account_target
     ):
@@ -2800,7 +2938,7 @@ class TestAnswerActivityItems(BaseTest):
         response = await client.get(url, dict(targetSubjectId=tom_subject.id))
         assert response.status_code == 200
         data = response.json()
-        assert set(data.keys()) == {"result", "count"}
+        assert set(data.keys()) == {"result", "count", "totalMode", "hasMore"}
         assert data["count"] == 1
         data = data["result"]
         assert set(data.keys()) == {"flows", "submissions"}
@@ -2863,7 +3001,7 @@ class TestAnswerActivityItems(BaseTest):
         response = await client.get(url, dict(targetSubjectId=tom_subject.id))
         assert response.status_code == 200
         data = response.json()
-        assert set(data.keys()) == {"result", "count"}
+        assert set(data.keys()) == {"result", "count", "totalMode", "hasMore"}
         assert data["count"] == 0
         data = data["result"]
         assert set(data.keys()) == {"flows", "submissions"}
@@ -4182,3 +4320,19 @@ class TestAnswerActivityItems(BaseTest):
         response = await client.get(url)
 
         assert response.status_code == 403
+
+
+async def test_answer_submission_statements_count(session: AsyncSession, tom: User, answer_create: AppletAnswerCreate):
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        await AnswerService(session, tom.id).create_answer(answer_create)
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+    # submit id, submission context, subject relations, answer and answer item inserts with their reloads,
+    # answer event insert
+    assert len(statements) == 8
@@ -15,6 +15,7 @@ from apps.answers.crud.answers import AnswersCRUD
 from apps.answers.db.schemas import AnswerItemSchema, AnswerNoteSchema, AnswerSchema
 from apps.answers.domain import AnswerNote, AppletAnswerCreate, AssessmentAnswerCreate
 from apps.answers.service import AnswerService
+from apps.answers.tasks import process_answer_events_batch
 from apps.applets.domain.applet_full import AppletFull
 from apps.applets.errors import InvalidVersionError
 from apps.mailing.services import TestMail
@@ -141,24 +142,32 @@ class TestAnswerActivityItems(BaseTest):
     async def test_answer_activity_items_create_for_respondent(
         self,
         mock_kiq_report: AsyncMock,
+        mock_kiq_answer_events: AsyncMock,
+        mock_get_session: Any,
         arbitrary_client: TestClient,
         tom: User,
         redis: RedisCacheTest,
         answer_with_alert_create: AppletAnswerCreate,
         mailbox: TestMail,
         session: AsyncSession,
+        arbitrary_session: AsyncSession,
     ):
         arbitrary_client.login(tom)
         response = await arbitrary_client.post(self.answer_url, data=answer_with_alert_create)
         assert response.status_code == http.HTTPStatus.CREATED, response.json()
 
+        mock_kiq_answer_events.assert_awaited_once_with(answer_with_alert_create.applet_id)
+        # the event is written with the answer to the arbitrary database
+        assert await process_answer_events_batch(session, 100) == 0
+        assert await process_answer_events_batch(session, 100, arbitrary_session) == 1
+
         mock_kiq_report.assert_awaited_once()
 
         published_values = await redis.get(f"channel_{tom.id}")
         published_values = published_values or []
         assert len(published_values) == 1
         # 2 because alert for lucy and for tom
-        assert len(redis._storage) == 1
+        assert len(await redis.keys("channel_.*")) == 1
         assert len(mailbox.mails) == 1
         assert mailbox.mails[0].subject == "Response alert"
 
@@ -11,7 +11,7 @@ from apps.activities.domain.activity_update import ActivityReportConfiguration
 from apps.activities.services.activity import ActivityService
 from apps.activity_flows.domain.flow_update import ActivityFlowReportConfiguration
 from apps.activity_flows.service.flow import FlowService
-from apps.applets.crud import AppletsCRUD, UserAppletAccessCRUD
+from apps.applets.crud import AppletHistoryChangesCRUD, AppletsCRUD, UserAppletAccessCRUD
 from apps.applets.domain import AppletFolder, AppletName, AppletUniqueName, PublicAppletHistoryChange, PublicHistory
 from apps.applets.domain.applet import (
     AppletActivitiesBaseInfo,
@@ -35,6 +35,8 @@ from apps.applets.domain.base import Encryption
 from apps.applets.filters import AppletQueryParams
 from apps.applets.service import AppletHistoryService, AppletService
 from apps.applets.service.applet_history import retrieve_applet_by_version, retrieve_versions
+from apps.applets.service.applet_version_cache import AppletVersionCache
+from apps.applets.tasks import save_applet_version_changes
 from apps.authentication.deps import get_current_user
 from apps.shared.domain.response import Response, ResponseMulti
 from apps.shared.exception import NotFoundError
@@ -134,6 +136,7 @@ async def applet_create(
         )
         manager_role = Role.EDITOR if has_editor else None
         applet = await AppletService(session, owner_id).create(schema, user.id, manager_role)
+    await save_applet_version_changes.kiq(applet.id, applet.version)
     return Response(result=public_detail.Applet.from_orm(applet))
 
 
@@ -148,6 +151,7 @@ async def applet_update(
         await service.exist_by_id(applet_id)
         await CheckAccessService(session, user.id).check_applet_edit_access(applet_id)
         applet = await service.update(applet_id, schema)
+    await save_applet_version_changes.kiq(applet.id, applet.version)
     try:
         await service.send_notification_to_applet_respondents(
             applet_id,
@@ -191,6 +195,7 @@ async def applet_duplicate(
         applet = await service.duplicate(
             applet_for_duplicate, schema.display_name, schema.encryption, schema.include_report_server
         )
+    await save_applet_version_changes.kiq(applet.id, applet.version)
     return Response(result=public_detail.Applet.from_orm(applet))
 
 
@@ -243,6 +248,8 @@ async def activity_report_config_update(
 
     async with atomic(session):
         await ActivityService(session, user.id).update_report(activity_id, schema)
+        await AppletHistoryChangesCRUD(session).delete_current(applet_id)
+        AppletVersionCache.invalidate_on_commit(session, applet_id)
 
     return HTTPResponse()
 
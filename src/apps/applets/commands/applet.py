@@ -1,9 +1,11 @@
 import uuid
+from typing import Optional
 
 import typer
 from rich import print
 
-from apps.applets.service import AppletService
+from apps.applets.crud import AppletHistoryChangesCRUD
+from apps.applets.service import AppletHistoryService, AppletService
 from apps.transfer_ownership.service import TransferService
 from apps.users import User
 from apps.users.cruds.user import UsersCRUD
@@ -78,3 +80,35 @@ async def transfer_ownership(
                 transfer = await service_from.save_transfer_request(applet_id, target_owner_email, target_user.id)
                 await service_to.accept_transfer(applet_id, transfer.key)
                 print(f"[green]Transfer ownership for applet {applet_id} finished[/green]")
+
+
+@app.command(short_help="Build change-logs of applet versions which don't have them")
+@coro
+async def build_changes(
+    applet_ids: Optional[list[uuid.UUID]] = typer.Argument(
+        None, help="Applet IDs, if no IDs are provided versions of all applets are processed."
+    ),
+    batch_size: int = typer.Option(100, "--batch-size", "-b", min=1, help="Versions saved in one transaction."),
+) -> None:
+    session_maker = session_manager.get_session()
+    last_id_version = None
+    total = failed = 0
+    while True:
+        async with session_maker() as session:
+            async with atomic(session):
+                versions = await AppletHistoryChangesCRUD(session).get_versions_without_changes(
+                    applet_ids, last_id_version, batch_size
+                )
+                for applet_id, version, _ in versions:
+                    try:
+                        async with session.begin_nested():
+                            await AppletHistoryService(session, applet_id, version).save_changes()
+                    except Exception as e:
+                        failed += 1
+                        error_msg(f"Applet {applet_id} version {version}: {e}")
+        if not versions:
+            break
+        last_id_version = versions[-1].id_version
+        total += len(versions)
+        print(f"{total} versions processed")
+    print(f"[green]Change-logs are built, {total - failed} versions saved, {failed} failed[/green]")
@@ -1,4 +1,3 @@
-import calendar
 import codecs
 import csv
 import datetime
@@ -6,12 +5,12 @@ import io
 import os
 import tracemalloc
 import uuid
-from typing import BinaryIO, Optional, TypeVar, cast
+from typing import BinaryIO, Optional, TypeVar
 
 import typer
 from pydantic import parse_obj_as
 from rich import print
-from sqlalchemy import Date, and_, case, false, func, literal, null, select, text
+from sqlalchemy import and_, false, func, null, select, text
 from sqlalchemy.cimmutabledict import immutabledict
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -32,6 +31,7 @@ from apps.schedule.db.schemas import (
     UserEventsSchema,
 )
 from apps.schedule.domain.constants import PeriodicityType
+from apps.schedule.service.occurrences import OccurrenceCalendar
 from apps.shared.domain.base import PublicModel
 from apps.subjects.db.schemas import SubjectSchema
 from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
@@ -54,12 +54,6 @@ PATH_USER_FLOW_SCHEDULE_FILE_NAME = settings.applet_ema.export_user_flow_schedul
 PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME = settings.applet_ema.export_user_activity_schedule_file_name
 
 
-# Not ISO
-MONDAY_WEEKDAY = 0
-FRIDAY_WEEKDAY = 4
-SATURDAY_WEEKDAY = 5
-SUNDAY_WEEKDAY = 6
-
 OUTPUT_TIME_FORMAT = "%H:%M"
 
 
@@ -95,7 +89,7 @@ class ActivityEventOutputRow(PublicModel):
 
 class RawRow(PublicModel):
     applet_id: uuid.UUID
-    date: datetime.date
+    date: datetime.date | None = None
     user_id: uuid.UUID
     secret_user_id: str | uuid.UUID
     applet_version: str
@@ -105,7 +99,7 @@ class RawRow(PublicModel):
     event_type: PeriodicityType
     start_date: datetime.date | None
     end_date: datetime.date | None
-    selected_date: datetime.date
+    selected_date: datetime.date | None
 
     @property
     def is_crossday_event(self) -> bool:
@@ -125,13 +119,6 @@ class ActivityEventRawRow(RawRow):
     activity_name: str
 
 
-def is_last_day_of_month(date: datetime.date):
-    mdays = calendar.mdays.copy()  # type: ignore[attr-defined]
-    if calendar.isleap(date.year):
-        mdays[calendar.February] += 1  # type: ignore[attr-defined]
-    return date.day == mdays[date.month]
-
-
 def get_applet_id(applet_id: uuid.UUID | None = None) -> uuid.UUID:
     _applet_id = str(applet_id) if applet_id else APPLET_ID
     if not _applet_id:
@@ -232,9 +219,7 @@ async def export_flows(
 
 
 ##### Daily user flow schedule stuff
-async def get_user_flow_events(
-    session: AsyncSession, scheduled_date: datetime.date, applet_id: uuid.UUID
-) -> list[FlowEventRawRow]:
+async def get_user_flow_events(session: AsyncSession, applet_id: uuid.UUID) -> list[FlowEventRawRow]:
     cte = (
         select(
             EventSchema.applet_id,
@@ -242,14 +227,7 @@ async def get_user_flow_events(
             UserEventsSchema.user_id,
             FlowEventsSchema.flow_id,
             PeriodicitySchema.type.label("event_type"),
-            case(
-                (
-                    PeriodicitySchema.type.in_(("WEEKDAYS", "DAILY")),
-                    scheduled_date,
-                ),
-                (PeriodicitySchema.type.in_(("WEEKLY", "MONTHLY")), PeriodicitySchema.start_date),
-                else_=PeriodicitySchema.selected_date,
-            ).label("selected_date"),
+            PeriodicitySchema.selected_date,
             PeriodicitySchema.start_date,
             PeriodicitySchema.end_date,
             EventSchema.start_time,
@@ -265,7 +243,6 @@ async def get_user_flow_events(
     query = (
         select(
             AppletSchema.id.label("applet_id"),
-            literal(scheduled_date, Date).label("date"),
             UserAppletAccessSchema.user_id.label("user_id"),
             SubjectSchema.secret_user_id.label("secret_user_id"),
             ActivityFlowSchema.id.label("flow_id"),
@@ -315,83 +292,56 @@ async def get_user_flow_events(
     return parse_obj_as(list[FlowEventRawRow], result)
 
 
-def filter_events(raw_events_rows: list[TRawRow], schedule_date: datetime.date) -> list[TRawRow]:  # noqa: C901
-    filtered: list[TRawRow] = []
+def expand_events(
+    raw_events_rows: list[TRawRow], start_date: datetime.date, end_date: datetime.date
+) -> dict[datetime.date, list[TRawRow]]:
+    """Returns the rows scheduled on every day from `start_date` to `end_date`."""
+    occurrences = OccurrenceCalendar(start_date, end_date)
+    expanded: dict[datetime.date, list[TRawRow]] = {
+        start_date + datetime.timedelta(days=i): [] for i in range(occurrences.days)
+    }
     for row in raw_events_rows:
         # TODO: patch events with periodicity WEEKDAYS, WEEKLY, some events don't have start_date and end_date
         # (the issue is in migrated data).
-        # For current script is ok, because or applet does not have issues with WEEKDAYS, WEEKLY
-        row.end_date = cast(datetime.date, row.end_date)
-        row.start_date = cast(datetime.date, row.start_date)
-        match row.event_type:
-            case PeriodicityType.DAILY:
-                if row.is_crossday_event:
-                    row.end_date += datetime.timedelta(days=1)
-                if schedule_date >= row.start_date and schedule_date <= row.end_date:
-                    filtered.append(row)
-            case PeriodicityType.ONCE:
-                schedule_start_date = row.selected_date
-                row.end_date = row.selected_date
-                if row.is_crossday_event:
-                    row.end_date += datetime.timedelta(days=1)
-                if schedule_date >= schedule_start_date and schedule_date <= row.end_date:
-                    filtered.append(row)
-            case PeriodicityType.WEEKDAYS:
-                last_weekday = FRIDAY_WEEKDAY
-                if row.is_crossday_event:
-                    last_weekday = SATURDAY_WEEKDAY
-                    if row.end_date.weekday() == FRIDAY_WEEKDAY:
-                        row.end_date += datetime.timedelta(days=1)
-                if (
-                    schedule_date.weekday() <= last_weekday
-                    and schedule_date >= row.start_date
-                    and schedule_date <= row.end_date
-                ):
-                    filtered.append(row)
-            case PeriodicityType.WEEKLY:
-                scheduled_weekday = row.start_date.weekday()
-                following_weekday = scheduled_weekday
-                if row.is_crossday_event:
-                    # For crossday event need to check following day as well
-                    following_weekday += 1
-                    # If was SUNDAY start new week
-                    if following_weekday > SUNDAY_WEEKDAY:
-                        following_weekday = 0
-                    # Increase end_date for crossday event only in case if weekdays of start and end days are equal.
-                    # The same logic on frontend for schedule.
-                    if row.start_date.weekday() == row.end_date.weekday():
-                        row.end_date += datetime.timedelta(days=1)
-                if (
-                    (schedule_date.weekday() == scheduled_weekday or schedule_date.weekday() == following_weekday)
-                    and schedule_date >= row.start_date
-                    and schedule_date <= row.end_date
-                ):
-                    filtered.append(row)
-            case PeriodicityType.MONTHLY:
-                scheduled_monthday = row.start_date.day
-                following_monthday = scheduled_monthday
-                if row.is_crossday_event:
-                    following_monthday += 1
-                    if is_last_day_of_month(row.start_date):
-                        following_monthday = 1
-                    # Increase end_date only if start_date equal end_date
-                    if (
-                        is_last_day_of_month(row.start_date)
-                        and is_last_day_of_month(row.end_date)
-                        or row.start_date.day == row.end_date.day
-                    ):
-                        row.end_date += datetime.timedelta(days=1)
-                if (
-                    (
-                        schedule_date.day == scheduled_monthday
-                        or schedule_date.day == following_monthday
-                        or (is_last_day_of_month(schedule_date) and row.start_date)
-                    )
-                    and schedule_date >= row.start_date
-                    and schedule_date <= row.end_date
-                ):
-                    filtered.append(row)
-    return filtered
+        mask = occurrences.expand(
+            row.event_type, row.start_date, row.end_date, row.selected_date, is_crossday=row.is_crossday_event
+        )
+        for date in occurrences.dates(mask):
+            expanded[date].append(row)
+    return expanded
+
+
+def filter_events(raw_events_rows: list[TRawRow], schedule_date: datetime.date) -> list[TRawRow]:
+    return expand_events(raw_events_rows, schedule_date, schedule_date)[schedule_date]
+
+
+async def upload_schedule_files(
+    path_prefix: str, unique_prefix: str, file_name: str, rows_by_date: dict[datetime.date, list[dict]]
+):
+    """Uploads a file for every day. A day file contains the rows of the previous day file
+    followed by the rows of the day."""
+    cdn_client = await get_operations_bucket()
+    dates = sorted(rows_by_date)
+
+    prev_filename = file_name.format(date=dates[0] - datetime.timedelta(days=1))
+    prev_key = cdn_client.generate_key(path_prefix, unique_prefix, prev_filename)
+
+    path = settings.uploads_dir / file_name.format(date=dates[-1])
+
+    with open(path, "w+b") as f:
+        try:
+            cdn_client.download(prev_key, f)
+        except ObjectNotFoundError:
+            pass
+        for date in dates:
+            f.seek(0, io.SEEK_END)
+            create_csv(rows_by_date[date], append_to=f)
+            f.seek(0)
+            key = cdn_client.generate_key(path_prefix, unique_prefix, file_name.format(date=date))
+            print(f"Upload file to the {key}")
+            await cdn_client.upload(key, f)
+
+    os.remove(path)
 
 
 @app.command(short_help="Export daily user flow schedule events to csv")
@@ -406,12 +356,16 @@ async def export_flow_schedule(
         "-f",
         help="Force run even if job executed before",
     ),
+    days: int = typer.Option(1, "--days", "-d", min=1, help="Number of days to export starting from the run date"),
 ):
     assert path_prefix
     applet_id = get_applet_id(applet_id)
     scheduled_date = run_date.date() if run_date else datetime.date.today()
+    last_date = scheduled_date + datetime.timedelta(days=days - 1)
 
     job_name = f"export_flow_schedule_{applet_id}_{scheduled_date}"
+    if last_date != scheduled_date:
+        job_name += f"_{last_date}"
 
     session_maker = session_manager.get_session()
     async with session_maker() as session:
@@ -432,55 +386,36 @@ async def export_flow_schedule(
             if job.status != JobStatus.in_progress:
                 await job_service.change_status(job.id, JobStatus.in_progress)
 
-    print(f"Flow schedule export start {applet_id} ({scheduled_date})")
+    print(f"Flow schedule export start {applet_id} ({scheduled_date} - {last_date})")
     tracemalloc.start()
 
     try:
         async with session_maker() as session:
-            raw_data = await get_user_flow_events(session, scheduled_date, applet_id)
+            raw_data = await get_user_flow_events(session, applet_id)
         print(f"Num raw rows is {len(raw_data)}")
-        filtered = filter_events(raw_data, scheduled_date)
-        print(f"Num filtered rows is {len(filtered)}")
-        result = []
-        for row in filtered:
-            outrow = FlowEventOutputRow(
-                applet_id=row.applet_id,
-                date_prior_day=scheduled_date,
-                user_id=row.user_id,
-                secret_user_id=row.secret_user_id,
-                flow_id=row.flow_id,
-                flow_name=row.flow_name,
-                applet_version=row.applet_version,
-                scheduled_date=scheduled_date,
-                schedule_start_time=row.schedule_start_time.strftime(OUTPUT_TIME_FORMAT),
-                schedule_end_time=row.schedule_end_time.strftime(OUTPUT_TIME_FORMAT),
-                event_id=row.event_id,
-            ).dict()
-            result.append(outrow)
-
-        cdn_client = await get_operations_bucket()
-        unique_prefix = f"{applet_id}/flow-schedule"
-
-        prev_filename = PATH_USER_FLOW_SCHEDULE_FILE_NAME.format(date=scheduled_date - datetime.timedelta(days=1))
-        prev_key = cdn_client.generate_key(path_prefix, unique_prefix, prev_filename)
-
-        filename = PATH_USER_FLOW_SCHEDULE_FILE_NAME.format(date=scheduled_date)
-        key = cdn_client.generate_key(path_prefix, unique_prefix, filename)
-
-        path = settings.uploads_dir / filename
-
-        with open(path, "wb") as f:
-            try:
-                cdn_client.download(prev_key, f)
-            except ObjectNotFoundError:
-                pass
-            f.seek(0, io.SEEK_END)
-            create_csv(result, append_to=f)
-        with open(path, "rb") as f:
-            print(f"Upload file to the {key}")
-            await cdn_client.upload(key, f)
-
-        os.remove(path)
+        rows_by_date: dict[datetime.date, list[dict]] = {}
+        for date, filtered in expand_events(raw_data, scheduled_date, last_date).items():
+            print(f"Num filtered rows for {date} is {len(filtered)}")
+            rows_by_date[date] = [
+                FlowEventOutputRow(
+                    applet_id=row.applet_id,
+                    date_prior_day=date,
+                    user_id=row.user_id,
+                    secret_user_id=row.secret_user_id,
+                    flow_id=row.flow_id,
+                    flow_name=row.flow_name,
+                    applet_version=row.applet_version,
+                    scheduled_date=date,
+                    schedule_start_time=row.schedule_start_time.strftime(OUTPUT_TIME_FORMAT),
+                    schedule_end_time=row.schedule_end_time.strftime(OUTPUT_TIME_FORMAT),
+                    event_id=row.event_id,
+                ).dict()
+                for row in filtered
+            ]
+
+        await upload_schedule_files(
+            path_prefix, f"{applet_id}/flow-schedule", PATH_USER_FLOW_SCHEDULE_FILE_NAME, rows_by_date
+        )
 
         async with session_maker() as session:
             async with atomic(session):
@@ -498,9 +433,7 @@ async def export_flow_schedule(
 
 
 ##### Daily user activity schedule stuff
-async def get_user_activity_events(
-    session: AsyncSession, scheduled_date: datetime.date, applet_id: uuid.UUID
-) -> list[ActivityEventRawRow]:
+async def get_user_activity_events(session: AsyncSession, applet_id: uuid.UUID) -> list[ActivityEventRawRow]:
     cte = (
         select(
             EventSchema.applet_id,
@@ -508,14 +441,7 @@ async def get_user_activity_events(
             UserEventsSchema.user_id,
             ActivityEventsSchema.activity_id,
             PeriodicitySchema.type.label("event_type"),
-            case(
-                (
-                    PeriodicitySchema.type.in_(("WEEKDAYS", "DAILY")),
-                    scheduled_date,
-                ),
-                (PeriodicitySchema.type.in_(("WEEKLY", "MONTHLY")), PeriodicitySchema.start_date),
-                else_=PeriodicitySchema.selected_date,
-            ).label("selected_date"),
+            PeriodicitySchema.selected_date,
             PeriodicitySchema.start_date,
             PeriodicitySchema.end_date,
             EventSchema.start_time,
@@ -531,7 +457,6 @@ async def get_user_activity_events(
     query = (
         select(
             AppletSchema.id.label("applet_id"),
-            literal(scheduled_date, Date).label("date"),
             UserAppletAccessSchema.user_id.label("user_id"),
             SubjectSchema.secret_user_id.label("secret_user_id"),
             ActivitySchema.id.label("activity_id"),
@@ -593,12 +518,16 @@ async def export_activity_schedule(
         "-f",
         help="Force run even if job executed before",
     ),
+    days: int = typer.Option(1, "--days", "-d", min=1, help="Number of days to export starting from the run date"),
 ):
     assert path_prefix
     applet_id = get_applet_id(applet_id)
     scheduled_date = run_date.date() if run_date else datetime.date.today()
+    last_date = scheduled_date + datetime.timedelta(days=days - 1)
 
     job_name = f"export_activity_schedule_{applet_id}_{scheduled_date}"
+    if last_date != scheduled_date:
+        job_name += f"_{last_date}"
 
     session_maker = session_manager.get_session()
     async with session_maker() as session:
@@ -618,56 +547,38 @@ async def export_activity_schedule(
                     raise
             if job.status != JobStatus.in_progress:
                 await job_service.change_status(job.id, JobStatus.in_progress)
-    print(f"Activity schedule export start {applet_id} ({scheduled_date})")
+    print(f"Activity schedule export start {applet_id} ({scheduled_date} - {last_date})")
     tracemalloc.start()
 
     try:
         session_maker = session_manager.get_session()
         async with session_maker() as session:
-            raw_data = await get_user_activity_events(session, scheduled_date, applet_id)
+            raw_data = await get_user_activity_events(session, applet_id)
         print(f"Num raw rows is {len(raw_data)}")
-        filtered = filter_events(raw_data, scheduled_date)
-        print(f"Num filtered rows is {len(filtered)}")
-        result = []
-        for row in filtered:
-            outrow = ActivityEventOutputRow(
-                applet_id=row.applet_id,
-                date_prior_day=scheduled_date,
-                user_id=row.user_id,
-                secret_user_id=row.secret_user_id,
-                activity_id=row.activity_id,
-                activity_name=row.activity_name,
-                applet_version=row.applet_version,
-                scheduled_date=scheduled_date,
-                schedule_start_time=row.schedule_start_time.strftime(OUTPUT_TIME_FORMAT),
-                schedule_end_time=row.schedule_end_time.strftime(OUTPUT_TIME_FORMAT),
-                event_id=row.event_id,
-            ).dict()
-            result.append(outrow)
-
-        cdn_client = await get_operations_bucket()
-        unique_prefix = f"{applet_id}/activity-schedule"
-
-        prev_filename = PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME.format(date=scheduled_date - datetime.timedelta(days=1))
-        prev_key = cdn_client.generate_key(path_prefix, unique_prefix, prev_filename)
-
-        filename = PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME.format(date=scheduled_date)
-        key = cdn_client.generate_key(path_prefix, unique_prefix, filename)
-
-        path = settings.uploads_dir / filename
-
-        with open(path, "wb") as f:
-            try:
-                cdn_client.download(prev_key, f)
-            except ObjectNotFoundError:
-                pass
-            f.seek(0, io.SEEK_END)
-            create_csv(result, append_to=f)
-        with open(path, "rb") as f:
-            print(f"Upload file to the {key}")
-            await cdn_client.upload(key, f)
+        rows_by_date: dict[datetime.date, list[dict]] = {}
+        for date, filtered in expand_events(raw_data, scheduled_date, last_date).items():
+            print(f"Num filtered rows for {date} is {len(filtered)}")
+            rows_by_date[date] = [
+                ActivityEventOutputRow(
+                    applet_id=row.applet_id,
+                    date_prior_day=date,
+                    user_id=row.user_id,
+                    secret_user_id=row.secret_user_id,
+                    activity_id=row.activity_id,
+                    activity_name=row.activity_name,
+                    applet_version=row.applet_version,
+                    scheduled_date=date,
+                    schedule_start_time=row.schedule_start_time.strftime(OUTPUT_TIME_FORMAT),
+                    schedule_end_time=row.schedule_end_time.strftime(OUTPUT_TIME_FORMAT),
+                    event_id=row.event_id,
+                ).dict()
+                for row in filtered
+            ]
+
+        await upload_schedule_files(
+            path_prefix, f"{applet_id}/activity-schedule", PATH_USER_ACTIVITY_SCHEDULE_FILE_NAME, rows_by_date
+        )
 
-        os.remove(path)
         async with session_maker() as session:
             async with atomic(session):
                 await JobService(session, owner_id).change_status(job.id, JobStatus.success)
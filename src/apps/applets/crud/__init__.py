@@ -1,3 +1,4 @@
+from apps.applets.crud.applet_history_changes import *  # noqa: F401, F403
 from apps.applets.crud.applets import *  # noqa: F401, F403
 from apps.applets.crud.applets_history import *  # noqa: F401, F403
 from apps.workspaces.crud.user_applet_access import *  # noqa: F401, F403
@@ -0,0 +1,84 @@
+import uuid
+
+from sqlalchemy import delete, exists, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query
+
+from apps.applets.db.schemas import AppletHistoryChangeSchema, AppletHistorySchema, AppletSchema
+from infrastructure.database.crud import BaseCRUD
+
+__all__ = ["AppletHistoryChangesCRUD"]
+
+
+class AppletHistoryChangesCRUD(BaseCRUD[AppletHistoryChangeSchema]):
+    schema_class = AppletHistoryChangeSchema
+
+    async def get_changes(self, applet_id: uuid.UUID, version: str) -> bytes | None:
+        query: Query = select(AppletHistoryChangeSchema.changes)
+        query = query.where(
+            AppletHistoryChangeSchema.id == applet_id,
+            AppletHistoryChangeSchema.version == version,
+        )
+        result = await self._execute(query)
+        return result.scalar_one_or_none()
+
+    async def lock_applet(self, applet_id: uuid.UUID, *, exclusive: bool) -> None:
+        """Locks the applet row until the end of the transaction.
+
+        The change-log is built under a shared lock and dropped under an
+        exclusive one, so a change-log built from the history rows before an
+        in-place update is either stored before it is dropped, or the build
+        waits for the update to be committed.
+        """
+        query: Query = select(AppletSchema.id)
+        query = query.where(AppletSchema.id == applet_id)
+        query = query.with_for_update(read=not exclusive)
+        await self._execute(query)
+
+    async def save(self, applet_id: uuid.UUID, version: str, changes: bytes) -> None:
+        """Keeps the stored change-log if there is one, it was built from the same history rows."""
+        stmt = (
+            insert(AppletHistoryChangeSchema)
+            .values(id=applet_id, version=version, changes=changes)
+            .on_conflict_do_nothing(
+                index_elements=[AppletHistoryChangeSchema.id, AppletHistoryChangeSchema.version],
+            )
+        )
+        await self._execute(stmt)
+
+    async def delete_current(self, applet_id: uuid.UUID) -> None:
+        """Drops the change-log of the current version of the applet after
+        its history rows are updated in place.
+        """
+        await self.lock_applet(applet_id, exclusive=True)
+        current_version = select(AppletSchema.version).where(AppletSchema.id == applet_id).scalar_subquery()
+        query = delete(AppletHistoryChangeSchema)
+        query = query.where(
+            AppletHistoryChangeSchema.id == applet_id,
+            AppletHistoryChangeSchema.version == current_version,
+        )
+        await self._execute(query)
+
+    async def get_versions_without_changes(
+        self,
+        applet_ids: list[uuid.UUID] | None,
+        after: str | None,
+        limit: int,
+    ) -> list[Row]:
+        """Versions without a change-log ordered by id_version,
+        returns (id, version, id_version) rows.
+        """
+        has_changes = exists().where(
+            tuple_(AppletHistoryChangeSchema.id, AppletHistoryChangeSchema.version)
+            == tuple_(AppletHistorySchema.id, AppletHistorySchema.version)
+        )
+        query: Query = select(AppletHistorySchema.id, AppletHistorySchema.version, AppletHistorySchema.id_version)
+        query = query.where(~has_changes)
+        if applet_ids:
+            query = query.where(AppletHistorySchema.id.in_(applet_ids))
+        if after is not None:
+            query = query.where(AppletHistorySchema.id_version > after)
+        query = query.order_by(AppletHistorySchema.id_version).limit(limit)
+        result = await self._execute(query)
+        return result.all()
@@ -1,11 +1,11 @@
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text, text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, LargeBinary, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy_utils.types import IPAddressType
 
 from infrastructure.database.base import Base
 from infrastructure.database.mixins import HistoryAware
 
-__all__ = ["AppletSchema", "AppletHistorySchema"]
+__all__ = ["AppletSchema", "AppletHistorySchema", "AppletHistoryChangeSchema"]
 
 
 class _BaseAppletSchema:
@@ -52,3 +52,16 @@ class AppletHistorySchema(_BaseAppletSchema, HistoryAware, Base):
     display_name = Column(String(length=100))
 
     user_id = Column(ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
+
+
+class AppletHistoryChangeSchema(Base):
+    """Change-log of an applet version compared with the previous one,
+    built once from the history tables.
+    """
+
+    __tablename__ = "applet_history_changes"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    version = Column(String(255), primary_key=True)
+    # zlib compressed JSON of AppletHistoryChange
+    changes = Column(LargeBinary(), nullable=False)
@@ -10,7 +10,7 @@ from apps.activity_flows.crud import FlowsCRUD
 from apps.activity_flows.domain.flow_create import FlowCreate, FlowItemCreate
 from apps.activity_flows.service.flow import FlowService
 from apps.answers.crud.answers import AnswersCRUD
-from apps.applets.crud import AppletHistoriesCRUD, AppletsCRUD, UserAppletAccessCRUD
+from apps.applets.crud import AppletHistoriesCRUD, AppletHistoryChangesCRUD, AppletsCRUD, UserAppletAccessCRUD
 from apps.applets.db.schemas import AppletSchema
 from apps.applets.domain import (
     AppletActivitiesBaseInfo,
@@ -34,6 +34,7 @@ from apps.applets.errors import (
     AppletsFolderAccessDenied,
 )
 from apps.applets.service.applet_history_service import AppletHistoryService
+from apps.applets.service.applet_version_cache import AppletVersionCache
 from apps.folders.crud import FolderAppletCRUD, FolderCRUD
 from apps.schedule.service import ScheduleService
 from apps.shared.version import (
@@ -45,10 +46,12 @@ from apps.shared.version import (
 from apps.subjects.domain import SubjectCreate
 from apps.subjects.services import SubjectsService
 from apps.themes.service import ThemeService
+from apps.users.cruds.user_device import UserDevicesCRUD
 from apps.users.services.user import UserService
 from apps.workspaces.errors import AppletEncryptionUpdateDenied
 from apps.workspaces.service.user_applet_access import UserAppletAccessService
 from config import settings
+from infrastructure.database import atomic, session_manager
 
 __all__ = [
     "AppletService",
@@ -715,6 +718,8 @@ class AppletService:
         applet = await repository.get_by_id(applet_id)
         await repository.set_report_configuration(applet_id, schema)
         await AppletHistoriesCRUD(self.session).set_report_configuration(applet.id, applet.version, schema)
+        await AppletHistoryChangesCRUD(self.session).delete_current(applet.id)
+        AppletVersionCache.invalidate_on_commit(self.session, applet.id)
 
     async def send_notification_to_applet_respondents(
         self,
@@ -730,7 +735,7 @@ class AppletService:
             device_ids = []
         respondents_device_ids = await AppletsCRUD(self.session).get_respondents_device_ids(applet_id, respondent_ids)
         respondents_device_ids += device_ids
-        await FCMNotification().notify(
+        result = await FCMNotification().notify(
             respondents_device_ids,
             FirebaseMessage(
                 title=title,
@@ -741,6 +746,11 @@ class AppletService:
                 ),
             ),
         )
+        if result.unregistered:
+            # notifications are sent after the request transaction, so devices are removed in a separate one
+            async with session_manager.get_session()() as session:
+                async with atomic(session):
+                    await UserDevicesCRUD(session).remove_by_device_ids(result.unregistered)
 
     async def get_info_by_id(self, applet_id: uuid.UUID, language: str) -> AppletActivitiesBaseInfo:
         schema = await AppletsCRUD(self.session).get_by_id(applet_id)
@@ -4,9 +4,17 @@ from apps.activities.crud import ActivityHistoriesCRUD, ActivityItemHistoriesCRU
 from apps.activity_flows.crud import FlowItemHistoriesCRUD, FlowsHistoryCRUD
 from apps.applets.crud import AppletHistoriesCRUD
 from apps.applets.domain.applets.history_detail import Activity, ActivityFlow, ActivityFlowItem, ActivityItem, Applet
+from apps.applets.service.applet_version_cache import AppletVersionCache
+from infrastructure.cache import CacheNotFound
 
 
 async def retrieve_applet_by_version(session, applet_id: uuid.UUID, version: str) -> Applet:
+    cache = AppletVersionCache("detail", Applet)
+    try:
+        return await cache.get(applet_id, version)
+    except CacheNotFound:
+        pass
+
     id_version = f"{applet_id}_{version}"
 
     applet_schema = await AppletHistoriesCRUD(session).retrieve_by_applet_version(id_version)
@@ -36,4 +44,5 @@ async def retrieve_applet_by_version(session, applet_id: uuid.UUID, version: str
         flow_item = ActivityFlowItem.from_orm(flow_item_schema)
         flow_item.activity = activity_map[flow_item.activity_id]
         flow_map[flow_item.activity_flow_id].items.append(flow_item)
+    await cache.set(applet_id, version, applet)
     return applet
@@ -1,14 +1,17 @@
 import uuid
+import zlib
 
 from apps.activities.services import ActivityHistoryService
 from apps.activity_flows.service.flow_history import FlowHistoryService
-from apps.applets.crud import AppletHistoriesCRUD
+from apps.applets.crud import AppletHistoriesCRUD, AppletHistoryChangesCRUD
 from apps.applets.db.schemas import AppletHistorySchema
 from apps.applets.domain import AppletHistory, AppletHistoryChange
 from apps.applets.domain.applet_full import AppletFull, AppletHistoryFull
 from apps.applets.errors import NotValidAppletHistory
 from apps.applets.service.applet_change import AppletChangeService
+from apps.applets.service.applet_version_cache import AppletVersionCache
 from apps.shared.version import INITIAL_VERSION
+from infrastructure.cache import CacheNotFound
 
 __all__ = ["AppletHistoryService"]
 
@@ -48,6 +51,25 @@ class AppletHistoryService:
         await FlowHistoryService(self.session, applet.id, applet.version).add(applet.activity_flows)
 
     async def get_changes(self) -> AppletHistoryChange:
+        """Returns the change-log of the version. It is saved by a background
+        task when the version is created, older versions are built on the
+        first request.
+        """
+        changes = await AppletHistoryChangesCRUD(self.session).get_changes(self._applet_id, self._version)
+        if changes is not None:
+            return AppletHistoryChange.parse_raw(zlib.decompress(changes))
+        return await self.save_changes()
+
+    async def save_changes(self) -> AppletHistoryChange:
+        crud = AppletHistoryChangesCRUD(self.session)
+        # in-place updates of the history rows wait for the change-log to be saved before dropping it
+        await crud.lock_applet(self._applet_id, exclusive=False)
+        changes = await self.build_changes()
+        await crud.save(self._applet_id, self._version, zlib.compress(changes.json().encode()))
+        return changes
+
+    async def build_changes(self) -> AppletHistoryChange:
+        """Compares the version with the previous one."""
         prev_version = await self.get_prev_version()
         old_id_version = f"{self._applet_id}_{prev_version}"
         changes = await self._get_applet_changes(old_id_version)
@@ -83,10 +105,18 @@ class AppletHistoryService:
         return prev_version
 
     async def get_full(self, non_performance=False) -> AppletHistoryFull:
+        """Returns the applet version, the cached instance is shared, so it must not be changed."""
+        cache = AppletVersionCache("full_non_performance" if non_performance else "full", AppletHistoryFull)
+        try:
+            return await cache.get(self._applet_id, self._version)
+        except CacheNotFound:
+            pass
+
         schema = await AppletHistoriesCRUD(self.session).get_by_id_version(self._id_version)
         applet = AppletHistoryFull.from_orm(schema)
         applet.activities = await ActivityHistoryService(self.session, self._applet_id, self._version).get_full(
             non_performance
         )
         applet.activity_flows = await FlowHistoryService(self.session, self._applet_id, self._version).get_full()
+        await cache.set(self._applet_id, self._version, applet)
         return applet
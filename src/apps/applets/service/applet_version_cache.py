@@ -0,0 +1,123 @@
+import functools
+import uuid
+import zlib
+from contextlib import suppress
+from typing import Generic, Literal, Type, TypeVar
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.database import after_commit
+from infrastructure.utility import RedisCache
+
+__all__ = ["AppletVersionCache"]
+
+_Model = TypeVar("_Model", bound=BaseModel)
+
+# "export_activity" entries are activity versions with the items, keyed by the activity id_version
+VersionKind = Literal["full", "full_non_performance", "detail", "export_activity"]
+
+
+class AppletVersionCache(Generic[_Model]):
+    """Two tier cache of applet versions built from the history tables.
+
+    The history of an applet version is written once, so an entry is never
+    replaced. The few updates of the history rows (report settings, library
+    name) replace the revision of the applet, which is a part of the keys:
+        AppletVersionCache:<kind>:<applet_id>_<version>:<revision>
+
+    The revision is replaced after the update is committed, and a version
+    built after a cache miss is stored under the revision read before the
+    miss, so a version built concurrently with the update is never stored
+    under the new revision.
+
+    Redis values are zlib compressed JSON. The process tier keeps decoded
+    models which are shared by all the callers, so they must not be changed.
+    """
+
+    _local: LocalCache[BaseModel] = LocalCache(maxsize=settings.cache.applet_version_local_maxsize)
+    _revisions: LocalCache[str] = LocalCache(
+        maxsize=settings.cache.applet_version_local_maxsize,
+        ttl=settings.cache.version_check_ttl,
+    )
+    redis_hits = 0
+    redis_misses = 0
+
+    def __init__(self, kind: VersionKind, model: Type[_Model]):
+        self.kind = kind
+        self.model = model
+        self.redis_client = RedisCache()
+        # keys of the missed versions
+        self._missed: dict[tuple[uuid.UUID, str], str] = {}
+
+    @classmethod
+    def _revision_key(cls, applet_id: uuid.UUID) -> str:
+        return f"{cls.__name__}:revision:{applet_id}"
+
+    async def _get_revision(self, applet_id: uuid.UUID) -> str:
+        key = self._revision_key(applet_id)
+        try:
+            return self._revisions.get(key)
+        except CacheNotFound:
+            pass
+        revision = await self.redis_client.get(key) or "0"
+        revision = revision.decode() if isinstance(revision, bytes) else revision
+        self._revisions.set(key, revision)
+        return revision
+
+    async def _build_key(self, applet_id: uuid.UUID, version: str) -> str:
+        revision = await self._get_revision(applet_id)
+        return f"{self.__class__.__name__}:{self.kind}:{applet_id}_{version}:{revision}"
+
+    async def get(self, applet_id: uuid.UUID, version: str) -> _Model:
+        """Returns cached applet version or raises CacheNotFound."""
+        key = await self._build_key(applet_id, version)
+        try:
+            return self._local.get(key)  # type: ignore[return-value]
+        except CacheNotFound:
+            pass
+
+        cached = await self.redis_client.get(key)
+        if cached is None:
+            AppletVersionCache.redis_misses += 1
+            self._missed[(applet_id, version)] = key
+            raise CacheNotFound()
+        AppletVersionCache.redis_hits += 1
+        value = self.model.parse_raw(zlib.decompress(cached))
+        self._local.set(key, value)
+        return value
+
+    async def set(self, applet_id: uuid.UUID, version: str, value: _Model) -> None:
+        key = self._missed.pop((applet_id, version), None) or await self._build_key(applet_id, version)
+        self._local.set(key, value)
+        with suppress(RedisError):
+            await self.redis_client.set(
+                key,
+                zlib.compress(value.json().encode()),
+                ex=settings.cache.applet_version_redis_ttl,
+            )
+
+    @classmethod
+    async def invalidate(cls, applet_id: uuid.UUID) -> None:
+        """Drops cached versions of the applet after its history rows are updated."""
+        key = cls._revision_key(applet_id)
+        revision = uuid.uuid4().hex
+        await RedisCache().set(key, revision, persist=True)
+        cls._revisions.set(key, revision)
+
+    @classmethod
+    def invalidate_on_commit(cls, session: AsyncSession, applet_id: uuid.UUID) -> None:
+        """Drops cached versions of the applet once the transaction updating its history rows is committed."""
+        after_commit(session, functools.partial(cls.invalidate, applet_id))
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return dict(
+            local_hits=cls._local.hits,
+            local_misses=cls._local.misses,
+            redis_hits=cls.redis_hits,
+            redis_misses=cls.redis_misses,
+        )
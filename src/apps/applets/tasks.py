@@ -0,0 +1,23 @@
+import traceback
+import uuid
+
+import sentry_sdk
+
+from apps.applets.service.applet_history_service import AppletHistoryService
+from broker import broker
+from infrastructure.database import atomic, session_manager
+
+
+@broker.task()
+async def save_applet_version_changes(applet_id: uuid.UUID, version: str) -> None:
+    """Builds the change-log of a new applet version, must be sent after
+    the version is committed.
+    """
+    session_maker = session_manager.get_session()
+    try:
+        async with session_maker() as session:
+            async with atomic(session):
+                await AppletHistoryService(session, applet_id, version).save_changes()
+    except Exception as e:
+        traceback.print_exception(e)
+        sentry_sdk.capture_exception(e)
@@ -34,6 +34,7 @@ from apps.subjects.domain import Subject
 from apps.users.domain import User
 from apps.workspaces.domain.constants import Role
 from apps.workspaces.errors import AppletCreationAccessDenied, AppletEncryptionUpdateDenied
+from infrastructure.database import atomic
 from infrastructure.utility import FCMNotificationTest
 
 
@@ -249,17 +250,18 @@ class TestApplet:
     async def test_duplicate_applet_default_exclude_report_server_config(
         self, client: TestClient, tom: User, applet_one: AppletFull, encryption: Encryption, session: AsyncSession
     ):
-        await AppletService(session, tom.id).set_report_configuration(
-            applet_one.id,
-            AppletReportConfiguration(
-                report_server_ip="ipaddress",
-                report_public_key="public key",
-                report_recipients=["recipient1", "recipient1"],
-                report_include_user_id=True,
-                report_include_case_id=True,
-                report_email_body="email body",
-            ),
-        )
+        async with atomic(session):
+            await AppletService(session, tom.id).set_report_configuration(
+                applet_one.id,
+                AppletReportConfiguration(
+                    report_server_ip="ipaddress",
+                    report_public_key="public key",
+                    report_recipients=["recipient1", "recipient1"],
+                    report_include_user_id=True,
+                    report_include_case_id=True,
+                    report_email_body="email body",
+                ),
+            )
 
         client.login(tom)
         new_name = "New Name"
@@ -281,17 +283,18 @@ class TestApplet:
     async def test_duplicate_applet_include_report_server_config(
         self, client: TestClient, tom: User, applet_one: AppletFull, encryption: Encryption, session: AsyncSession
     ):
-        await AppletService(session, tom.id).set_report_configuration(
-            applet_one.id,
-            AppletReportConfiguration(
-                report_server_ip="ipaddress",
-                report_public_key="public key",
-                report_recipients=["recipient1", "recipient1"],
-                report_include_user_id=True,
-                report_include_case_id=True,
-                report_email_body="email body",
-            ),
-        )
+        async with atomic(session):
+            await AppletService(session, tom.id).set_report_configuration(
+                applet_one.id,
+                AppletReportConfiguration(
+                    report_server_ip="ipaddress",
+                    report_public_key="public key",
+                    report_recipients=["recipient1", "recipient1"],
+                    report_include_user_id=True,
+                    report_include_case_id=True,
+                    report_email_body="email body",
+                ),
+            )
 
         client.login(tom)
         new_name = "New Name"
@@ -0,0 +1,49 @@
+import uuid
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.activities.db.schemas import ActivityItemHistorySchema
+from apps.activities.domain.activity_create import ActivityCreate, ActivityItemCreate
+from apps.applets.domain.applet_create_update import AppletCreate
+from apps.applets.service import AppletService
+from apps.users.domain import User
+
+ACTIVITIES = 50
+ITEMS = 30
+
+
+async def test_create_large_applet_inserts_items_in_bulk(
+    session: AsyncSession, tom: User, applet_minimal_data: AppletCreate, item_create: ActivityItemCreate
+):
+    activities = [
+        ActivityCreate(
+            name=f"activity {i}",
+            description={"en": "activity"},
+            items=[item_create.copy(update=dict(name=f"item_{j}")) for j in range(ITEMS)],
+            key=uuid.uuid4(),
+        )
+        for i in range(ACTIVITIES)
+    ]
+    create_data = applet_minimal_data.copy(update=dict(display_name="Large applet", activities=activities))
+
+    statements: list[str] = []
+
+    def collect(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", collect)
+    try:
+        applet = await AppletService(session, tom.id).create(create_data)
+    finally:
+        event.remove(Engine, "before_cursor_execute", collect)
+
+    assert len(applet.activities) == ACTIVITIES
+    assert all(len(activity.items) == ITEMS for activity in applet.activities)
+    item_ids = [item.id for activity in applet.activities for item in activity.items]
+    query = select(func.count()).where(ActivityItemHistorySchema.id.in_(item_ids))
+    assert (await session.execute(query)).scalar() == ACTIVITIES * ITEMS
+    # all the items of the applet and their history rows fit in one multi-row insert each
+    assert sum(statement.startswith("INSERT INTO activity_items ") for statement in statements) == 1
+    assert sum(statement.startswith("INSERT INTO activity_item_histories ") for statement in statements) == 1
@@ -0,0 +1,38 @@
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.applets.crud import AppletHistoryChangesCRUD
+from apps.applets.domain.applet_create_update import AppletCreate, AppletUpdate
+from apps.applets.service import AppletService
+from apps.applets.service.applet_history_service import AppletHistoryService
+from apps.users.domain import User
+
+
+async def test_changes_are_built_once_and_dropped_after_history_update(
+    session: AsyncSession, tom: User, applet_minimal_data: AppletCreate, mocker: MockerFixture
+):
+    service = AppletService(session, tom.id)
+    applet = await service.create(applet_minimal_data.copy(update=dict(display_name="Change log")))
+    data = AppletUpdate(**applet.dict())
+    data.display_name = "Change log renamed"
+    updated = await service.update(applet.id, data)
+    history_service = AppletHistoryService(session, applet.id, updated.version)
+    spy = mocker.spy(history_service, "build_changes")
+
+    changes = await history_service.get_changes()
+    assert changes.display_name == "Applet Change log renamed updated"
+    assert await history_service.get_changes() == changes
+    assert spy.call_count == 1
+
+    await AppletHistoryChangesCRUD(session).delete_current(applet.id)
+    assert await AppletHistoryChangesCRUD(session).get_changes(applet.id, updated.version) is None
+    assert await history_service.get_changes() == changes
+    assert spy.call_count == 2
+
+
+async def test_stored_changes_are_not_overwritten(session: AsyncSession, tom: User, applet_minimal_data: AppletCreate):
+    applet = await AppletService(session, tom.id).create(applet_minimal_data.copy(update=dict(display_name="Stored")))
+    crud = AppletHistoryChangesCRUD(session)
+    await crud.save(applet.id, applet.version, b"stored")
+    await crud.save(applet.id, applet.version, b"stale")
+    assert await crud.get_changes(applet.id, applet.version) == b"stored"
@@ -0,0 +1,46 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.activities.db.schemas import ActivityHistorySchema, ActivityItemHistorySchema
+from apps.applets.domain.applet_create_update import AppletCreate, AppletUpdate
+from apps.applets.service import AppletService
+from apps.applets.service.applet_history_service import AppletHistoryService
+from apps.users.domain import User
+
+
+async def _count_item_histories(session: AsyncSession, activity_id) -> int:
+    query = select(func.count()).select_from(ActivityItemHistorySchema)
+    query = query.where(ActivityItemHistorySchema.activity_id.like(f"{activity_id}_%"))
+    return (await session.execute(query)).scalar()
+
+
+async def test_unchanged_activity_items_are_shared_between_versions(
+    session: AsyncSession, tom: User, applet_minimal_data: AppletCreate
+):
+    service = AppletService(session, tom.id)
+    applet = await service.create(applet_minimal_data.copy(update=dict(display_name="History items")))
+    activity = applet.activities[0]
+    items_count = len(activity.items)
+
+    data = AppletUpdate(**applet.dict())
+    data.display_name = "History items renamed"
+    renamed = await service.update(applet.id, data)
+
+    assert await _count_item_histories(session, activity.id) == items_count
+    history = await session.get(ActivityHistorySchema, f"{activity.id}_{renamed.version}")
+    assert history.items_id_version == f"{activity.id}_{applet.version}"
+
+    applet_history = await AppletHistoryService(session, applet.id, renamed.version).get_full()
+    items = applet_history.activities[0].items
+    assert [item.id_version for item in items] == [f"{item.id}_{renamed.version}" for item in activity.items]
+    assert {item.activity_id for item in items} == {f"{activity.id}_{renamed.version}"}
+
+    data = AppletUpdate(**renamed.dict())
+    data.activities[0].items[0].name = "renamed_item"
+    changed = await service.update(applet.id, data)
+
+    assert await _count_item_histories(session, activity.id) == 2 * items_count
+    history = await session.get(ActivityHistorySchema, f"{activity.id}_{changed.version}")
+    assert history.items_id_version == history.id_version
+    changes = await AppletHistoryService(session, applet.id, changed.version).get_changes()
+    assert changes.activities
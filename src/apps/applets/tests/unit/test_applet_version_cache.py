@@ -0,0 +1,48 @@
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.applets.crud.applets_history import AppletHistoriesCRUD
+from apps.applets.domain.applet_full import AppletFull
+from apps.applets.domain.base import AppletReportConfigurationBase
+from apps.applets.service import AppletHistoryService, AppletService
+from apps.applets.service.applet_version_cache import AppletVersionCache
+from apps.users.domain import User
+from infrastructure.cache import LocalCache
+from infrastructure.database import atomic
+
+
+async def test_get_full_reuses_cached_version(session: AsyncSession, applet_one: AppletFull, mocker: MockerFixture):
+    spy = mocker.spy(AppletHistoriesCRUD, "get_by_id_version")
+    service = AppletHistoryService(session, applet_one.id, applet_one.version)
+    applet = await service.get_full()
+    assert await service.get_full() is applet
+    assert spy.call_count == 1
+
+
+async def test_get_full_decodes_redis_tier(session: AsyncSession, applet_one: AppletFull, mocker: MockerFixture):
+    service = AppletHistoryService(session, applet_one.id, applet_one.version)
+    applet = await service.get_full()
+
+    # other process: local tier is empty
+    LocalCache.clear_all()
+    spy = mocker.spy(AppletHistoriesCRUD, "get_by_id_version")
+    redis_hits = AppletVersionCache.redis_hits
+    assert await service.get_full() == applet
+    assert AppletVersionCache.redis_hits == redis_hits + 1
+    assert spy.call_count == 0
+
+
+async def test_report_configuration_update_invalidates_version(
+    session: AsyncSession,
+    tom: User,
+    applet_one: AppletFull,
+    applet_report_configuration_data: AppletReportConfigurationBase,
+):
+    service = AppletHistoryService(session, applet_one.id, applet_one.version)
+    applet = await service.get_full()
+    async with atomic(session):
+        await AppletService(session, tom.id).set_report_configuration(applet_one.id, applet_report_configuration_data)
+        # the cached version is used until the update is committed
+        assert await service.get_full() is applet
+    applet = await service.get_full()
+    assert applet.report_server_ip == applet_report_configuration_data.report_server_ip
@@ -4,8 +4,9 @@ from typing import cast
 
 import pytest
 
-from apps.applets.commands.applet_ema import RawRow, filter_events, is_last_day_of_month
+from apps.applets.commands.applet_ema import RawRow, filter_events
 from apps.schedule.domain.constants import PeriodicityType
+from apps.schedule.service.occurrences import is_last_day_of_month
 from apps.shared.version import INITIAL_VERSION
 
 
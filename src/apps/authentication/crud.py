@@ -1,4 +1,7 @@
 import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import select
 
 from apps.authentication.db.schemas import TokenBlacklistSchema
 from apps.authentication.domain.token import InternalToken, TokenPurpose
@@ -21,3 +24,12 @@ class TokenBlacklistCRUD(BaseCRUD):
 
     async def exists(self, token: InternalToken) -> bool:
         return await self.exist_by_key("jti", token.payload.jti)
+
+    async def get_not_expired(self, batch_size: int = 10_000) -> AsyncIterator[list[tuple[str, datetime.datetime]]]:
+        """Yields (jti, exp) of the tokens which are not expired yet by batches."""
+        query = select(TokenBlacklistSchema.jti, TokenBlacklistSchema.exp)
+        query = query.where(TokenBlacklistSchema.exp > datetime.datetime.utcnow())
+        query = query.order_by(TokenBlacklistSchema.exp)
+        result = await self.session.stream(query.execution_options(yield_per=batch_size))
+        async for rows in result.partitions(batch_size):
+            yield [(row.jti, row.exp) for row in rows]
@@ -13,6 +13,7 @@ from apps.authentication.errors import AuthenticationError
 from apps.authentication.services import AuthenticationService
 from apps.users.cruds.user import UsersCRUD
 from apps.users.domain import User
+from apps.users.services.last_seen import last_seen_aggregator
 from config import settings
 from infrastructure.database import atomic
 from infrastructure.database.deps import get_session
@@ -96,7 +97,7 @@ async def get_current_user(
             raise AuthenticationError
 
         user = await UsersCRUD(session).get_by_id(id_=token.payload.sub)
-        await UsersCRUD(session).update_last_seen_by_id(token.payload.sub)
+    last_seen_aggregator.touch(user.id)
 
     return user
 
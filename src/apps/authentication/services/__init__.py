@@ -1,2 +1,3 @@
 from apps.authentication.services.core import *  # noqa: F401, F403
+from apps.authentication.services.revocation import *  # noqa: F401, F403
 from apps.authentication.services.security import *  # noqa: F401, F403
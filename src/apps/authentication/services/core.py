@@ -2,6 +2,7 @@ import datetime
 
 from apps.authentication.crud import TokenBlacklistCRUD
 from apps.authentication.domain.token import InternalToken, TokenPurpose
+from apps.authentication.services.revocation import TokenRevocationIndex
 
 __all__ = ["TokensService"]
 
@@ -11,7 +12,14 @@ class TokensService:
         self.session = session
 
     async def is_revoked(self, token: InternalToken) -> bool:
-        return await TokenBlacklistCRUD(self.session).exists(token)
+        index = TokenRevocationIndex()
+        revoked = await index.is_revoked(token)
+        if revoked is not None:
+            return revoked
+        revoked = await TokenBlacklistCRUD(self.session).exists(token)
+        if not revoked:
+            await index.remember_not_revoked(token)
+        return revoked
 
     async def revoke(self, token: InternalToken, type_: TokenPurpose) -> None:
         now = datetime.datetime.utcnow()
@@ -20,3 +28,4 @@ class TokensService:
             revoked = await self.is_revoked(token)
             if not revoked:
                 await TokenBlacklistCRUD(self.session).create(token, type_)
+                await TokenRevocationIndex().add(token.payload.jti, token.payload.exp)
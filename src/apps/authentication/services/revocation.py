@@ -0,0 +1,92 @@
+import datetime
+from contextlib import suppress
+from typing import Iterable
+
+from redis.exceptions import RedisError
+
+from apps.authentication.domain.token import InternalToken
+from config import settings
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.utility import RedisCache
+
+__all__ = ["TokenRevocationIndex"]
+
+_REVOKED = "1"
+_NOT_REVOKED = "0"
+
+
+class TokenRevocationIndex:
+    """Redis index of the answers of the token blacklist table.
+
+    Revocations are kept until the token expires, "not revoked" answers
+    checked against the database for `token_revocation_redis_ttl` seconds.
+    A revocation replaces the "not revoked" answer, and a "not revoked"
+    answer never replaces a revocation. Keys missing in redis (not checked
+    yet, evicted, or not written because of redis errors) are answered with
+    None and the caller has to check the database, so the index never
+    accepts a revoked token it has lost.
+
+    Each process keeps the answers locally: revocations forever (until the
+    token expires), "not revoked" for `token_revocation_local_ttl` seconds.
+    """
+
+    _local: LocalCache[bool] = LocalCache(maxsize=settings.cache.token_revocation_local_maxsize)
+
+    def __init__(self):
+        self.redis_client = RedisCache()
+
+    def _build_key(self, jti: str) -> str:
+        return f"{self.__class__.__name__}:{jti}"
+
+    @staticmethod
+    def _ttl(exp: int) -> int:
+        now = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc)
+        return exp - int(now.timestamp())
+
+    async def is_revoked(self, token: InternalToken) -> bool | None:
+        jti = token.payload.jti
+        try:
+            return self._local.get(jti)
+        except CacheNotFound:
+            pass
+        value = await self.redis_client.get(self._build_key(jti))
+        value = value.decode() if isinstance(value, bytes) else value
+        if value == _REVOKED:
+            self._local.set(jti, True, ttl=max(self._ttl(token.payload.exp), 1))
+            return True
+        if value == _NOT_REVOKED:
+            self._remember_locally(token)
+            return False
+        return None
+
+    def _remember_locally(self, token: InternalToken) -> None:
+        ttl = min(self._ttl(token.payload.exp), settings.cache.token_revocation_local_ttl)
+        if ttl > 0:
+            self._local.set(token.payload.jti, False, ttl=ttl)
+
+    async def remember_not_revoked(self, token: InternalToken) -> None:
+        """Keeps the answer of the database, unless the token is revoked meanwhile."""
+        self._remember_locally(token)
+        ttl = min(self._ttl(token.payload.exp), settings.cache.token_revocation_redis_ttl)
+        if ttl < 1:
+            return
+        with suppress(RedisError):
+            await self.redis_client.set(self._build_key(token.payload.jti), _NOT_REVOKED, ex=ttl, nx=True)
+
+    async def add(self, jti: str, exp: int) -> None:
+        ttl = self._ttl(exp)
+        if ttl < 1:
+            return
+        self._local.set(jti, True, ttl=ttl)
+        # the revocation is stored in the database, the index is checked against it on a miss
+        with suppress(RedisError):
+            await self.redis_client.set(self._build_key(jti), _REVOKED, ex=ttl)
+
+    async def load(self, revoked: Iterable[tuple[str, int]]) -> int:
+        """Adds (jti, exp) pairs to the index. Returns the number of added tokens."""
+        count = 0
+        for jti, exp in revoked:
+            if self._ttl(exp) >= 1:
+                await self.add(jti, exp)
+                count += 1
+        return count
@@ -18,6 +18,7 @@ from apps.users.cruds.user import UsersCRUD
 from apps.users.db.schemas import UserSchema
 from apps.users.domain import User
 from apps.users.errors import UserNotFound
+from apps.users.services.last_seen import last_seen_aggregator
 from config import settings
 
 TEST_PASSWORD = "Test1234!"
@@ -83,6 +84,7 @@ async def test_get_current_user_for_ws(user: User, access_token: str, session: A
 async def test_get_current_user(faketime, session: AsyncSession, access_token_internal: InternalToken, user: User):
     current_user = await get_current_user(token=access_token_internal, session=session)
     assert current_user.id == user.id
+    await last_seen_aggregator.flush(session)
     crud = UsersCRUD(session)
     user_db = await crud._get("id", user.id)
     user_db = cast(UserSchema, user_db)
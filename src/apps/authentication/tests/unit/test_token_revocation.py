@@ -0,0 +1,78 @@
+import datetime
+
+from pytest_mock import MockerFixture
+from redis.exceptions import RedisError
+
+from apps.authentication.crud import TokenBlacklistCRUD
+from apps.authentication.domain.token import InternalToken
+from apps.authentication.domain.token.internal import TokenPurpose
+from apps.authentication.services import TokenRevocationIndex
+from apps.authentication.services.core import TokensService
+from infrastructure.cache import LocalCache
+
+
+class TestTokenRevocationIndex:
+    async def test_unknown_token_is_not_answered(self, access_token_internal: InternalToken):
+        assert await TokenRevocationIndex().is_revoked(access_token_internal) is None
+
+    async def test_revoked_token(self, access_token_internal: InternalToken):
+        index = TokenRevocationIndex()
+        await index.add(access_token_internal.payload.jti, access_token_internal.payload.exp)
+        LocalCache.clear_all()
+        assert await index.is_revoked(access_token_internal) is True
+
+    async def test_not_revoked_answer_does_not_replace_revocation(self, access_token_internal: InternalToken):
+        index = TokenRevocationIndex()
+        await index.add(access_token_internal.payload.jti, access_token_internal.payload.exp)
+        # the database was checked before the token was revoked
+        await index.remember_not_revoked(access_token_internal)
+        LocalCache.clear_all()
+        assert await index.is_revoked(access_token_internal) is True
+
+    async def test_expired_token_is_not_added(self, access_token_internal: InternalToken):
+        index = TokenRevocationIndex()
+        assert await index.load([(access_token_internal.payload.jti, 0)]) == 0
+        assert await index.is_revoked(access_token_internal) is None
+
+    async def test_is_revoked_without_db_query(
+        self, token_blacklist_service: TokensService, access_token_internal: InternalToken, mocker: MockerFixture
+    ):
+        spy = mocker.spy(TokenBlacklistCRUD, "exists")
+        assert not await token_blacklist_service.is_revoked(access_token_internal)
+        # other process
+        LocalCache.clear_all()
+        assert not await token_blacklist_service.is_revoked(access_token_internal)
+        assert spy.await_count == 1
+
+    async def test_lost_index_entry_is_checked_in_database(
+        self, token_blacklist_service: TokensService, access_token_internal: InternalToken, mocker: MockerFixture
+    ):
+        mocker.patch("infrastructure.utility.redis_client.RedisCache.set", side_effect=RedisError())
+        await token_blacklist_service.revoke(access_token_internal, TokenPurpose.ACCESS)
+        # other process
+        LocalCache.clear_all()
+        assert await token_blacklist_service.is_revoked(access_token_internal)
+
+    async def test_not_revoked_answer_is_cached(
+        self, token_blacklist_service: TokensService, access_token_internal: InternalToken, mocker: MockerFixture
+    ):
+        spy = mocker.spy(TokenBlacklistCRUD, "exists")
+        assert not await token_blacklist_service.is_revoked(access_token_internal)
+        assert not await token_blacklist_service.is_revoked(access_token_internal)
+        assert spy.await_count == 1
+
+    async def test_revoke_writes_through(
+        self, token_blacklist_service: TokensService, access_token_internal: InternalToken
+    ):
+        assert not await token_blacklist_service.is_revoked(access_token_internal)
+        await token_blacklist_service.revoke(access_token_internal, TokenPurpose.ACCESS)
+        # other process
+        LocalCache.clear_all()
+        assert await TokenRevocationIndex().is_revoked(access_token_internal)
+
+    async def test_get_not_expired(self, token_blacklist_service: TokensService, access_token_internal: InternalToken):
+        await token_blacklist_service.revoke(access_token_internal, TokenPurpose.ACCESS)
+        batches = [batch async for batch in TokenBlacklistCRUD(token_blacklist_service.session).get_not_expired()]
+        revoked = dict(row for batch in batches for row in batch)
+        assert access_token_internal.payload.jti in revoked
+        assert revoked[access_token_internal.payload.jti] > datetime.datetime.utcnow()
@@ -10,7 +10,7 @@ from urllib.parse import quote
 import aiofiles
 import pytz
 from botocore.exceptions import ClientError
-from fastapi import Body, Depends, File, Query, UploadFile
+from fastapi import Body, Depends, File, Header, Query, UploadFile
 from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from taskiq import TaskiqResult, TaskiqResultTimeoutError
@@ -187,19 +187,32 @@ def _get_keys_and_bucket_for_image(
     return target_key, upload_key, bucket
 
 
-async def download(
-    request: FileDownloadRequest = Body(...),
-    user: User = Depends(get_current_user),
-    cdn_client: CDNClient = Depends(get_media_bucket),
+async def _stream_download(
+    cdn_client: CDNClient, key: str, range_header: str | None, if_none_match: str | None
 ) -> StreamingResponse:
     try:
-        file, media_type = cdn_client.download(request.key)
+        stream = await cdn_client.stream(key, range_header=range_header, if_none_match=if_none_match)
     except ClientError:
         raise SomethingWentWrongError
     except ObjectNotFoundError:
         raise FileNotFoundError
 
-    return StreamingResponse(file, media_type=media_type)
+    return StreamingResponse(
+        stream.chunks or iter(()),
+        status_code=stream.status_code,
+        headers=stream.headers,
+        media_type=stream.media_type,
+    )
+
+
+async def download(
+    request: FileDownloadRequest = Body(...),
+    user: User = Depends(get_current_user),
+    cdn_client: CDNClient = Depends(get_media_bucket),
+    range_header: str | None = Header(None, alias="Range"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
+) -> StreamingResponse:
+    return await _stream_download(cdn_client, request.key, range_header, if_none_match)
 
 
 async def answer_upload(
@@ -261,18 +274,14 @@ async def answer_download(
     request: FileDownloadRequest = Body(...),
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+    range_header: str | None = Header(None, alias="Range"),
+    if_none_match: str | None = Header(None, alias="If-None-Match"),
 ) -> StreamingResponse:
     cdn_client = await select_storage(applet_id=applet_id, session=session)
     if request.key.startswith(LogFileService.LOG_KEY):
         LogFileService.raise_for_access(user.email)
 
-    try:
-        file, media_type = cdn_client.download(request.key)
-    except ClientError:
-        raise SomethingWentWrongError
-    except ObjectNotFoundError:
-        raise FileNotFoundError
-    return StreamingResponse(file, media_type=media_type)
+    return await _stream_download(cdn_client, request.key, range_header, if_none_match)
 
 
 async def check_file_uploaded(
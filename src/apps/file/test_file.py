@@ -1,6 +1,8 @@
+import asyncio
 import http
 import io
-from typing import Any, Callable, Generator, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Generator, cast
 
 import pytest
 from botocore.exceptions import ClientError, EndpointConnectionError
@@ -24,11 +26,17 @@ from apps.workspaces.errors import AnswerViewAccessDenied
 from apps.workspaces.service.workspace import WorkspaceService
 from config import settings
 from config.cdn import CDNSettings
+from infrastructure.database import atomic
 from infrastructure.utility.cdn_arbitrary import ArbitraryS3CdnClient
-from infrastructure.utility.cdn_client import CDNClient
+from infrastructure.utility.cdn_client import CDNClient, ObjectStream
 from infrastructure.utility.cdn_config import CdnConfig
 
 
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
 @pytest.fixture
 def mock_presigned_post(mocker: MockerFixture):
     def fake_generate_presigned_post(_, bucket: str, key: str, ExpiresIn=settings.cdn.ttl_signed_urls):
@@ -70,7 +78,8 @@ async def tom_workspace_arbitrary_aws(tom: User, arbitrary_db_url: str, session:
         storage_bucket="aws-bucket",
         use_arbitrary=True,
     )
-    await srv.set_arbitrary_server(data, rewrite=True)
+    async with atomic(session):
+        await srv.set_arbitrary_server(data, rewrite=True)
     ws = await srv.get_arbitrary_info_by_owner_id_if_use_arbitrary(tom.id)
     ws = cast(WorkspaceArbitrary, ws)
     return ws
@@ -90,7 +99,8 @@ async def tom_workspace_arbitrary_gcp(tom: User, arbitrary_db_url: str, session:
         storage_bucket="gcp-bucket",
         use_arbitrary=True,
     )
-    await srv.set_arbitrary_server(data, rewrite=True)
+    async with atomic(session):
+        await srv.set_arbitrary_server(data, rewrite=True)
     ws = await srv.get_arbitrary_info_by_owner_id_if_use_arbitrary(tom.id)
     ws = cast(WorkspaceArbitrary, ws)
     return ws
@@ -110,7 +120,8 @@ async def tom_workspace_arbitrary_azure(tom: User, arbitrary_db_url: str, sessio
         storage_bucket="azure-bucket",
         use_arbitrary=True,
     )
-    await srv.set_arbitrary_server(data, rewrite=True)
+    async with atomic(session):
+        await srv.set_arbitrary_server(data, rewrite=True)
     ws = await srv.get_arbitrary_info_by_owner_id_if_use_arbitrary(tom.id)
     ws = cast(WorkspaceArbitrary, ws)
     return ws
@@ -206,8 +217,8 @@ class TestAnswerActivityItems(BaseTest):
     ):
         client.login(tom)
         mock = mocker.patch(
-            "infrastructure.utility.cdn_arbitrary.ArbitraryS3CdnClient.download",
-            return_value=(iter(("a", "b")), "txt"),
+            "infrastructure.utility.cdn_arbitrary.ArbitraryS3CdnClient.stream",
+            return_value=ObjectStream(http.HTTPStatus.OK, "txt", chunks=_chunks(b"a", b"b")),
         )
         response = await client.post(
             self.answer_download_url.format(applet_id=applet_one.id),
@@ -237,8 +248,8 @@ class TestAnswerActivityItems(BaseTest):
     ):
         client.login(tom)
         mock = mocker.patch(
-            "infrastructure.utility.cdn_arbitrary.ArbitraryGCPCdnClient.download",
-            return_value=(iter(("a", "b")), "txt"),
+            "infrastructure.utility.cdn_arbitrary.ArbitraryGCPCdnClient.stream",
+            return_value=ObjectStream(http.HTTPStatus.OK, "txt", chunks=_chunks(b"a", b"b")),
         )
         response = await client.post(
             self.answer_download_url.format(applet_id=applet_one.id),
@@ -548,7 +559,7 @@ class TestAnswerActivityItems(BaseTest):
         client.login(tom)
         data = {"key": "key"}
         mocker.patch(
-            "infrastructure.utility.cdn_client.CDNClient.download",
+            "infrastructure.utility.cdn_client.CDNClient.stream",
             side_effect=FileNotFoundError,
         )
         resp = await client.post(self.answer_download_url.format(applet_id=applet_one.id), data=data)
@@ -612,7 +623,7 @@ class TestAnswerActivityItems(BaseTest):
         client.login(tom)
         data = {"key": "key"}
         mocker.patch(
-            "infrastructure.utility.cdn_client.CDNClient.download",
+            "infrastructure.utility.cdn_client.CDNClient.stream",
             side_effect=FileNotFoundError,
         )
         resp = await client.post(self.download_url, data=data)
@@ -625,13 +636,24 @@ class TestAnswerActivityItems(BaseTest):
         client.login(tom)
         data = {"key": "key"}
         mocker.patch(
-            "infrastructure.utility.cdn_client.CDNClient.download",
-            return_value=(iter(("a", "b")), "txt"),
+            "infrastructure.utility.cdn_client.CDNClient.stream",
+            return_value=ObjectStream(http.HTTPStatus.OK, "txt", chunks=_chunks(b"a", b"b")),
         )
         resp = await client.post(self.download_url, data=data)
         assert resp.status_code == http.HTTPStatus.OK
         assert resp.content == b"ab"
 
+    async def test_general_file_download_range(self, client: TestClient, tom: User, s3_object: bytes):
+        client.login(tom)
+        resp = await client.post(self.download_url, data={"key": "key.txt"}, headers={"Range": "bytes=2-5"})
+        assert resp.status_code == http.HTTPStatus.PARTIAL_CONTENT
+        assert resp.content == s3_object[2:6]
+        assert resp.headers["content-range"] == f"bytes 2-5/{len(s3_object)}"
+
+        etag = resp.headers["etag"]
+        resp = await client.post(self.download_url, data={"key": "key.txt"}, headers={"If-None-Match": etag})
+        assert resp.status_code == http.HTTPStatus.NOT_MODIFIED
+
     # NOTE: We must keep old answer upload process untill all Mindlogger users have last App version.
     async def test_answer_upload__not_valid_user_role(
         self, client: TestClient, applet_one_lucy_coordinator: AppletFull, lucy: User, mocker: MockerFixture
@@ -883,3 +905,77 @@ class TestAnswerActivityItems(BaseTest):
         assert len(result) == 1
         assert result[0]["message"] == SomethingWentWrongError.message
         assert len(caplog.messages) == 1
+
+
+@pytest.fixture
+def s3_config() -> CdnConfig:
+    return CdnConfig(region="us-east-1", bucket="bucket", access_key="access_key", secret_key="secret_key")
+
+
+def test_cdn_client_sdk_client_is_shared(s3_config: CdnConfig):
+    assert CDNClient(s3_config, env="testing").client is CDNClient(s3_config, env="testing").client
+    other_config = s3_config.copy(update={"secret_key": "other_secret_key"})
+    assert CDNClient(other_config, env="testing").client is not CDNClient(s3_config, env="testing").client
+
+
+async def test_cdn_client_presign_batch_uses_shared_executor(s3_config: CdnConfig, mocker: MockerFixture):
+    cdn_client = CDNClient(s3_config, env="testing")
+    await cdn_client.generate_presigned_url("warm-up")
+    calls = CDNClient.stats()["generate_presigned_url"]["calls"]
+    spy = mocker.spy(ThreadPoolExecutor, "__init__")
+
+    urls = await asyncio.gather(*(cdn_client.generate_presigned_url(f"key{i}") for i in range(200)))
+
+    assert len(set(urls)) == 200
+    spy.assert_not_called()
+    assert CDNClient.stats()["generate_presigned_url"]["calls"] == calls + 200
+
+
+@pytest.fixture
+def s3_object(mocker: MockerFixture) -> bytes:
+    content = b"0123456789"
+    mocker.patch.object(settings.cdn, "download_chunk_size", 4)
+    mocker.patch.object(CDNClient, "_head_object", return_value=(len(content), '"etag"'))
+    get_range = mocker.patch.object(CDNClient, "_get_object_range")
+    get_range.side_effect = lambda key, start, end: content[start : end + 1]
+    return content
+
+
+async def _read(stream: ObjectStream) -> list[bytes]:
+    assert stream.chunks
+    return [chunk async for chunk in stream.chunks]
+
+
+async def test_cdn_client_stream_by_chunks(s3_config: CdnConfig, s3_object: bytes):
+    stream = await CDNClient(s3_config, env="testing").stream("key.txt")
+    assert stream.status_code == http.HTTPStatus.OK
+    assert stream.media_type == "text/plain"
+    assert stream.headers["Content-Length"] == str(len(s3_object))
+    assert await _read(stream) == [b"0123", b"4567", b"89"]
+
+
+@pytest.mark.parametrize(
+    "range_header, status_code, content_range, content",
+    (
+        ("bytes=2-5", http.HTTPStatus.PARTIAL_CONTENT, "bytes 2-5/10", b"2345"),
+        ("bytes=7-", http.HTTPStatus.PARTIAL_CONTENT, "bytes 7-9/10", b"789"),
+        ("bytes=-3", http.HTTPStatus.PARTIAL_CONTENT, "bytes 7-9/10", b"789"),
+        ("bytes=0-1,4-5", http.HTTPStatus.OK, None, b"0123456789"),
+        ("bytes=10-", http.HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, "bytes */10", None),
+    ),
+)
+async def test_cdn_client_stream_range(
+    s3_config: CdnConfig,
+    s3_object: bytes,
+    range_header: str,
+    status_code: int,
+    content_range: str | None,
+    content: bytes | None,
+):
+    stream = await CDNClient(s3_config, env="testing").stream("key.txt", range_header=range_header)
+    assert stream.status_code == status_code
+    assert stream.headers.get("Content-Range") == content_range
+    if content is None:
+        assert stream.chunks is None
+    else:
+        assert b"".join(await _read(stream)) == content
@@ -49,3 +49,7 @@ class JobService:
         if details:
             data["details"] = details
         return await JobCRUD(self.session).update(id_, **data)
+
+    async def save_details(self, id_: uuid.UUID, details: dict) -> Job:
+        """Replaces the job details, e.g. progress checkpoints, keeping the status"""
+        return await JobCRUD(self.session).update(id_, details=details)
@@ -0,0 +1,3 @@
+from apps.jsonld_converter.commands.document_store import app as jsonld_cli
+
+__all__ = ["jsonld_cli"]
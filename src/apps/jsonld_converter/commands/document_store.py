@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+import typer
+from rich import print
+
+from apps.jsonld_converter.errors import JsonLDLoaderError
+from apps.jsonld_converter.service.document_loader import get_cached_document_loader
+from config import settings
+from infrastructure.commands.utils import coro
+
+app = typer.Typer()
+
+
+@app.command(short_help="Fill the JSON-LD document store with the contexts used by the importer")
+@coro
+async def seed(
+    urls: Optional[list[str]] = typer.Argument(None, help="Document urls. Default: the standard contexts."),
+    files: Optional[list[str]] = typer.Option(
+        None, "--file", "-f", help="Load the document from a local file instead of network: URL=PATH."
+    ),
+) -> None:
+    if not settings.jsonld_converter.document_store_dir:
+        print("[bold red]Error: JSONLD_CONVERTER__DOCUMENT_STORE_DIR is not set[/bold red]")
+        raise typer.Exit(1)
+    loader = get_cached_document_loader()
+    for item in files or []:
+        url, _, path = item.partition("=")
+        if not path:
+            print(f"[bold red]Error: wrong --file value '{item}', expected URL=PATH[/bold red]")
+            raise typer.Exit(1)
+        loader.seed(url, json.loads(Path(path).read_text()))
+        print(f"[green]{url} is stored from {path}[/green]")
+    if not urls and not files:
+        urls = settings.jsonld_converter.seed_urls
+    for url in urls or []:
+        try:
+            await loader.load(url)
+        except JsonLDLoaderError as e:
+            print(f"[bold red]Error: {e}[/bold red]")
+            continue
+        print(f"[green]{url} is stored[/green]")
@@ -1,22 +1,55 @@
-from typing import Callable
+import threading
+from typing import Any, Callable
 
 from cachetools import LRUCache
 from fastapi import Depends
 from pyld import ContextResolver
-from pyld.jsonld import requests_document_loader
 
 from apps.jsonld_converter.service import JsonLDModelConverter, ModelJsonLDConverter
+from apps.jsonld_converter.service.document_loader import get_cached_document_loader
 from config import settings
 
 
+
+class _SharedLRUCache(LRUCache):
+    """LRUCache shared by the threads running pyld, reads reorder the entries as well."""
+
+    def __init__(self, maxsize: int):
+        super().__init__(maxsize=maxsize)
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key: Any) -> Any:
+        with self._lock:
+            return super().__getitem__(key)
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+
+    def __delitem__(self, key: Any) -> None:
+        with self._lock:
+            super().__delitem__(key)
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        with self._lock:
+            return super().get(key, default)
+
+    def pop(self, key: Any, *args: Any) -> Any:
+        with self._lock:
+            return super().pop(key, *args)
+
+
+# resolved contexts are immutable for the given url, share them between requests
+_resolved_context_cache: LRUCache = _SharedLRUCache(maxsize=settings.jsonld_converter.document_cache_size)
+
+
 def get_document_loader() -> Callable:
-    return requests_document_loader()
+    return get_cached_document_loader()
 
 
 def get_context_resolver(
     document_loader: Callable = Depends(get_document_loader),
 ) -> ContextResolver:
-    _resolved_context_cache: LRUCache = LRUCache(maxsize=100)
     return ContextResolver(_resolved_context_cache, document_loader)
 
 
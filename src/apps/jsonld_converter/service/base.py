@@ -6,6 +6,7 @@ from typing import Callable, Optional
 from pyld import ContextResolver, jsonld
 
 from apps.jsonld_converter.errors import JsonLDLoaderError, JsonLDProcessingError
+from apps.jsonld_converter.service.document_loader import CachedDocumentLoader
 
 
 class LdKeyword(enum.StrEnum):
@@ -26,7 +27,11 @@ class ContextResolverAwareMixin:
     async def load_remote_doc(self, remote_doc: str) -> dict:
         assert self.document_loader is not None
         try:
+            if isinstance(self.document_loader, CachedDocumentLoader):
+                return await self.document_loader.load(remote_doc)
             return await asyncio.to_thread(self.document_loader, remote_doc)
+        except JsonLDLoaderError:
+            raise
         except Exception as e:
             raise JsonLDLoaderError(remote_doc) from e
 
@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+import httpx
+from pyld import jsonld
+
+from apps.jsonld_converter.errors import JsonLDLoaderError
+from config import settings
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.logger import logger
+
+__all__ = ["CachedDocumentLoader", "get_cached_document_loader"]
+
+_LINK_CONTEXT = "http://www.w3.org/ns/json-ld#context"
+
+
+@dataclass
+class _Entry:
+    remote_doc: dict
+    etag: str | None = None
+    last_modified: str | None = None
+    # monotonic time of the last (re)validation or of the load from the store, 0 - never validated
+    checked_at: float = 0.0
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class _DiskStore:
+    """Content addressed store of the loaded documents:
+    urls/<sha256 of url>.json - url metadata with the content hash
+    objects/<sha256 of content>.json - document content
+    """
+
+    def __init__(self, path: Path):
+        self.urls = path / "urls"
+        self.objects = path / "objects"
+        self.urls.mkdir(parents=True, exist_ok=True)
+        self.objects.mkdir(parents=True, exist_ok=True)
+
+    def _url_path(self, url: str) -> Path:
+        return self.urls / f"{_sha256(url.encode())}.json"
+
+    def get(self, url: str) -> _Entry | None:
+        try:
+            meta = json.loads(self._url_path(url).read_bytes())
+            document = json.loads((self.objects / f"{meta['sha256']}.json").read_bytes())
+        except (OSError, ValueError, KeyError):
+            return None
+        remote_doc = dict(
+            contentType=meta.get("content_type"),
+            contextUrl=meta.get("context_url"),
+            documentUrl=meta.get("document_url") or url,
+            document=document,
+        )
+        return _Entry(
+            remote_doc, etag=meta.get("etag"), last_modified=meta.get("last_modified"), checked_at=time.monotonic()
+        )
+
+    def put(self, url: str, entry: _Entry) -> None:
+        content = json.dumps(entry.remote_doc["document"], sort_keys=True).encode()
+        sha256 = _sha256(content)
+        object_path = self.objects / f"{sha256}.json"
+        if not object_path.exists():
+            _write_atomic(object_path, content)
+        meta = dict(
+            url=url,
+            sha256=sha256,
+            content_type=entry.remote_doc.get("contentType"),
+            context_url=entry.remote_doc.get("contextUrl"),
+            document_url=entry.remote_doc.get("documentUrl"),
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+        )
+        _write_atomic(self._url_path(url), json.dumps(meta).encode())
+
+
+class CachedDocumentLoader:
+    """Process-wide JSON-LD document loader with a bounded in-memory cache.
+
+    Cached documents are fresh for `ttl` seconds, then they are revalidated
+    with `If-None-Match`/`If-Modified-Since`. If the server can not be
+    reached, the cached copy is used. With `store_dir` the documents are
+    kept on disk as well, so they survive restarts and the store can be
+    seeded in advance to import protocols without network.
+
+    The instance is a synchronous pyld document loader, `load` is its
+    asynchronous version. Both keep one connection pool.
+    """
+
+    def __init__(self, maxsize: int, ttl: int, timeout: int, store_dir: str | None = None):
+        self.ttl = ttl
+        self.timeout = timeout
+        self._memory: LocalCache[_Entry] = LocalCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._store = _DiskStore(Path(store_dir)) if store_dir else None
+        self._ssl_context = httpx.create_ssl_context()
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_cached(self, url: str) -> _Entry | None:
+        with self._lock:
+            try:
+                return self._memory.get(url)
+            except CacheNotFound:
+                pass
+        entry = self._store.get(url) if self._store else None
+        if entry:
+            with self._lock:
+                self._memory.set(url, entry)
+        return entry
+
+    def _is_fresh(self, entry: _Entry | None) -> bool:
+        return bool(entry and entry.checked_at and time.monotonic() - entry.checked_at < self.ttl)
+
+    @staticmethod
+    def _request_headers(entry: _Entry | None) -> dict[str, str]:
+        headers = {"Accept": "application/ld+json, application/json;q=0.9, */*;q=0.1"}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    @staticmethod
+    def _to_remote_doc(response: httpx.Response) -> dict:
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+        context_url = None
+        if content_type != "application/ld+json" and (link := response.headers.get("Link")):
+            linked = jsonld.parse_link_header(link).get(_LINK_CONTEXT)
+            if isinstance(linked, dict):
+                context_url = linked["target"]
+        return dict(
+            contentType=content_type,
+            contextUrl=context_url,
+            documentUrl=str(response.url),
+            document=response.json(),
+        )
+
+    def _handle_response(self, url: str, entry: _Entry | None, response: httpx.Response) -> dict:
+        if response.status_code == httpx.codes.NOT_MODIFIED and entry:
+            entry.checked_at = time.monotonic()
+            return entry.remote_doc
+        response.raise_for_status()
+        new_entry = _Entry(
+            self._to_remote_doc(response),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            checked_at=time.monotonic(),
+        )
+        self.put(url, new_entry)
+        return new_entry.remote_doc
+
+    def _fallback(self, url: str, entry: _Entry | None, error: Exception) -> dict:
+        if entry is None:
+            raise JsonLDLoaderError(url) from error
+        logger.warning(f"JSON-LD document {url} is not revalidated, the cached copy is used: {error}")
+        return entry.remote_doc
+
+    def put(self, url: str, entry: _Entry) -> None:
+        with self._lock:
+            self._memory.set(url, entry)
+        if self._store:
+            self._store.put(url, entry)
+
+    def seed(self, url: str, document: dict) -> None:
+        """Adds the document as if it was loaded from the url."""
+        remote_doc = dict(contentType="application/ld+json", contextUrl=None, documentUrl=url, document=document)
+        self.put(url, _Entry(remote_doc, checked_at=time.monotonic()))
+
+    def __call__(self, url: str, options: dict | None = None) -> dict:
+        entry = self._get_cached(url)
+        if self._is_fresh(entry):
+            return entry.remote_doc  # type: ignore[union-attr]
+        if self._client is None:
+            self._client = httpx.Client(timeout=self.timeout, follow_redirects=True, verify=self._ssl_context)
+        try:
+            response = self._client.get(url, headers=self._request_headers(entry))
+            return self._handle_response(url, entry, response)
+        except (httpx.HTTPError, ValueError) as e:
+            return self._fallback(url, entry, e)
+
+    async def load(self, url: str) -> dict:
+        entry = self._get_cached(url)
+        if self._is_fresh(entry):
+            return entry.remote_doc  # type: ignore[union-attr]
+        try:
+            response = await self._get_async_client().get(url, headers=self._request_headers(entry))
+            return self._handle_response(url, entry, response)
+        except (httpx.HTTPError, ValueError) as e:
+            return self._fallback(url, entry, e)
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        # the app runs one loop, tests run a loop per test
+        if self._async_client is None or self._async_client.is_closed or self._loop is not loop:
+            self._loop = loop
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout, follow_redirects=True, verify=self._ssl_context
+            )
+        return self._async_client
+
+    async def close(self) -> None:
+        if self._async_client and not self._async_client.is_closed:
+            await self._async_client.aclose()
+        self._async_client = None
+        if self._client:
+            self._client.close()
+        self._client = None
+
+
+@cache
+def get_cached_document_loader() -> CachedDocumentLoader:
+    jsonld_settings = settings.jsonld_converter
+    return CachedDocumentLoader(
+        maxsize=jsonld_settings.document_cache_size,
+        ttl=jsonld_settings.document_cache_ttl,
+        timeout=jsonld_settings.document_fetch_timeout,
+        store_dir=jsonld_settings.document_store_dir,
+    )
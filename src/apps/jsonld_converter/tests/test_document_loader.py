@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import httpx
+import pytest
+from pytest_mock import MockerFixture
+
+from apps.jsonld_converter.errors import JsonLDLoaderError
+from apps.jsonld_converter.service.document_loader import CachedDocumentLoader
+
+URL = "https://example.com/contexts/generic"
+DOCUMENT = {"@context": {"schema": "http://schema.org/"}}
+
+
+def _response(status_code: int, **kwargs) -> httpx.Response:
+    return httpx.Response(status_code, request=httpx.Request("GET", URL), **kwargs)
+
+
+@pytest.fixture
+def loader(tmp_path: Path) -> CachedDocumentLoader:
+    return CachedDocumentLoader(maxsize=10, ttl=3600, timeout=1, store_dir=str(tmp_path))
+
+
+async def test_loaded_document_is_cached(loader: CachedDocumentLoader, mocker: MockerFixture):
+    get = mocker.patch(
+        "httpx.AsyncClient.get",
+        return_value=_response(200, json=DOCUMENT, headers={"Content-Type": "application/ld+json", "ETag": '"v1"'}),
+    )
+    first = await loader.load(URL)
+    second = await loader.load(URL)
+    assert first["document"] == second["document"] == DOCUMENT
+    assert first["contentType"] == "application/ld+json"
+    get.assert_awaited_once()
+
+
+async def test_stale_document_is_revalidated(tmp_path: Path, mocker: MockerFixture):
+    loader = CachedDocumentLoader(maxsize=10, ttl=0, timeout=1, store_dir=str(tmp_path))
+    get = mocker.patch("httpx.AsyncClient.get", return_value=_response(200, json=DOCUMENT, headers={"ETag": '"v1"'}))
+    await loader.load(URL)
+    get.return_value = _response(304)
+    assert (await loader.load(URL))["document"] == DOCUMENT
+    assert get.await_args
+    assert get.await_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+
+async def test_seeded_store_is_used_offline(tmp_path: Path, mocker: MockerFixture):
+    CachedDocumentLoader(maxsize=10, ttl=3600, timeout=1, store_dir=str(tmp_path)).seed(URL, DOCUMENT)
+    mocker.patch("httpx.AsyncClient.get", side_effect=httpx.ConnectError("offline"))
+    # new process: memory tier is empty
+    loader = CachedDocumentLoader(maxsize=10, ttl=3600, timeout=1, store_dir=str(tmp_path))
+    assert (await loader.load(URL))["document"] == DOCUMENT
+
+
+async def test_not_cached_document_load_error(loader: CachedDocumentLoader, mocker: MockerFixture):
+    mocker.patch("httpx.AsyncClient.get", return_value=_response(404))
+    with pytest.raises(JsonLDLoaderError):
+        await loader.load(URL)
+
+
+def test_sync_loader(loader: CachedDocumentLoader, mocker: MockerFixture):
+    get = mocker.patch("httpx.Client.get", return_value=_response(200, json=DOCUMENT))
+    assert loader(URL)["document"] == DOCUMENT
+    assert loader(URL)["document"] == DOCUMENT
+    get.assert_called_once()
+
+
+async def test_connection_pool_is_reused(loader: CachedDocumentLoader, mocker: MockerFixture):
+    mocker.patch("httpx.AsyncClient.get", return_value=_response(200, json=DOCUMENT))
+    await loader.load(URL)
+    client = loader._get_async_client()
+    await loader.load(f"{URL}/other")
+    assert loader._get_async_client() is client
+    await loader.close()
+    assert client.is_closed
@@ -9,7 +9,8 @@ from apps.activities.crud import ActivityHistoriesCRUD, ActivityItemHistoriesCRU
 from apps.activities.db.schemas import ActivityItemHistorySchema
 from apps.activity_flows.crud import FlowItemHistoriesCRUD, FlowsHistoryCRUD
 from apps.activity_flows.db.schemas import ActivityFlowItemHistorySchema
-from apps.applets.crud import AppletHistoriesCRUD, AppletsCRUD
+from apps.applets.crud import AppletHistoriesCRUD, AppletHistoryChangesCRUD, AppletsCRUD
+from apps.applets.service.applet_version_cache import AppletVersionCache
 from apps.library.crud import CartCRUD, LibraryCRUD
 from apps.library.db import CartSchema, LibrarySchema
 from apps.library.domain import (
@@ -70,6 +71,8 @@ class LibraryService:
                 id_version=applet_version,
                 display_name=schema.name,
             )
+            await AppletHistoryChangesCRUD(self.session).delete_current(schema.applet_id)
+            AppletVersionCache.invalidate_on_commit(self.session, schema.applet_id)
 
         search_keywords = await self._get_search_keywords(applet, applet_version)
         search_keywords.append(schema.name)
@@ -263,6 +266,8 @@ class LibraryService:
                 id_version=new_applet_version,
                 display_name=schema.name,
             )
+            await AppletHistoryChangesCRUD(self.session).delete_current(applet_id)
+            AppletVersionCache.invalidate_on_commit(self.session, applet_id)
         search_keywords = await self._get_search_keywords(applet, new_applet_version)
         search_keywords.append(schema.name)
 
@@ -1,19 +1,22 @@
+import datetime
+from typing import Any
+
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import InstrumentedAttribute, Query
 from sqlalchemy.sql.operators import ColumnOperators
 
-from apps.logs.db.schemas import NotificationLogSchema
-from apps.logs.domain import NotificationLogCreate, NotificationLogQuery, PublicNotificationLog
-from apps.logs.errors import NotificationLogError
+from apps.logs.db.schemas import NotificationLogPayloadSchema, NotificationLogSchema, NotificationLogSnapshotSchema
+from apps.logs.domain import NotificationLogCreate, NotificationLogQuery
 from infrastructure.database.crud import BaseCRUD
 
-__all__ = ["NotificationLogCRUD"]
+__all__ = ["NotificationLogCRUD", "NotificationLogPayloadsCRUD", "NotificationLogSnapshotsCRUD"]
 
 
 class NotificationLogCRUD(BaseCRUD[NotificationLogSchema]):
     schema_class = NotificationLogSchema
 
-    async def filter(self, query_set: NotificationLogQuery, user_id: str) -> list[PublicNotificationLog]:
+    async def filter(self, query_set: NotificationLogQuery, user_id: str) -> list[NotificationLogSchema]:
         """Return all NotificationLogs where the user and device exists."""
         query: Query = (
             select(self.schema_class)
@@ -26,52 +29,10 @@ class NotificationLogCRUD(BaseCRUD[NotificationLogSchema]):
         )
 
         result = await self._execute(query)
-        logs = result.scalars().all()
-
-        return [PublicNotificationLog.from_orm(log) for log in logs]
-
-    async def save(self, schema: NotificationLogCreate, user_id: str) -> PublicNotificationLog:
-        """Return NotificationLog instance."""
-
-        notif_desc_upd = True
-        notif_in_queue_upd = True
-        sched_notif_upd = True
-
-        if schema.notification_descriptions is None:
-            description = await self.get_previous_description(user_id, schema)
-            schema.notification_descriptions = description if description is not None else None
-            notif_desc_upd = False
-
-        if schema.notification_in_queue is None:
-            in_queue = await self.get_previous_in_queue(user_id, schema)
-            schema.notification_in_queue = in_queue if in_queue is not None else None
-            notif_in_queue_upd = False
-
-        if schema.scheduled_notifications is None:
-            scheduled = await self.get_previous_scheduled_notifications(user_id, schema)
-            schema.scheduled_notifications = scheduled if scheduled is not None else None
-            sched_notif_upd = False
-
-        # Save NotificationLogs into the database
-        try:
-            instance: NotificationLogSchema = await self._create(
-                NotificationLogSchema(
-                    action_type=schema.action_type,
-                    user_id=user_id,
-                    device_id=schema.device_id,
-                    notification_descriptions=schema.notification_descriptions,
-                    notification_in_queue=schema.notification_in_queue,
-                    scheduled_notifications=schema.scheduled_notifications,
-                    notification_descriptions_updated=notif_desc_upd,
-                    notifications_in_queue_updated=notif_in_queue_upd,
-                    scheduled_notifications_updated=sched_notif_upd,
-                )
-            )
-            notification_log = PublicNotificationLog.from_orm(instance)
+        return result.scalars().all()
 
-            return notification_log
-        except Exception:
-            raise NotificationLogError()
+    async def create_many(self, logs: list[NotificationLogSchema]) -> None:
+        await self._insert_many(logs)
 
     async def _get_previous(
         self,
@@ -118,3 +79,52 @@ class NotificationLogCRUD(BaseCRUD[NotificationLogSchema]):
             NotificationLogSchema.scheduled_notifications,
             [NotificationLogSchema.scheduled_notifications.isnot(None)],
         )
+
+
+class NotificationLogPayloadsCRUD(BaseCRUD[NotificationLogPayloadSchema]):
+    schema_class = NotificationLogPayloadSchema
+
+    async def add_many(self, payloads: dict[str, Any]) -> None:
+        """Stores the values by their keys, values which are already stored are skipped."""
+        if not payloads:
+            return
+        values = [dict(id=key, value=value) for key, value in payloads.items()]
+        stmt = insert(NotificationLogPayloadSchema).values(values)
+        stmt = stmt.on_conflict_do_nothing(index_elements=[NotificationLogPayloadSchema.id])
+        await self._execute(stmt)
+
+    async def get_values(self, keys: set[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+        query: Query = select(NotificationLogPayloadSchema.id, NotificationLogPayloadSchema.value)
+        query = query.where(NotificationLogPayloadSchema.id.in_(keys))
+        result = await self._execute(query)
+        return dict(result.all())
+
+
+class NotificationLogSnapshotsCRUD(BaseCRUD[NotificationLogSnapshotSchema]):
+    schema_class = NotificationLogSnapshotSchema
+
+    async def get_by_device(self, user_id: str, device_id: str) -> NotificationLogSnapshotSchema | None:
+        query: Query = select(NotificationLogSnapshotSchema)
+        query = query.where(
+            NotificationLogSnapshotSchema.user_id == user_id,
+            NotificationLogSnapshotSchema.device_id == device_id,
+        )
+        result = await self._execute(query)
+        return result.scalars().one_or_none()
+
+    async def upsert(self, user_id: str, device_id: str, keys: dict[str, str | None]) -> None:
+        values = dict(user_id=user_id, device_id=device_id, **keys)
+        stmt = (
+            insert(NotificationLogSnapshotSchema)
+            .values(values)
+            .on_conflict_do_update(
+                constraint=NotificationLogSnapshotSchema.uq_constraint,
+                set_={
+                    **keys,
+                    "updated_at": datetime.datetime.utcnow(),
+                },
+            )
+        )
+        await self._execute(stmt)
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB
 
 from infrastructure.database.base import Base
@@ -10,9 +10,39 @@ class NotificationLogSchema(Base):
     user_id = Column(String(), nullable=False)
     device_id = Column(String(), nullable=False)
     action_type = Column(String(), nullable=False)
+    # values of old logs, new logs refer to notification_log_payloads by the *_key columns
     notification_descriptions = Column(JSONB(), nullable=True)
     notification_in_queue = Column(JSONB(), nullable=True)
     scheduled_notifications = Column(JSONB(), nullable=True)
+    notification_descriptions_key = Column(String(64), nullable=True)
+    notification_in_queue_key = Column(String(64), nullable=True)
+    scheduled_notifications_key = Column(String(64), nullable=True)
     notification_descriptions_updated = Column(Boolean(), nullable=False)
     notifications_in_queue_updated = Column(Boolean(), nullable=False)
     scheduled_notifications_updated = Column(Boolean(), nullable=False)
+
+
+class NotificationLogPayloadSchema(Base):
+    """Distinct values of notification log fields, every value is stored once."""
+
+    __tablename__ = "notification_log_payloads"
+
+    # sha256 of the canonical JSON of the value
+    id = Column(String(64), primary_key=True)
+    value = Column(JSONB(), nullable=False)
+
+
+class NotificationLogSnapshotSchema(Base):
+    """Payload keys of the latest notification log fields of a device."""
+
+    __tablename__ = "notification_log_snapshots"
+
+    uq_constraint = "uq_notification_log_snapshots_user_device"
+
+    __table_args__ = (UniqueConstraint("user_id", "device_id", name=uq_constraint),)
+
+    user_id = Column(String(), nullable=False)
+    device_id = Column(String(), nullable=False)
+    notification_descriptions_key = Column(String(64), nullable=True)
+    notification_in_queue_key = Column(String(64), nullable=True)
+    scheduled_notifications_key = Column(String(64), nullable=True)
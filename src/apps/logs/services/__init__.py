@@ -0,0 +1 @@
+from apps.logs.services.notification import *  # noqa: F401, F403
@@ -0,0 +1,213 @@
+import asyncio
+import datetime
+import hashlib
+import json
+import uuid
+from contextlib import suppress
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.logs.crud.notification import NotificationLogCRUD, NotificationLogPayloadsCRUD, NotificationLogSnapshotsCRUD
+from apps.logs.db.schemas import NotificationLogSchema
+from apps.logs.domain import NotificationLogCreate, NotificationLogQuery, PublicNotificationLog
+from apps.logs.errors import NotificationLogError
+from config import settings
+from infrastructure.database import after_commit, atomic, session_manager
+from infrastructure.logger import logger
+
+__all__ = ["NotificationLogBuffer", "NotificationLogService", "notification_log_buffer", "payload_key"]
+
+# logged fields and the flags of the fields provided by the device
+LOG_FIELDS = {
+    "notification_descriptions": "notification_descriptions_updated",
+    "notification_in_queue": "notifications_in_queue_updated",
+    "scheduled_notifications": "scheduled_notifications_updated",
+}
+
+
+def payload_key(value: Any) -> str:
+    """Key of a logged value, equal values have equal keys."""
+    dump = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(dump.encode()).hexdigest()
+
+
+class NotificationLogBuffer:
+    """Collects notification logs in memory and writes them with bulk
+    INSERT statements every `task_notification_log_flush.interval` seconds,
+    or as soon as `max_pending` logs are collected, instead of an INSERT
+    per request.
+
+    The logs only refer to payloads and snapshots which are written by the
+    requests, so a lost log never changes the values of the other ones.
+
+    The buffer belongs to the process: logs buffered by other workers are
+    not visible to the reads for up to `interval` seconds.
+    """
+
+    def __init__(self):
+        self._pending: list[NotificationLogSchema] = []
+        self._task: asyncio.Task | None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def add(self, log: NotificationLogSchema) -> None:
+        self._pending.append(log)
+        if len(self._pending) >= settings.task_notification_log_flush.max_pending:
+            flush = asyncio.create_task(self.flush_safely())
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def flush(self, session: AsyncSession | None = None) -> int:
+        """Writes collected logs. Returns the number of flushed logs."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            if session is not None:
+                await NotificationLogCRUD(session).create_many(pending)
+            else:
+                async with session_manager.get_session()() as session:
+                    async with atomic(session):
+                        await NotificationLogCRUD(session).create_many(pending)
+        except BaseException:
+            # return logs back before the ones collected meanwhile
+            self._pending[:0] = pending
+            raise
+        return len(pending)
+
+    async def flush_safely(self) -> None:
+        """Writes collected logs in a new session, errors are logged."""
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.exception(f"Notification logs flush failed: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.task_notification_log_flush.interval)
+            await self.flush_safely()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+
+notification_log_buffer = NotificationLogBuffer()
+
+
+class NotificationLogService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def save(self, schema: NotificationLogCreate, user_id: str) -> PublicNotificationLog:
+        """Buffers a new log of the device.
+
+        Fields which are not provided keep the latest values of the device,
+        they are resolved by the snapshot of the device. Every distinct value
+        is stored once, the log refers to the values by their keys.
+        """
+        snapshot = await NotificationLogSnapshotsCRUD(self.session).get_by_device(user_id, schema.device_id)
+        keys: dict[str, str | None] = {field: None for field in LOG_FIELDS}
+        if snapshot is not None:
+            keys = {field: getattr(snapshot, f"{field}_key") for field in LOG_FIELDS}
+
+        values: dict[str, Any] = {}
+        new_payloads: dict[str, Any] = {}
+        for field in LOG_FIELDS:
+            value = getattr(schema, field)
+            if value is None and snapshot is None:
+                # devices without a snapshot have logged before the snapshots were added
+                value = await self._get_previous_value(field, user_id, schema)
+            if value is None:
+                continue
+            key = payload_key(value)
+            if key != keys[field]:
+                new_payloads[key] = value
+            keys[field] = key
+            values[field] = value
+
+        try:
+            if new_payloads or snapshot is None:
+                await NotificationLogPayloadsCRUD(self.session).add_many(new_payloads)
+                await NotificationLogSnapshotsCRUD(self.session).upsert(
+                    user_id, schema.device_id, {f"{field}_key": key for field, key in keys.items()}
+                )
+        except Exception:
+            raise NotificationLogError()
+
+        unresolved = {key for field, key in keys.items() if key is not None and field not in values}
+        stored = await NotificationLogPayloadsCRUD(self.session).get_values(unresolved)
+        for field, key in keys.items():
+            if key is not None and field not in values:
+                values[field] = stored.get(key)
+
+        now = datetime.datetime.utcnow()
+        log = NotificationLogSchema(
+            id=uuid.uuid4(),
+            created_at=now,
+            updated_at=now,
+            action_type=schema.action_type,
+            user_id=user_id,
+            device_id=schema.device_id,
+            **{f"{field}_key": key for field, key in keys.items()},
+            **{flag: getattr(schema, field) is not None for field, flag in LOG_FIELDS.items()},
+        )
+
+        async def buffer_log() -> None:
+            notification_log_buffer.add(log)
+
+        # the log refers to the payloads and the snapshot written by the transaction
+        after_commit(self.session, buffer_log)
+        return PublicNotificationLog(
+            id=log.id,
+            created_at=now,
+            action_type=log.action_type,
+            user_id=user_id,
+            device_id=log.device_id,
+            **{field: values.get(field) for field in LOG_FIELDS},
+        )
+
+    async def _get_previous_value(self, field: str, user_id: str, schema: NotificationLogCreate) -> Any:
+        crud = NotificationLogCRUD(self.session)
+        if field == "notification_descriptions":
+            return await crud.get_previous_description(user_id, schema)
+        if field == "notification_in_queue":
+            return await crud.get_previous_in_queue(user_id, schema)
+        return await crud.get_previous_scheduled_notifications(user_id, schema)
+
+    async def filter(self, query_set: NotificationLogQuery, user_id: str) -> list[PublicNotificationLog]:
+        """Returns the latest logs of the device with the full values.
+
+        Logs buffered by this process are written first, in their own
+        transaction, so they are kept if the request is rolled back.
+        """
+        await notification_log_buffer.flush_safely()
+        logs = await NotificationLogCRUD(self.session).filter(query_set, user_id)
+        keys = {getattr(log, f"{field}_key") for log in logs for field in LOG_FIELDS} - {None}
+        payloads = await NotificationLogPayloadsCRUD(self.session).get_values(keys)
+        result = []
+        for log in logs:
+            values: dict[str, Any] = {}
+            for field in LOG_FIELDS:
+                key = getattr(log, f"{field}_key")
+                # old logs keep the values in place
+                values[field] = payloads.get(key) if key is not None else getattr(log, field)
+            result.append(
+                PublicNotificationLog(
+                    id=log.id,
+                    created_at=log.created_at,
+                    action_type=log.action_type,
+                    user_id=log.user_id,
+                    device_id=log.device_id,
+                    **values,
+                )
+            )
+        return result
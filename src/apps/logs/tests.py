@@ -1,6 +1,18 @@
+import uuid
+
+import pytest
 from pytest import fixture, mark
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from apps.logs.db.schemas import NotificationLogPayloadSchema, NotificationLogSchema
+from apps.logs.domain import NotificationLogCreate
+from apps.logs.services import NotificationLogService, notification_log_buffer, payload_key
 from apps.shared.test import BaseTest
+from infrastructure.database import atomic
+
+# the logs are flushed with a session of the session manager
+pytestmark = mark.usefixtures("mock_get_session")
 
 EMPTY_DESCRIPTIONS = [
     dict(
@@ -84,6 +96,13 @@ EMPTY_SCHEDULE = [
 ]
 
 
+@fixture(autouse=True)
+async def flush_notification_logs(session: AsyncSession):
+    yield
+    # buffered logs of the test must not be written by the next tests
+    await notification_log_buffer.flush(session)
+
+
 @fixture(scope="function")
 def dummy_logs_payload() -> list[dict]:
     return [
@@ -318,3 +337,47 @@ class TestNotificationLogs(BaseTest):
         assert log_1[param] is None
         assert log_2[param] == []
         assert log_3[param] == []
+
+    async def test_create_log_stores_values_once(self, client, session: AsyncSession):
+        queue = [{"name": f"in_queue{i}"} for i in range(10)]
+        for i in range(3):
+            response = await client.post(
+                self.logs_url,
+                data=dict(
+                    user_id="tom@mindlogger.com",
+                    device_id="deviceid",
+                    action_type=f"test{i}",
+                    notification_descriptions=[{"name": "descriptions"}],
+                    notification_in_queue=queue if i < 2 else None,
+                    scheduled_notifications=[{"name": f"notifications{i}"}],
+                ),
+            )
+            assert response.status_code == 201, response.json()
+        assert response.json()["result"]["notificationInQueue"] == queue
+
+        query = dict(email="tom@mindlogger.com", device_id="deviceid", limit=3)
+        response = await client.get(self.logs_url, query=query)
+        assert response.status_code == 200, response.json()
+        logs = response.json()["result"]
+        assert [log["actionType"] for log in logs] == ["test2", "test1", "test0"]
+        assert all(log["notificationInQueue"] == queue for log in logs)
+        assert [log["scheduledNotifications"] for log in logs] == [[{"name": f"notifications{i}"}] for i in (2, 1, 0)]
+
+        keys = [payload_key(queue), payload_key([{"name": "descriptions"}])]
+        payloads_count = select(func.count()).where(NotificationLogPayloadSchema.id.in_(keys))
+        assert (await session.execute(payloads_count)).scalar() == 2
+        in_place_count = select(func.count()).where(
+            NotificationLogSchema.device_id == "deviceid",
+            NotificationLogSchema.notification_in_queue.isnot(None),
+        )
+        assert (await session.execute(in_place_count)).scalar() == 0
+
+    async def test_log_of_rolled_back_request_is_not_buffered(self, session: AsyncSession, dummy_logs_payload):
+        pending = len(notification_log_buffer._pending)
+        with pytest.raises(RuntimeError):
+            async with atomic(session):
+                await NotificationLogService(session).save(
+                    NotificationLogCreate(**dummy_logs_payload[0]), user_id=str(uuid.uuid4())
+                )
+                raise RuntimeError()
+        assert len(notification_log_buffer._pending) == pending
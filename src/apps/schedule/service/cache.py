@@ -0,0 +1,80 @@
+import json
+import uuid
+from contextlib import suppress
+
+from redis.exceptions import RedisError
+
+from apps.schedule.domain.schedule.public import PublicEventByUser
+from config import settings
+from infrastructure.utility import RedisCache
+
+__all__ = ["UserScheduleCache"]
+
+
+class UserScheduleCache:
+    """Snapshots of the schedules of all the user applets.
+
+    Every applet has a schedule version replaced by any write of its events,
+    periodicities, notifications or reminders. A snapshot stores the versions
+    it was built from and is used while the user has the same applets with
+    the same versions, so membership changes need no invalidation:
+        UserScheduleCache:applet:<applet_id> -> <version>
+        UserScheduleCache:user:<user_id> -> {"versions": {...}, "events": [...]}
+
+    A version is replaced after the write is committed, so a snapshot read
+    concurrently with the write is stored with the old version.
+
+    Reads don't depend on Redis: if it fails, the schedules are read from
+    the database and not cached.
+    """
+
+    def __init__(self):
+        self.redis_client = RedisCache()
+
+    def _applet_key(self, applet_id: uuid.UUID) -> str:
+        return f"{self.__class__.__name__}:applet:{applet_id}"
+
+    def _user_key(self, user_id: uuid.UUID) -> str:
+        return f"{self.__class__.__name__}:user:{user_id}"
+
+    async def get_versions(self, applet_ids: list[uuid.UUID]) -> dict[str, str] | None:
+        """Returns schedule versions of the applets, missing versions are created.
+        Returns None if Redis is not available.
+        """
+        if not applet_ids:
+            return {}
+        try:
+            values = await self.redis_client.mget([self._applet_key(applet_id) for applet_id in applet_ids])
+            versions: dict[str, str] = {}
+            for applet_id, value in zip(applet_ids, values):
+                if value is None:
+                    value = await self.invalidate(applet_id)
+                versions[str(applet_id)] = value.decode() if isinstance(value, bytes) else value
+        except RedisError:
+            return None
+        return versions
+
+    async def get(self, user_id: uuid.UUID, versions: dict[str, str]) -> list[PublicEventByUser] | None:
+        """Returns the snapshot built from the same applet versions."""
+        cached = await self.redis_client.get(self._user_key(user_id))
+        if cached is None:
+            return None
+        data = json.loads(cached)
+        if data["versions"] != versions:
+            return None
+        return [PublicEventByUser(**applet_events) for applet_events in data["events"]]
+
+    async def set(self, user_id: uuid.UUID, versions: dict[str, str], events: list[PublicEventByUser]) -> None:
+        data = dict(versions=versions, events=[applet_events.dict() for applet_events in events])
+        with suppress(RedisError):
+            await self.redis_client.set(
+                self._user_key(user_id),
+                json.dumps(data, default=str),
+                ex=settings.cache.schedule_snapshot_ttl,
+            )
+
+    async def invalidate(self, applet_id: uuid.UUID) -> str:
+        """Replaces the schedule version of the applet. Returns the new version."""
+        version = uuid.uuid4().hex
+        await self.redis_client.set(self._applet_key(applet_id), version, ex=settings.cache.schedule_version_ttl)
+        return version
@@ -0,0 +1,121 @@
+import calendar
+import datetime
+
+from apps.schedule.domain.constants import PeriodicityType
+
+__all__ = ["OccurrenceCalendar", "is_last_day_of_month"]
+
+# Not ISO
+FRIDAY_WEEKDAY = 4
+SATURDAY_WEEKDAY = 5
+
+
+def is_last_day_of_month(date: datetime.date) -> bool:
+    return date.day == calendar.monthrange(date.year, date.month)[1]
+
+
+class OccurrenceCalendar:
+    """Expands periodicity rules over the days from `start` to `end`.
+
+    An expansion is a bitmask where bit `i` is the day `start + i`. Masks of
+    weekdays and days of month are built once per calendar, so a rule is
+    expanded over the whole range with a few integer operations and the
+    masks of many events can be combined or tested for any day:
+        calendar = OccurrenceCalendar(date(2024, 3, 1), date(2024, 3, 31))
+        mask = calendar.expand(PeriodicityType.WEEKLY, start_date, end_date)
+        calendar.dates(mask) -> [date(2024, 3, 4), date(2024, 3, 11), ...]
+
+    Cross-day events (the end time is before the start time) also occur on
+    the day after every scheduled day, the rules follow the mobile app.
+    """
+
+    def __init__(self, start: datetime.date, end: datetime.date):
+        self.start = start
+        self.end = end
+        self.days = max((end - start).days + 1, 0)
+        self.weekday_masks = [0] * 7
+        self.monthday_masks = [0] * 32
+        self.last_monthday_mask = 0
+        for i in range(self.days):
+            date = start + datetime.timedelta(days=i)
+            self.weekday_masks[date.weekday()] |= 1 << i
+            self.monthday_masks[date.day] |= 1 << i
+            if is_last_day_of_month(date):
+                self.last_monthday_mask |= 1 << i
+
+    def range_mask(self, start: datetime.date | None, end: datetime.date | None) -> int:
+        """Mask of the days from `start` to `end`, open ends are not limited."""
+        first = 0 if start is None else max((start - self.start).days, 0)
+        last = self.days - 1 if end is None else min((end - self.start).days, self.days - 1)
+        if first > last:
+            return 0
+        return ((1 << (last - first + 1)) - 1) << first
+
+    def day_mask(self, date: datetime.date) -> int:
+        return self.range_mask(date, date)
+
+    def dates(self, mask: int) -> list[datetime.date]:
+        dates = []
+        while mask:
+            low = mask & -mask
+            dates.append(self.start + datetime.timedelta(days=low.bit_length() - 1))
+            mask ^= low
+        return dates
+
+    def expand(  # noqa: C901
+        self,
+        periodicity_type: PeriodicityType | str,
+        start_date: datetime.date | None,
+        end_date: datetime.date | None,
+        selected_date: datetime.date | None = None,
+        is_crossday: bool = False,
+    ) -> int:
+        """Returns the mask of the days the event is scheduled on."""
+        one_day = datetime.timedelta(days=1)
+        match periodicity_type:
+            case PeriodicityType.ALWAYS:
+                return self.range_mask(None, None)
+            case PeriodicityType.ONCE:
+                if selected_date is None:
+                    return 0
+                return self.range_mask(selected_date, selected_date + one_day if is_crossday else selected_date)
+            case PeriodicityType.DAILY:
+                if is_crossday and end_date:
+                    end_date += one_day
+                return self.range_mask(start_date, end_date)
+            case PeriodicityType.WEEKDAYS:
+                last_weekday = FRIDAY_WEEKDAY
+                if is_crossday:
+                    last_weekday = SATURDAY_WEEKDAY
+                    if end_date and end_date.weekday() == FRIDAY_WEEKDAY:
+                        end_date += one_day
+                weekdays = 0
+                for weekday in range(last_weekday + 1):
+                    weekdays |= self.weekday_masks[weekday]
+                return weekdays & self.range_mask(start_date, end_date)
+            case PeriodicityType.WEEKLY:
+                if start_date is None:
+                    return 0
+                weekdays = self.weekday_masks[start_date.weekday()]
+                if is_crossday:
+                    weekdays |= self.weekday_masks[(start_date.weekday() + 1) % 7]
+                    # the end date is extended only if it is on the weekday of the start date
+                    if end_date and start_date.weekday() == end_date.weekday():
+                        end_date += one_day
+                return weekdays & self.range_mask(start_date, end_date)
+            case PeriodicityType.MONTHLY:
+                if start_date is None:
+                    return 0
+                # the last days of all the months are scheduled as the export did before
+                monthdays = self.monthday_masks[start_date.day] | self.last_monthday_mask
+                if is_crossday:
+                    monthdays |= self.monthday_masks[1 if is_last_day_of_month(start_date) else start_date.day + 1]
+                    # the end date is extended only if it is on the day of month of the start date
+                    if end_date and (
+                        is_last_day_of_month(start_date)
+                        and is_last_day_of_month(end_date)
+                        or start_date.day == end_date.day
+                    ):
+                        end_date += one_day
+                return monthdays & self.range_mask(start_date, end_date)
+        return 0
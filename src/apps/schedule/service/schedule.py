@@ -1,4 +1,5 @@
 import asyncio
+import functools
 import uuid
 from datetime import date
 
@@ -48,10 +49,12 @@ from apps.schedule.errors import (
     EventAlwaysAvailableExistsError,
     ScheduleNotFoundError,
 )
+from apps.schedule.service.cache import UserScheduleCache
 from apps.shared.query_params import QueryParams
 from apps.users.cruds.user import UsersCRUD
 from apps.users.errors import UserNotFound
 from apps.workspaces.domain.constants import Role
+from infrastructure.database import after_commit
 
 __all__ = ["ScheduleService"]
 
@@ -60,6 +63,9 @@ class ScheduleService:
     def __init__(self, session):
         self.session = session
 
+    def _invalidate_cache(self, applet_id: uuid.UUID) -> None:
+        after_commit(self.session, functools.partial(UserScheduleCache().invalidate, applet_id))
+
     async def create_schedule(self, schedule: EventRequest, applet_id: uuid.UUID) -> PublicEvent:
         # Validate schedule data before saving
         await self._validate_schedule(applet_id=applet_id, schedule=schedule)
@@ -159,6 +165,8 @@ class ScheduleService:
                 else None,
             )
 
+        self._invalidate_cache(applet_id)
+
         return PublicEvent(
             **event.dict(),
             periodicity=PublicPeriodicity(**periodicity.dict()),
@@ -279,6 +287,7 @@ class ScheduleService:
         flow_ids = await FlowEventsCRUD(self.session).get_by_event_ids(event_ids)
 
         await self._delete_by_ids(event_ids, periodicity_ids)
+        self._invalidate_cache(applet_id)
 
         # Create default events for activities and flows
         for activity_id in activity_ids:
@@ -298,6 +307,7 @@ class ScheduleService:
 
         # Delete event-user, event-activity, event-flow
         await self._delete_by_ids(event_ids=[schedule_id], periodicity_ids=[periodicity_id])
+        self._invalidate_cache(event.applet_id)
         # Create default event for activity or flow if another event doesn't exist # noqa: E501
         if activity_id:
             count_events = await ActivityEventsCRUD(self.session).count_by_activity(
@@ -415,6 +425,8 @@ class ScheduleService:
                 else None,
             )
 
+        self._invalidate_cache(applet_id)
+
         return PublicEvent(
             **event.dict(),
             periodicity=PublicPeriodicity(**periodicity.dict()),
@@ -493,6 +505,7 @@ class ScheduleService:
             periodicity_ids,
             user_id,
         )
+        self._invalidate_cache(applet_id)
         # Create AA events for all activities and flows
         await self.create_default_schedules(
             applet_id=applet_id,
@@ -589,6 +602,7 @@ class ScheduleService:
         event_ids = [event.id for event in events]
         periodicity_ids = [event.periodicity_id for event in events]
         await self._delete_by_ids(event_ids, periodicity_ids)
+        self._invalidate_cache(applet_id)
 
     async def delete_by_flow_ids(self, applet_id: uuid.UUID, flow_ids: list[uuid.UUID]) -> None:
         """Delete schedules by flow ids."""
@@ -596,6 +610,7 @@ class ScheduleService:
         event_ids = [event.id for event in events]
         periodicity_ids = [event.periodicity_id for event in events]
         await self._delete_by_ids(event_ids, periodicity_ids)
+        self._invalidate_cache(applet_id)
 
     async def create_default_schedules(
         self,
@@ -621,30 +636,18 @@ class ScheduleService:
             query_params=QueryParams(),
         )
         applet_ids = [applet.id for applet in applets]
-        events = []
 
-        for applet_id in applet_ids:
-            user_events: list = await EventCRUD(self.session).get_all_by_applet_and_user(
-                applet_id=applet_id,
-                user_id=user_id,
-            )
-            general_events: list = await EventCRUD(self.session).get_general_events_by_user(
-                applet_id=applet_id, user_id=user_id
-            )
-            all_events = user_events + general_events
-            events.append(
-                PublicEventByUser(
-                    applet_id=applet_id,
-                    events=[
-                        self._convert_to_dto(
-                            event=event,
-                            notifications=await NotificationCRUD(self.session).get_all_by_event_id(event.id),
-                            reminder=await ReminderCRUD(self.session).get_by_event_id(event.id),
-                        )
-                        for event in all_events
-                    ],
-                )
-            )
+        cache = UserScheduleCache()
+        versions = await cache.get_versions(applet_ids)
+        if versions is not None and (events := await cache.get(user_id, versions)) is not None:
+            return events
+
+        events_map = await self._get_events_by_applets_and_user(user_id, applet_ids)
+        events = [
+            PublicEventByUser(applet_id=applet_id, events=events_map.get(applet_id, [])) for applet_id in applet_ids
+        ]
+        if versions is not None:
+            await cache.set(user_id, versions, events)
 
         return events
 
@@ -656,6 +659,21 @@ class ScheduleService:
         max_start_date: date | None = None,
     ) -> list[PublicEventByUser]:
         """Get all events for user in applets that user is respondent."""
+        events_map = await self._get_events_by_applets_and_user(user_id, applet_ids, min_end_date, max_start_date)
+        return [PublicEventByUser(applet_id=applet_id, events=events) for applet_id, events in events_map.items()]
+
+    async def _get_events_by_applets_and_user(
+        self,
+        user_id: uuid.UUID,
+        applet_ids: list[uuid.UUID],
+        min_end_date: date | None = None,
+        max_start_date: date | None = None,
+    ) -> dict[uuid.UUID, list[ScheduleEventDto]]:
+        """Loads individual and general events of the applets with their
+        notifications and reminders in four queries.
+        Return {applet_id: [ScheduleEventDto]} for applets with events"""
+        if not applet_ids:
+            return {}
         user_events_map, user_event_ids = await EventCRUD(self.session).get_all_by_applets_and_user(
             applet_ids=applet_ids,
             user_id=user_id,
@@ -675,23 +693,17 @@ class ScheduleService:
         reminders_map_c = ReminderCRUD(self.session).get_by_event_ids(event_ids)
         notifications_map, reminders_map = await asyncio.gather(notifications_map_c, reminders_map_c)
 
-        events: list[PublicEventByUser] = []
-        for applet_id, all_events in full_events_map.items():
-            events.append(
-                PublicEventByUser(
-                    applet_id=applet_id,
-                    events=[
-                        self._convert_to_dto(
-                            event=event,
-                            notifications=notifications_map.get(event.id),
-                            reminder=reminders_map.get(event.id),
-                        )
-                        for event in all_events
-                    ],
+        return {
+            applet_id: [
+                self._convert_to_dto(
+                    event=event,
+                    notifications=notifications_map.get(event.id),
+                    reminder=reminders_map.get(event.id),
                 )
-            )
-
-        return events
+                for event in all_events
+            ]
+            for applet_id, all_events in full_events_map.items()
+        }
 
     @staticmethod
     def _sum_applets_events_map(m1: dict, m2: dict):
@@ -811,26 +823,8 @@ class ScheduleService:
         ):
             raise AccessDeniedToApplet()
 
-        user_events = await EventCRUD(self.session).get_all_by_applet_and_user(
-            applet_id=applet_id,
-            user_id=user_id,
-        )
-
-        general_events = await EventCRUD(self.session).get_general_events_by_user(applet_id=applet_id, user_id=user_id)
-
-        events = PublicEventByUser(
-            applet_id=applet_id,
-            events=[
-                self._convert_to_dto(
-                    event=event,
-                    notifications=await NotificationCRUD(self.session).get_all_by_event_id(event.id),
-                    reminder=await ReminderCRUD(self.session).get_by_event_id(event.id),
-                )
-                for event in (user_events + general_events)
-            ],
-        )
-
-        return events
+        events_map = await self._get_events_by_applets_and_user(user_id, [applet_id])
+        return PublicEventByUser(applet_id=applet_id, events=events_map.get(applet_id, []))
 
     async def count_events_by_user(self, user_id: uuid.UUID) -> int:
         """Count all events for user in applets that user is respondent."""
@@ -939,6 +933,7 @@ class ScheduleService:
             periodicity_ids,
             user_id,
         )
+        self._invalidate_cache(applet_id)
 
     async def import_schedule(self, schedules: list[EventRequest], applet_id: uuid.UUID) -> list[PublicEvent]:
         """Import schedule."""
@@ -7,6 +7,7 @@ import pytest
 from firebase_admin.exceptions import NotFoundError as FireBaseNotFoundError
 from pytest import FixtureRequest, LogCaptureFixture
 from pytest_mock import MockerFixture
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from apps.activity_flows.domain.flow_create import FlowCreate, FlowItemCreate
@@ -546,6 +547,45 @@ class TestSchedule:
         # Default events
         assert response.json()["count"] == num_events
 
+    async def test_schedules_get_user_all__cached_schedule_updated_after_event_created(
+        self, client: TestClient, user: User, applet: AppletFull, event_daily_data: EventRequest
+    ):
+        client.login(user)
+        response = await client.get(self.schedule_user_url)
+        assert response.status_code == http.HTTPStatus.OK
+
+        response = await client.post(self.schedule_url.format(applet_id=applet.id), data=event_daily_data)
+        assert response.status_code == http.HTTPStatus.CREATED
+        event_id = response.json()["result"]["id"]
+
+        response = await client.get(self.schedule_user_url)
+        assert response.status_code == http.HTTPStatus.OK
+        applet_events = next(i for i in response.json()["result"] if i["appletId"] == str(applet.id))
+        event = next(i for i in applet_events["events"] if i["id"] == event_id)
+        assert event["availability"]["periodicityType"] == constants.PeriodicityType.DAILY
+
+    async def test_schedules_get_user_all__second_read_is_cached(
+        self, client: TestClient, user: User, applet: AppletFull, mocker: MockerFixture
+    ):
+        client.login(user)
+        spy = mocker.spy(ScheduleService, "_get_events_by_applets_and_user")
+        first = await client.get(self.schedule_user_url)
+        assert first.status_code == http.HTTPStatus.OK
+
+        second = await client.get(self.schedule_user_url)
+        assert second.status_code == http.HTTPStatus.OK
+        assert second.json() == first.json()
+        assert spy.call_count == 1
+
+    async def test_schedules_get_user_all__redis_errors_are_ignored(
+        self, client: TestClient, user: User, applet: AppletFull, mocker: MockerFixture
+    ):
+        client.login(user)
+        mocker.patch("infrastructure.utility.redis_client.RedisCacheTest.mget", side_effect=RedisError())
+        response = await client.get(self.schedule_user_url)
+        assert response.status_code == http.HTTPStatus.OK
+        assert any(i["appletId"] == str(applet.id) for i in response.json()["result"])
+
     async def test_respondent_schedules_get_user_two_weeks(self, client: TestClient, applet: AppletFull, user: User):
         client.login(user)
 
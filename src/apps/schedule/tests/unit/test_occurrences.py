@@ -0,0 +1,56 @@
+import datetime
+
+import pytest
+
+from apps.schedule.domain.constants import PeriodicityType
+from apps.schedule.service.occurrences import OccurrenceCalendar
+
+MARCH_START = datetime.date(2024, 3, 1)
+MARCH_END = datetime.date(2024, 3, 31)
+
+
+@pytest.fixture
+def march() -> OccurrenceCalendar:
+    return OccurrenceCalendar(MARCH_START, MARCH_END)
+
+
+def test_dates_of_range_mask(march: OccurrenceCalendar):
+    mask = march.range_mask(datetime.date(2024, 2, 1), datetime.date(2024, 3, 3))
+    assert march.dates(mask) == [datetime.date(2024, 3, 1), datetime.date(2024, 3, 2), datetime.date(2024, 3, 3)]
+    assert march.range_mask(datetime.date(2024, 4, 1), None) == 0
+
+
+@pytest.mark.parametrize(
+    "periodicity_type, start_date, end_date, exp_days",
+    (
+        (PeriodicityType.ALWAYS, None, None, list(range(1, 32))),
+        (PeriodicityType.DAILY, datetime.date(2024, 3, 29), datetime.date(2024, 4, 10), [29, 30, 31]),
+        (PeriodicityType.WEEKDAYS, datetime.date(2024, 3, 1), datetime.date(2024, 3, 10), [1, 4, 5, 6, 7, 8]),
+        (PeriodicityType.WEEKLY, datetime.date(2024, 2, 5), datetime.date(2024, 3, 18), [4, 11, 18]),
+        (PeriodicityType.MONTHLY, datetime.date(2024, 1, 10), datetime.date(2024, 6, 1), [10, 31]),
+    ),
+)
+def test_expand(
+    march: OccurrenceCalendar,
+    periodicity_type: PeriodicityType,
+    start_date: datetime.date | None,
+    end_date: datetime.date | None,
+    exp_days: list[int],
+):
+    mask = march.expand(periodicity_type, start_date, end_date)
+    assert [date.day for date in march.dates(mask)] == exp_days
+
+
+def test_expand_once_cross_day(march: OccurrenceCalendar):
+    mask = march.expand(PeriodicityType.ONCE, None, None, selected_date=datetime.date(2024, 3, 31), is_crossday=True)
+    assert march.dates(mask) == [datetime.date(2024, 3, 31)]
+    april = OccurrenceCalendar(datetime.date(2024, 4, 1), datetime.date(2024, 4, 30))
+    mask = april.expand(PeriodicityType.ONCE, None, None, selected_date=datetime.date(2024, 3, 31), is_crossday=True)
+    assert april.dates(mask) == [datetime.date(2024, 4, 1)]
+
+
+def test_expand_weekly_cross_day(march: OccurrenceCalendar):
+    mask = march.expand(
+        PeriodicityType.WEEKLY, datetime.date(2024, 3, 10), datetime.date(2024, 3, 24), is_crossday=True
+    )
+    assert [date.day for date in march.dates(mask)] == [10, 11, 17, 18, 24, 25]
@@ -0,0 +1,134 @@
+import hashlib
+import hmac
+import string
+import unicodedata
+from typing import Any, Iterator
+
+from sqlalchemy import event, inspect
+
+from config import settings
+
+__all__ = ["BlindIndexed", "search_keys", "query_keys", "sort_key"]
+
+# values are indexed by all n-grams up to this length
+SEARCH_NGRAM = 3
+# length of the hex digest kept for every n-gram
+SEARCH_KEY_LENGTH = 16
+# sort keys order values by this number of leading characters only
+SORT_KEY_CHARS = 2
+# sort key alphabet: 0 - no character, 1 - not alphanumeric, digits, latin letters, other letters
+_SORT_ALPHABET = {char: index for index, char in enumerate(string.digits + string.ascii_lowercase, start=2)}
+_SORT_BASE = len(_SORT_ALPHABET) + 3
+
+
+def _normalize(value: str) -> str:
+    """Case-insensitive, accent-insensitive form of the value.
+
+    Every character is mapped separately, so a substring of the value
+    stays a substring of the normalized value.
+    """
+    decomposed = unicodedata.normalize("NFKD", value.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _hash(token: str) -> str:
+    digest = hmac.new(settings.secrets.blind_index_key, token.encode(), hashlib.sha256)
+    return digest.hexdigest()[:SEARCH_KEY_LENGTH]
+
+
+def _ngrams(value: str, n: int) -> Iterator[str]:
+    return (value[i : i + n] for i in range(len(value) - n + 1))
+
+
+def search_keys(value: str | None) -> list[str] | None:
+    """Keyed hashes of all the n-grams of the value up to SEARCH_NGRAM length."""
+    if value is None:
+        return None
+    value = _normalize(value)
+    tokens = {ngram for n in range(1, SEARCH_NGRAM + 1) for ngram in _ngrams(value, n)}
+    return sorted(_hash(token) for token in tokens)
+
+
+def query_keys(term: str) -> list[str]:
+    """Keys which every value containing the term has.
+
+    Values with all the keys are candidates only: for terms longer than
+    SEARCH_NGRAM the n-grams may be found in different places of the value,
+    so the match has to be checked against the decrypted value.
+    """
+    term = _normalize(term)
+    if len(term) <= SEARCH_NGRAM:
+        return [_hash(term)] if term else []
+    return sorted({_hash(ngram) for ngram in _ngrams(term, SEARCH_NGRAM)})
+
+
+def sort_key(value: str | None) -> int | None:
+    """Order-preserving bucket of the value by its first SORT_KEY_CHARS characters.
+
+    Only the bucket is stored, so values are sorted approximately without
+    disclosing more than their leading characters. The bucket is not keyed,
+    the leading characters are readable by anyone with access to the column.
+    """
+    if value is None:
+        return None
+    value = _normalize(value)
+    key = 0
+    for i in range(SORT_KEY_CHARS):
+        char = value[i] if i < len(value) else None
+        if char is None:
+            index = 0
+        elif char in _SORT_ALPHABET:
+            index = _SORT_ALPHABET[char]
+        else:
+            index = _SORT_BASE - 1 if char.isalpha() else 1
+        key = key * _SORT_BASE + index
+    return key
+
+
+class BlindIndexed:
+    """Mixin of schemas with blind indexes of encrypted columns.
+
+    Every field listed in `__blind_indexed__` has two columns declared by the
+    schema: `<field>_search_keys` with the search keys of the value and
+    `<field>_sort_key` with its sort key. They are filled on ORM flushes and
+    in the values of the statements built from schema instances
+    (`BaseCRUD._update_one`, `BaseCRUD._update`).
+    Statements with explicit values should add `blind_index_values(values)`.
+    Existing rows are indexed by the `blind-index backfill` command.
+    """
+
+    __blind_indexed__: tuple[str, ...] = ()
+
+    @classmethod
+    def blind_index_values(cls, values: dict[str, Any]) -> dict[str, Any]:
+        """Index columns of the indexed fields present in the values."""
+        index = {}
+        for field in cls.__blind_indexed__:
+            if field in values:
+                index[f"{field}_search_keys"] = search_keys(values[field])
+                index[f"{field}_sort_key"] = sort_key(values[field])
+        return index
+
+    def __iter__(self):
+        values = dict(super().__iter__())  # type: ignore[misc]
+        values.update(self.blind_index_values(values))
+        return iter(values.items())
+
+
+@event.listens_for(BlindIndexed, "before_insert", propagate=True)
+def _index_on_insert(mapper, connection, target: BlindIndexed) -> None:
+    values = {field: getattr(target, field) for field in target.__blind_indexed__}
+    for key, value in target.blind_index_values(values).items():
+        setattr(target, key, value)
+
+
+@event.listens_for(BlindIndexed, "before_update", propagate=True)
+def _index_on_update(mapper, connection, target: BlindIndexed) -> None:
+    state = inspect(target)
+    values = {
+        field: getattr(target, field)
+        for field in target.__blind_indexed__
+        if state.attrs[field].history.has_changes()
+    }
+    for key, value in target.blind_index_values(values).items():
+        setattr(target, key, value)
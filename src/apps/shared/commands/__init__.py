@@ -1,2 +1,3 @@
+from apps.shared.commands.blind_index import app as blind_index_cli  # noqa: F401
 from apps.shared.commands.encryption import app as encryption_cli  # noqa: F401
 from apps.shared.commands.patch_commands import app as patch  # noqa: F401
@@ -0,0 +1,64 @@
+from typing import Optional
+
+import typer
+from rich import print
+from sqlalchemy import bindparam, select, update
+
+from apps.subjects.db.schemas import SubjectSchema
+from apps.users.db.schemas import UserSchema
+from infrastructure.commands.utils import coro
+from infrastructure.database import atomic, session_manager
+
+app = typer.Typer()
+
+BLIND_INDEXED_SCHEMAS = {schema.__tablename__: schema for schema in (SubjectSchema, UserSchema)}
+
+
+async def backfill_schema(session_maker, schema, batch_size: int) -> int:
+    """Rebuilds the blind indexes of all rows by batches ordered by id,
+    every batch is committed separately.
+    """
+    fields = [getattr(schema, field) for field in schema.__blind_indexed__]
+    table = schema.__table__
+    stmt = update(table).where(table.c.id == bindparam("_id"))
+    last_id = None
+    total = 0
+    while True:
+        async with session_maker() as session:
+            async with atomic(session):
+                query = select(schema.id, *fields).order_by(schema.id).limit(batch_size)
+                if last_id is not None:
+                    query = query.where(schema.id > last_id)
+                rows = (await session.execute(query)).all()
+                if not rows:
+                    return total
+                values = [
+                    dict(_id=row.id, **schema.blind_index_values(dict(zip(schema.__blind_indexed__, row[1:]))))
+                    for row in rows
+                ]
+                await session.execute(stmt, values)
+        last_id = rows[-1].id
+        total += len(rows)
+        print(f"{schema.__tablename__}: {total} rows indexed")
+
+
+@app.command(short_help="Build blind indexes (search and sort keys) of encrypted fields")
+@coro
+async def backfill(
+    tables: Optional[list[str]] = typer.Argument(
+        None,
+        help=f"Tables to index, if no table names are provided all of them are indexed: "
+        f"{', '.join(BLIND_INDEXED_SCHEMAS)}.",
+    ),
+    batch_size: int = typer.Option(1000, "--batch-size", "-b", min=1, help="Rows updated in one transaction."),
+) -> None:
+    """Run after deployment of the blind indexes and after changes of the secret keys."""
+    tables = tables or list(BLIND_INDEXED_SCHEMAS)
+    unknown = set(tables) - set(BLIND_INDEXED_SCHEMAS)
+    if unknown:
+        print(f"[red]Tables without blind indexes: {', '.join(sorted(unknown))}[/red]")
+        raise typer.Exit(1)
+    session_maker = session_manager.get_session()
+    for table in tables:
+        total = await backfill_schema(session_maker, BLIND_INDEXED_SCHEMAS[table], batch_size)
+        print(f"[green]{table}: indexing is finished, {total} rows[/green]")
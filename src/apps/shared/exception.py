@@ -21,8 +21,11 @@ class BaseError(Exception):
 
     status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     type = ExceptionTypes.UNDEFINED
+    # other errors found in the same validation pass, they are reported together
+    related_errors: list["BaseError"]
 
     def __init__(self, *args, **kwargs):
+        self.related_errors = []
         self.kwargs = kwargs
         self.updated_message = None
         if self.args and not self.message_is_template:
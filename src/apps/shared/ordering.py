@@ -27,6 +27,10 @@ class Ordering:
     Clauses returned by get_clauses will only include requested encrypted fields only if record
     count is below ENCRYPTED_ORDERING_LIMIT.
 
+    Encrypted fields with blind index sort keys (see `BlindIndexed`) can be added to the
+    sort_key_fields dictionary. Above ENCRYPTED_ORDERING_LIMIT records are ordered by the sort
+    keys instead, approximately by the leading characters of the values.
+
     Example:
 
     ```
@@ -61,6 +65,16 @@ class Ordering:
         # Else if count >= ENCRYPTED_ORDERING_LIMIT, will give result as SQL:
         #   select * from schema order by created_at desc
         # and EncryptedOrdering().get_ordering_fields(count) will return ["id", "date"]
+
+
+        class SortKeyOrdering(EncryptedOrdering):
+            sort_key_fields = {
+                "email": UserSchema.email_encrypted_sort_key,
+            }
+
+        # If count >= ENCRYPTED_ORDERING_LIMIT, will give result as SQL:
+        #   select * from schema order by email_encrypted_sort_key asc, created_at desc
+        # and SortKeyOrdering().get_ordering_fields(count) will return ["id", "date", "email"]
     ```
     """
 
@@ -74,6 +88,7 @@ class Ordering:
 
     fields: dict[str, InstrumentedAttribute | Column | Clause] = dict()
     encrypted_fields: dict[str, InstrumentedAttribute | Column | Clause] = dict()
+    sort_key_fields: dict[str, InstrumentedAttribute | Column | Clause] = dict()
 
     actions = {
         "+": asc,
@@ -100,11 +115,20 @@ class Ordering:
             if _val is not None:
                 self.encrypted_fields[key] = _val
 
+        for key, val in self.sort_key_fields.items():
+            _val = None
+            if isinstance(val, (InstrumentedAttribute, Column)):
+                _val = val
+            elif isinstance(val, Ordering.Clause):
+                _val = val.clause
+            if _val is not None:
+                self.sort_key_fields[key] = _val
+
     def get_clauses(self, *args: str, count: int = 0):
         """
         Returns SQL clauses suitable for Query.order_by based on provided "+field"-style args,
         including any requested encrypted fields only if provided record count is below
-        ENCRYPTED_ORDERING_LIMIT.
+        ENCRYPTED_ORDERING_LIMIT, otherwise their sort keys if there are any.
         """
         clauses: list[str] = []
         for value in args:
@@ -118,6 +142,8 @@ class Ordering:
                 clause = self._prepare_sql_clause((direction, self.fields[field]))
             elif field in self.encrypted_fields and count < ENCRYPTED_ORDERING_LIMIT:
                 clause = self._prepare_sql_clause((direction, self.encrypted_fields[field]))
+            elif field in self.sort_key_fields:
+                clause = self._prepare_sql_clause((direction, self.sort_key_fields[field]))
             else:
                 continue
 
@@ -128,7 +154,8 @@ class Ordering:
     def get_ordering_fields(self, count: int = 0):
         """
         Returns list of fields that this Ordering class supports for sorting, which includes
-        encrypted fields only if provided record count is below ENCRYPTED_ORDERING_LIMIT.
+        encrypted fields only if provided record count is below ENCRYPTED_ORDERING_LIMIT
+        or if they have sort keys.
 
         Returns field names in camelCase suitable for API output.
         """
@@ -136,6 +163,8 @@ class Ordering:
         include_encrypted_fields = bool(self.encrypted_fields) and count < ENCRYPTED_ORDERING_LIMIT
         if include_encrypted_fields:
             fields += self.encrypted_fields.keys()
+        else:
+            fields += [field for field in self.encrypted_fields if field in self.sort_key_fields]
         return list(to_camelcase(word) for word in fields)
 
     def _parse_ordered_field(self, value: str):
@@ -1,8 +1,33 @@
+import hashlib
+import json
+from contextlib import suppress
+from enum import StrEnum
 from typing import List, Optional
 
+from redis.exceptions import RedisError
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Query
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import ClauseElement
 
+from apps.shared.domain import InternalModel
 from config import settings
+from infrastructure.utility import RedisCache
+
+
+class TotalMode(StrEnum):
+    EXACT = "exact"
+    # cached exact count or the query planner estimation
+    ESTIMATED = "estimated"
+    # no count at all, `has_more` shows if there is the next page
+    NONE = "none"
+
+
+class PageTotal(InternalModel):
+    mode: TotalMode = TotalMode.EXACT
+    count: int | None = 0
+    has_more: bool = False
 
 
 def check_limitation(func):
@@ -33,3 +58,64 @@ def paging_list(items: Optional[List], page=1, limit=10) -> list:
     start = (page - 1) * limit
     end = start + limit
     return items[start:end]
+
+
+class _Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: Query):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
+
+
+def _count_cache_key(count_query: Query) -> str:
+    compiled = count_query.compile()
+    params = sorted((key, str(value)) for key, value in compiled.params.items())
+    digest = hashlib.sha256(f"{compiled}{params}".encode()).hexdigest()
+    return f"PageTotal:{digest}"
+
+
+async def _exact_count(session, count_query: Query) -> int:
+    count = (await session.execute(count_query)).scalar()
+    # the count is cached for the estimated mode only, the exact mode doesn't depend on Redis
+    with suppress(RedisError):
+        await RedisCache().set(_count_cache_key(count_query), str(count), ex=settings.cache.listing_total_ttl)
+    return count
+
+
+async def _estimated_count(session, query: Query, count_query: Query) -> int:
+    cached = await RedisCache().get(_count_cache_key(count_query))
+    if cached is not None:
+        return int(cached)
+    plan = (await session.execute(_Explain(query))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def paginate(
+    session, query: Query, count_query: Query, page=1, limit=10, mode: TotalMode = TotalMode.EXACT
+) -> tuple[list[Row], PageTotal]:
+    """Returns a page of rows and the total according to the mode.
+
+    One extra row is selected to know if there is the next page, so
+    the last page total is exact without any count query.
+    """
+    limit = min(limit or settings.service.result_limit, settings.service.result_limit)
+    offset = ((page or 1) - 1) * limit
+    rows = (await session.execute(query.limit(limit + 1).offset(offset))).all()
+    total = PageTotal(mode=mode, count=None, has_more=len(rows) > limit)
+    rows = rows[:limit]
+
+    if mode != TotalMode.NONE and not total.has_more and (rows or not offset):
+        total.count = offset + len(rows)
+    elif mode == TotalMode.EXACT:
+        total.count = await _exact_count(session, count_query)
+    elif mode == TotalMode.ESTIMATED:
+        minimum = offset + len(rows) + int(total.has_more)
+        total.count = max(await _estimated_count(session, query, count_query), minimum)
+    return rows, total
@@ -5,6 +5,7 @@ from fastapi import Depends
 from pydantic import Field
 
 from apps.shared.domain import InternalModel
+from apps.shared.paging import TotalMode
 from config import settings
 
 
@@ -29,6 +30,7 @@ class QueryParams(InternalModel):
     page: int = Field(gt=0, default=1)
     limit: int = Field(gt=0, default=10, le=settings.service.result_limit)
     ordering: list[str] = Field(default_factory=list)
+    total_mode: TotalMode = TotalMode.EXACT
 
 
 def parse_query_params(query_param_class):
@@ -48,6 +50,8 @@ def parse_query_params(query_param_class):
                 grouped_query_params.page = val
             elif key == "limit":
                 grouped_query_params.limit = val
+            elif key == "total":
+                grouped_query_params.total_mode = val
             elif key == "ordering":
                 grouped_query_params.ordering = list(map(_camelcase_to_snakecase, val.split(",")))
             else:
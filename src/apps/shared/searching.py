@@ -1,6 +1,9 @@
 from functools import reduce
 
-from sqlalchemy import Unicode, or_
+from sqlalchemy import Unicode, and_, func, or_
+
+from apps.shared.blind_index import query_keys
+from apps.shared.encryption import get_key
 
 __all__ = ["Searching"]
 
@@ -16,16 +19,39 @@ class Searching:
         will generate where clause like below:
         select * from schema where first_name::text ilike '%To%'
 
+    Encrypted fields are searched by their blind indexes, see `BlindIndexed`:
+        class SchemaSearch(Searching):
+            blind_index_fields = [(Schema.nickname, Schema.nickname_search_keys)]
+
+        SchemaSearch().get_clauses('To')
+        will generate where clause like below:
+        select * from schema
+        where nickname_search_keys @> '{<keys of "to">}'
+            and decrypt_internal(nickname, …) ilike '%To%'
 
+    Only the rows found by the (GIN indexed) search keys are decrypted.
+    Rows without search keys (not indexed by the `blind-index backfill` yet,
+    or without a value) are decrypted and matched as well.
     """
 
     search_fields: list = []
+    # pairs of an encrypted field and the column of its search keys
+    blind_index_fields: list[tuple] = []
 
     def get_clauses(self, search_term):
         clauses = []
-        if not search_term or not self.search_fields:
+        if not search_term or not (self.search_fields or self.blind_index_fields):
             return None
         for search_field in self.search_fields:
             clauses.append(search_field.cast(Unicode()).ilike(f"%{search_term}%"))
+        keys = query_keys(search_term)
+        for encrypted_field, search_keys in self.blind_index_fields:
+            clauses.append(self.get_blind_index_clause(encrypted_field, search_keys, keys, search_term))
 
         return reduce(or_, clauses)
+
+    def get_blind_index_clause(self, encrypted_field, search_keys, keys: list[str], search_term: str):
+        return and_(
+            or_(search_keys.contains(keys), search_keys.is_(None)),
+            func.decrypt_internal(encrypted_field, get_key()).ilike(f"%{search_term}%"),
+        )
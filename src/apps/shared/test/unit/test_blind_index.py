@@ -0,0 +1,90 @@
+import uuid
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.applets.domain.applet_full import AppletFull
+from apps.shared.blind_index import query_keys, search_keys, sort_key
+from apps.shared.ordering import ENCRYPTED_ORDERING_LIMIT, Ordering
+from apps.shared.searching import Searching
+from apps.subjects.crud import SubjectsCrud
+from apps.subjects.db.schemas import SubjectSchema
+from apps.users.domain import User
+
+
+class _SubjectSearch(Searching):
+    blind_index_fields = [(SubjectSchema.nickname, SubjectSchema.nickname_search_keys)]
+
+
+class _SubjectOrdering(Ordering):
+    id = SubjectSchema.id
+    encrypted_fields = {"nickname": SubjectSchema.nickname, "email": SubjectSchema.email}
+    sort_key_fields = {"nickname": SubjectSchema.nickname_sort_key}
+
+
+@pytest.mark.parametrize("term", ("a", "Ga", "gab", "Gabel", "ÉLEN", "gabel hel"))
+def test_query_keys_are_subset_of_value_keys(term: str):
+    assert set(query_keys(term)) <= set(search_keys("Lucy Gabel Hélène"))
+
+
+def test_query_keys_do_not_match_other_values():
+    assert not set(query_keys("tom")) <= set(search_keys("Lucy Gabel"))
+
+
+def test_sort_key_keeps_order_of_leading_characters():
+    names = ["Zoe", "adam", "Émile", "42", "bob", "ab"]
+    assert sorted(names, key=sort_key) == ["42", "ab", "adam", "bob", "Émile", "Zoe"]
+    assert sort_key(None) is None
+
+
+def test_ordering_uses_sort_keys_above_limit():
+    ordering = _SubjectOrdering()
+    assert ordering.get_ordering_fields(count=ENCRYPTED_ORDERING_LIMIT) == ["id", "nickname"]
+    clauses = ordering.get_clauses("-nickname", "email", count=ENCRYPTED_ORDERING_LIMIT)
+    assert [str(clause) for clause in clauses] == ["subjects.nickname_sort_key DESC"]
+
+
+async def test_search_keys_are_maintained_on_write(session: AsyncSession, tom: User, applet_one: AppletFull):
+    crud = SubjectsCrud(session)
+    subject = await crud.create(
+        SubjectSchema(
+            applet_id=applet_one.id,
+            creator_id=tom.id,
+            first_name="Lucy",
+            last_name="Gabel",
+            nickname="Lucy Gabel",
+            secret_user_id=str(uuid.uuid4()),
+        )
+    )
+    def search(term: str):
+        return select(SubjectSchema.id).where(
+            SubjectSchema.applet_id == applet_one.id, _SubjectSearch().get_clauses(term)
+        )
+
+    assert (await session.execute(search("gab"))).scalars().all() == [subject.id]
+
+    await crud.update_by_id(subject.id, nickname="Lucy Hélène")
+    assert (await session.execute(search("gab"))).scalars().all() == []
+    # accent-insensitive keys are rechecked against the decrypted value
+    assert (await session.execute(search("helen"))).scalars().all() == []
+    assert (await session.execute(search("Hélène"))).scalars().all() == [subject.id]
+
+
+async def test_rows_without_search_keys_are_searched(session: AsyncSession, tom: User, applet_one: AppletFull):
+    subject = await SubjectsCrud(session).create(
+        SubjectSchema(
+            applet_id=applet_one.id,
+            creator_id=tom.id,
+            first_name="Lucy",
+            last_name="Gabel",
+            nickname="Lucy Gabel",
+            secret_user_id=str(uuid.uuid4()),
+        )
+    )
+    # rows created before the blind indexes are not indexed until the backfill
+    not_indexed = update(SubjectSchema).where(SubjectSchema.id == subject.id).values(nickname_search_keys=None)
+    await session.execute(not_indexed)
+    query = select(SubjectSchema.id)
+    query = query.where(SubjectSchema.applet_id == applet_one.id, _SubjectSearch().get_clauses("gab"))
+    assert (await session.execute(query)).scalars().all() == [subject.id]
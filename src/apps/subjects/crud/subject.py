@@ -28,6 +28,7 @@ class SubjectsCrud(BaseCRUD[SubjectSchema]):
         return await self._update_one("id", schema.id, schema)
 
     async def update_by_id(self, id_, **values):
+        values.update(SubjectSchema.blind_index_values(values))
         query = (
             update(self.schema_class).where(self.schema_class.id == id_).values(**values).returning(self.schema_class)
         )
@@ -163,6 +164,7 @@ class SubjectsCrud(BaseCRUD[SubjectSchema]):
 
     async def upsert(self, schema: SubjectCreate) -> SubjectSchema | None:
         values = {**schema.dict()}
+        values.update(SubjectSchema.blind_index_values(values))
         stmt = insert(SubjectSchema).values(values)
         stmt = stmt.on_conflict_do_update(
             index_elements=[SubjectSchema.user_id, SubjectSchema.applet_id],
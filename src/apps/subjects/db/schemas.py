@@ -1,15 +1,17 @@
-from sqlalchemy import Column, ForeignKey, Index, String, Unicode
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Column, ForeignKey, Index, SmallInteger, String, Unicode
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy_utils import StringEncryptedType
 
+from apps.shared.blind_index import BlindIndexed
 from apps.shared.encryption import get_key
 from infrastructure.database.base import Base
 
 __all__ = ["SubjectSchema", "SubjectRelationSchema"]
 
 
-class SubjectSchema(Base):
+class SubjectSchema(BlindIndexed, Base):
     __tablename__ = "subjects"
+    __blind_indexed__ = ("email", "first_name", "last_name", "nickname")
     applet_id = Column(ForeignKey("applets.id", ondelete="RESTRICT"), nullable=False)
     creator_id = Column(ForeignKey("users.id", ondelete="RESTRICT"), nullable=False)
     user_id = Column(ForeignKey("users.id", ondelete="RESTRICT"), nullable=True)
@@ -20,6 +22,14 @@ class SubjectSchema(Base):
     tag = Column(String, default=None, nullable=True)
     secret_user_id = Column(String, nullable=False)
     language = Column(String(length=5))
+    email_search_keys = Column(ARRAY(String), nullable=True)
+    email_sort_key = Column(SmallInteger(), nullable=True)
+    first_name_search_keys = Column(ARRAY(String), nullable=True)
+    first_name_sort_key = Column(SmallInteger(), nullable=True)
+    last_name_search_keys = Column(ARRAY(String), nullable=True)
+    last_name_sort_key = Column(SmallInteger(), nullable=True)
+    nickname_search_keys = Column(ARRAY(String), nullable=True)
+    nickname_sort_key = Column(SmallInteger(), nullable=True)
     __table_args__ = (
         Index(
             None,
@@ -27,6 +37,10 @@ class SubjectSchema(Base):
             "applet_id",
             unique=True,
         ),
+        Index(None, "email_search_keys", postgresql_using="gin"),
+        Index(None, "first_name_search_keys", postgresql_using="gin"),
+        Index(None, "last_name_search_keys", postgresql_using="gin"),
+        Index(None, "nickname_search_keys", postgresql_using="gin"),
     )
 
 
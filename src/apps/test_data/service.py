@@ -4,6 +4,8 @@ import uuid
 from datetime import datetime, timedelta
 
 from apps.activities.domain.activity_create import ActivityCreate, ActivityItemCreate
+from apps.activities.domain.conditional_logic import ConditionalLogic, Match
+from apps.activities.domain.conditions import ConditionType, EqualToOptionCondition, OptionPayload
 from apps.activities.domain.response_type_config import ResponseType
 from apps.activity_flows.domain.flow_create import FlowCreate, FlowItemCreate
 from apps.applets.domain.applet_create_update import AppletCreate
@@ -143,26 +145,47 @@ class TestDataService:
             )
         return flows
 
-    def generate_activity_items(self, count=10) -> list[ActivityItemCreate]:
+    def generate_activity_items(self, count=10, conditions_per_item=0) -> list[ActivityItemCreate]:
+        """Generates items, every item is shown by conditions on the options
+        of up to `conditions_per_item` previous select items.
+        """
         items = []
+        select_items: list[str] = []
         for index in range(count):
-            response_config = self.generate_response_value_config(
-                type_=self.activity_item_options[index % len(self.activity_item_options)]
-            )
+            response_type = self.activity_item_options[index % len(self.activity_item_options)]
+            response_config = self.generate_response_value_config(type_=response_type)
+            conditional_logic = None
+            if conditions_per_item and select_items:
+                conditional_logic = ConditionalLogic(
+                    match=Match.ANY,
+                    conditions=[
+                        EqualToOptionCondition(
+                            item_name=item_name,
+                            type=ConditionType.EQUAL_TO_OPTION,
+                            payload=OptionPayload(option_value="1"),
+                        )
+                        for item_name in select_items[-conditions_per_item:]
+                    ],
+                )
 
+            item_name = f"activity_item_{index + 1}"
             items.append(
                 ActivityItemCreate(
-                    name=f"activity_item_{index + 1}",
+                    name=item_name,
                     question=dict(
                         en=f"Activity item question {self.random_string()}",
                         fr=f"Activity item question {self.random_string()}",
                     ),
-                    response_type=self.activity_item_options[index % len(self.activity_item_options)],
+                    response_type=response_type,
                     response_values=response_config["response_values"],
                     config=response_config["config"],
-                    is_hidden=self.random_boolean(),
+                    # items with conditional logic cannot be hidden
+                    is_hidden=conditional_logic is None and self.random_boolean(),
+                    conditional_logic=conditional_logic,
                 )
             )
+            if response_type in ResponseType.options_mapped_on_value():
+                select_items.append(item_name)
         return items
 
     @staticmethod
@@ -18,7 +18,9 @@ from apps.transfer_ownership.errors import TransferEmailError
 from apps.users import UsersCRUD
 from apps.users.domain import User
 from apps.workspaces.db.schemas import UserAppletAccessSchema
+from apps.workspaces.service.arbitrary_cache import ArbitraryServerCache
 from config import settings
+from infrastructure.database import after_commit
 
 
 class TransferService:
@@ -176,6 +178,8 @@ class TransferService:
         await UserAppletAccessCRUD(self.session).change_owner_of_applet_accesses(
             new_owner=self._user.id, applet_id=applet_id
         )
+        # the applet now uses the answers server of the new owner
+        after_commit(self.session, ArbitraryServerCache().invalidate)
 
     def _generate_transfer_url(self) -> str:
         domain = settings.service.urls.frontend.web_base
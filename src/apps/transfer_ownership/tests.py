@@ -22,6 +22,7 @@ from apps.transfer_ownership.crud import TransferCRUD
 from apps.transfer_ownership.errors import TransferEmailError
 from apps.users.domain import User
 from apps.workspaces.service.user_applet_access import UserAppletAccessService
+from infrastructure.database import atomic
 
 
 @pytest.fixture
@@ -44,7 +45,8 @@ async def applet_one_with_report_conf(
     applet_report_configuration_data: AppletReportConfiguration,
 ) -> AppletFull:
     srv = AppletService(session, tom.id)
-    await srv.set_report_configuration(applet_one.id, applet_report_configuration_data)
+    async with atomic(session):
+        await srv.set_report_configuration(applet_one.id, applet_report_configuration_data)
     applet = await srv.get_full_applet(applet_one.id)
     return applet
 
@@ -4,9 +4,11 @@ import uuid
 import typer
 from rich import print
 
+from apps.authentication.crud import TokenBlacklistCRUD
 from apps.authentication.domain.token import JWTClaim
-from apps.authentication.services import AuthenticationService
+from apps.authentication.services import AuthenticationService, TokenRevocationIndex
 from infrastructure.commands.utils import coro
+from infrastructure.database import session_manager
 
 app = typer.Typer()
 
@@ -26,3 +28,17 @@ async def generate(
 
     access_token = AuthenticationService.create_access_token(payload)
     print(access_token)
+
+
+@app.command(short_help="Load revoked tokens from the token blacklist into the redis revocation index")
+@coro
+async def backfill_revoked():
+    index = TokenRevocationIndex()
+    session_maker = session_manager.get_session()
+    count = 0
+    async with session_maker() as session:
+        async for batch in TokenBlacklistCRUD(session).get_not_expired():
+            count += await index.load(
+                (jti, int(exp.replace(tzinfo=datetime.timezone.utc).timestamp())) for jti, exp in batch
+            )
+    print(f"[green]{count} revoked tokens loaded[/green]")
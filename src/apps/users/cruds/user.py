@@ -2,7 +2,8 @@ import datetime
 import uuid
 from typing import Any, Collection, List
 
-from sqlalchemy import false, select, true, update
+from sqlalchemy import DateTime, column, false, select, true, update, values
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Query
 
@@ -93,6 +94,20 @@ class UsersCRUD(BaseCRUD[UserSchema]):
         query = query.values(last_seen_at=datetime.datetime.utcnow())
         await self._execute(query)
 
+    async def update_last_seen_bulk(self, last_seen: dict[uuid.UUID, datetime.datetime]) -> None:
+        """Set last_seen_at of many users with a single UPDATE ... FROM (VALUES ...) statement."""
+        if not last_seen:
+            return
+        seen = values(
+            column("id", UUID(as_uuid=True)),
+            column("last_seen_at", DateTime()),
+            name="seen",
+        ).data(list(last_seen.items()))
+        query = update(UserSchema)
+        query = query.where(UserSchema.id == seen.c.id)
+        query = query.values(last_seen_at=seen.c.last_seen_at)
+        await self._execute(query.execution_options(synchronize_session=False))
+
     async def exist_by_id(self, id_: uuid.UUID) -> bool:
         query = select(UserSchema)
         query = query.where(UserSchema.id == id_)
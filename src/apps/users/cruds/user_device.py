@@ -1,6 +1,7 @@
 import datetime
 import uuid
 
+from sqlalchemy import delete
 from sqlalchemy.dialects.postgresql import insert
 
 from apps.users.db.schemas import UserDeviceSchema
@@ -18,6 +19,10 @@ class UserDevicesCRUD(BaseCRUD[UserDeviceSchema]):
     async def remove_device(self, user_id: uuid.UUID, device_id: str) -> None:
         await self._delete(user_id=user_id, device_id=device_id)
 
+    async def remove_by_device_ids(self, device_ids: list[str]) -> None:
+        query = delete(UserDeviceSchema).where(UserDeviceSchema.device_id.in_(device_ids))
+        await self._execute(query)
+
     async def upsert(self, user_id: uuid.UUID, device_id: str, **data):
         values = dict(user_id=user_id, device_id=device_id, **data)
         stmt = (
@@ -1,14 +1,28 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text, Unicode, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    SmallInteger,
+    String,
+    Text,
+    Unicode,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy_utils import StringEncryptedType
 
+from apps.shared.blind_index import BlindIndexed
 from apps.shared.encryption import get_key
 from infrastructure.database.base import Base
 
 
-class UserSchema(Base):
+class UserSchema(BlindIndexed, Base):
     __tablename__ = "users"
+    __blind_indexed__ = ("email_encrypted", "first_name", "last_name")
 
     email = Column(String(length=56), unique=True)
     email_encrypted = Column(StringEncryptedType(Unicode, get_key), default=None)
@@ -19,6 +33,18 @@ class UserSchema(Base):
     is_super_admin = Column(Boolean(), default=False, server_default="false")
     is_anonymous_respondent = Column(Boolean(), default=False, server_default="false")
     is_legacy_deleted_respondent = Column(Boolean(), default=False, server_default="false")
+    email_encrypted_search_keys = Column(ARRAY(String), nullable=True)
+    email_encrypted_sort_key = Column(SmallInteger(), nullable=True)
+    first_name_search_keys = Column(ARRAY(String), nullable=True)
+    first_name_sort_key = Column(SmallInteger(), nullable=True)
+    last_name_search_keys = Column(ARRAY(String), nullable=True)
+    last_name_sort_key = Column(SmallInteger(), nullable=True)
+
+    __table_args__ = (
+        Index(None, "email_encrypted_search_keys", postgresql_using="gin"),
+        Index(None, "first_name_search_keys", postgresql_using="gin"),
+        Index(None, "last_name_search_keys", postgresql_using="gin"),
+    )
 
     def __repr__(self) -> str:
         return f"UserSchema(id='{self.id}', email='{self.email}')"  # pragma: no cover # noqa: E501
@@ -0,0 +1,82 @@
+import asyncio
+import datetime
+import uuid
+from contextlib import suppress
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.users.cruds.user import UsersCRUD
+from config import settings
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.database import atomic, session_manager
+from infrastructure.logger import logger
+
+__all__ = ["LastSeenAggregator", "last_seen_aggregator"]
+
+
+class LastSeenAggregator:
+    """Collects users' last seen timestamps in memory and writes them
+    with one bulk UPDATE every `task_last_seen_flush.interval` seconds
+    instead of an UPDATE per authenticated request.
+
+    Users whose timestamp was recorded less than `min_update_interval`
+    seconds ago are skipped.
+    """
+
+    def __init__(self):
+        self._pending: dict[uuid.UUID, datetime.datetime] = {}
+        self._recent: LocalCache[bool] = LocalCache(
+            maxsize=100_000, ttl=settings.task_last_seen_flush.min_update_interval
+        )
+        self._task: asyncio.Task | None = None
+
+    def touch(self, user_id: uuid.UUID) -> None:
+        try:
+            self._recent.get(user_id)
+            return
+        except CacheNotFound:
+            pass
+        self._recent.set(user_id, True)
+        self._pending[user_id] = datetime.datetime.utcnow()
+
+    async def flush(self, session: AsyncSession | None = None) -> int:
+        """Writes collected timestamps. Returns the number of flushed users."""
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            if session is not None:
+                await UsersCRUD(session).update_last_seen_bulk(pending)
+            else:
+                async with session_manager.get_session()() as session:
+                    async with atomic(session):
+                        await UsersCRUD(session).update_last_seen_bulk(pending)
+        except BaseException:
+            # return timestamps back unless newer ones were collected meanwhile
+            for user_id, seen_at in pending.items():
+                self._pending.setdefault(user_id, seen_at)
+            raise
+        return len(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.task_last_seen_flush.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.exception(f"Last seen flush failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+
+last_seen_aggregator = LastSeenAggregator()
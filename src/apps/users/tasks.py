@@ -1,16 +1,146 @@
+import asyncio
+import hashlib
 import json
+import multiprocessing
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
 from json import JSONDecodeError
 
 from apps.answers.service import AnswerEncryptor, AnswerService
 from apps.job.constants import JobStatus
 from apps.job.service import JobService
 from apps.shared.encryption import generate_dh_aes_key, generate_dh_public_key, generate_dh_user_private_key
+from apps.workspaces.domain.workspace import AnswerDbApplet
 from apps.workspaces.service.workspace import WorkspaceService
 from broker import broker
 from config import settings
 from infrastructure.database import atomic, session_manager
 from infrastructure.logger import logger
 
+def _key_fingerprint(private_key: int) -> str:
+    return hashlib.sha256(str(private_key).encode()).hexdigest()
+
+
+class _ReencryptionProgress:
+    """Progress of the reencryption kept in the job details.
+
+    `checkpoints` is the last reencrypted answer item of each applet,
+    `completed` are the reencrypted applets, so a retry continues the work.
+    The progress is bound to the fingerprint of the new key, the progress of
+    a previous password change is not reused.
+    """
+
+    def __init__(self, session_maker, user_id: uuid.UUID, job_id: uuid.UUID, key: str, details: dict | None):
+        self.session_maker = session_maker
+        self.user_id = user_id
+        self.job_id = job_id
+        self.key = key
+        details = details or {}
+        if details.get("key") != key:
+            details = {}
+        self.checkpoints: dict[str, str] = dict(details.get("checkpoints", {}))
+        self.completed: set[str] = set(details.get("completed", []))
+        self.errors: list[str] = []
+        self._lock = asyncio.Lock()
+
+    def details(self) -> dict:
+        details: dict = {}
+        if self.errors:
+            details["errors"] = self.errors
+        if self.checkpoints or self.completed:
+            details.update(key=self.key, checkpoints=self.checkpoints, completed=sorted(self.completed))
+        return details
+
+    def get_checkpoint(self, applet_id: uuid.UUID) -> uuid.UUID | None:
+        checkpoint = self.checkpoints.get(str(applet_id))
+        return uuid.UUID(checkpoint) if checkpoint else None
+
+    async def save_checkpoint(self, applet_id: uuid.UUID, answer_item_id: uuid.UUID):
+        self.checkpoints[str(applet_id)] = str(answer_item_id)
+        await self._save()
+
+    async def complete(self, applet_id: uuid.UUID):
+        self.checkpoints.pop(str(applet_id), None)
+        self.completed.add(str(applet_id))
+        await self._save()
+
+    async def fail(self, errors: list[str]):
+        async with self._lock:
+            self.errors += errors
+            async with self.session_maker() as session:
+                async with atomic(session):
+                    await JobService(session, self.user_id).change_status(
+                        self.job_id, JobStatus.error, self.details()
+                    )
+
+    async def _save(self):
+        async with self._lock:
+            async with self.session_maker() as session:
+                async with atomic(session):
+                    await JobService(session, self.user_id).save_details(self.job_id, self.details())
+
+
+async def _reencrypt_applet_answers(
+    applet: AnswerDbApplet,
+    user_id: uuid.UUID,
+    session_maker,
+    old_private_key: int,
+    new_private_key: int,
+    progress: _ReencryptionProgress,
+    semaphore: asyncio.Semaphore,
+    executor: Executor,
+) -> bool:
+    if str(applet.applet_id) in progress.completed:
+        return True
+
+    try:
+        prime = json.loads(applet.encryption.prime)
+        base = json.loads(applet.encryption.base)
+        applet_pub_key = json.loads(applet.encryption.public_key)
+    except JSONDecodeError as e:
+        logger.error(f"Reencryption {user_id}: Wrong applet {applet.applet_id} encryption format, skip")
+        logger.exception(str(e))
+        return True
+
+    batch_limit = settings.task_answer_encryption.batch_limit
+    async with semaphore:
+        old_public_key = generate_dh_public_key(old_private_key, prime, base)
+        new_public_key = generate_dh_public_key(new_private_key, prime, base)
+        old_aes_key = generate_dh_aes_key(old_private_key, applet_pub_key, prime)
+        new_aes_key = generate_dh_aes_key(new_private_key, applet_pub_key, prime)
+
+        # items already encrypted with the new key are skipped by the public key check,
+        # so a batch reencrypted after the last saved checkpoint is safe to process again
+        after_id = progress.get_checkpoint(applet.applet_id)
+        try:
+            while True:
+                async with session_maker() as session:
+                    async with atomic(session):
+                        count, last_id = await AnswerService(session).reencrypt_user_answers(
+                            applet.applet_id,
+                            user_id,
+                            after_id,
+                            limit=batch_limit,
+                            old_public_key=old_public_key,
+                            new_public_key=new_public_key,
+                            encryptor=AnswerEncryptor(bytes(new_aes_key)),
+                            decryptor=AnswerEncryptor(bytes(old_aes_key)),
+                            executor=executor,
+                        )
+                if count < batch_limit:
+                    break
+                after_id = last_id
+                await progress.save_checkpoint(applet.applet_id, after_id)
+        except Exception as e:
+            msg = f"Reencryption {user_id}: cannot process applet " f"{applet.applet_id}, skip"
+            logger.error(msg)
+            logger.exception(str(e))
+            await progress.fail([msg, str(e)])
+            return False
+
+        await progress.complete(applet.applet_id)
+        return True
+
 
 @broker.task
 async def reencrypt_answers(
@@ -27,9 +157,6 @@ async def reencrypt_answers(
     old_private_key = generate_dh_user_private_key(user_id, email, old_password)
     new_private_key = generate_dh_user_private_key(user_id, email, new_password)
 
-    batch_limit = settings.task_answer_encryption.batch_limit
-    success = True
-
     default_session_maker = session_manager.get_session()
     async with default_session_maker() as session:
         job_service = JobService(session, user_id)
@@ -40,56 +167,33 @@ async def reencrypt_answers(
 
         db_applets = await WorkspaceService(session, user_id).get_user_answer_db_info()
 
-    for db_applet_data in db_applets:
-        session_maker = default_session_maker
-        if arb_uri := db_applet_data.database_uri:
-            session_maker = session_manager.get_session(arb_uri)
-
-        for applet in db_applet_data.applets:
-            try:
-                prime = json.loads(applet.encryption.prime)
-                base = json.loads(applet.encryption.base)
-                applet_pub_key = json.loads(applet.encryption.public_key)
-            except JSONDecodeError as e:
-                logger.error(f"Reencryption {user_id}: Wrong applet {applet.applet_id} encryption format, skip")
-                logger.exception(str(e))
-                continue
-
-            old_public_key = generate_dh_public_key(old_private_key, prime, base)
-            new_public_key = generate_dh_public_key(new_private_key, prime, base)
-            old_aes_key = generate_dh_aes_key(old_private_key, applet_pub_key, prime)
-            new_aes_key = generate_dh_aes_key(new_private_key, applet_pub_key, prime)
-
-            page = 1
-            try:
-                while True:
-                    async with session_maker() as session:
-                        async with atomic(session):
-                            service = AnswerService(session)
-                            count = await service.reencrypt_user_answers(
-                                applet.applet_id,
-                                user_id,
-                                page=page,
-                                limit=batch_limit,
-                                old_public_key=old_public_key,
-                                new_public_key=new_public_key,
-                                encryptor=AnswerEncryptor(bytes(new_aes_key)),
-                                decryptor=AnswerEncryptor(bytes(old_aes_key)),
-                            )
-                            if count < batch_limit:
-                                break
-                            page += 1
-
-            except Exception as e:
-                msg = f"Reencryption {user_id}: cannot process applet " f"{applet.applet_id}, skip"
-                logger.error(msg)
-                logger.exception(str(e))
-                async with default_session_maker() as session:
-                    async with atomic(session):
-                        details = dict(errors=[msg, str(e)])
-                        await JobService(session, user_id).change_status(job.id, JobStatus.error, details)
-                success = False
-                continue
+    # a retry of the same password change continues from the saved progress, a new one starts over
+    progress = _ReencryptionProgress(
+        default_session_maker, user_id, job.id, _key_fingerprint(new_private_key), job.details
+    )
+    semaphore = asyncio.Semaphore(settings.task_answer_encryption.max_concurrent_applets)
+    # the worker runs threads, so the processes are spawned instead of forked
+    executor = ProcessPoolExecutor(
+        max_workers=settings.task_answer_encryption.process_pool_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+    try:
+        applet_tasks = []
+        for db_applet_data in db_applets:
+            session_maker = default_session_maker
+            if arb_uri := db_applet_data.database_uri:
+                session_maker = session_manager.get_session(arb_uri)
+
+            for applet in db_applet_data.applets:
+                applet_tasks.append(
+                    _reencrypt_applet_answers(
+                        applet, user_id, session_maker, old_private_key, new_private_key, progress, semaphore, executor
+                    )
+                )
+
+        success = all(await asyncio.gather(*applet_tasks))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     # Update job status, schedule retry
     async with default_session_maker() as session:
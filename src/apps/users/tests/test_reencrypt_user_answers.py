@@ -24,10 +24,11 @@ from apps.job.service import JobService
 from apps.shared.encryption import generate_dh_aes_key, generate_dh_public_key, generate_dh_user_private_key
 from apps.themes.service import ThemeService
 from apps.users.domain import User, UserCreate
-from apps.users.tasks import reencrypt_answers
+from apps.users.tasks import _ReencryptionProgress, reencrypt_answers
 from apps.workspaces.constants import StorageType
 from apps.workspaces.domain.workspace import WorkspaceArbitraryCreate
 from apps.workspaces.service.workspace import WorkspaceService
+from infrastructure.database import atomic
 
 pytestmark = pytest.mark.usefixtures("mock_get_session")
 
@@ -344,7 +345,8 @@ async def test_reencrypt_answers_arbitrary(
         storage_bucket="bucket",
     )
     await WorkspaceService(session, user.id).create_workspace_from_user(user)
-    await WorkspaceService(session, user.id).set_arbitrary_server(w)
+    async with atomic(session):
+        await WorkspaceService(session, user.id).set_arbitrary_server(w)
     answer_id = answer_arbitrary.id
     act_id_version = f"{applet.activities[0].id}_{applet.version}"
     answer_before = (await AnswerItemsCRUD(arbitrary_session).get_by_answer_and_activity(answer_id, [act_id_version]))[
@@ -361,3 +363,17 @@ async def test_reencrypt_answers_arbitrary(
         0
     ].answer
     assert answer_before != answer_after
+
+
+def test_reencryption_progress_is_bound_to_the_new_key():
+    applet_id = str(uuid.uuid4())
+    details = dict(key="previous", checkpoints={}, completed=[applet_id])
+
+    progress = _ReencryptionProgress(None, uuid.uuid4(), uuid.uuid4(), "new", details)
+    assert not progress.completed
+    assert progress.details() == {}
+
+    progress = _ReencryptionProgress(None, uuid.uuid4(), uuid.uuid4(), "previous", details)
+    assert progress.completed == {applet_id}
+    progress.errors.append("error")
+    assert progress.details() == dict(errors=["error"], **details)
@@ -0,0 +1,57 @@
+import datetime
+from typing import cast
+
+import pytest
+from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.users.cruds.user import UsersCRUD
+from apps.users.db.schemas import UserSchema
+from apps.users.domain import User
+from apps.users.services.last_seen import LastSeenAggregator
+
+
+async def test_touch_and_flush(faketime, user: User, session: AsyncSession):
+    aggregator = LastSeenAggregator()
+    aggregator.touch(user.id)
+    assert await aggregator.flush(session) == 1
+    updated = cast(UserSchema, await UsersCRUD(session)._get("id", user.id))
+    await session.refresh(updated)
+    assert updated.last_seen_at == faketime.current_utc
+    assert await aggregator.flush(session) == 0
+
+
+async def test_recently_seen_user_is_skipped(user: User, session: AsyncSession):
+    aggregator = LastSeenAggregator()
+    aggregator.touch(user.id)
+    await aggregator.flush(session)
+    aggregator.touch(user.id)
+    assert await aggregator.flush(session) == 0
+
+
+async def test_many_users_flushed_with_one_statement(
+    user: User, tom: User, session: AsyncSession, mocker: MockerFixture
+):
+    aggregator = LastSeenAggregator()
+    aggregator.touch(user.id)
+    aggregator.touch(tom.id)
+    spy = mocker.spy(UsersCRUD, "_execute")
+    assert await aggregator.flush(session) == 2
+    assert spy.await_count == 1
+
+
+async def test_failed_flush_keeps_timestamps(user: User, session: AsyncSession, mocker: MockerFixture):
+    aggregator = LastSeenAggregator()
+    aggregator.touch(user.id)
+    mocker.patch.object(UsersCRUD, "update_last_seen_bulk", side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        await aggregator.flush(session)
+    assert isinstance(aggregator._pending[user.id], datetime.datetime)
+
+
+async def test_stop_flushes(user: User, mocker: MockerFixture):
+    aggregator = LastSeenAggregator()
+    flush = mocker.patch.object(aggregator, "flush")
+    aggregator.start()
+    await aggregator.stop()
+    flush.assert_awaited_once()
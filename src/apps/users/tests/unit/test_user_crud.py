@@ -213,3 +213,12 @@ def test_user_get_full_name():
 def test_user_get_full_name__no_last_name():
     user = UserSchema(first_name="John")
     assert user.get_full_name() == "John"
+
+
+async def test_update_last_seen_bulk(faketime, user: User, tom: User, session: AsyncSession):
+    crud = UsersCRUD(session)
+    await crud.update_last_seen_bulk({user.id: faketime.current_utc, tom.id: faketime.current_utc})
+    for user_id in (user.id, tom.id):
+        updated = cast(UserSchema, await crud._get("id", user_id))
+        await session.refresh(updated)
+        assert updated.last_seen_at == faketime.current_utc
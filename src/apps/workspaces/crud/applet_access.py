@@ -7,7 +7,7 @@ from apps.subjects.db.schemas import SubjectSchema
 from apps.users import UserSchema
 from apps.workspaces.db.schemas import UserAppletAccessSchema
 from apps.workspaces.domain.constants import Role
-from apps.workspaces.domain.user_applet_access import RespondentExportData, SubjectExportData
+from apps.workspaces.domain.user_applet_access import AccessPermissions, RespondentExportData, SubjectExportData
 from infrastructure.database import BaseCRUD
 
 
@@ -90,6 +90,28 @@ class AppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         db_result = await self._execute(select(query))
         return db_result.scalars().first()
 
+    async def get_applet_permissions(self, applet_id: uuid.UUID, user_id: uuid.UUID) -> AccessPermissions:
+        query: Query = select(UserAppletAccessSchema.role, UserAppletAccessSchema.meta)
+        query = query.where(UserAppletAccessSchema.soft_exists())
+        query = query.where(UserAppletAccessSchema.applet_id == applet_id)
+        query = query.where(UserAppletAccessSchema.user_id == user_id)
+        db_result = await self._execute(query)
+
+        permissions = AccessPermissions()
+        for role, meta in db_result.all():
+            permissions.roles.append(Role(role))
+            if role == Role.REVIEWER and meta:
+                permissions.reviewer_subjects = [uuid.UUID(i) for i in meta.get("subjects") or []]
+        return permissions
+
+    async def get_workspace_permissions(self, owner_id: uuid.UUID, user_id: uuid.UUID) -> AccessPermissions:
+        query: Query = select(UserAppletAccessSchema.role).distinct()
+        query = query.where(UserAppletAccessSchema.soft_exists())
+        query = query.where(UserAppletAccessSchema.owner_id == owner_id)
+        query = query.where(UserAppletAccessSchema.user_id == user_id)
+        db_result = await self._execute(query)
+        return AccessPermissions(roles=[Role(role) for role in db_result.scalars().all()])
+
     async def get_applets_priority_role(
         self,
         applet_id: uuid.UUID,
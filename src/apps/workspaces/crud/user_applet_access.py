@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import Tuple
+from typing import Any, Iterable, Tuple
 
 from asyncpg.exceptions import UniqueViolationError
 from pydantic import parse_obj_as
@@ -45,6 +45,7 @@ from apps.workspaces.domain.constants import Role, UserPinRole
 from apps.workspaces.domain.user_applet_access import RespondentAppletAccess, UserAppletAccess
 from apps.workspaces.domain.workspace import AppletRoles, WorkspaceManager, WorkspaceRespondent
 from apps.workspaces.errors import AppletAccessDenied, UserAppletAccessesNotFound
+from apps.workspaces.service.permission_cache import PermissionCache, PermissionKey
 from infrastructure.database.crud import BaseCRUD
 
 __all__ = ["UserAppletAccessCRUD"]
@@ -80,13 +81,20 @@ class _WorkspaceRespondentOrdering(Ordering):
             )
         )
     }
+    sort_key_fields = {"nicknames": Ordering.Clause(func.min(SubjectSchema.nickname_sort_key))}
 
 
 class _WorkspaceRespondentSearch(Searching):
     search_fields = [
-        func.array_agg(SubjectSchema.nickname),
         func.array_agg(SubjectSchema.secret_user_id),
     ]
+    blind_index_fields = [
+        (SubjectSchema.nickname, SubjectSchema.nickname_search_keys),
+    ]
+
+    def get_blind_index_clause(self, encrypted_field, search_keys, keys: list[str], search_term: str):
+        # respondents are grouped, the clause is used in HAVING
+        return func.bool_or(super().get_blind_index_clause(encrypted_field, search_keys, keys, search_term))
 
 
 class _AppletRespondentSearch(Searching):
@@ -96,15 +104,29 @@ class _AppletRespondentSearch(Searching):
 
 
 class _AppletUsersSearch(Searching):
+    blind_index_fields = [
+        (UserSchema.first_name, UserSchema.first_name_search_keys),
+        (UserSchema.last_name, UserSchema.last_name_search_keys),
+        (UserSchema.email_encrypted, UserSchema.email_encrypted_search_keys),
+    ]
+
+
+class _InvitedManagersSearch(Searching):
     search_fields = [
-        UserSchema.first_name,
-        UserSchema.last_name,
-        UserSchema.email,
+        func.decrypt_internal(InvitationSchema.first_name, get_key()),
+        func.decrypt_internal(InvitationSchema.last_name, get_key()),
+        func.decrypt_internal(InvitationSchema.email, get_key()),
     ]
 
 
 class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
     schema_class = UserAppletAccessSchema
+    # columns identifying the cached permissions an access is part of
+    _permission_columns = (
+        UserAppletAccessSchema.applet_id,
+        UserAppletAccessSchema.user_id,
+        UserAppletAccessSchema.owner_id,
+    )
 
     async def get_applet_role_by_user_id(
         self, applet_id: uuid.UUID, user_id: uuid.UUID, role: Role
@@ -184,13 +206,31 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
 
         return [UserAppletAccess.from_orm(user_applet_access) for user_applet_access in results]
 
+    def _invalidate_permissions(self, accesses: Iterable[Any]) -> None:
+        """Drops cached permissions of the users of the changed accesses once the session is committed."""
+        keys: list[PermissionKey] = []
+        for access in accesses:
+            keys.append(("applet", access.applet_id, access.user_id))
+            keys.append(("workspace", access.owner_id, access.user_id))
+        PermissionCache.invalidate_on_commit(self.session, keys)
+
     async def save(self, schema: UserAppletAccessSchema) -> UserAppletAccessSchema:
         """Return UserAppletAccess instance and the created information."""
+        self._invalidate_permissions([schema])
         return await self._create(schema)
 
     async def create_many(self, schemas: list[UserAppletAccessSchema]) -> list[UserAppletAccessSchema]:
+        self._invalidate_permissions(schemas)
         return await self._create_many(schemas)
 
+    async def restore(self, key: str, val: Any) -> None:
+        query: Query = update(UserAppletAccessSchema)
+        query = query.where(getattr(UserAppletAccessSchema, key) == val)
+        query = query.values(is_deleted=False)
+        query = query.returning(*self._permission_columns)
+        db_result = await self._execute(query)
+        self._invalidate_permissions(db_result.all())
+
     async def upsert_user_applet_access(self, schema: UserAppletAccessSchema, where=None):
         values = {
             "invitor_id": schema.invitor_id,
@@ -229,6 +269,7 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         result = list(await self._execute(stmt))
         if not result:
             raise UniqueViolationError("duplicate key value violates unique" ' constraint "unique_user_applet_role"')
+        self._invalidate_permissions(result)
 
         return result
 
@@ -266,9 +307,10 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
                 "nickname": stmt.excluded.nickname,
                 "title": stmt.excluded.title,
             },
-        )
+        ).returning(*self._permission_columns)
 
-        await self._execute(stmt)
+        db_result = await self._execute(stmt)
+        self._invalidate_permissions(db_result.all())
 
         return await self.get_user_applet_access_list(schemas)
 
@@ -366,7 +408,9 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         query: Query = update(UserAppletAccessSchema)
         query = query.where(UserAppletAccessSchema.applet_id == applet_id)
         query = query.values(is_deleted=True)
-        await self._execute(query)
+        query = query.returning(*self._permission_columns)
+        db_result = await self._execute(query)
+        self._invalidate_permissions(db_result.all())
 
     @staticmethod
     def workspace_applets_subquery(owner_id: uuid.UUID, applet_id: uuid.UUID | None) -> Query:
@@ -675,6 +719,9 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
                 UserSchema.last_name,
                 UserSchema.email_encrypted,
                 UserSchema.created_at,
+                UserSchema.first_name_sort_key,
+                UserSchema.last_name_sort_key,
+                UserSchema.email_encrypted_sort_key,
                 func.coalesce(UserSchema.last_seen_at, UserSchema.created_at).label("last_seen"),
                 func.array_agg(
                     aggregate_order_by(
@@ -738,6 +785,9 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
                 *_AppletInvitationFilter().get_clauses(**query_params.filters)
             )
             accepted_users_query = accepted_users_query.where(*_AppletUsersFilter().get_clauses(**query_params.filters))
+        if query_params.search:
+            invited_users_query = invited_users_query.where(_InvitedManagersSearch().get_clauses(query_params.search))
+            accepted_users_query = accepted_users_query.where(_AppletUsersSearch().get_clauses(query_params.search))
 
         invited_users = invited_users_query.cte("invited_users")
         accepted_users = accepted_users_query.cte("accepted_users")
@@ -793,6 +843,12 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
                     )
                 ),
             }
+            # invited users do not have sort keys
+            sort_key_fields = {
+                "email": accepted_users.c.email_encrypted_sort_key,
+                "first_name": accepted_users.c.first_name_sort_key,
+                "last_name": accepted_users.c.last_name_sort_key,
+            }
 
         ordering = _AppletManagersOrdering()
 
@@ -805,34 +861,6 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         data = parse_obj_as(list[WorkspaceManager], data)
         ordering_fields = ordering.get_ordering_fields(total)
 
-        # TODO: Fix via class Searching
-        #  using database fields - StringEncryptedType
-        if query_params.search:
-            data_search = []
-            total_search = 0
-            for manager in data:
-                if manager.first_name:
-                    first_name_lower = manager.first_name.lower()
-                else:
-                    first_name_lower = ""
-                if manager.last_name:
-                    last_name_lower = manager.last_name.lower()
-                else:
-                    last_name_lower = ""
-                if manager.email_encrypted:
-                    email_encrypted_lower = manager.email_encrypted.lower()
-                else:
-                    email_encrypted_lower = ""
-
-                if (
-                    query_params.search.lower() in first_name_lower
-                    or query_params.search.lower() in last_name_lower
-                    or query_params.search.lower() in email_encrypted_lower
-                ):
-                    data_search.append(manager)
-                    total_search += 1
-            return data_search, total_search, ordering_fields
-
         return data, total, ordering_fields
 
     async def get_all_by_user_id_and_roles(self, user_id_: uuid.UUID, roles: list[Role]) -> list[UserAppletAccess]:
@@ -890,7 +918,9 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         query = query.where(UserAppletAccessSchema.role.in_(roles))
         query = query.where(UserAppletAccessSchema.applet_id.in_(applet_ids))
         query = query.values(is_deleted=True)
-        await self._execute(query)
+        query = query.returning(*self._permission_columns)
+        db_result = await self._execute(query)
+        self._invalidate_permissions(db_result.all())
 
     async def check_access_by_user_and_owner(
         self,
@@ -1079,7 +1109,9 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         query = query.where(UserAppletAccessSchema.applet_id == applet_id)
         query = query.where(UserAppletAccessSchema.role.in_(roles))
         query = query.values(is_deleted=True)
-        await self._execute(query)
+        query = query.returning(*self._permission_columns)
+        db_result = await self._execute(query)
+        self._invalidate_permissions(db_result.all())
 
     async def has_role(self, applet_id: uuid.UUID, user_id: uuid.UUID, role: Role) -> bool:
         query: Query = select(UserAppletAccessSchema)
@@ -1156,8 +1188,10 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         query = query.where(UserAppletAccessSchema.soft_exists())
         query = query.where(UserAppletAccessSchema.id == access_id)
         query = query.values(meta=meta, nickname=nickname)
+        query = query.returning(*self._permission_columns)
 
-        await self._execute(query)
+        db_result = await self._execute(query)
+        self._invalidate_permissions(db_result.all())
 
     async def get_workspace_applet_roles(
         self,
@@ -1269,11 +1303,20 @@ class UserAppletAccessCRUD(BaseCRUD[UserAppletAccessSchema]):
         return db_result
 
     async def change_owner_of_applet_accesses(self, new_owner: uuid.UUID, applet_id: uuid.UUID):
+        # the workspace permissions change in the workspaces of both owners
+        previous: Query = select(*self._permission_columns)
+        previous = previous.where(UserAppletAccessSchema.soft_exists())
+        previous = previous.where(UserAppletAccessSchema.applet_id == applet_id)
+        previous_result = await self._execute(previous)
+        self._invalidate_permissions(previous_result.all())
+
         query: Query = update(UserAppletAccessSchema)
         query = query.where(UserAppletAccessSchema.soft_exists())
         query = query.where(UserAppletAccessSchema.applet_id == applet_id)
         query = query.values(owner_id=new_owner)
-        await self._execute(query)
+        query = query.returning(*self._permission_columns)
+        db_result = await self._execute(query)
+        self._invalidate_permissions(db_result.all())
 
     async def change_subject_pins_to_user(self, user_id: uuid.UUID, subject_id: uuid.UUID):
         query: Query = update(UserPinSchema)
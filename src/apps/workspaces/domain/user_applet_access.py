@@ -19,6 +19,7 @@ __all__ = [
     "RemoveManagerAccess",
     "ManagerAccesses",
     "PublicRespondentAppletAccess",
+    "AccessPermissions",
 ]
 
 
@@ -144,3 +145,23 @@ class RespondentInfoPublic(PublicModel):
     secret_user_id: str
     last_seen: datetime.datetime | None
     subject_id: uuid.UUID
+
+
+class AccessPermissions(InternalModel):
+    """Roles of a user in an applet or in a workspace
+    and the subjects assigned to the user as a reviewer.
+    """
+
+    roles: list[Role] = Field(default_factory=list)
+    reviewer_subjects: list[uuid.UUID] = Field(default_factory=list)
+
+    def has_any_role(self, roles: list[Role]) -> bool:
+        return any(role in self.roles for role in roles)
+
+    def priority_role(self, ordered_roles: list[Role] | None = None) -> Role | None:
+        """The first user role by `ordered_roles`, by default from the owner
+        to the respondent and the super admin is the last.
+        """
+        if ordered_roles is None:
+            ordered_roles = Role.as_list()[1:] + [Role.SUPER_ADMIN]
+        return next((role for role in ordered_roles if role in self.roles), None)
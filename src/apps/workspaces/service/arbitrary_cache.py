@@ -0,0 +1,113 @@
+import json
+import uuid
+from contextlib import suppress
+from typing import Literal
+
+from redis.exceptions import RedisError
+
+from apps.shared.encryption import decrypt, encrypt
+from apps.workspaces.domain.workspace import WorkspaceArbitrary
+from config import settings
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.utility import RedisCache
+
+__all__ = ["ArbitraryServerCache"]
+
+LookupKind = Literal["applet", "owner", "subject"]
+
+
+class ArbitraryServerCache:
+    """Two tier cache of the arbitrary server settings resolved
+    for an applet, a workspace owner or a subject.
+
+    `None` (the default server is used) is cached as well. Redis keys
+    contain a version stamp, the invalidation replaces the stamp, so all
+    the entries of every process become unreachable at once:
+        ArbitraryServerCache:<version>:applet:<applet_id>
+
+    The stamp is replaced after the write is committed, and a value read
+    after a cache miss is stored under the stamp read before the miss, so a
+    value read concurrently with the write is never stored under the new
+    stamp.
+
+    Redis values are encrypted, because they contain storage credentials.
+    """
+
+    _local: LocalCache[WorkspaceArbitrary | None] = LocalCache(
+        maxsize=settings.cache.arbitrary_local_maxsize,
+        ttl=settings.cache.arbitrary_local_ttl,
+    )
+    _versions: LocalCache[str] = LocalCache(maxsize=1, ttl=settings.cache.version_check_ttl)
+    redis_hits = 0
+    redis_misses = 0
+
+    def __init__(self):
+        self.redis_client = RedisCache()
+        # keys of the missed lookups
+        self._missed: dict[tuple[LookupKind, uuid.UUID], str] = {}
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.__class__.__name__}:version"
+
+    async def _get_version(self) -> str:
+        try:
+            return self._versions.get(self._version_key)
+        except CacheNotFound:
+            pass
+        version = await self.redis_client.get(self._version_key)
+        if version is None:
+            return await self.invalidate()
+        version = version.decode() if isinstance(version, bytes) else version
+        self._versions.set(self._version_key, version)
+        return version
+
+    def _build_key(self, version: str, kind: LookupKind, id_: uuid.UUID) -> str:
+        return f"{self.__class__.__name__}:{version}:{kind}:{id_}"
+
+    async def get(self, kind: LookupKind, id_: uuid.UUID) -> WorkspaceArbitrary | None:
+        """Returns cached settings or raises CacheNotFound."""
+        key = self._build_key(await self._get_version(), kind, id_)
+        try:
+            return self._local.get(key)
+        except CacheNotFound:
+            pass
+
+        cached = await self.redis_client.get(key)
+        if cached is None:
+            ArbitraryServerCache.redis_misses += 1
+            self._missed[(kind, id_)] = key
+            raise CacheNotFound()
+        ArbitraryServerCache.redis_hits += 1
+        data = json.loads(decrypt(bytes.fromhex(cached.decode() if isinstance(cached, bytes) else cached)))
+        value = WorkspaceArbitrary(**data) if data else None
+        self._local.set(key, value)
+        return value
+
+    async def set(self, kind: LookupKind, id_: uuid.UUID, value: WorkspaceArbitrary | None) -> None:
+        key = self._missed.pop((kind, id_), None) or self._build_key(await self._get_version(), kind, id_)
+        self._local.set(key, value)
+        data = value.json() if value else json.dumps(None)
+        with suppress(RedisError):
+            await self.redis_client.set(
+                key,
+                encrypt(data.encode()).hex(),
+                ex=settings.cache.arbitrary_redis_ttl,
+            )
+
+    async def invalidate(self) -> str:
+        """Drops all cached settings. Returns the new version stamp."""
+        version = uuid.uuid4().hex
+        await self.redis_client.set(self._version_key, version, ex=settings.cache.arbitrary_redis_ttl)
+        self._local.clear()
+        self._versions.set(self._version_key, version)
+        return version
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return dict(
+            local_hits=cls._local.hits,
+            local_misses=cls._local.misses,
+            redis_hits=cls.redis_hits,
+            redis_misses=cls.redis_misses,
+        )
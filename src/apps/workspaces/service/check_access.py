@@ -3,8 +3,8 @@ import uuid
 from apps.answers.errors import AnswerAccessDeniedError
 from apps.shared.exception import AccessDeniedError
 from apps.workspaces.crud.applet_access import AppletAccessCRUD
-from apps.workspaces.crud.user_applet_access import UserAppletAccessCRUD
 from apps.workspaces.domain.constants import Role
+from apps.workspaces.domain.user_applet_access import AccessPermissions
 from apps.workspaces.errors import (
     AnswerCheckAccessDenied,
     AnswerCreateAccessDenied,
@@ -22,14 +22,40 @@ from apps.workspaces.errors import (
     WorkspaceAccessDenied,
     WorkspaceFolderManipulationAccessDenied,
 )
+from apps.workspaces.service.permission_cache import PermissionCache
+from infrastructure.cache import CacheNotFound
 
 
 class CheckAccessService:
+    """Checks are resolved from the user roles of the applet or workspace,
+    which are loaded once and cached by PermissionCache.
+    """
+
     def __init__(self, session, user_id: uuid.UUID, is_super_admin=False):
         self.session = session
         self.user_id = user_id
         self.is_super_admin = is_super_admin
 
+    async def get_applet_permissions(self, applet_id: uuid.UUID) -> AccessPermissions:
+        cache = PermissionCache()
+        try:
+            return await cache.get("applet", applet_id, self.user_id)
+        except CacheNotFound:
+            pass
+        permissions = await AppletAccessCRUD(self.session).get_applet_permissions(applet_id, self.user_id)
+        await cache.set("applet", applet_id, self.user_id, permissions)
+        return permissions
+
+    async def get_workspace_permissions(self, owner_id: uuid.UUID) -> AccessPermissions:
+        cache = PermissionCache()
+        try:
+            return await cache.get("workspace", owner_id, self.user_id)
+        except CacheNotFound:
+            pass
+        permissions = await AppletAccessCRUD(self.session).get_workspace_permissions(owner_id, self.user_id)
+        await cache.set("workspace", owner_id, self.user_id, permissions)
+        return permissions
+
     async def _check_workspace_roles(
         self,
         owner_id: uuid.UUID,
@@ -40,9 +66,8 @@ class CheckAccessService:
         if owner_id == self.user_id:
             return
 
-        has_access = await AppletAccessCRUD(self.session).has_any_roles_for_workspace(owner_id, self.user_id, roles)
-
-        if not has_access:
+        permissions = await self.get_workspace_permissions(owner_id)
+        if not permissions.has_any_role(Role.managers() if roles is None else roles):
             raise exception or WorkspaceAccessDenied()
 
     async def _check_applet_roles(
@@ -52,9 +77,8 @@ class CheckAccessService:
         *,
         exception=None,
     ):
-        has_access = await AppletAccessCRUD(self.session).has_any_roles_for_applet(applet_id, self.user_id, roles)
-
-        if not has_access:
+        permissions = await self.get_applet_permissions(applet_id)
+        if not permissions.has_any_role(Role.as_list() if roles is None else roles):
             raise exception or AppletAccessDenied()
 
     async def check_applet_detail_access(self, applet_id: uuid.UUID):
@@ -104,23 +128,13 @@ class CheckAccessService:
         )
 
     async def check_applet_create_access(self, owner_id: uuid.UUID):
-        if owner_id == self.user_id:
-            return
-        has_access = await AppletAccessCRUD(self.session).can_create_applet(owner_id, self.user_id)
-        if not has_access:
-            raise AppletCreationAccessDenied()
+        await self._check_workspace_roles(owner_id, Role.editors(), exception=AppletCreationAccessDenied())
 
     async def check_applet_edit_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_edit_applet(applet_id, self.user_id)
-
-        if not has_access:
-            raise AppletEditionAccessDenied()
+        await self._check_applet_roles(applet_id, Role.editors(), exception=AppletEditionAccessDenied())
 
     async def check_applet_retention_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_set_retention(applet_id, self.user_id)
-
-        if not has_access:
-            raise AppletEditionAccessDenied()
+        await self._check_applet_roles(applet_id, [Role.OWNER, Role.MANAGER], exception=AppletEditionAccessDenied())
 
     async def check_link_edit_access(self, applet_id: uuid.UUID):
         await self._check_applet_roles(
@@ -130,57 +144,38 @@ class CheckAccessService:
         )
 
     async def check_applet_duplicate_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_edit_applet(applet_id, self.user_id)
-        if not has_access:
-            raise AppletDuplicateAccessDenied()
+        await self._check_applet_roles(applet_id, Role.editors(), exception=AppletDuplicateAccessDenied())
 
     async def check_applet_delete_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_edit_applet(applet_id, self.user_id)
-        if not has_access:
-            raise AppletDeleteAccessDenied()
+        await self._check_applet_roles(applet_id, Role.editors(), exception=AppletDeleteAccessDenied())
 
     async def check_answer_create_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).has_role(applet_id, self.user_id, Role.RESPONDENT)
-
-        if not has_access:
-            raise AnswerCreateAccessDenied()
+        await self._check_applet_roles(applet_id, [Role.RESPONDENT], exception=AnswerCreateAccessDenied())
 
     async def check_answer_review_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_see_data(applet_id, self.user_id)
-
-        if not has_access:
-            raise AnswerViewAccessDenied()
+        await self._check_applet_roles(applet_id, Role.reviewers(), exception=AnswerViewAccessDenied())
 
     async def check_note_crud_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_see_data(applet_id, self.user_id)
-
-        if not has_access:
-            raise AnswerNoteCRUDAccessDenied()
+        await self._check_applet_roles(applet_id, Role.reviewers(), exception=AnswerNoteCRUDAccessDenied())
 
     async def check_applet_invite_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_invite_anyone(applet_id, self.user_id)
-
-        if not has_access:
-            raise AppletInviteAccessDenied()
+        await self._check_applet_roles(applet_id, Role.inviters(), exception=AppletInviteAccessDenied())
 
     async def check_applet_schedule_create_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_set_schedule_and_notifications(applet_id, self.user_id)
-
-        if not has_access:
-            raise AppletSetScheduleAccessDenied()
+        await self._check_applet_roles(applet_id, Role.schedulers(), exception=AppletSetScheduleAccessDenied())
 
     async def check_create_transfer_ownership_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).has_role(applet_id, self.user_id, Role.OWNER)
-
-        if not has_access:
-            raise TransferOwnershipAccessDenied()
+        await self._check_applet_roles(applet_id, [Role.OWNER], exception=TransferOwnershipAccessDenied())
 
     async def check_publish_conceal_access(self):
         if not self.is_super_admin:
             raise PublishConcealAccessDenied()
 
     async def check_answers_export_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).check_export_access(applet_id, self.user_id)
+        permissions = await self.get_applet_permissions(applet_id)
+        has_access = permissions.has_any_role([Role.OWNER, Role.MANAGER, Role.RESPONDENT]) or (
+            Role.REVIEWER in permissions.roles and len(permissions.reviewer_subjects) > 0
+        )
 
         if not has_access:
             raise AppletAccessDenied()
@@ -189,16 +184,10 @@ class CheckAccessService:
         await self._check_applet_roles(applet_id, [Role.OWNER])
 
     async def check_answers_mobile_data_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).has_role(applet_id, self.user_id, Role.RESPONDENT)
-
-        if not has_access:
-            raise AppletAccessDenied()
+        await self._check_applet_roles(applet_id, [Role.RESPONDENT])
 
     async def check_answer_check_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).has_role(applet_id, self.user_id, Role.RESPONDENT)
-
-        if not has_access:
-            raise AnswerCheckAccessDenied()
+        await self._check_applet_roles(applet_id, [Role.RESPONDENT], exception=AnswerCheckAccessDenied())
 
     async def check_summary_access(self, applet_id: uuid.UUID, subject_id: uuid.UUID | None):
         try:
@@ -207,19 +196,16 @@ class CheckAccessService:
             raise AnswerAccessDeniedError()
 
     async def check_subject_edit_access(self, applet_id: uuid.UUID):
-        has_access = await AppletAccessCRUD(self.session).can_invite_anyone(applet_id, self.user_id)
-
-        if not has_access:
-            raise AccessDeniedError()
+        await self._check_applet_roles(applet_id, Role.inviters(), exception=AccessDeniedError())
 
     async def check_subject_answer_access(self, applet_id: uuid.UUID, subject_id: uuid.UUID | None):
-        access = await UserAppletAccessCRUD(self.session).get_by_roles(self.user_id, applet_id, Role.reviewers())
-        if not access:
+        permissions = await self.get_applet_permissions(applet_id)
+        role = permissions.priority_role(Role.reviewers())
+        if not role:
             raise AccessDeniedError()
 
-        if access.role == Role.REVIEWER:
-            allowed_subject_ids = access.reviewer_subjects
-            if subject_id not in allowed_subject_ids:
+        if role == Role.REVIEWER:
+            if subject_id not in permissions.reviewer_subjects:
                 raise AccessDeniedError()
 
     async def check_answer_access(
@@ -238,17 +224,16 @@ class CheckAccessService:
         Check if the current authenticated user has access to the subject within this applet. The user must be an
         owner, manager, coordinator, or a reviewer who was assigned the subject.
         """
-        access = await AppletAccessCRUD(self.session).get_priority_access(applet_id, self.user_id)
-        role = getattr(access, "role", None)
-        if not access:
+        permissions = await self.get_applet_permissions(applet_id)
+        role = permissions.priority_role()
+        if not role:
             raise AccessDeniedError()
         elif role in Role.inviters():
             return True
         elif role == Role.REVIEWER:
             if not subject_id:
                 raise AccessDeniedError()
-            allowed_subject_ids = access.meta.get("subjects", [])
-            if str(subject_id) not in allowed_subject_ids:
+            if subject_id not in permissions.reviewer_subjects:
                 raise AccessDeniedError()
         else:
             raise AccessDeniedError()
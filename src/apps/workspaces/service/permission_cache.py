@@ -0,0 +1,129 @@
+import functools
+import json
+import uuid
+from contextlib import suppress
+from typing import Iterable, Literal
+
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.workspaces.domain.user_applet_access import AccessPermissions
+from config import settings
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.database import after_commit
+from infrastructure.utility import RedisCache
+
+__all__ = ["PermissionCache", "PermissionKey"]
+
+PermissionKind = Literal["applet", "workspace"]
+# (kind, applet id or workspace owner id, user id)
+PermissionKey = tuple[PermissionKind, uuid.UUID, uuid.UUID]
+
+
+class PermissionCache:
+    """Two tier cache of the user permissions resolved for an applet
+    or for a workspace owner.
+
+    Every (kind, id, user) pair has its own stamp, replaced after a write
+    of the user's accesses is committed. Redis entries keep the stamp they
+    were read under and are used only while it is the current one:
+        PermissionCache:stamp:applet:<applet_id>:<user_id> -> <stamp>
+        PermissionCache:applet:<applet_id>:<user_id> -> {"stamp": <stamp>, "permissions": ...}
+
+    A value read after a cache miss is stored under the stamp read before
+    the miss, so a value read concurrently with the write is never used.
+    Local entries of other processes expire after `permissions_local_ttl`.
+    """
+
+    _local: LocalCache[AccessPermissions] = LocalCache(
+        maxsize=settings.cache.permissions_local_maxsize,
+        ttl=settings.cache.permissions_local_ttl,
+    )
+    # number of invalidations done by this process
+    _invalidations = 0
+    redis_hits = 0
+    redis_misses = 0
+
+    def __init__(self):
+        self.redis_client = RedisCache()
+        # stamps and invalidation counters of the missed lookups
+        self._missed: dict[str, tuple[str | None, int]] = {}
+
+    @classmethod
+    def _build_key(cls, kind: PermissionKind, id_: uuid.UUID, user_id: uuid.UUID) -> str:
+        return f"{cls.__name__}:{kind}:{id_}:{user_id}"
+
+    @classmethod
+    def _stamp_key(cls, kind: PermissionKind, id_: uuid.UUID, user_id: uuid.UUID) -> str:
+        return f"{cls.__name__}:stamp:{kind}:{id_}:{user_id}"
+
+    async def get(self, kind: PermissionKind, id_: uuid.UUID, user_id: uuid.UUID) -> AccessPermissions:
+        """Returns cached permissions or raises CacheNotFound."""
+        key = self._build_key(kind, id_, user_id)
+        try:
+            return self._local.get(key)
+        except CacheNotFound:
+            pass
+
+        invalidations = PermissionCache._invalidations
+        try:
+            stamp, cached = (await self.redis_client.mget([self._stamp_key(kind, id_, user_id), key])) or (None, None)
+        except RedisError:
+            # the permissions are read from the database and not cached
+            PermissionCache.redis_misses += 1
+            raise CacheNotFound()
+        stamp = stamp.decode() if isinstance(stamp, bytes) else stamp
+        data = json.loads(cached) if cached else None
+        if data is None or data["stamp"] != stamp:
+            PermissionCache.redis_misses += 1
+            self._missed[key] = (stamp, invalidations)
+            raise CacheNotFound()
+        PermissionCache.redis_hits += 1
+        value = AccessPermissions.parse_obj(data["permissions"])
+        self._local.set(key, value)
+        return value
+
+    async def set(self, kind: PermissionKind, id_: uuid.UUID, user_id: uuid.UUID, value: AccessPermissions) -> None:
+        key = self._build_key(kind, id_, user_id)
+        if key in self._missed:
+            stamp, invalidations = self._missed.pop(key)
+        else:
+            invalidations = PermissionCache._invalidations
+            stamp = await self.redis_client.get(self._stamp_key(kind, id_, user_id))
+            stamp = stamp.decode() if isinstance(stamp, bytes) else stamp
+        if invalidations == PermissionCache._invalidations:
+            self._local.set(key, value)
+        data = json.dumps(dict(stamp=stamp, permissions=json.loads(value.json())))
+        with suppress(RedisError):
+            await self.redis_client.set(key, data, ex=settings.cache.permissions_redis_ttl)
+
+    @classmethod
+    async def invalidate(cls, keys: Iterable[PermissionKey]) -> None:
+        """Drops cached permissions of the (kind, id, user) pairs."""
+        keys = set(keys)
+        if not keys:
+            return
+        cls._invalidations += 1
+        for key in keys:
+            cls._local.delete(cls._build_key(*key))
+        # stamps outlive the entries, so an entry stored under a replaced stamp expires first
+        await RedisCache().set_many(
+            {cls._stamp_key(*key): uuid.uuid4().hex for key in keys},
+            ex=2 * settings.cache.permissions_redis_ttl,
+        )
+
+    @classmethod
+    def invalidate_on_commit(cls, session: AsyncSession, keys: Iterable[PermissionKey]) -> None:
+        """Drops cached permissions of the pairs once the transaction changing the accesses is committed."""
+        keys = set(keys)
+        if keys:
+            after_commit(session, functools.partial(cls.invalidate, keys))
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return dict(
+            local_hits=cls._local.hits,
+            local_misses=cls._local.misses,
+            redis_hits=cls.redis_hits,
+            redis_misses=cls.redis_misses,
+        )
@@ -1,4 +1,5 @@
 import uuid
+from contextlib import suppress
 from typing import Tuple
 
 from pydantic import ValidationError
@@ -28,8 +29,11 @@ from apps.workspaces.errors import (
     WorkspaceDoesNotExistError,
     WorkspaceNotFoundError,
 )
+from apps.workspaces.service.arbitrary_cache import ArbitraryServerCache
 from apps.workspaces.service.check_access import CheckAccessService
 from apps.workspaces.service.user_access import UserAccessService
+from infrastructure.cache import CacheNotFound
+from infrastructure.database import after_commit
 
 
 class WorkspaceService:
@@ -248,19 +252,30 @@ class WorkspaceService:
         )
 
     async def get_arbitrary_info_if_use_arbitrary(self, applet_id: uuid.UUID) -> WorkspaceArbitrary | None:
+        cache = ArbitraryServerCache()
+        with suppress(CacheNotFound):
+            return await cache.get("applet", applet_id)
         schema = await UserWorkspaceCRUD(self.session).get_by_applet_id(applet_id)
-        if not schema or not schema.use_arbitrary or not schema.database_uri:
-            return None
-        try:
-            return WorkspaceArbitrary.from_orm(schema) if schema else None
-        except ValidationError:
-            return None
+        info = self._get_arbitrary_info(schema) if schema else None
+        await cache.set("applet", applet_id, info)
+        return info
 
     async def get_arbitrary_info_by_owner_id_if_use_arbitrary(
         self, owner_id: uuid.UUID, *, in_use_only=True
     ) -> WorkspaceArbitrary | None:
+        cache = ArbitraryServerCache()
+        if in_use_only:
+            with suppress(CacheNotFound):
+                return await cache.get("owner", owner_id)
         schema = await UserWorkspaceCRUD(self.session).get_by_user_id(owner_id)
-        if not schema or (in_use_only and not schema.use_arbitrary) or not schema.database_uri:
+        info = self._get_arbitrary_info(schema, in_use_only=in_use_only) if schema else None
+        if in_use_only:
+            await cache.set("owner", owner_id, info)
+        return info
+
+    @staticmethod
+    def _get_arbitrary_info(schema: UserWorkspaceSchema, *, in_use_only=True) -> WorkspaceArbitrary | None:
+        if (in_use_only and not schema.use_arbitrary) or not schema.database_uri:
             return None
         try:
             return WorkspaceArbitrary.from_orm(schema)
@@ -306,6 +321,7 @@ class WorkspaceService:
         for k, v in data.dict(by_alias=False).items():
             setattr(schema, k, v)
         await repository.update_by_user_id(schema.user_id, schema)
+        after_commit(self.session, ArbitraryServerCache().invalidate)
 
     async def get_arbitrary_list(self) -> list[WorkspaceArbitrary]:
         schemas = await UserWorkspaceCRUD(self.session).get_arbitrary_list()
@@ -0,0 +1,102 @@
+import uuid
+
+import pytest
+from pytest_mock import MockerFixture
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.applets.domain.applet_full import AppletFull
+from apps.users.domain import User
+from apps.workspaces.constants import StorageType
+from apps.workspaces.crud.workspaces import UserWorkspaceCRUD
+from apps.workspaces.domain.workspace import WorkspaceArbitrary, WorkspaceArbitraryCreate
+from apps.workspaces.service.arbitrary_cache import ArbitraryServerCache
+from apps.workspaces.service.workspace import WorkspaceService
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.database import atomic
+from infrastructure.utility import RedisCacheTest
+
+
+@pytest.fixture
+def arbitrary_create_data(arbitrary_db_url: str) -> WorkspaceArbitraryCreate:
+    return WorkspaceArbitraryCreate(
+        database_uri=arbitrary_db_url,
+        storage_type=StorageType.AWS,
+        storage_access_key="storage_access_key",
+        storage_secret_key="storage_secret_key",
+        storage_region="us-east-1",
+        storage_bucket="aws-bucket",
+        use_arbitrary=True,
+    )
+
+
+async def test_cache_miss_raises_not_found():
+    with pytest.raises(CacheNotFound):
+        await ArbitraryServerCache().get("applet", uuid.uuid4())
+
+
+async def test_cache_none_value():
+    cache = ArbitraryServerCache()
+    applet_id = uuid.uuid4()
+    await cache.set("applet", applet_id, None)
+    assert await cache.get("applet", applet_id) is None
+
+
+async def test_cache_redis_tier_is_encrypted_and_shared(arbitrary_create_data: WorkspaceArbitraryCreate):
+    cache = ArbitraryServerCache()
+    owner_id = uuid.uuid4()
+    info = WorkspaceArbitrary(id=uuid.uuid4(), user_id=owner_id, **arbitrary_create_data.dict())
+    await cache.set("owner", owner_id, info)
+    assert not any("storage_secret_key" in str(value) for value, _ in RedisCacheTest._storage.values())
+
+    # other process: local tier is empty
+    LocalCache.clear_all()
+    redis_hits = ArbitraryServerCache.redis_hits
+    assert await cache.get("owner", owner_id) == info
+    assert ArbitraryServerCache.redis_hits == redis_hits + 1
+
+
+async def test_invalidate_drops_all_entries():
+    cache = ArbitraryServerCache()
+    applet_id = uuid.uuid4()
+    await cache.set("applet", applet_id, None)
+    await cache.invalidate()
+    with pytest.raises(CacheNotFound):
+        await cache.get("applet", applet_id)
+
+
+async def test_workspace_service_uses_cache(session: AsyncSession, applet_one: AppletFull, mocker: MockerFixture):
+    spy = mocker.spy(UserWorkspaceCRUD, "get_by_applet_id")
+    service = WorkspaceService(session, uuid.uuid4())
+    assert await service.get_arbitrary_info_if_use_arbitrary(applet_one.id) is None
+    assert await service.get_arbitrary_info_if_use_arbitrary(applet_one.id) is None
+    assert spy.call_count == 1
+    assert ArbitraryServerCache.stats()["local_hits"] >= 1
+
+
+async def test_set_arbitrary_server_invalidates_cache(
+    session: AsyncSession, tom: User, applet_one: AppletFull, arbitrary_create_data: WorkspaceArbitraryCreate
+):
+    service = WorkspaceService(session, tom.id)
+    await service.create_workspace_from_user(tom)
+    assert await service.get_arbitrary_info_if_use_arbitrary(applet_one.id) is None
+    assert await service.get_arbitrary_info_by_owner_id_if_use_arbitrary(tom.id) is None
+
+    async with atomic(session):
+        await service.set_arbitrary_server(arbitrary_create_data, rewrite=True)
+        # the cache keeps the committed settings until the commit
+        assert await service.get_arbitrary_info_if_use_arbitrary(applet_one.id) is None
+
+    applet_info = await service.get_arbitrary_info_if_use_arbitrary(applet_one.id)
+    owner_info = await service.get_arbitrary_info_by_owner_id_if_use_arbitrary(tom.id)
+    assert applet_info and applet_info.database_uri == arbitrary_create_data.database_uri
+    assert owner_info == applet_info
+
+
+async def test_set_tolerates_redis_errors(mocker: MockerFixture):
+    cache = ArbitraryServerCache()
+    await cache.invalidate()
+    mocker.patch("infrastructure.utility.redis_client.RedisCache.set", side_effect=RedisError())
+    applet_id = uuid.uuid4()
+    await cache.set("applet", applet_id, None)
+    assert await cache.get("applet", applet_id) is None
@@ -0,0 +1,97 @@
+import uuid
+
+import pytest
+from pytest_mock import MockerFixture
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from apps.applets.domain.applet_full import AppletFull
+from apps.users.domain import User
+from apps.workspaces.crud.applet_access import AppletAccessCRUD
+from apps.workspaces.domain.constants import Role
+from apps.workspaces.domain.user_applet_access import AccessPermissions
+from apps.workspaces.errors import AppletEditionAccessDenied
+from apps.workspaces.service.check_access import CheckAccessService
+from apps.workspaces.service.permission_cache import PermissionCache
+from apps.workspaces.service.user_applet_access import UserAppletAccessService
+from infrastructure.cache import CacheNotFound, LocalCache
+from infrastructure.database import atomic
+
+
+def test_priority_role_follows_role_order():
+    permissions = AccessPermissions(roles=[Role.SUPER_ADMIN, Role.RESPONDENT, Role.REVIEWER])
+    assert permissions.priority_role() == Role.REVIEWER
+    assert permissions.priority_role([Role.OWNER, Role.MANAGER]) is None
+
+
+async def test_cache_redis_tier_is_shared():
+    cache = PermissionCache()
+    applet_id, user_id = uuid.uuid4(), uuid.uuid4()
+    permissions = AccessPermissions(roles=[Role.REVIEWER], reviewer_subjects=[uuid.uuid4()])
+    await cache.set("applet", applet_id, user_id, permissions)
+
+    # other process: local tier is empty
+    LocalCache.clear_all()
+    redis_hits = PermissionCache.redis_hits
+    assert await cache.get("applet", applet_id, user_id) == permissions
+    assert PermissionCache.redis_hits == redis_hits + 1
+    with pytest.raises(CacheNotFound):
+        await cache.get("workspace", applet_id, user_id)
+
+
+async def test_checks_reuse_one_query(session: AsyncSession, tom: User, applet_one: AppletFull, mocker: MockerFixture):
+    spy = mocker.spy(AppletAccessCRUD, "get_applet_permissions")
+    service = CheckAccessService(session, tom.id)
+    await service.check_applet_detail_access(applet_one.id)
+    await service.check_applet_edit_access(applet_one.id)
+    await service.check_answers_export_access(applet_one.id)
+    assert spy.call_count == 1
+
+
+async def test_role_change_invalidates_cache(session: AsyncSession, tom: User, lucy: User, applet_one: AppletFull):
+    service = CheckAccessService(session, lucy.id)
+    with pytest.raises(AppletEditionAccessDenied):
+        await service.check_applet_edit_access(applet_one.id)
+
+    async with atomic(session):
+        await UserAppletAccessService(session, tom.id, applet_one.id).add_role(lucy.id, Role.EDITOR)
+        # the cached permissions are kept until the role is committed
+        with pytest.raises(AppletEditionAccessDenied):
+            await service.check_applet_edit_access(applet_one.id)
+    await service.check_applet_edit_access(applet_one.id)
+
+
+async def test_value_read_before_invalidation_is_not_used():
+    cache = PermissionCache()
+    applet_id, user_id = uuid.uuid4(), uuid.uuid4()
+    with pytest.raises(CacheNotFound):
+        await cache.get("applet", applet_id, user_id)
+
+    # the accesses are changed while the permissions are read from the database
+    await PermissionCache.invalidate([("applet", applet_id, user_id)])
+    await cache.set("applet", applet_id, user_id, AccessPermissions(roles=[Role.MANAGER]))
+
+    with pytest.raises(CacheNotFound):
+        await PermissionCache().get("applet", applet_id, user_id)
+
+
+async def test_invalidation_is_per_user():
+    cache = PermissionCache()
+    applet_id, user_id, other_user_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    permissions = AccessPermissions(roles=[Role.EDITOR])
+    await cache.set("applet", applet_id, user_id, permissions)
+    await cache.set("applet", applet_id, other_user_id, permissions)
+
+    await PermissionCache.invalidate([("applet", applet_id, other_user_id)])
+    LocalCache.clear_all()
+    assert await cache.get("applet", applet_id, user_id) == permissions
+    with pytest.raises(CacheNotFound):
+        await cache.get("applet", applet_id, other_user_id)
+
+
+async def test_checks_fall_back_to_database_on_redis_errors(
+    session: AsyncSession, tom: User, applet_one: AppletFull, mocker: MockerFixture
+):
+    mocker.patch("infrastructure.utility.redis_client.RedisCache.mget", side_effect=RedisError())
+    mocker.patch("infrastructure.utility.redis_client.RedisCache.set", side_effect=RedisError())
+    await CheckAccessService(session, tom.id).check_applet_edit_access(applet_one.id)
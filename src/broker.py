@@ -1,10 +1,12 @@
 import taskiq_fastapi
-from taskiq import AsyncBroker, InMemoryBroker
+from taskiq import AsyncBroker, InMemoryBroker, TaskiqEvents, TaskiqState
 from taskiq.formatters.json_formatter import JSONFormatter
 from taskiq_aio_pika import AioPikaBroker
 from taskiq_redis import RedisAsyncResultBackend
 
 from config import settings
+from infrastructure.database.core import engine_registry
+from infrastructure.utility.report_client import report_client
 
 broker: AsyncBroker = (
     AioPikaBroker(settings.rabbitmq.url)
@@ -16,3 +18,9 @@ if settings.env == "testing":
     broker = InMemoryBroker().with_formatter(JSONFormatter())
 
 taskiq_fastapi.init(broker, "main:app")
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def close_connections(state: TaskiqState) -> None:
+    await engine_registry.dispose()
+    await report_client.close()
@@ -13,7 +13,8 @@ from apps.applets.commands import (  # noqa: E402
     applet_cli,  # noqa: E402
     applet_ema_cli,  # noqa: E402
 )  # noqa: E402
-from apps.shared.commands import encryption_cli, patch  # noqa: E402
+from apps.jsonld_converter.commands import jsonld_cli  # noqa: E402
+from apps.shared.commands import blind_index_cli, encryption_cli, patch  # noqa: E402
 from apps.users.commands import token_cli  # noqa: E402
 from apps.workspaces.commands import arbitrary_server_cli  # noqa: E402
 
@@ -24,8 +25,10 @@ cli.add_typer(activities, name="activities")
 cli.add_typer(token_cli, name="token")
 cli.add_typer(patch, name="patch")
 cli.add_typer(encryption_cli, name="encryption")
+cli.add_typer(blind_index_cli, name="blind-index")
 cli.add_typer(applet_ema_cli, name="applet-ema")
 cli.add_typer(applet_cli, name="applet")
+cli.add_typer(jsonld_cli, name="jsonld")
 
 if __name__ == "__main__":
     # with app context?
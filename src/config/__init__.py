@@ -6,6 +6,7 @@ from config.alerts import AlertsSettings
 from config.anonymous_respondent import AnonymousRespondent
 from config.applet import AppletEMASettings
 from config.authentication import AuthenticationSettings
+from config.cache import CacheSettings
 from config.cdn import CDNSettings
 from config.cors import CorsSettings
 from config.database import DatabaseSettings
@@ -16,11 +17,19 @@ from config.notification import FirebaseCloudMessagingSettings
 from config.opentelemetry import OpenTelemetrySettings
 from config.rabbitmq import RabbitMQSettings
 from config.redis import RedisSettings
+from config.report_server import ReportServerSettings
 from config.secret import SecretSettings
 from config.sentry import SentrySettings
 from config.service import JsonLdConverterSettings, ServiceSettings
 from config.superuser import SuperAdmin
-from config.task import AnswerEncryption, AudioFileConvert, ImageConvert
+from config.task import (
+    AnswerEncryption,
+    AnswerEvents,
+    AudioFileConvert,
+    ImageConvert,
+    LastSeenFlush,
+    NotificationLogFlush,
+)
 
 
 # NOTE: Settings powered by pydantic
@@ -55,6 +64,7 @@ class Settings(BaseSettings):
 
     # Redis
     redis: RedisSettings = RedisSettings()
+    cache: CacheSettings = CacheSettings()
     rabbitmq: RabbitMQSettings = RabbitMQSettings()
 
     # Mailing
@@ -75,6 +85,9 @@ class Settings(BaseSettings):
     # Alerts configs
     alerts: AlertsSettings = AlertsSettings()
 
+    # Report servers client configs
+    report_server: ReportServerSettings = ReportServerSettings()
+
     # NOTE: This config is used by SQLAlchemy for imports
     migrations_apps: list[str]
 
@@ -85,6 +98,9 @@ class Settings(BaseSettings):
     task_answer_encryption = AnswerEncryption()
     task_audio_file_convert = AudioFileConvert()
     task_image_convert = ImageConvert()
+    task_last_seen_flush = LastSeenFlush()
+    task_answer_events = AnswerEvents()
+    task_notification_log_flush = NotificationLogFlush()
 
     applet_ema = AppletEMASettings()
 
@@ -3,3 +3,8 @@ from pydantic import BaseModel
 
 class AlertsSettings(BaseModel):
     ws_fetching_periodicity_sec: int = 5
+    # undelivered alerts kept per websocket, the oldest are dropped for slow clients
+    ws_queue_size: int = 100
+    # applet, workspace and subject details of the alerts
+    context_cache_size: int = 10000
+    context_cache_ttl: int = 60
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+
+
+class CacheSettings(BaseModel):
+    """Configure in-process and redis caches of rarely changed data"""
+
+    # applet/owner/subject -> arbitrary server settings
+    arbitrary_local_ttl: int = 60  # sec
+    arbitrary_local_maxsize: int = 10_000
+    arbitrary_redis_ttl: int = 60 * 60  # sec
+    # how often the invalidation version stamp is re-read from redis
+    version_check_ttl: int = 5  # sec
+
+    # jti -> "not revoked" answers kept by each process
+    token_revocation_local_ttl: int = 30  # sec
+    # jti -> "not revoked" answers shared by the processes, a failed revocation write is stale for this long
+    token_revocation_redis_ttl: int = 5 * 60  # sec
+    token_revocation_local_maxsize: int = 100_000
+
+    # respondents/subjects/flows resolved while streaming an answers export
+    export_local_maxsize: int = 10_000
+
+    # exact listing totals reused by the "estimated" total mode
+    listing_total_ttl: int = 60  # sec
+
+    # user -> schedule returned to the mobile app, checked against per-applet schedule versions
+    schedule_snapshot_ttl: int = 10 * 60  # sec
+    schedule_version_ttl: int = 24 * 60 * 60  # sec
+
+    # applet version -> applet history tree used by reports and version endpoints
+    applet_version_local_maxsize: int = 100
+    applet_version_redis_ttl: int = 24 * 60 * 60  # sec
+
+    # (user, applet) and (user, workspace owner) -> roles and reviewer subjects
+    # other processes keep the local entries of changed accesses until they expire
+    permissions_local_ttl: int = 5  # sec
+    permissions_local_maxsize: int = 100_000
+    permissions_redis_ttl: int = 10 * 60  # sec
@@ -23,6 +23,12 @@ class CDNSettings(BaseModel):
     endpoint_url: str | None = None
     storage_address: str | None = None
     max_concurrent_tasks: int = 10
+    # threads of the process running blocking storage SDK calls
+    executor_max_workers: int = 32
+    # storage SDK clients cached per storage configuration
+    client_cache_size: int = 100
+    # size of ranged reads of streamed downloads
+    download_chunk_size: int = 1024 * 1024
 
     @property
     def url(self):
@@ -7,7 +7,15 @@ class DatabaseSettings(BaseModel):
     password: str = "postgres"
     user: str = "postgres"
     db: str = "mindlogger_backend"
-    pool_size: int = 2
+    # Connection pool settings of the process-wide engine registry (per database URI and process).
+    # Set use_pool to False to fall back to a new connection per session.
+    use_pool: bool = True
+    pool_size: int = 5
+    max_overflow: int = 5
+    pool_timeout: int = 30  # sec
+    pool_recycle: int = 30 * 60  # sec
+    # Engines of arbitrary servers which were not used for this period are disposed
+    arbitrary_idle_timeout: int = 15 * 60  # sec
 
     @property
     def url(self) -> str:
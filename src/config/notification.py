@@ -18,6 +18,10 @@ class FirebaseCloudMessagingSettings(BaseModel):
     client_x509_cert_url: str | None
     universe_domain: str | None
     ttl: int = 7 * 24 * 60 * 60
+    # devices of one multicast request, 500 is the FCM limit
+    batch_size: int = 500
+    # multicast requests sent at the same time by one notification
+    max_concurrent_batches: int = 4
 
     @property
     def certificate(self) -> dict:
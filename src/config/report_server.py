@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+
+class ReportServerSettings(BaseModel):
+    """Configure the client of applet report servers"""
+
+    # keep-alive connections of the worker to all report servers
+    pool_size: int = 100
+    # requests sent to one report server at the same time
+    max_concurrent_requests: int = 4
+    connect_timeout: int = 10  # sec
+    request_timeout: int = 300  # sec
+    # retries of connection errors, timeouts and 502/503/504 responses
+    max_retries: int = 2
+    # first retry delay, doubled with every retry, with a random jitter
+    retry_backoff: float = 1.0  # sec
+    # consecutive failures after which the server is not requested for `circuit_reset_timeout`
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: int = 60  # sec
+    # reports larger than this are spooled to disk
+    spool_max_size: int = 5 * 1024 * 1024
+    read_chunk_size: int = 64 * 1024
@@ -1,9 +1,15 @@
+import hashlib
+import hmac
+
 from pydantic import BaseModel
 
 
 class SecretSettings(BaseModel):
     key_length: int = 32
     secret_key: str | None = None
+    # Hex of the key of the blind indexes of encrypted fields.
+    # If not specified the key is derived from the secret key.
+    blind_index_secret_key: str | None = None
 
     @property
     def key(self) -> bytes:
@@ -13,3 +19,9 @@ class SecretSettings(BaseModel):
                 raise ValueError(f"Key length in bytes should be {self.key_length}")
             return key
         raise ValueError("Please specify SECRETS__SECRET_KEY variable")
+
+    @property
+    def blind_index_key(self) -> bytes:
+        if self.blind_index_secret_key:
+            return bytes.fromhex(self.blind_index_secret_key)
+        return hmac.new(self.key, b"blind-index", hashlib.sha256).digest()
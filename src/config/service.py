@@ -38,3 +38,13 @@ class JsonLdConverterSettings(BaseModel):
     """Configure json-ld converter service settings."""
 
     protocol_password: str = ""
+    # JSON-LD contexts and documents are shared between imports
+    document_cache_size: int = 1000
+    document_cache_ttl: int = 3600
+    document_fetch_timeout: int = 30
+    # directory of the persistent document store, disabled if not set
+    document_store_dir: str | None = None
+    seed_urls: list[str] = [
+        "https://raw.githubusercontent.com/ReproNim/reproschema/1.0.0-rc4/contexts/generic",
+        "https://raw.githubusercontent.com/ChildMindInstitute/reproschema-context/master/context.json",
+    ]
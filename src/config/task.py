@@ -5,6 +5,10 @@ class AnswerEncryption(BaseModel):
     batch_limit: int = 1000
     max_retries: int = 5
     retry_timeout: int = 12 * 60 * 60
+    # applets reencrypted at the same time by one task
+    max_concurrent_applets: int = 4
+    # processes decrypting and encrypting answer batches
+    process_pool_workers: int = 2
 
 
 class AudioFileConvert(BaseModel):
@@ -17,3 +21,24 @@ class ImageConvert(BaseModel):
     command: str = "convert -strip -interlace JPEG -sampling-factor 4:2:0 " "-quality 85 -colorspace RGB {fin} {fout}"
     subprocess_timeout: int = 20  # sec
     task_wait_timeout: int = 10  # sec
+
+
+class LastSeenFlush(BaseModel):
+    interval: int = 30  # sec
+    # users seen less than this ago are not updated again
+    min_update_interval: int = 60  # sec
+
+
+class AnswerEvents(BaseModel):
+    # events processed in one transaction
+    batch_limit: int = 100
+    # claimed events are processed again if they are not done in this time
+    lease: int = 5 * 60  # sec
+    # events failed this many times are logged and deleted
+    max_attempts: int = 10
+
+
+class NotificationLogFlush(BaseModel):
+    interval: int = 5  # sec
+    # buffered logs are flushed right away when there are this many of them
+    max_pending: int = 500
@@ -0,0 +1,84 @@
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Iterable, Mapping, TypeVar
+
+from infrastructure.cache.errors import CacheNotFound
+
+__all__ = ["LocalCache"]
+
+_Value = TypeVar("_Value")
+_Key = TypeVar("_Key", bound=Hashable)
+
+
+class LocalCache(Generic[_Value]):
+    """Per-process LRU cache with an optional time to live of the entries.
+
+    Missing and expired keys raise CacheNotFound, so `None` can be cached
+    as a regular value. Hits and misses are counted for monitoring.
+
+        [In 0]: cache = LocalCache[str](maxsize=100, ttl=60)
+        [In 1]: cache.set("key", "value")
+        [In 2]: cache.get("key")
+        [Out 2]: 'value'
+    """
+
+    _instances: weakref.WeakSet["LocalCache"] = weakref.WeakSet()
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        LocalCache._instances.add(self)
+
+    def get(self, key: Hashable) -> _Value:
+        try:
+            value, expires_at = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise CacheNotFound()
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            raise CacheNotFound()
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: _Value, ttl: float | None = None) -> None:
+        ttl = ttl or self.ttl
+        self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_many(self, keys: Iterable[_Key]) -> dict[_Key, _Value]:
+        """Returns the found entries only, missing keys are skipped."""
+        found = {}
+        for key in keys:
+            try:
+                found[key] = self.get(key)
+            except CacheNotFound:
+                pass
+        return found
+
+    def set_many(self, mapping: Mapping[_Key, _Value], ttl: float | None = None) -> None:
+        for key, value in mapping.items():
+            self.set(key, value, ttl)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @classmethod
+    def clear_all(cls) -> None:
+        """Drop the entries of every local cache of the process."""
+        for cache in list(cls._instances):
+            cache.clear()
@@ -1,10 +1,18 @@
 import asyncio
 from functools import wraps
 
+from infrastructure.database.core import engine_registry
+
 
 def coro(f):
     @wraps(f)
     def wrapper(*args, **kwargs):
-        return asyncio.run(f(*args, **kwargs))
+        async def run():
+            try:
+                return await f(*args, **kwargs)
+            finally:
+                await engine_registry.dispose()
+
+        return asyncio.run(run())
 
     return wrapper
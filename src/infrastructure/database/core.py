@@ -1,31 +1,123 @@
+import asyncio
 import json
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
 from config import settings
+from infrastructure.logger import logger
 
-__all__ = ["session_manager", "atomic", "build_engine"]
+__all__ = ["session_manager", "atomic", "build_engine", "engine_registry", "after_commit"]
 
+_AFTER_COMMIT = "after_commit"
 
-def build_engine(uri: str) -> AsyncEngine:
+
+def build_engine(uri: str, pooled: bool = False) -> AsyncEngine:
+    pool_options: dict
+    if pooled:
+        pool_options = dict(
+            pool_size=settings.database.pool_size,
+            max_overflow=settings.database.max_overflow,
+            pool_timeout=settings.database.pool_timeout,
+            pool_recycle=settings.database.pool_recycle,
+        )
+    else:
+        pool_options = dict(poolclass=NullPool)
     return create_async_engine(
         uri,
         future=True,
         pool_pre_ping=True,
         echo=False,
-        poolclass=NullPool,
         json_serializer=lambda x: json.dumps(x),
         json_deserializer=lambda x: json.loads(x),
+        **pool_options,
     )
 
 
+@dataclass
+class _EngineEntry:
+    engine: AsyncEngine
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class EngineRegistry:
+    """Process-wide registry of pooled engines keyed by database URI.
+
+    Pooled asyncpg connections are bound to the event loop they were opened
+    in, so engines are kept per running loop. Engines of arbitrary servers
+    which had no connection checked out for `arbitrary_idle_timeout` seconds
+    are disposed on the next lookup.
+    """
+
+    def __init__(self):
+        self._engines: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _EngineEntry]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._disposing: set[asyncio.Task] = set()
+
+    def get(self, uri: str) -> AsyncEngine:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Nothing to bind a pool to, connections are opened per session
+            return build_engine(uri)
+
+        engines = self._engines.setdefault(loop, {})
+        self._evict_idle(engines)
+        entry = engines.get(uri)
+        if entry is None:
+            entry = engines[uri] = self._build_entry(uri)
+        entry.last_used = time.monotonic()
+        return entry.engine
+
+    @staticmethod
+    def _build_entry(uri: str) -> _EngineEntry:
+        entry = _EngineEntry(build_engine(uri, pooled=True))
+
+        @event.listens_for(entry.engine.sync_engine, "checkout")
+        def _touch(*args) -> None:
+            entry.last_used = time.monotonic()
+
+        return entry
+
+    def _evict_idle(self, engines: dict[str, _EngineEntry]) -> None:
+        timeout = settings.database.arbitrary_idle_timeout
+        now = time.monotonic()
+        for uri, entry in list(engines.items()):
+            if uri == settings.database.url or now - entry.last_used < timeout:
+                continue
+            if entry.engine.pool.checkedout():
+                continue
+            engines.pop(uri)
+            task = asyncio.create_task(entry.engine.dispose())
+            self._disposing.add(task)
+            task.add_done_callback(self._disposing.discard)
+
+    async def dispose(self) -> None:
+        """Close pooled connections of all engines created in the running loop."""
+        loop = asyncio.get_running_loop()
+        engines = self._engines.pop(loop, {})
+        await asyncio.gather(
+            *(entry.engine.dispose() for entry in engines.values()),
+            *(task for task in self._disposing if task.get_loop() is loop),
+        )
+
+
+engine_registry = EngineRegistry()
+
+
 class SessionManager:
     @staticmethod
     def get_session(uri: str = settings.database.url) -> sessionmaker:
+        engine = engine_registry.get(uri) if settings.database.use_pool else build_engine(uri)
         return sessionmaker(
-            build_engine(uri),
+            engine,
             class_=AsyncSession,
             expire_on_commit=False,
             autoflush=False,
@@ -36,6 +128,25 @@ class SessionManager:
 session_manager = SessionManager()
 
 
+def after_commit(session: AsyncSession, callback: Callable[[], Awaitable[Any]]) -> None:
+    """Runs the callback once `atomic` commits the session, the callback
+    is dropped if the transaction is rolled back.
+
+    Used to invalidate caches, so concurrent readers can't cache the data
+    of the transaction before it is visible to them.
+    """
+    session.info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def _run_after_commit(session: AsyncSession) -> None:
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        try:
+            await callback()
+        except Exception as e:
+            # the transaction is committed already
+            logger.exception(f"After commit callback failed: {e}")
+
+
 class atomic:
     def __init__(self, session):
         self.session = session
@@ -48,6 +159,8 @@ class atomic:
             return
         if not exc_type:
             await self.session.commit()
+            await _run_after_commit(self.session)
         else:
+            self.session.info.pop(_AFTER_COMMIT, None)
             await self.session.rollback()
             raise
@@ -3,9 +3,9 @@ import typing
 from copy import deepcopy
 from typing import Any, Generic, Type, TypeVar
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import delete, func, inspect, insert, select, update
 from sqlalchemy.cimmutabledict import immutabledict
-from sqlalchemy.engine import Result
+from sqlalchemy.engine import Result, Row
 from sqlalchemy.exc import MultipleResultsFound, NoResultFound
 from sqlalchemy.orm import Query
 
@@ -13,6 +13,9 @@ from infrastructure.database.base import Base
 
 ConcreteSchema = TypeVar("ConcreteSchema", bound=Base)
 
+# asyncpg accepts up to 32767 bind parameters in one statement
+_MAX_INSERT_PARAMS = 32_000
+
 __all__ = ["BaseCRUD"]
 
 
@@ -92,6 +95,35 @@ class BaseCRUD(Generic[ConcreteSchema]):
         await self.session.flush()
         return deepcopy(schemas)
 
+    async def _insert_many(self, schemas: list[ConcreteSchema]) -> list[Row]:
+        """Inserts new instances with multi-row INSERT ... RETURNING statements
+        bypassing the unit of work of the session.
+
+        The instances are only used as containers of the values, they are not
+        added to the session. Returns plain rows of the inserted records in
+        the order of the instances.
+        """
+        table = self.schema_class.__table__
+        columns = {attr.key: attr.columns[0] for attr in inspect(self.schema_class).column_attrs}
+
+        # multi-row VALUES needs the same columns in every row
+        groups: dict[tuple[str, ...], list[tuple[int, dict[str, Any]]]] = {}
+        for index, schema in enumerate(schemas):
+            values = {columns[key].key: value for key, value in vars(schema).items() if key in columns}
+            groups.setdefault(tuple(values), []).append((index, values))
+
+        rows: list[Row | None] = [None] * len(schemas)
+        for keys, group in groups.items():
+            chunk_size = max(_MAX_INSERT_PARAMS // max(len(keys), 1), 1)
+            for start in range(0, len(group), chunk_size):
+                chunk = group[start : start + chunk_size]
+                query = insert(table).values([values for _, values in chunk]).returning(*table.columns)
+                db_result = await self._execute(query)
+                for (index, _), row in zip(chunk, db_result.all()):
+                    rows[index] = row
+
+        return typing.cast(list[Row], rows)
+
     async def _all(self) -> list[ConcreteSchema]:
         query = select(self.schema_class)
         results = await self._execute(query=query)
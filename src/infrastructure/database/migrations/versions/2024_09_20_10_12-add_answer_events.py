@@ -0,0 +1,55 @@
+"""Add answer events outbox
+
+Revision ID: 3f2c8e1d5a7b
+Revises: 9cc4ba6a211a
+Create Date: 2024-09-20 10:12:31.114207
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+from sqlalchemy_utils.types.encrypted.encrypted_type import StringEncryptedType
+
+from apps.shared.encryption import get_key
+
+# revision identifiers, used by Alembic.
+revision = "3f2c8e1d5a7b"
+down_revision = "9cc4ba6a211a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "answer_events",
+        sa.Column("is_deleted", sa.Boolean(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"),
+            nullable=True,
+        ),
+        sa.Column("migrated_date", sa.DateTime(), nullable=True),
+        sa.Column("migrated_updated", sa.DateTime(), nullable=True),
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("answer_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("submit_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("applet_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("version", sa.Text(), nullable=False),
+        sa.Column("activity_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("respondent_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("subject_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("alerts", StringEncryptedType(sa.Unicode, get_key), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_answer_events")),
+        sa.UniqueConstraint("answer_id", name=op.f("uq_answer_events_answer_id")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("answer_events")
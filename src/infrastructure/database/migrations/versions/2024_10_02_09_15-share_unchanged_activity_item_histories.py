@@ -0,0 +1,50 @@
+"""Share item histories of unchanged activities between versions
+
+Revision ID: 5d9e3a71c4b2
+Revises: 8b41d2c7e9f0
+Create Date: 2024-10-02 09:15:42.183406
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d9e3a71c4b2"
+down_revision = "8b41d2c7e9f0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("activity_histories", sa.Column("items_hash", sa.String(length=64), nullable=True))
+    op.add_column("activity_histories", sa.Column("items_id_version", sa.String(), nullable=True))
+    # every existing version owns its item history rows
+    op.execute("UPDATE activity_histories SET items_id_version = id_version")
+    op.alter_column("activity_histories", "items_id_version", nullable=False)
+    op.create_index(op.f("ix_activity_histories_id"), "activity_histories", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    # copy shared item history rows back to every version which uses them
+    op.execute(
+        """
+        INSERT INTO activity_item_histories (
+            id, id_version, activity_id, name, question, response_type, response_values, config,
+            "order", is_hidden, conditional_logic, allow_edit, extra_fields,
+            is_deleted, created_at, updated_at, migrated_date, migrated_updated
+        )
+        SELECT
+            aih.id,
+            aih.id || '_' || split_part(ah.id_version, '_', 2),
+            ah.id_version,
+            aih.name, aih.question, aih.response_type, aih.response_values, aih.config,
+            aih."order", aih.is_hidden, aih.conditional_logic, aih.allow_edit, aih.extra_fields,
+            aih.is_deleted, aih.created_at, aih.updated_at, aih.migrated_date, aih.migrated_updated
+        FROM activity_histories ah
+        JOIN activity_item_histories aih ON aih.activity_id = ah.items_id_version
+        WHERE ah.items_id_version != ah.id_version
+        """
+    )
+    op.drop_index(op.f("ix_activity_histories_id"), table_name="activity_histories")
+    op.drop_column("activity_histories", "items_id_version")
+    op.drop_column("activity_histories", "items_hash")
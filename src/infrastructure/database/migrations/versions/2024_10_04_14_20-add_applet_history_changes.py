@@ -0,0 +1,45 @@
+"""Add applet history changes
+
+Revision ID: 0c7f4e2b9a16
+Revises: 5d9e3a71c4b2
+Create Date: 2024-10-04 14:20:07.529311
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "0c7f4e2b9a16"
+down_revision = "5d9e3a71c4b2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "applet_history_changes",
+        sa.Column("is_deleted", sa.Boolean(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"),
+            nullable=True,
+        ),
+        sa.Column("migrated_date", sa.DateTime(), nullable=True),
+        sa.Column("migrated_updated", sa.DateTime(), nullable=True),
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("version", sa.String(length=255), nullable=False),
+        sa.Column("changes", sa.LargeBinary(), nullable=False),
+        sa.PrimaryKeyConstraint("id", "version", name=op.f("pk_applet_history_changes")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("applet_history_changes")
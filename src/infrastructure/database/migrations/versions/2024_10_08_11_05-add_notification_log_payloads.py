@@ -0,0 +1,76 @@
+"""Add notification log payloads and snapshots
+
+Revision ID: e41b6d0f8c27
+Revises: 0c7f4e2b9a16
+Create Date: 2024-10-08 11:05:33.872640
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "e41b6d0f8c27"
+down_revision = "0c7f4e2b9a16"
+branch_labels = None
+depends_on = None
+
+LOG_FIELDS = ("notification_descriptions", "notification_in_queue", "scheduled_notifications")
+
+
+def _base_columns() -> list[sa.Column]:
+    return [
+        sa.Column("is_deleted", sa.Boolean(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("timezone('utc', now())"),
+            nullable=True,
+        ),
+        sa.Column("migrated_date", sa.DateTime(), nullable=True),
+        sa.Column("migrated_updated", sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_log_payloads",
+        *_base_columns(),
+        sa.Column("id", sa.String(length=64), nullable=False),
+        sa.Column("value", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_notification_log_payloads")),
+    )
+    op.create_table(
+        "notification_log_snapshots",
+        *_base_columns(),
+        sa.Column("id", postgresql.UUID(as_uuid=True), server_default=sa.text("gen_random_uuid()"), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("device_id", sa.String(), nullable=False),
+        *[sa.Column(f"{field}_key", sa.String(length=64), nullable=True) for field in LOG_FIELDS],
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_notification_log_snapshots")),
+        sa.UniqueConstraint("user_id", "device_id", name="uq_notification_log_snapshots_user_device"),
+    )
+    for field in LOG_FIELDS:
+        op.add_column("notification_logs", sa.Column(f"{field}_key", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    # restore the values of the logs which refer to payloads
+    for field in LOG_FIELDS:
+        op.execute(
+            f"""
+            UPDATE notification_logs nl
+            SET {field} = nlp.value
+            FROM notification_log_payloads nlp
+            WHERE nlp.id = nl.{field}_key
+            """
+        )
+        op.drop_column("notification_logs", f"{field}_key")
+    op.drop_table("notification_log_snapshots")
+    op.drop_table("notification_log_payloads")
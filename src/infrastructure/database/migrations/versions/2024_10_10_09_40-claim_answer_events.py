@@ -0,0 +1,30 @@
+"""Claim answer events with a lease
+
+Revision ID: 7a3e9c15d2b4
+Revises: e41b6d0f8c27
+Create Date: 2024-10-10 09:40:12.518364
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7a3e9c15d2b4"
+down_revision = "e41b6d0f8c27"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("answer_events", sa.Column("locked_until", sa.DateTime(), nullable=True))
+    op.add_column("answer_events", sa.Column("attempts", sa.Integer(), server_default=sa.text("0"), nullable=False))
+    op.add_column(
+        "answer_events",
+        sa.Column("is_report_processed", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("answer_events", "is_report_processed")
+    op.drop_column("answer_events", "attempts")
+    op.drop_column("answer_events", "locked_until")
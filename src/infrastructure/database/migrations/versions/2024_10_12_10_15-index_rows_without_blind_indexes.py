@@ -0,0 +1,41 @@
+"""Index rows without blind indexes
+
+Searches match the rows without search keys by their decrypted values,
+the partial indexes keep the search keys index usable for the others.
+
+Revision ID: 5d0e7b3a9c21
+Revises: 7a3e9c15d2b4
+Create Date: 2024-10-12 10:15:42.118305
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d0e7b3a9c21"
+down_revision = "7a3e9c15d2b4"
+branch_labels = None
+depends_on = None
+
+BLIND_INDEXED = {
+    "subjects": ("email", "first_name", "last_name", "nickname"),
+    "users": ("email_encrypted", "first_name", "last_name"),
+}
+
+
+def upgrade() -> None:
+    for table, fields in BLIND_INDEXED.items():
+        for field in fields:
+            op.create_index(
+                op.f(f"ix_{table}_{field}_not_blind_indexed"),
+                table,
+                ["id"],
+                unique=False,
+                postgresql_where=sa.text(f"{field}_search_keys IS NULL"),
+            )
+
+
+def downgrade() -> None:
+    for table, fields in BLIND_INDEXED.items():
+        for field in fields:
+            op.drop_index(op.f(f"ix_{table}_{field}_not_blind_indexed"), table_name=table)
@@ -0,0 +1,29 @@
+"""Index answer events by the claim order
+
+Consumers claim the oldest events whose lease has expired.
+
+Revision ID: 9e4c2a7b5d13
+Revises: 5d0e7b3a9c21
+Create Date: 2024-10-15 11:20:37.641982
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9e4c2a7b5d13"
+down_revision = "5d0e7b3a9c21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_answer_events_created_at_locked_until"),
+        "answer_events",
+        ["created_at", "locked_until"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_answer_events_created_at_locked_until"), table_name="answer_events")
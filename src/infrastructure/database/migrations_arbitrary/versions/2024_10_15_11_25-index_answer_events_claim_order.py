@@ -0,0 +1,29 @@
+"""Index answer events by the claim order
+
+Consumers claim the oldest events whose lease has expired.
+
+Revision ID: 3c7a1e9f2b58
+Revises: 2b8f6d4e0a93
+Create Date: 2024-10-15 11:25:09.203517
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3c7a1e9f2b58"
+down_revision = "2b8f6d4e0a93"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_answer_events_created_at_locked_until"),
+        "answer_events",
+        ["created_at", "locked_until"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_answer_events_created_at_locked_until"), table_name="answer_events")
@@ -12,14 +12,17 @@ from infrastructure.logger import logger
 
 
 def custom_base_errors_handler(_: Request, error: BaseError) -> JSONResponse:
-    """This function is called if the BaseError was raised."""
+    """This function is called if the BaseError was raised.
+    Errors found in the same validation pass are in `related_errors`.
+    """
     response = ErrorResponseMulti(
         result=[
             ErrorResponse(
-                message=error.error,
-                type=error.type,
-                path=getattr(error, "path", []),
+                message=err.error,
+                type=err.type,
+                path=getattr(err, "path", []),
             )
+            for err in [error, *error.related_errors]
         ]
     )
 
@@ -5,8 +5,15 @@ from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.sdk.trace import TracerProvider
 from opentelemetry.sdk.trace.export import BatchSpanProcessor
 
+from apps.alerts.dispatcher import alert_dispatcher
+from apps.jsonld_converter.service.document_loader import get_cached_document_loader
+from apps.logs.services import notification_log_buffer
+from apps.users.services.last_seen import last_seen_aggregator
 from broker import broker
 from config import settings
+from infrastructure.database.core import engine_registry
+from infrastructure.utility.cdn_client import CDNClient
+from infrastructure.utility.report_client import report_client
 
 
 def startup_opentelemetry(app: FastAPI) -> None:
@@ -49,6 +56,8 @@ async def shutdown_taskiq() -> None:
 def startup(app: FastAPI):
     async def _startup():
         await startup_taskiq()
+        last_seen_aggregator.start()
+        notification_log_buffer.start()
 
     startup_opentelemetry(app)
     return _startup
@@ -57,5 +66,12 @@ def startup(app: FastAPI):
 def shutdown(app: FastAPI):
     async def _shutdown():
         await shutdown_taskiq()
+        await last_seen_aggregator.stop()
+        await notification_log_buffer.stop()
+        await alert_dispatcher.stop()
+        await engine_registry.dispose()
+        await report_client.close()
+        await get_cached_document_loader().close()
+        CDNClient.shutdown()
 
     return _shutdown
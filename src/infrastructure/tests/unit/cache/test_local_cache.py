@@ -0,0 +1,47 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from infrastructure.cache import CacheNotFound, LocalCache
+
+
+def test_local_cache_get_set():
+    cache = LocalCache[int | None](maxsize=10)
+    cache.set("none", None)
+    assert cache.get("none") is None
+    with pytest.raises(CacheNotFound):
+        cache.get("missing")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache[int](maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    with pytest.raises(CacheNotFound):
+        cache.get("b")
+
+
+def test_local_cache_entry_expires(mocker: MockerFixture):
+    monotonic = mocker.patch("infrastructure.cache.local.time.monotonic", return_value=100)
+    cache = LocalCache[int](maxsize=2, ttl=10)
+    cache.set("a", 1)
+    monotonic.return_value = 111
+    with pytest.raises(CacheNotFound):
+        cache.get("a")
+    assert len(cache) == 0
+
+
+def test_local_cache_clear_all():
+    cache = LocalCache[int](maxsize=2)
+    cache.set("a", 1)
+    LocalCache.clear_all()
+    assert len(cache) == 0
+
+
+def test_local_cache_get_many_skips_missing():
+    cache = LocalCache[int](maxsize=3)
+    cache.set_many({"a": 1, "b": 2})
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "b": 2}
@@ -0,0 +1,74 @@
+import asyncio
+
+from pytest_mock import MockerFixture
+
+from config import settings
+from infrastructure.utility.notification_client import (
+    FCMDeliveryResult,
+    FCMNotificationTest,
+    FirebaseMessage,
+    FirebaseNotificationType,
+)
+
+MESSAGE = FirebaseMessage(title="Title", body="Body", data=dict(type=FirebaseNotificationType.APPLET_UPDATE))
+
+
+async def test_notify_sends_deduplicated_devices_by_batches(fcm_client: FCMNotificationTest, mocker: MockerFixture):
+    mocker.patch.object(settings.fcm, "batch_size", 3)
+    spy = mocker.spy(FCMNotificationTest, "_send_batch")
+    devices = [f"device_{i}" for i in range(8)]
+
+    result = await fcm_client.notify(devices + devices[:2], MESSAGE)
+
+    assert result == FCMDeliveryResult(sent=8)
+    assert [len(call.args[1]) for call in spy.call_args_list] == [3, 3, 2]
+    assert all(len(fcm_client.notifications[device]) == 1 for device in devices)
+
+
+async def test_notify_limits_concurrent_batches(fcm_client: FCMNotificationTest, mocker: MockerFixture):
+    mocker.patch.object(settings.fcm, "batch_size", 1)
+    mocker.patch.object(settings.fcm, "max_concurrent_batches", 2)
+    running = max_running = 0
+
+    async def send_batch(devices: list[str], message: FirebaseMessage) -> FCMDeliveryResult:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return FCMDeliveryResult(sent=len(devices))
+
+    mocker.patch.object(fcm_client, "_send_batch", send_batch)
+    result = await fcm_client.notify([f"device_{i}" for i in range(6)], MESSAGE)
+
+    assert result.sent == 6
+    assert max_running == 2
+
+
+async def test_notify_reports_unregistered_devices(fcm_client: FCMNotificationTest):
+    fcm_client.unregistered.add("device_2")
+    batches = FCMNotificationTest.stats().get("batches", 0)
+
+    result = await fcm_client.notify(["device_1", "device_2"], MESSAGE)
+
+    assert result == FCMDeliveryResult(sent=1, failed=1, unregistered=["device_2"])
+    assert "device_2" not in fcm_client.notifications
+    assert FCMNotificationTest.stats()["batches"] == batches + 1
+
+
+async def test_notify_keeps_results_of_other_batches_on_failure(
+    fcm_client: FCMNotificationTest, mocker: MockerFixture
+):
+    mocker.patch.object(settings.fcm, "batch_size", 2)
+    fcm_client.unregistered.add("device_3")
+    send_batch = fcm_client._send_batch
+
+    async def fail_first_batch(devices: list[str], message: FirebaseMessage) -> FCMDeliveryResult:
+        if "device_0" in devices:
+            raise ConnectionError()
+        return await send_batch(devices, message)
+
+    mocker.patch.object(fcm_client, "_send_batch", fail_first_batch)
+    result = await fcm_client.notify([f"device_{i}" for i in range(4)], MESSAGE)
+
+    assert result == FCMDeliveryResult(sent=1, failed=3, unregistered=["device_3"])
@@ -0,0 +1,86 @@
+import asyncio
+import base64
+import json
+from tempfile import SpooledTemporaryFile
+
+import aiohttp
+import pytest
+from pytest_mock import MockerFixture
+
+from apps.answers.errors import ReportServerError
+from config import settings
+from infrastructure.utility.report_client import ReportClient, ReportServerPayload, _PdfDecoder
+
+URL = "http://report-server/send-pdf-report"
+
+
+def test_pdf_decoder_decodes_pdf_by_chunks():
+    pdf = bytes(range(256)) * 10
+    body = json.dumps(dict(email=dict(subject="Subject"), pdf=base64.b64encode(pdf).decode())).encode()
+    decoder = _PdfDecoder(SpooledTemporaryFile())
+    for i in range(0, len(body), 7):
+        decoder.feed(body[i : i + 7])
+    data = decoder.close()
+    assert data == dict(email=dict(subject="Subject"), pdf="")
+    assert decoder.pdf.read() == pdf
+
+
+def test_pdf_decoder_unescapes_slashes():
+    pdf = b"\xff\xff\xff" * 10
+    body = '{"pdf": "%s"}' % base64.b64encode(pdf).decode().replace("/", "\\/")
+    decoder = _PdfDecoder(SpooledTemporaryFile())
+    decoder.feed(body.encode())
+    decoder.close()
+    assert decoder.pdf.read() == pdf
+
+
+async def test_report_client_retries_transient_errors(mocker: MockerFixture):
+    mocker.patch.object(settings.report_server, "retry_backoff", 0)
+    client = ReportClient()
+    payload = ReportServerPayload(pdf=SpooledTemporaryFile(), data={})
+    post = mocker.patch.object(client, "_post", side_effect=[aiohttp.ClientConnectionError(), payload])
+    assert await client.post_report(URL, {}) is payload
+    assert post.call_count == 2
+    assert client.stats()["report-server"]["retries"] == 1
+
+
+async def test_report_client_opens_circuit_after_failures(mocker: MockerFixture):
+    mocker.patch.object(settings.report_server, "retry_backoff", 0)
+    client = ReportClient()
+    post = mocker.patch.object(client, "_post", side_effect=asyncio.TimeoutError())
+    for _ in range(settings.report_server.circuit_failure_threshold):
+        with pytest.raises(ReportServerError):
+            await client.post_report(URL, {})
+    calls = post.call_count
+    with pytest.raises(ReportServerError):
+        await client.post_report(URL, {})
+    assert post.call_count == calls
+    assert client.stats()["report-server"]["circuit_open"]
+
+
+async def test_report_client_rejected_requests_do_not_open_circuit(mocker: MockerFixture):
+    client = ReportClient()
+    mocker.patch.object(client, "_post", side_effect=ReportServerError(message="Bad request"))
+    for _ in range(settings.report_server.circuit_failure_threshold):
+        with pytest.raises(ReportServerError):
+            await client.post_report(URL, {})
+    assert not client.stats()["report-server"]["circuit_open"]
+
+
+async def test_report_client_limits_concurrent_requests(mocker: MockerFixture):
+    client = ReportClient()
+    in_flight = 0
+    max_in_flight = 0
+
+    async def post(url, payload):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return ReportServerPayload(pdf=SpooledTemporaryFile(), data={})
+
+    mocker.patch.object(client, "_post", side_effect=post)
+    await asyncio.gather(*(client.post_report(URL, {}) for _ in range(20)))
+    assert max_in_flight == settings.report_server.max_concurrent_requests
+    assert client.stats()["report-server"]["requests"] == 20
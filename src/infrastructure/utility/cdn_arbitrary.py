@@ -3,10 +3,11 @@ from datetime import datetime, timedelta
 from typing import BinaryIO
 
 import boto3
+from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.blob import BlobSasPermissions, BlobServiceClient, generate_blob_sas
 from botocore.config import Config
 
-from infrastructure.utility.cdn_client import CDNClient
+from infrastructure.utility.cdn_client import CDNClient, ObjectNotFoundError
 from infrastructure.utility.cdn_config import CdnConfig
 
 
@@ -32,6 +33,9 @@ class ArbitraryGCPCdnClient(CDNClient):
     def generate_private_url(self, key):
         return f"gs://{self.config.bucket}/{key}"
 
+    def _client_key(self, signature_version=None):
+        return super()._client_key(signature_version), self.endpoint_url
+
     def configure_client(self, config, signature_version=None):
         client_config = Config(
             max_pool_connections=25,
@@ -58,6 +62,9 @@ class ArbitraryAzureCdnClient(CDNClient):
     def generate_private_url(self, key):
         return f"https://{self.config.bucket}.blob.core.windows.net/mindlogger/{key}"  # noqa
 
+    def _client_key(self, signature_version=None):
+        return self.__class__, self.sec_key
+
     def configure_client(self, _, **kwargs):
         blob_service_client = BlobServiceClient.from_connection_string(self.sec_key)
         with suppress(Exception):
@@ -73,6 +80,18 @@ class ArbitraryAzureCdnClient(CDNClient):
         blob_client = self.client.get_blob_client(self.default_container_name, blob=key)
         return blob_client.exists()
 
+    def _head_object(self, key) -> tuple[int, str]:
+        blob_client = self.client.get_blob_client(self.default_container_name, blob=key)
+        try:
+            properties = blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            raise ObjectNotFoundError()
+        return properties.size, properties.etag
+
+    def _get_object_range(self, key, start: int, end: int) -> bytes:
+        blob_client = self.client.get_blob_client(self.default_container_name, blob=key)
+        return blob_client.download_blob(offset=start, length=end - start + 1).readall()
+
     def _generate_presigned_url(self, key: str):
         blob_client = self.client.get_blob_client(self.default_container_name, key)
         permissions = BlobSasPermissions(read=True)
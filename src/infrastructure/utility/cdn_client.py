@@ -3,8 +3,13 @@ import http
 import io
 import json
 import mimetypes
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
 from concurrent.futures import ThreadPoolExecutor
-from typing import BinaryIO
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, BinaryIO, Callable, Hashable
 
 import boto3
 import httpx
@@ -14,6 +19,7 @@ from botocore.exceptions import ClientError, EndpointConnectionError
 
 from apps.file.errors import FileNotFoundError
 from apps.shared.exception import NotFoundError
+from config import settings
 from infrastructure.logger import logger
 from infrastructure.utility.cdn_config import CdnConfig
 
@@ -22,17 +28,61 @@ class ObjectNotFoundError(Exception):
     pass
 
 
+@dataclass
+class ObjectStream:
+    """Object content read from the storage by ranged chunks."""
+
+    status_code: int
+    media_type: str
+    headers: dict[str, str] = field(default_factory=dict)
+    chunks: AsyncIterator[bytes] | None = None
+
+
+def _parse_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Returns the first and the last byte of a single `bytes=` range.
+
+    Raises ValueError if the range can not be satisfied. Multiple ranges
+    and not bytes ranges return None, the whole object is sent then.
+    """
+    unit, _, ranges = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in ranges:
+        return None
+    first, _, last = ranges.strip().partition("-")
+    if not first:
+        # suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        raise ValueError(range_header)
+    return start, end
+
+
 class CDNClient:
+    """Storage client.
+
+    Blocking SDK calls are run in one bounded thread pool of the process,
+    SDK clients are cached per storage configuration and shared by the
+    instances, so creating a CDNClient per request is cheap.
+    """
+
     KEY_KEY = "Key"
     KEY_CHECKSUM = "ETag"
 
     default_container_name = "mindlogger"
     meta_last_modified = "last_modified_orig"
 
+    _executor: ThreadPoolExecutor | None = None
+    _clients: OrderedDict[Hashable, Any] = OrderedDict()
+    _clients_lock = threading.Lock()
+    # operation -> [calls, seconds waiting for a worker, seconds of the SDK call]
+    _stats: defaultdict[str, list[float]] = defaultdict(lambda: [0, 0.0, 0.0])
+    _stats_lock = threading.Lock()
+
     def __init__(self, config: CdnConfig, env: str, *, max_concurrent_tasks: int = 10):
         self.config = config
         self.env = env
-        self.client = self.configure_client(config)
+        self.client = self._get_client()
 
         # semaphore for concurrent calls of urlib3 in boto3
         self.semaphore = asyncio.Semaphore(max_concurrent_tasks)
@@ -46,6 +96,72 @@ class CDNClient:
     def generate_private_url(self, key):
         return f"s3://{self.config.bucket}/{key}"
 
+    def _client_key(self, signature_version=None) -> Hashable:
+        config = self.config
+        return (
+            self.__class__,
+            signature_version,
+            config.endpoint_url,
+            config.region,
+            config.access_key,
+            config.secret_key,
+        )
+
+    def _get_client(self, signature_version=None):
+        key = self._client_key(signature_version)
+        with self._clients_lock:
+            if key in self._clients:
+                self._clients.move_to_end(key)
+                return self._clients[key]
+            client = self.configure_client(self.config, signature_version=signature_version)
+            self._clients[key] = client
+            while len(self._clients) > settings.cdn.client_cache_size:
+                self._clients.popitem(last=False)
+            return client
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if CDNClient._executor is None:
+            CDNClient._executor = ThreadPoolExecutor(
+                max_workers=settings.cdn.executor_max_workers, thread_name_prefix="cdn"
+            )
+        return CDNClient._executor
+
+    async def _run(self, operation: str, func: Callable, *args, **kwargs):
+        """Runs the blocking call in the shared thread pool and records
+        how long it waited for a worker and how long the call took."""
+        submitted_at = time.monotonic()
+
+        def call():
+            started_at = time.monotonic()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                finished_at = time.monotonic()
+                with CDNClient._stats_lock:
+                    stats = CDNClient._stats[operation]
+                    stats[0] += 1
+                    stats[1] += started_at - submitted_at
+                    stats[2] += finished_at - started_at
+
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+
+    @classmethod
+    def stats(cls) -> dict[str, dict[str, float]]:
+        with cls._stats_lock:
+            return {
+                operation: dict(calls=calls, queue_wait=queue_wait, call_time=call_time)
+                for operation, (calls, queue_wait, call_time) in cls._stats.items()
+            }
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Logs the call stats of the process and stops the thread pool."""
+        logger.info(f"CDN client calls: {cls.stats()}")
+        if CDNClient._executor is not None:
+            CDNClient._executor.shutdown(wait=False, cancel_futures=True)
+            CDNClient._executor = None
+
     def configure_client(self, config, signature_version=None):
         assert config, "set CDN"
         client_config = Config(
@@ -78,9 +194,7 @@ class CDNClient:
         )
 
     async def upload(self, path, body: BinaryIO):
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._upload, path, body)
-        await asyncio.wrap_future(future)
+        await self._run("upload", self._upload, path, body)
 
     def _check_existence(self, bucket: str, key: str):
         try:
@@ -90,18 +204,14 @@ class CDNClient:
             raise NotFoundError
 
     async def check_existence(self, bucket: str, key: str):
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._check_existence, bucket, key)
-            return await asyncio.wrap_future(future)
-
-    def download(self, key, file: BinaryIO | None = None):
-        if not file:
-            file = io.BytesIO()
+        return await self._run("check_existence", self._check_existence, bucket, key)
 
+    @contextmanager
+    def _download_errors(self, key):
         try:
-            self.client.download_fileobj(self.config.bucket, key, file)
+            yield
         except ClientError as e:
-            if int(e.response.get("Error", {}).get("Code", "0")) == 404:
+            if e.response.get("Error", {}).get("Code", "0") in ("404", "NoSuchKey"):
                 logger.warning(f"Trying to download not existing file {key}")
                 raise ObjectNotFoundError()
             logger.error(f"Error when trying to download file {key}: {e}")
@@ -110,12 +220,86 @@ class CDNClient:
             logger.error(f"Error when trying to download file {key}: {e}")
             raise FileNotFoundError
 
+    @staticmethod
+    def _guess_media_type(key) -> str:
+        return mimetypes.guess_type(key)[0] or "application/octet-stream"
+
+    def download(self, key, file: BinaryIO | None = None):
+        if not file:
+            file = io.BytesIO()
+
+        with self._download_errors(key):
+            self.client.download_fileobj(self.config.bucket, key, file)
+
         file.seek(0)
-        media_type = mimetypes.guess_type(key)[0] if mimetypes.guess_type(key)[0] else "application/octet-stream"
-        return file, media_type
+        return file, self._guess_media_type(key)
+
+    def _head_object(self, key) -> tuple[int, str]:
+        """Returns the size and the ETag of the object."""
+        res = self.client.head_object(Bucket=self.config.bucket, Key=key)
+        return res["ContentLength"], res["ETag"]
+
+    def _get_object_range(self, key, start: int, end: int) -> bytes:
+        res = self.client.get_object(Bucket=self.config.bucket, Key=key, Range=f"bytes={start}-{end}")
+        return res["Body"].read()
+
+    async def _iter_chunks(self, key, start: int, end: int) -> AsyncIterator[bytes]:
+        chunk_size = settings.cdn.download_chunk_size
+        fetches: deque[asyncio.Future] = deque()
+        try:
+            for offset in range(start, end + 1, chunk_size):
+                chunk_end = min(offset + chunk_size, end + 1) - 1
+                fetches.append(
+                    asyncio.ensure_future(self._run("download", self._get_object_range, key, offset, chunk_end))
+                )
+                # the next chunk is fetched while the current one is sent
+                if len(fetches) > 1:
+                    yield await fetches.popleft()
+            while fetches:
+                yield await fetches.popleft()
+        finally:
+            for fetch in fetches:
+                fetch.cancel()
+
+    async def stream(self, key, *, range_header: str | None = None, if_none_match: str | None = None) -> ObjectStream:
+        """Prepares the object to be sent by ranged chunks.
+
+        Supports a single `Range` and `If-None-Match`, so only a couple of
+        chunks are kept in memory regardless of the object size.
+        """
+        with self._download_errors(key):
+            size, etag = await self._run("head_object", self._head_object, key)
+
+        media_type = self._guess_media_type(key)
+        headers = {"Accept-Ranges": "bytes", "ETag": etag}
+        if if_none_match and (if_none_match.strip() == "*" or etag in map(str.strip, if_none_match.split(","))):
+            return ObjectStream(status_code=http.HTTPStatus.NOT_MODIFIED, media_type=media_type, headers=headers)
+
+        status_code = http.HTTPStatus.OK
+        start, end = 0, size - 1
+        if range_header:
+            try:
+                byte_range = _parse_range(range_header, size)
+            except ValueError:
+                headers["Content-Range"] = f"bytes */{size}"
+                return ObjectStream(
+                    status_code=http.HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, media_type=media_type, headers=headers
+                )
+            if byte_range:
+                status_code = http.HTTPStatus.PARTIAL_CONTENT
+                start, end = byte_range
+                headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+        headers["Content-Length"] = str(end - start + 1)
+        return ObjectStream(
+            status_code=status_code,
+            media_type=media_type,
+            headers=headers,
+            chunks=self._iter_chunks(key, start, end),
+        )
 
     def _generate_public_url(self, key):
-        client = self.configure_client(config=self.config, signature_version=UNSIGNED)
+        client = self._get_client(signature_version=UNSIGNED)
         url = client.generate_presigned_url(
             "get_object",
             Params={
@@ -138,29 +322,19 @@ class CDNClient:
         return url
 
     async def generate_presigned_url(self, key):
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._generate_presigned_url, key)
-            url = await asyncio.wrap_future(future)
-            return url
+        return await self._run("generate_presigned_url", self._generate_presigned_url, key)
 
     async def generate_public_url(self, key):
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._generate_public_url, key)
-            url = await asyncio.wrap_future(future)
-            return url
+        return await self._run("generate_public_url", self._generate_public_url, key)
 
     async def delete_object(self, key: str | None):
         async with self.semaphore:
-            with ThreadPoolExecutor() as executor:
-                future = executor.submit(self.client.delete_object, Bucket=self.config.bucket, Key=key)
-                await asyncio.wrap_future(future)
+            await self._run("delete_object", self.client.delete_object, Bucket=self.config.bucket, Key=key)
 
     async def list_object(self, key: str):
         async with self.semaphore:
-            with ThreadPoolExecutor() as executor:
-                future = executor.submit(self.client.list_objects, Bucket=self.config.bucket, Prefix=key)
-                result = await asyncio.wrap_future(future)
-                return result.get("Contents", [])
+            result = await self._run("list_object", self.client.list_objects, Bucket=self.config.bucket, Prefix=key)
+            return result.get("Contents", [])
 
     def generate_presigned_post(self, bucket, key):
         # Not needed ThreadPoolExecutor because there is no any IO operation (no API calls to s3)
@@ -188,10 +362,7 @@ class CDNClient:
 
     async def copy(self, key, storage_from: "CDNClient", key_from: str | None = None) -> int:
         async with self.semaphore:
-            with ThreadPoolExecutor() as executor:
-                future = executor.submit(self._copy, key, storage_from, key_from=key_from)
-                res = await asyncio.wrap_future(future)
-                return res
+            return await self._run("copy", self._copy, key, storage_from, key_from=key_from)
 
     async def check(self):
         storage_bucket = self.config.bucket
@@ -257,6 +428,4 @@ class CDNClient:
         return False  # No public access found
 
     async def is_object_public(self, key) -> bool:
-        with ThreadPoolExecutor() as executor:
-            future = executor.submit(self._is_object_public, key)
-            return await asyncio.wrap_future(future)
+        return await self._run("is_object_public", self._is_object_public, key)
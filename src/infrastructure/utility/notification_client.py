@@ -1,3 +1,4 @@
+import abc
 import asyncio
 import enum
 import json
@@ -6,9 +7,11 @@ from collections import defaultdict
 
 import firebase_admin
 from firebase_admin import credentials, messaging
+from pydantic import Field
 
 from apps.shared.domain import InternalModel
 from config import settings
+from infrastructure.logger import logger
 
 
 class FirebaseNotificationType(enum.StrEnum):
@@ -30,8 +33,32 @@ class FirebaseMessage(InternalModel):
     data: FirebaseData
 
 
-class FCMNotificationTest:
-    notifications: dict[str, list] = defaultdict(list)
+class FCMDeliveryResult(InternalModel):
+    sent: int = 0
+    failed: int = 0
+    # tokens of the app instances which are not registered anymore
+    unregistered: list[str] = Field(default_factory=list)
+
+    def merge(self, other: "FCMDeliveryResult") -> None:
+        self.sent += other.sent
+        self.failed += other.failed
+        self.unregistered += other.unregistered
+
+
+class _FCMDispatcher(abc.ABC):
+    """Sends a notification to devices in multicast batches of `fcm.batch_size`
+    tokens, at most `fcm.max_concurrent_batches` batches at the same time.
+    Transports implement `_send_batch`.
+
+    A failed batch is logged and its devices are counted as failed,
+    the results of the other batches are kept.
+    """
+
+    _metrics: dict[str, int] = defaultdict(int)
+
+    @abc.abstractmethod
+    async def _send_batch(self, devices: list[str], message: FirebaseMessage) -> FCMDeliveryResult:
+        """Sends the message to the devices of one batch"""
 
     async def notify(
         self,
@@ -42,14 +69,59 @@ class FCMNotificationTest:
         extra_kwargs: dict | None = None,
         *args,
         **kwargs,
-    ):
+    ) -> FCMDeliveryResult:
+        result = FCMDeliveryResult()
+        devices = list(dict.fromkeys(devices))
         if not devices:
-            return
+            return result
+
+        semaphore = asyncio.Semaphore(settings.fcm.max_concurrent_batches)
+
+        async def send(batch: list[str]) -> FCMDeliveryResult:
+            async with semaphore:
+                return await self._send_batch(batch, message)
+
+        batch_size = settings.fcm.batch_size
+        batches = [devices[i : i + batch_size] for i in range(0, len(devices), batch_size)]
+        batch_results = await asyncio.gather(*(send(batch) for batch in batches), return_exceptions=True)
+        for batch, batch_result in zip(batches, batch_results):
+            if isinstance(batch_result, Exception):
+                logger.error(f"FCM batch of {len(batch)} devices failed: {batch_result!r}")
+                _FCMDispatcher._metrics["failed_batches"] += 1
+                result.failed += len(batch)
+                continue
+            result.merge(batch_result)
+
+        _FCMDispatcher._metrics["batches"] += len(batches)
+        _FCMDispatcher._metrics["sent"] += result.sent
+        _FCMDispatcher._metrics["failed"] += result.failed
+        _FCMDispatcher._metrics["unregistered"] += len(result.unregistered)
+        return result
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        return dict(_FCMDispatcher._metrics)
+
+
+class FCMNotificationTest(_FCMDispatcher):
+    """Local transport, devices from `unregistered` are reported as not registered."""
+
+    notifications: dict[str, list] = defaultdict(list)
+    unregistered: set[str] = set()
+
+    async def _send_batch(self, devices: list[str], message: FirebaseMessage) -> FCMDeliveryResult:
+        result = FCMDeliveryResult()
         for device in devices:
+            if device in self.unregistered:
+                result.failed += 1
+                result.unregistered.append(device)
+                continue
             self.notifications[device].append(json.dumps(message.dict(by_alias=True), default=str))
+            result.sent += 1
+        return result
 
 
-class FCMNotification:
+class FCMNotification(_FCMDispatcher):
     """Singleton FCM Notification client"""
 
     _initialized = False
@@ -74,46 +146,27 @@ class FCMNotification:
 
         self._initialized = True
 
-    async def notify(
-        self,
-        devices: list,
-        message: FirebaseMessage,
-        time_to_live: int | None = None,
-        badge: str | None = None,
-        extra_kwargs: dict | None = None,
-        *args,
-        **kwargs,
-    ):
+    async def notify(self, devices: list, message: FirebaseMessage, *args, **kwargs) -> FCMDeliveryResult:
         if not self._initialized:
-            return
-        devices = list(set(devices))
-        if len(devices) == 0:
-            return
-        elif devices and len(devices) > 1:
-            await asyncio.to_thread(
-                messaging.send_each_for_multicast,
-                messaging.MulticastMessage(
-                    devices,
-                    android=messaging.AndroidConfig(ttl=settings.fcm.ttl, priority="high"),
-                    data=dict(message=json.dumps(message.dict(by_alias=True), default=str)),
-                    apns=messaging.APNSConfig(
-                        headers={"apns-priority": "5"},
-                        payload=messaging.APNSPayload(aps=messaging.Aps(content_available=True)),
-                    ),
-                ),
-                app=self._app,
-            )
-        else:
-            await asyncio.to_thread(
-                messaging.send,
-                messaging.Message(
-                    android=messaging.AndroidConfig(ttl=settings.fcm.ttl, priority="high"),
-                    data=dict(message=json.dumps(message.dict(by_alias=True), default=str)),
-                    token=devices[0],
-                    apns=messaging.APNSConfig(
-                        headers={"apns-priority": "5"},
-                        payload=messaging.APNSPayload(aps=messaging.Aps(content_available=True)),
-                    ),
+            return FCMDeliveryResult()
+        return await super().notify(devices, message, *args, **kwargs)
+
+    async def _send_batch(self, devices: list[str], message: FirebaseMessage) -> FCMDeliveryResult:
+        response: messaging.BatchResponse = await asyncio.to_thread(
+            messaging.send_each_for_multicast,
+            messaging.MulticastMessage(
+                devices,
+                android=messaging.AndroidConfig(ttl=settings.fcm.ttl, priority="high"),
+                data=dict(message=json.dumps(message.dict(by_alias=True), default=str)),
+                apns=messaging.APNSConfig(
+                    headers={"apns-priority": "5"},
+                    payload=messaging.APNSPayload(aps=messaging.Aps(content_available=True)),
                 ),
-                app=self._app,
-            )
+            ),
+            app=self._app,
+        )
+        result = FCMDeliveryResult(sent=response.success_count, failed=response.failure_count)
+        for device, send_response in zip(devices, response.responses):
+            if isinstance(send_response.exception, (messaging.UnregisteredError, messaging.SenderIdMismatchError)):
+                result.unregistered.append(device)
+        return result
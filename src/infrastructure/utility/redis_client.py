@@ -1,4 +1,5 @@
 import datetime
+import fnmatch
 import json
 import re
 import typing
@@ -10,6 +11,27 @@ from sentry_sdk import capture_exception
 from config import settings
 
 
+class _RedisPipelineTest:
+    """Collects the commands and runs them on execute, like a non-transactional pipeline"""
+
+    def __init__(self, cache: "RedisCacheTest"):
+        self._cache = cache
+        self._commands: list[tuple[typing.Callable[..., typing.Awaitable], tuple]] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self._commands.clear()
+
+    def publish(self, channel: str, value: str) -> None:
+        self._commands.append((self._cache.publish_raw, (channel, value)))
+
+    async def execute(self) -> list[typing.Any]:
+        commands, self._commands = self._commands, []
+        return [await command(*args) for command, args in commands]
+
+
 class RedisCacheTest:
     _storage: dict = {}
 
@@ -22,7 +44,9 @@ class RedisCacheTest:
 
         return value
 
-    async def set(self, name, value, ex=None, **kwargs):
+    async def set(self, name, value, ex=None, nx=False, **kwargs):
+        if nx and await self.get(name) is not None:
+            return None
         now = datetime.datetime.utcnow()
         self._storage[name] = [
             value,
@@ -47,23 +71,38 @@ class RedisCacheTest:
         return filtered_keys
 
     async def mget(self, keys) -> list[typing.Any]:
-        results = []
-        for key in keys:
-            result, expire = self._storage.get(key, [None, None])
-            if expire > datetime.datetime.utcnow():
-                results.append(result)
-        return results
+        return [await self.get(key) for key in keys]
 
     async def publish(self, channel: str, value: dict):
+        await self.publish_raw(channel, json.dumps(value, default=str))
+
+    async def publish_raw(self, channel: str, value: str):
         values, expiry = self._storage.get(channel, ([], None))
-        values.append(json.dumps(value, default=str))
+        values.append(value)
         self._storage[channel] = (values, expiry)
 
+    def pipeline(self, transaction: bool = True) -> _RedisPipelineTest:
+        return _RedisPipelineTest(self)
+
+    async def publish_many(self, messages: list[tuple[str, dict]]):
+        for channel, value in messages:
+            await self.publish(channel, value)
+
+    async def set_many(self, values: dict[str, EncodableT], ex=None):
+        for name, value in values.items():
+            await self.set(name, value, ex=ex)
+
     async def messages(self, channel_name: str):
         values, expiry = self._storage.get(channel_name, ([], None))
         for value in values:
             yield value
 
+    async def pmessages(self, pattern: str):
+        for channel, (values, _) in list(self._storage.items()):
+            if isinstance(values, list) and fnmatch.fnmatchcase(channel, pattern):
+                for value in values:
+                    yield dict(type="pmessage", pattern=pattern, channel=channel, data=value)
+
 
 class RedisCache:
     """Singleton Redis cache client"""
@@ -129,13 +168,18 @@ class RedisCache:
         except redis.RedisError:
             return None
 
-    async def set(self, key: str, value: EncodableT, ex=None) -> bool:
+    async def set(self, key: str, value: EncodableT, ex=None, *, persist: bool = False, nx: bool = False) -> bool:
+        """Set the value with the `ex` seconds (default ttl if not set) expiration, or forever if persist.
+        With `nx` the value is set only if the key does not exist.
+        """
         if not self._cache:
             return False
-        if not ex:
+        if persist:
+            ex = None
+        elif not ex:
             ex = self.expire_duration
-        result = await self._cache.set(key, value, ex=ex)
-        return result
+        result = await self._cache.set(key, value, ex=ex, nx=nx)
+        return bool(result)
 
     async def delete(self, key) -> bool:
         if not self._cache:
@@ -157,9 +201,37 @@ class RedisCache:
         assert self._cache
         await self._cache.publish(channel, json.dumps(value, default=str))
 
+    async def publish_many(self, messages: list[tuple[str, dict]]):
+        """Publish (channel, value) messages in one round trip"""
+        assert self._cache
+        async with self._cache.pipeline(transaction=False) as pipe:
+            for channel, value in messages:
+                pipe.publish(channel, json.dumps(value, default=str))
+            await pipe.execute()
+
+    async def set_many(self, values: dict[str, EncodableT], ex=None):
+        """Set the values with the `ex` seconds (default ttl if not set) expiration in one round trip"""
+        if not self._cache or not values:
+            return
+        async with self._cache.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, ex=ex or self.expire_duration)
+            await pipe.execute()
+
     async def messages(self, channel_name: str):
         assert self._cache
         pubsub = self._cache.pubsub()
         await pubsub.subscribe(channel_name)
         async for message in pubsub.listen():
             yield message
+
+    async def pmessages(self, pattern: str):
+        """Messages of all channels matching the pattern over a single connection"""
+        assert self._cache
+        pubsub = self._cache.pubsub()
+        await pubsub.psubscribe(pattern)
+        try:
+            async for message in pubsub.listen():
+                yield message
+        finally:
+            await pubsub.aclose()
@@ -0,0 +1,248 @@
+import asyncio
+import base64
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from tempfile import SpooledTemporaryFile
+from typing import Any
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from apps.answers.errors import ReportServerError
+from config import settings
+from infrastructure.logger import logger
+
+__all__ = ["ReportClient", "ReportServerPayload", "report_client"]
+
+_PDF_KEY = re.compile(rb'[{,]\s*"pdf"\s*:\s*"')
+_RETRY_STATUSES = {502, 503, 504}
+
+
+@dataclass
+class ReportServerPayload:
+    """Report server response: the decoded PDF spooled to a temporary file
+    and the rest of the response fields.
+    """
+
+    pdf: SpooledTemporaryFile
+    data: dict[str, Any]
+
+
+class _ServerFailure(ReportServerError):
+    """5xx response or connection error, counted by the circuit breaker."""
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+@dataclass
+class _ServerState:
+    semaphore: asyncio.Semaphore
+    waiting: int = 0
+    in_flight: int = 0
+    requests: int = 0
+    failures: int = 0
+    retries: int = 0
+    latency: float = 0.0
+    consecutive_failures: int = 0
+    open_until: float = 0.0
+    loop: asyncio.AbstractEventLoop | None = field(default=None, repr=False)
+
+
+class _PdfDecoder:
+    """Extracts the base64 `pdf` string of the JSON response while it is read,
+    the decoded bytes are written to a spooled file, other fields are kept
+    in memory and parsed at the end.
+    """
+
+    def __init__(self, pdf: SpooledTemporaryFile):
+        self.pdf = pdf
+        self.rest = bytearray()
+        self._state = "head"
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> None:
+        if self._state == "head":
+            self.rest += chunk
+            match = _PDF_KEY.search(self.rest)
+            if not match:
+                return
+            chunk = bytes(self.rest[match.end() :])
+            del self.rest[match.end() :]
+            self._state = "pdf"
+        if self._state == "pdf":
+            end = chunk.find(b'"')
+            if end == -1:
+                self._decode(chunk)
+                return
+            self._decode(chunk[:end])
+            self._flush()
+            self._state = "tail"
+            chunk = chunk[end:]
+        self.rest += chunk
+
+    def close(self) -> dict[str, Any]:
+        if self._state == "pdf":
+            raise ValueError("Unterminated pdf string")
+        self.pdf.seek(0)
+        return json.loads(self.rest)
+
+    def _decode(self, data: bytes) -> None:
+        data = self._pending + data
+        # a backslash of an escaped slash can be the last byte of the chunk
+        carry = b"\\" if data.endswith(b"\\") else b""
+        if carry:
+            data = data[:-1]
+        data = data.replace(b"\\/", b"/")
+        size = len(data) - len(data) % 4
+        self.pdf.write(base64.b64decode(data[:size]))
+        self._pending = data[size:] + carry
+
+    def _flush(self) -> None:
+        if self._pending:
+            self.pdf.write(base64.b64decode(self._pending + b"=" * (-len(self._pending) % 4)))
+            self._pending = b""
+
+
+class ReportClient:
+    """Client of the applet report servers shared by the worker.
+
+    Keeps one connection pool for all servers, limits concurrent requests
+    to each server, retries transient failures with a jittered backoff and
+    stops requesting a server for `circuit_reset_timeout` seconds after
+    `circuit_failure_threshold` consecutive 5xx responses or connection errors.
+    Rejected (4xx) and cancelled requests are not failures of the server.
+    """
+
+    def __init__(self) -> None:
+        self._session: aiohttp.ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._servers: dict[str, _ServerState] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        # a worker runs one loop, tests run a loop per test
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._loop = loop
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=settings.report_server.pool_size),
+                timeout=aiohttp.ClientTimeout(
+                    total=settings.report_server.request_timeout,
+                    connect=settings.report_server.connect_timeout,
+                ),
+            )
+        return self._session
+
+    def _get_server(self, url: str) -> _ServerState:
+        server = urlsplit(url).netloc
+        loop = asyncio.get_running_loop()
+        state = self._servers.get(server)
+        if state is None or state.loop is not loop:
+            state = _ServerState(semaphore=asyncio.Semaphore(settings.report_server.max_concurrent_requests), loop=loop)
+            self._servers[server] = state
+        return state
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per server: requests waiting for a slot (queue depth), requests in flight,
+        totals of requests, failures, retries and seconds of the requests.
+        """
+        now = time.monotonic()
+        return {
+            server: dict(
+                waiting=state.waiting,
+                in_flight=state.in_flight,
+                requests=state.requests,
+                failures=state.failures,
+                retries=state.retries,
+                latency=state.latency,
+                circuit_open=state.open_until > now,
+            )
+            for server, state in self._servers.items()
+        }
+
+    async def post_report(self, url: str, payload: dict) -> ReportServerPayload:
+        state = self._get_server(url)
+        if state.open_until > time.monotonic():
+            raise ReportServerError(message="server is unavailable")
+
+        state.waiting += 1
+        try:
+            await state.semaphore.acquire()
+        finally:
+            state.waiting -= 1
+        state.in_flight += 1
+        start = time.monotonic()
+        try:
+            result = await self._post_with_retries(state, url, payload)
+        except _ServerFailure:
+            state.failures += 1
+            state.consecutive_failures += 1
+            if state.consecutive_failures >= settings.report_server.circuit_failure_threshold:
+                state.open_until = time.monotonic() + settings.report_server.circuit_reset_timeout
+                logger.warning(f"Report server {urlsplit(url).netloc} is not requested after repeated failures.")
+            raise
+        except Exception:
+            state.failures += 1
+            raise
+        else:
+            state.consecutive_failures = 0
+            return result
+        finally:
+            duration = time.monotonic() - start
+            state.in_flight -= 1
+            state.requests += 1
+            state.latency += duration
+            state.semaphore.release()
+
+    async def _post_with_retries(self, state: _ServerState, url: str, payload: dict) -> ReportServerPayload:
+        attempt = 0
+        while True:
+            try:
+                return await self._post(url, payload)
+            except (aiohttp.ClientError, asyncio.TimeoutError, _RetryableStatus) as e:
+                if attempt >= settings.report_server.max_retries:
+                    if isinstance(e, _RetryableStatus):
+                        raise _ServerFailure(message=e.message)
+                    raise _ServerFailure(message=str(e) or type(e).__name__)
+                attempt += 1
+                state.retries += 1
+                delay = settings.report_server.retry_backoff * 2 ** (attempt - 1)
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+
+    async def _post(self, url: str, payload: dict) -> ReportServerPayload:
+        logger.info(f"Sending request to the report server {url}.")
+        start = time.time()
+        async with self._get_session().post(url, json=payload) as resp:
+            if resp.status != 200:
+                logger.error(f"Failed request in {time.time() - start:.1f} seconds.")
+                error_message = await resp.text()
+                if resp.status in _RETRY_STATUSES:
+                    raise _RetryableStatus(error_message)
+                if resp.status >= 500:
+                    raise _ServerFailure(message=error_message)
+                raise ReportServerError(message=error_message)
+            pdf = SpooledTemporaryFile(max_size=settings.report_server.spool_max_size)
+            try:
+                decoder = _PdfDecoder(pdf)
+                async for chunk in resp.content.iter_chunked(settings.report_server.read_chunk_size):
+                    decoder.feed(chunk)
+                data = decoder.close()
+            except BaseException:
+                pdf.close()
+                raise
+            logger.info(f"Successful request in {time.time() - start:.1f} seconds.")
+            return ReportServerPayload(pdf=pdf, data=data)
+
+
+report_client = ReportClient()